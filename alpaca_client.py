@@ -6,6 +6,8 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Iterable, List, Optional
 
+from exchange_pair_index import PairIndex
+
 # Windows UTF-8 fix (MANDATORY - must be early)
 if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -175,6 +177,19 @@ class AlpacaClient:
             dedup_ttl = 0.2
         self._response_cache = TTLCache(default_ttl=dedup_ttl, name='alpaca_response_cache')
 
+        # Pair index, rebuilt once per crypto asset list refresh
+        try:
+            self._pairs_ttl = float(os.getenv('ALPACA_PAIRS_CACHE_TTL', '300'))
+        except Exception:
+            self._pairs_ttl = 300.0
+        try:
+            self._pairs_retry_s = float(os.getenv('ALPACA_PAIRS_RETRY_S', '30'))
+        except Exception:
+            self._pairs_retry_s = 30.0
+        self._pair_index: Optional[PairIndex] = None
+        self._pairs_time = 0.0
+        self._pairs_retry_at = 0.0   # After a failed refresh, keep the last index until then
+
         # Market Data Hub integration (Phase 2 optimization)
         self._market_data_hub = None
         try:
@@ -1939,9 +1954,23 @@ class AlpacaClient:
         Returns:
             List of pairs with base, quote, and pair name
         """
+        return [dict(entry) for entry in self._get_pair_index().pairs(base=base, quote=quote)]
+
+    def _get_pair_index(self) -> PairIndex:
+        """
+        Pair index over tradable crypto assets (ALPACA_PAIRS_CACHE_TTL).
+
+        A failed refresh is not retried for ALPACA_PAIRS_RETRY_S; callers get
+        the last good index (or an empty one) meanwhile instead of one
+        assets request per lookup.
+        """
+        now = time.time()
+        if self._pair_index is not None and ((now - self._pairs_time) <= self._pairs_ttl
+                                             or now < self._pairs_retry_at):
+            return self._pair_index
         try:
             assets = self.get_assets(status='active', asset_class='crypto') or []
-            results = []
+            entries = []
 
             for asset in assets:
                 if not asset.get('tradable'):
@@ -1952,15 +1981,10 @@ class AlpacaClient:
                     continue
 
                 pair_base, pair_quote = normalized.split('/')
-                if base and pair_base.upper() != base.upper():
-                    continue
-                if quote and pair_quote.upper() != quote.upper():
-                    continue
-
                 min_qty = asset.get('min_order_size') or asset.get('min_trade_increment') or 0
                 min_notional = asset.get('min_trade_increment') or 0
 
-                results.append({
+                entries.append({
                     "pair": normalized,
                     "base": pair_base,
                     "quote": pair_quote,
@@ -1968,10 +1992,14 @@ class AlpacaClient:
                     "min_notional": float(min_notional)
                 })
 
-            return results
+            self._pair_index = PairIndex(entries, token=now)
+            self._pairs_time = now
         except Exception as e:
             logger.error(f"Error getting Alpaca pairs: {e}")
-            return []
+            self._pairs_retry_at = now + self._pairs_retry_s
+            if self._pair_index is None:
+                self._pair_index = PairIndex([])
+        return self._pair_index
 
     def find_conversion_path(self, from_asset: str, to_asset: str) -> List[Dict[str, Any]]:
         """
@@ -1992,9 +2020,8 @@ class AlpacaClient:
         if from_asset == to_asset:
             return []
         
-        pairs = self.get_available_pairs()
-        pair_bases = {p["base"].upper() for p in pairs}
-        pair_quotes = {(p["base"].upper(), p["quote"].upper()) for p in pairs}
+        # (base, quote) -> pair, O(1) membership
+        pair_quotes = self._get_pair_index().by_assets
         
         # If converting to/from USD, single trade
         if from_asset == 'USD':
@@ -2295,12 +2322,8 @@ class AlpacaClient:
         Returns:
             Dict mapping each asset to list of assets it can convert to
         """
-        pairs = self.get_available_pairs()
-        
         # All crypto can convert to USD and to each other (via USD)
-        crypto_assets = set()
-        for p in pairs:
-            crypto_assets.add(p["base"].upper())
+        crypto_assets = set(self._get_pair_index().by_base)
         
         conversions = {"USD": sorted(crypto_assets)}
         
@@ -32,10 +32,12 @@ import sys
 import json
 import time
 import heapq
+import math
+from array import array
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import logging
 
 logger = logging.getLogger(__name__)
@@ -143,6 +145,249 @@ class BarterOpportunity:
     reason: str
 
 
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 🧭 PATH ENGINE - CSR graph with cached single-source searches
+# ════════════════════════════════════════════════════════════════════════════════
+
+_INF = float('inf')
+_EPS = 1e-12
+
+
+class _SourceTree:
+    """Hop-layered best costs and predecessor edges from one source asset."""
+    __slots__ = ('source', 'max_hops', 'dist', 'pred', 'used_edges', 'paths')
+
+    def __init__(self, source: int, max_hops: int):
+        self.source = source
+        self.max_hops = max_hops
+        self.dist: List[array] = []       # dist[k][v] = best cost using <= k hops
+        self.pred: List[array] = []       # pred[k][v] = edge into v at layer k, -1 = same as layer k-1
+        self.used_edges: Set[int] = set()
+        self.paths: Dict[int, Optional[List[int]]] = {}
+
+
+class BarterPathEngine:
+    """
+    Integer-indexed CSR view of the barter graph.
+
+    Edge weights are -log(effective_rate), so the best route is the cheapest
+    path. Rates span many orders of magnitude (BTC->USD vs USD->BTC), so
+    weights are negative as often as positive; searches are hop-limited
+    Bellman-Ford layers instead of Dijkstra. One search from a source yields
+    the best route to every destination for every hop budget; the result is
+    cached until an edge it depends on changes.
+    """
+
+    MAX_CACHED_SOURCES = 256
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.sources = array('i')
+        self.costs = array('d')
+        self.edges: List[TradingEdge] = []
+        self.in_edges: List[List[int]] = []
+        self.edge_pos: Dict[int, int] = {}   # id(TradingEdge) -> edge index
+        self._trees: 'OrderedDict[Tuple[int, int], _SourceTree]' = OrderedDict()
+        self.searches = 0
+        self.cache_hits = 0
+        self.invalidations = 0
+
+    # ── Build ────────────────────────────────────────────────────────────────
+
+    def rebuild(self, graph: Dict[str, List[TradingEdge]]) -> None:
+        names = set(graph)
+        for edges in graph.values():
+            for edge in edges:
+                names.add(edge.to_asset)
+        self.names = sorted(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+
+        offsets = array('i', [0]) * (n + 1)
+        targets = array('i')
+        sources = array('i')
+        costs = array('d')
+        ordered: List[TradingEdge] = []
+        in_edges: List[List[int]] = [[] for _ in range(n)]
+        edge_pos: Dict[int, int] = {}
+
+        for u, name in enumerate(self.names):
+            for edge in graph.get(name, ()):
+                e = len(ordered)
+                v = self.index[edge.to_asset]
+                ordered.append(edge)
+                targets.append(v)
+                sources.append(u)
+                costs.append(edge.cost)
+                in_edges[v].append(e)
+                edge_pos[id(edge)] = e
+            offsets[u + 1] = len(ordered)
+
+        self.offsets, self.targets, self.sources, self.costs = offsets, targets, sources, costs
+        self.edges, self.in_edges, self.edge_pos = ordered, in_edges, edge_pos
+        self._trees.clear()
+
+    # ── Search ───────────────────────────────────────────────────────────────
+
+    def tree(self, source: int, max_hops: int) -> _SourceTree:
+        key = (source, max_hops)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            self.cache_hits += 1
+            return tree
+
+        self.searches += 1
+        n = len(self.names)
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        tree = _SourceTree(source, max_hops)
+
+        dist = array('d', [_INF]) * n
+        dist[source] = 0.0
+        tree.dist.append(dist)
+        tree.pred.append(array('i', [-1]) * n)
+        frontier = [source]
+
+        for _ in range(max_hops):
+            prev = dist
+            dist = array('d', prev)
+            pred = array('i', [-1]) * n
+            improved = []
+            for u in frontier:
+                du = prev[u]
+                for e in range(offsets[u], offsets[u + 1]):
+                    nd = du + costs[e]
+                    v = targets[e]
+                    if nd < dist[v] - _EPS:
+                        if pred[v] < 0:
+                            improved.append(v)
+                        dist[v] = nd
+                        pred[v] = e
+            for v in improved:
+                tree.used_edges.add(pred[v])
+            tree.dist.append(dist)
+            tree.pred.append(pred)
+            frontier = improved
+            if not frontier:
+                # Remaining layers are identical - share the arrays
+                while len(tree.dist) <= max_hops:
+                    tree.dist.append(dist)
+                    tree.pred.append(array('i', [-1]) * n)
+                break
+
+        self._trees[key] = tree
+        if len(self._trees) > self.MAX_CACHED_SOURCES:
+            self._trees.popitem(last=False)
+        return tree
+
+    def _walk(self, tree: _SourceTree, layer: int, target: int) -> Optional[List[int]]:
+        """Edge indices of the layer-`layer` best route to `target`, or None if not simple."""
+        route: List[int] = []
+        v = target
+        k = layer
+        while k > 0:
+            e = tree.pred[k][v]
+            if e >= 0:
+                route.append(e)
+                v = self.sources[e]
+            k -= 1
+        if v != tree.source:
+            return None
+        route.reverse()
+        seen = {tree.source}
+        for e in route[:-1]:
+            to = self.targets[e]
+            if to in seen:
+                return None
+            seen.add(to)
+        if route and self.targets[route[-1]] in seen and self.targets[route[-1]] != tree.source:
+            return None
+        return route
+
+    def best_route(self, source: int, target: int, max_hops: int) -> Optional[List[int]]:
+        """Cheapest simple route (as edge indices) with at most `max_hops` hops."""
+        tree = self.tree(source, max_hops)
+        if target in tree.paths:
+            return tree.paths[target]
+        route = None
+        if tree.dist[max_hops][target] < _INF:
+            # Prefer the deepest layer; fall back to shallower layers if a
+            # negative cycle made the optimum non-simple.
+            best_cost = _INF
+            for k in range(max_hops, 0, -1):
+                cost = tree.dist[k][target]
+                if cost >= best_cost - _EPS:
+                    continue
+                candidate = self._walk(tree, k, target)
+                if candidate:
+                    route, best_cost = candidate, cost
+        tree.paths[target] = route
+        return route
+
+    def alternative_routes(self, source: int, target: int, max_hops: int) -> List[List[int]]:
+        """One candidate route per (hop budget, last edge into target), read off the cached tree."""
+        tree = self.tree(source, max_hops)
+        routes: List[List[int]] = []
+        seen: Set[Tuple[int, ...]] = set()
+        for k in range(1, max_hops + 1):
+            layer = tree.dist[k - 1]
+            for e in self.in_edges[target]:
+                u = self.sources[e]
+                if layer[u] == _INF:
+                    continue
+                if u == source:
+                    head = []
+                else:
+                    head = self._walk(tree, k - 1, u)
+                    if not head:
+                        continue
+                route = head + [e]
+                nodes = [source] + [self.targets[x] for x in route]
+                if source == target:
+                    inner = nodes[1:-1]
+                    if not inner or source in inner or len(set(inner)) != len(inner):
+                        continue
+                elif len(set(nodes)) != len(nodes):
+                    continue
+                key = tuple(route)
+                if key not in seen:
+                    seen.add(key)
+                    routes.append(route)
+        return routes
+
+    def route_cost(self, route: List[int]) -> float:
+        return sum(self.costs[e] for e in route)
+
+    # ── Incremental updates ──────────────────────────────────────────────────
+
+    def update_edge(self, e: int, new_cost: float) -> int:
+        """Change one edge weight; drop only the cached trees it can affect."""
+        old_cost = self.costs[e]
+        if new_cost == old_cost:
+            return 0
+        self.costs[e] = new_cost
+        u, v = self.sources[e], self.targets[e]
+        stale = []
+        for key, tree in self._trees.items():
+            if e in tree.used_edges:
+                stale.append(key)
+            elif new_cost < old_cost:
+                for k in range(tree.max_hops):
+                    if tree.dist[k][u] + new_cost < tree.dist[k + 1][v] - _EPS:
+                        stale.append(key)
+                        break
+        for key in stale:
+            del self._trees[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def cached_sources(self) -> int:
+        return len(self._trees)
+
 # ════════════════════════════════════════════════════════════════════════════════
 # 🫒 BARTER NAVIGATOR CLASS
 # ════════════════════════════════════════════════════════════════════════════════
@@ -186,10 +431,11 @@ class BarterNavigator:
         self.binance = None
         self.alpaca = None
         
-        # Cache for paths
-        self.path_cache: Dict[str, BarterPath] = {}
-        self.cache_ttl = 60  # seconds
-        self.cache_time = 0
+        # Path engine (CSR graph + per-source cached searches).
+        # Rebuilt lazily after the graph changes; rate changes go through
+        # update_rate() and only invalidate the routes that depend on them.
+        self.engine = BarterPathEngine()
+        self._engine_dirty = True
         
         # Stats
         self.total_pairs = 0
@@ -497,6 +743,7 @@ class BarterNavigator:
         self.assets.add(from_asset)
         self.assets.add(to_asset)
         self.total_edges += 1
+        self._engine_dirty = True
     
     def _add_dynamic_asset(self, asset: str):
         """Dynamically add an asset via stablecoin bridge if possible."""
@@ -685,6 +932,7 @@ class BarterNavigator:
                     self.graph[edge.from_asset].append(edge)
                     self.total_edges += 1
                 
+                self._engine_dirty = True
                 print(f"📂 Loaded barter graph from cache ({len(self.assets)} assets, {self.total_edges} edges)")
                 return True
         except Exception as e:
@@ -695,15 +943,65 @@ class BarterNavigator:
     # 🔍 PATHFINDING - Finding the Barter Chain
     # ════════════════════════════════════════════════════════════════════════════
     
+    def _ensure_engine(self) -> BarterPathEngine:
+        """Rebuild the CSR graph if edges were added since the last search."""
+        if self._engine_dirty:
+            self.engine.rebuild(self.graph)
+            self._engine_dirty = False
+        return self.engine
+    
+    def _path_from_route(self, source: str, destination: str, route: List[int]) -> BarterPath:
+        """Turn engine edge indices into a BarterPath."""
+        hops = [self.engine.edges[e] for e in route]
+        total_rate = 1.0
+        total_fees = 0.0
+        exchanges = set()
+        for edge in hops:
+            total_rate *= edge.effective_rate
+            total_fees += edge.fee_rate
+            exchanges.add(edge.exchange)
+        return BarterPath(
+            source=source,
+            destination=destination,
+            hops=hops,
+            total_rate=total_rate,
+            total_fees=total_fees,
+            exchanges_used=exchanges,
+            estimated_time_seconds=len(hops) * 5  # ~5s per trade
+        )
+    
+    def _require_asset(self, asset: str, role: str) -> bool:
+        """Make sure an asset is in the graph, adding a stablecoin bridge if needed."""
+        if asset in self.assets:
+            return True
+        # Try to dynamically add this asset via stablecoin bridge
+        self._add_dynamic_asset(asset)
+        if asset in self.assets:
+            return True
+        # Only warn once per session
+        if not hasattr(self, '_warned_assets'):
+            self._warned_assets = set()
+        if asset not in self._warned_assets:
+            if role == 'source':
+                print(f"⚠️ Source asset {asset} not in barter graph (will use direct USD pricing)")
+            else:
+                print(f"⚠️ Destination asset {asset} not in barter graph")
+            self._warned_assets.add(asset)
+        return False
+    
     def find_path(self, source: str, destination: str, max_hops: int = 5) -> Optional[BarterPath]:
         """
         Find the best barter path from source to destination.
         
-        Uses Dijkstra's algorithm with edge costs based on:
+        Edge costs are -log(effective rate) and account for:
         - Exchange rate (want to maximize)
         - Fees (want to minimize)
         - Spread (want to minimize)
         
+        One hop-limited search from `source` answers every destination, and
+        stays cached until update_rate() touches an edge it depends on, so
+        repeated calls from the same source are lookups.
+        
         Args:
             source: Asset you have (green olive)
             destination: Asset you want (black olive)
@@ -721,100 +1019,34 @@ class BarterNavigator:
         if destination == 'XBT':
             destination = 'BTC'
         
-        # Check cache
-        cache_key = f"{source}→{destination}"
-        if cache_key in self.path_cache and time.time() - self.cache_time < self.cache_ttl:
-            return self.path_cache[cache_key]
-        
-        if source not in self.assets:
-            # Try to dynamically add this asset via stablecoin bridge
-            self._add_dynamic_asset(source)
-            if source not in self.assets:
-                # Only warn once per session
-                if not hasattr(self, '_warned_assets'):
-                    self._warned_assets = set()
-                if source not in self._warned_assets:
-                    print(f"⚠️ Source asset {source} not in barter graph (will use direct USD pricing)")
-                    self._warned_assets.add(source)
-                return None
-        
-        if destination not in self.assets:
-            self._add_dynamic_asset(destination)
-            if destination not in self.assets:
-                if not hasattr(self, '_warned_assets'):
-                    self._warned_assets = set()
-                if destination not in self._warned_assets:
-                    print(f"⚠️ Destination asset {destination} not in barter graph")
-                    self._warned_assets.add(destination)
-                return None
+        if not self._require_asset(source, 'source'):
+            return None
+        if not self._require_asset(destination, 'destination'):
+            return None
         
-        # Dijkstra's algorithm
-        # State: (cost, current_asset, path_edges, hops)
-        import math
+        if source == destination:
+            return self._path_from_route(source, destination, [])
         
-        # Priority queue: (cost, asset, path)
-        pq = [(0.0, source, [])]
-        visited = set()
-        best_costs = {source: 0.0}
+        engine = self._ensure_engine()
+        src = engine.index.get(source)
+        dst = engine.index.get(destination)
+        if src is None or dst is None:
+            return None
         
-        while pq:
-            cost, current, path = heapq.heappop(pq)
-            
-            if current == destination:
-                # Found destination! Build the path
-                total_rate = 1.0
-                total_fees = 0.0
-                exchanges = set()
-                
-                for edge in path:
-                    total_rate *= edge.effective_rate
-                    total_fees += edge.fee_rate
-                    exchanges.add(edge.exchange)
-                
-                result = BarterPath(
-                    source=source,
-                    destination=destination,
-                    hops=path,
-                    total_rate=total_rate,
-                    total_fees=total_fees,
-                    exchanges_used=exchanges,
-                    estimated_time_seconds=len(path) * 5  # ~5s per trade
-                )
-                
-                self.path_cache[cache_key] = result
-                self.cache_time = time.time()
-                return result
-            
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            # Check hop limit
-            if len(path) >= max_hops:
-                continue
-            
-            # Explore edges
-            for edge in self.graph.get(current, []):
-                next_asset = edge.to_asset
-                
-                if next_asset in visited:
-                    continue
-                
-                new_cost = cost + edge.cost
-                
-                if next_asset not in best_costs or new_cost < best_costs[next_asset]:
-                    best_costs[next_asset] = new_cost
-                    heapq.heappush(pq, (new_cost, next_asset, path + [edge]))
-        
-        # No path found
-        return None
+        route = engine.best_route(src, dst, max_hops)
+        if not route:
+            return None
+        return self._path_from_route(source, destination, route)
     
     def find_all_paths(self, source: str, destination: str, max_hops: int = 4, 
                        max_paths: int = 5) -> List[BarterPath]:
         """
         Find multiple paths from source to destination.
         
-        Returns up to max_paths different routes, sorted by total rate.
+        Candidates are the best route into the destination through each of
+        its incoming edges for each hop budget, all read off the same cached
+        single-source search. Returns up to max_paths routes, sorted by total
+        rate. When source == destination the routes are cycles.
         """
         source = source.upper()
         destination = destination.upper()
@@ -824,46 +1056,83 @@ class BarterNavigator:
         if destination == 'XBT':
             destination = 'BTC'
         
-        paths = []
+        engine = self._ensure_engine()
+        src = engine.index.get(source)
+        dst = engine.index.get(destination)
+        if src is None or dst is None:
+            return []
         
-        # BFS with path tracking
-        queue = [(source, [], 1.0)]  # (asset, path, cumulative_rate)
-        
-        while queue and len(paths) < max_paths * 2:  # Get extra to filter
-            current, path, rate = queue.pop(0)
-            
-            if len(path) > max_hops:
-                continue
-            
-            if current == destination and path:
-                # Build path object
-                total_fees = sum(e.fee_rate for e in path)
-                exchanges = set(e.exchange for e in path)
-                
-                paths.append(BarterPath(
-                    source=source,
-                    destination=destination,
-                    hops=path,
-                    total_rate=rate,
-                    total_fees=total_fees,
-                    exchanges_used=exchanges,
-                    estimated_time_seconds=len(path) * 5
-                ))
-                continue
-            
-            # Explore edges
-            visited_in_path = {source} | {e.to_asset for e in path}
-            
-            for edge in self.graph.get(current, []):
-                if edge.to_asset not in visited_in_path:
-                    new_rate = rate * edge.effective_rate
-                    queue.append((edge.to_asset, path + [edge], new_rate))
+        paths = [
+            self._path_from_route(source, destination, route)
+            for route in engine.alternative_routes(src, dst, max_hops)
+        ]
         
         # Sort by total rate (highest first)
         paths.sort(key=lambda p: p.total_rate, reverse=True)
         
         return paths[:max_paths]
     
+    def update_rate(self, from_asset: str, to_asset: str, rate: float,
+                    pair: Optional[str] = None, exchange: Optional[str] = None) -> int:
+        """
+        Update the rate of existing edge(s) in place.
+        
+        Only cached routes that use the edge (or could now be beaten through
+        it) are invalidated. Returns the number of edges updated.
+        """
+        if rate <= 0:
+            return 0
+        engine = self._ensure_engine()
+        updated = 0
+        for edge in self.graph.get(from_asset, ()):
+            if edge.to_asset != to_asset:
+                continue
+            if pair is not None and edge.pair != pair:
+                continue
+            if exchange is not None and edge.exchange != exchange:
+                continue
+            if edge.rate == rate:
+                continue
+            edge.rate = rate
+            e = engine.edge_pos.get(id(edge))
+            if e is not None:
+                engine.update_edge(e, edge.cost)
+            updated += 1
+        return updated
+    
+    def update_rates_from_prices(self, prices: Dict[str, float], min_change: float = 1e-6,
+                                 assets: Optional[Set[str]] = None) -> int:
+        """
+        Re-derive exchange edge rates from a fresh USD price map.
+        
+        Uses the same convention as populate_from_labyrinth_data (stablecoins
+        count as 1.0) and skips edges whose rate moved by less than
+        `min_change` (relative). `assets`, when given, is the set of assets
+        whose price moved since the last call; edges touching neither end
+        are skipped without recomputing. Returns the number of edges updated.
+        """
+        engine = self._ensure_engine()
+        updated = 0
+        for e, edge in enumerate(engine.edges):
+            if edge.exchange not in self.EXCHANGE_FEES:
+                continue  # bridges and dynamic placeholders keep their fixed rates
+            if assets is not None and edge.from_asset not in assets and edge.to_asset not in assets:
+                continue
+            p_from = 1.0 if edge.from_asset in self.STABLECOINS else prices.get(edge.from_asset, 0)
+            p_to = 1.0 if edge.to_asset in self.STABLECOINS else prices.get(edge.to_asset, 0)
+            if p_from <= 0 or p_to <= 0:
+                continue
+            rate = p_from / p_to
+            if abs(rate - edge.rate) <= min_change * edge.rate:
+                continue
+            edge.rate = rate
+            engine.update_edge(e, edge.cost)
+            updated += 1
+        for asset, price in prices.items():
+            if price > 0:
+                self.prices[asset] = price
+        return updated
+    
     def find_best_opportunity(self, have_asset: str, have_amount: float,
                               want_assets: List[str] = None) -> Optional[BarterOpportunity]:
         """
@@ -933,6 +1202,10 @@ class BarterNavigator:
         
         A→B→C→A where final_amount > initial_amount
         
+        A profitable cycle is a negative-cost cycle in -log(rate) space; the
+        hop-limited search from start_asset finds the cheapest way back to it
+        through every incoming edge for every hop budget up to max_hops.
+        
         Args:
             start_asset: Asset to start and end with
             min_profit_pct: Minimum profit % to report
@@ -945,7 +1218,7 @@ class BarterNavigator:
         
         profitable_cycles = []
         
-        # Find all paths back to start
+        # Cycles back to start, read off the cached search
         paths = self.find_all_paths(start_asset, start_asset, max_hops=max_hops, max_paths=20)
         
         for path in paths:
@@ -1002,7 +1275,11 @@ class BarterNavigator:
             'exchanges': dict(exchange_counts),
             'stablecoins': list(self.STABLECOINS & self.assets),
             'major_cryptos': list(self.MAJOR_CRYPTOS & self.assets),
-            'prices_loaded': len(self.prices)
+            'prices_loaded': len(self.prices),
+            'cached_sources': self.engine.cached_sources(),
+            'path_searches': self.engine.searches,
+            'path_cache_hits': self.engine.cache_hits,
+            'path_invalidations': self.engine.invalidations
         }
     
     def print_path(self, path: BarterPath):
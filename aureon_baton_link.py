@@ -1,33 +1,56 @@
 #!/usr/bin/env python3
-"""Lightweight baton link for system relay validation."""
+"""Lightweight baton link for system relay validation.
+
+Every module calls ``link_system(__name__)`` at import time. In the default
+``full`` mode the first link wakes the Queen (full autonomous control) and
+later links publish throttled ``baton.link`` heartbeats.
+
+``AUREON_BATON_MODE=fast`` (or ``set_fast_start()`` before other imports)
+makes linking a registry insert only. The Queen, sonar and heartbeat wiring
+then waits for an explicit ``bootstrap_runtime()`` from the long-running
+service, so CLIs and tests skip the full organism.
+
+``python aureon_baton_link.py --profile MODULE`` reports per-module import
+self/cumulative ms (via ``-X importtime``) for cold-start tracking.
+"""
 from __future__ import annotations
 
 import json
 import os
+import re
 import time
 import sys
+import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
-try:
-    from aureon_thought_bus import Thought, get_thought_bus
-    THOUGHT_BUS_AVAILABLE = True
-except Exception:
-    Thought = None
-    get_thought_bus = None
-    THOUGHT_BUS_AVAILABLE = False
+Thought = None
+get_thought_bus = None
+ensure_sonar = None
+THOUGHT_BUS_AVAILABLE = False
+SONAR_AVAILABLE = False
 
-try:
-    from mycelium_whale_sonar import ensure_sonar
-    SONAR_AVAILABLE = True
-except Exception:
-    ensure_sonar = None
-    SONAR_AVAILABLE = False
+# Run as the profiler CLI (__main__) the bus imports would load this file a
+# second time as aureon_baton_link and drag the organism into the parent.
+if __name__ != "__main__":
+    try:
+        from aureon_thought_bus import Thought, get_thought_bus
+        THOUGHT_BUS_AVAILABLE = True
+    except Exception:
+        pass
 
+    try:
+        from mycelium_whale_sonar import ensure_sonar
+        SONAR_AVAILABLE = True
+    except Exception:
+        pass
 
-_LINKED = set()
+
+_LINKED: Dict[str, float] = {}     # module -> first link time (insertion ordered)
 _LAST_PING: Optional[float] = None
 _AUTO_CONTROL_DONE = False
+_FAST_START = os.getenv("AUREON_BATON_MODE", "full").strip().lower() == "fast"
+_BOOTSTRAPPED = False
 _LAST_HANDOFF: Optional[tuple[str, float]] = None
 _BATON_LOG_PATH = Path("state/baton_relay.jsonl")
 _REAL_DATA_ENV_DEFAULTS = {
@@ -130,26 +153,49 @@ def _enforce_real_data_only() -> None:
         os.environ[key] = value
 
 
+def set_fast_start(enabled: bool = True) -> None:
+    """Switch linking to registry-only mode (call before importing other modules)."""
+    global _FAST_START
+    _FAST_START = enabled
+
+
+def is_fast_start() -> bool:
+    return _FAST_START
+
+
+def linked_modules() -> List[str]:
+    """Modules that have called link_system, in link order."""
+    return list(_LINKED)
+
+
+def _wake_queen() -> bool:
+    global _AUTO_CONTROL_DONE
+    if _AUTO_CONTROL_DONE:
+        return False
+    _AUTO_CONTROL_DONE = True
+    try:
+        from aureon_queen_hive_mind import get_queen
+        queen = get_queen()
+        try:
+            queen.enable_full_autonomous_control()
+        except Exception:
+            pass
+        return True
+    except Exception:
+        return False
+
+
 def link_system(module_name: str) -> None:
     """Publish a baton heartbeat and ensure Mycelium sonar is wired."""
     _ensure_stdio()
     _enforce_real_data_only()
     if module_name in _LINKED:
         return
-    _LINKED.add(module_name)
+    _LINKED[module_name] = time.time()
+    if _FAST_START and not _BOOTSTRAPPED:
+        return
 
-    global _AUTO_CONTROL_DONE
-    if not _AUTO_CONTROL_DONE:
-        _AUTO_CONTROL_DONE = True
-        try:
-            from aureon_queen_hive_mind import get_queen
-            queen = get_queen()
-            try:
-                queen.enable_full_autonomous_control()
-            except Exception:
-                pass
-        except Exception:
-            pass
+    _wake_queen()
 
     if not THOUGHT_BUS_AVAILABLE or not get_thought_bus:
         return
@@ -179,6 +225,59 @@ def link_system(module_name: str) -> None:
         return
 
 
+def bootstrap_runtime(source: str = "runtime", *, queen: bool = True,
+                      sonar: bool = True, heartbeat: bool = True) -> dict:
+    """
+    Run the wiring that fast-start linking deferred: wake the Queen, wire
+    Mycelium sonar to the ThoughtBus and publish one baton heartbeat that
+    covers every module linked so far. Idempotent; later links behave as in
+    full mode.
+    """
+    global _BOOTSTRAPPED
+    status = {"queen": False, "sonar": False, "heartbeat": False, "modules": len(_LINKED)}
+    if _BOOTSTRAPPED:
+        return status
+    _BOOTSTRAPPED = True
+
+    if queen:
+        status["queen"] = _wake_queen()
+
+    # The module-level imports lose an import cycle with the bus (it links
+    # itself on import); by bootstrap time both sides are loaded.
+    try:
+        from aureon_thought_bus import Thought as _Thought, get_thought_bus as _get_bus
+        bus = _get_bus(persist_path="logs/aureon_thoughts.jsonl")
+    except Exception:
+        return status
+
+    if sonar:
+        try:
+            from mycelium_whale_sonar import ensure_sonar as _ensure_sonar
+            _ensure_sonar(bus)
+            status["sonar"] = True
+        except Exception:
+            pass
+
+    if heartbeat:
+        now = time.time()
+        try:
+            bus.publish(_Thought(
+                source=source,
+                topic="baton.link",
+                payload={
+                    "module": source,
+                    "pid": os.getpid(),
+                    "ts": now,
+                    "linked": len(_LINKED),
+                    "deferred": True,
+                },
+            ))
+            status["heartbeat"] = True
+        except Exception:
+            pass
+    return status
+
+
 def emit_stage(stage: str, source: str, *, topic: str | None = None, meta: Optional[dict] = None) -> None:
     """Emit a baton stage event to ThoughtBus."""
     stage = (stage or "").lower().strip()
@@ -223,3 +322,94 @@ def emit_stage(stage: str, source: str, *, topic: str | None = None, meta: Optio
         ))
     except Exception:
         return
+
+
+# ---------------------------------------------------------------------------
+# Import-time profiler
+# ---------------------------------------------------------------------------
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Parse ``-X importtime`` output into rows of module/self_ms/cumulative_ms/depth."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module.strip(),
+            "self_ms": int(self_us) / 1000.0,
+            "cumulative_ms": int(cumulative_us) / 1000.0,
+            "depth": (len(indent) - 1) // 2,
+        })
+    return rows
+
+
+def profile_imports(module: str, *, mode: Optional[str] = None, timeout: float = 600.0,
+                    python: Optional[str] = None) -> dict:
+    """
+    Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    ``mode`` sets AUREON_BATON_MODE for the child (``fast`` / ``full``);
+    None inherits the current environment. Returns the wall time and the
+    per-module rows sorted by cumulative ms.
+    """
+    env = dict(os.environ)
+    if mode:
+        env["AUREON_BATON_MODE"] = mode
+    cmd = [python or sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=timeout,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall_ms = (time.perf_counter() - start) * 1000.0
+    rows = parse_importtime(proc.stderr)
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return {
+        "module": module,
+        "mode": mode or env.get("AUREON_BATON_MODE", "full"),
+        "returncode": proc.returncode,
+        "wall_ms": wall_ms,
+        "modules_imported": len(rows),
+        "total_self_ms": sum(r["self_ms"] for r in rows),
+        "rows": rows,
+    }
+
+
+def format_import_profile(report: dict, top: int = 25) -> str:
+    lines = [
+        f"Import profile: {report['module']} (baton mode={report['mode']}, rc={report['returncode']})",
+        f"  wall {report['wall_ms']:.0f} ms | {report['modules_imported']} modules | "
+        f"self total {report['total_self_ms']:.0f} ms",
+        f"  {'self ms':>10} {'cum ms':>10}  module",
+    ]
+    for row in report["rows"][:top]:
+        lines.append(f"  {row['self_ms']:>10.1f} {row['cumulative_ms']:>10.1f}  {'  ' * row['depth']}{row['module']}")
+    return "\n".join(lines)
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Baton link tools")
+    parser.add_argument("--profile", metavar="MODULE", action="append", default=[],
+                        help="Import MODULE in a fresh interpreter and report import times")
+    parser.add_argument("--mode", choices=["fast", "full", "both"], default="both")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args(argv)
+    if not args.profile:
+        parser.print_help()
+        return 1
+    modes = ["fast", "full"] if args.mode == "both" else [args.mode]
+    reports = [profile_imports(module, mode=mode) for module in args.profile for mode in modes]
+    if args.json:
+        print(json.dumps([dict(r, rows=r["rows"][:args.top]) for r in reports], indent=2))
+    else:
+        print("\n\n".join(format_import_profile(r, args.top) for r in reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -4,6 +4,32 @@ Aureon Chirp Bus
 ----------------
 Ultra-compact kHz-rate signaling between running components using
 8-byte chirp packets and shared-memory ring buffer transport.
+
+The ring is a broadcast log: each chirp is stamped with a 64-bit sequence
+number and every reader - in any process - keeps its own cursor, so
+listeners no longer steal chirps from each other. Any attached process may
+write: the sequence claim and slot write happen under a per-ring writer
+lock (a thread lock plus a POSIX record lock on a lock file next to the
+segment name), so writers in different processes never share a sequence
+number or interleave inside a slot. When the ring is full
+the oldest chirp is overwritten; a reader that was lapped notices and
+counts the loss. Slots are seqlock-validated (odd stamp while written, even
+once committed, checked before and after the copy) so a reader never
+returns a half-written chirp. Stamps and the write sequence are aligned
+8-byte stores in program order; the double check still rejects a slot
+torn by reordering.
+
+    ring = ChirpRingBuffer("aureon_chirp_bus", create=True)
+    ring.write(packet.to_bytes())                  # never blocks, never fails when full
+    reader = ChirpRingBuffer("aureon_chirp_bus").reader()
+    out = bytearray(64 * CHIRP_SIZE)
+    n = reader.read_many(out)                      # batch copy, no per-chirp allocation
+
+Without fcntl (Windows) the writer lock is process-local only; keep to one
+writing process there.
+
+Throughput / correctness under several reader / writer processes:
+chirp_bus_bench.py.
 """
 
 from __future__ import annotations
@@ -14,10 +40,21 @@ import sys
 import time
 import zlib
 import struct
+import tempfile
+import threading
 from dataclasses import dataclass, field
 from enum import IntEnum
 from multiprocessing import shared_memory
-from typing import Optional
+from typing import Dict, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+import numpy as np
 
 # Windows UTF-8 Fix
 if sys.platform == 'win32':
@@ -36,7 +73,14 @@ if sys.platform == 'win32':
 
 CHIRP_MAGIC = 0xC1
 CHIRP_SIZE = 8
-HEADER_SIZE = 16  # write_idx (8) + read_idx (8)
+RING_MAGIC = 0x43485232  # "CHR2": broadcast layout
+HEADER_SIZE = 16  # magic (4) + slots (4) + write_seq (8)
+SEQ_OFFSET = 8
+SLOT_SIZE = 16  # stamp (8) + chirp (8)
+
+HEADER_STRUCT = struct.Struct("<IIQ")
+SEQ_STRUCT = struct.Struct("<Q")
+SLOT_DTYPE = np.dtype([("stamp", "<u8"), ("chirp", "u1", (CHIRP_SIZE,))])
 
 CHIRP_STRUCT = struct.Struct(">BBBBHBB")
 
@@ -99,97 +143,287 @@ class ChirpPacket:
         )
 
 
+def _track(shm: shared_memory.SharedMemory, tracked: bool) -> None:
+    """(Un)register a segment with this process's resource tracker, which unlinks tracked segments at exit."""
+    try:
+        from multiprocessing import resource_tracker
+        # Forked readers share their parent's tracker: re-register before the owner unlinks
+        (resource_tracker.register if tracked else resource_tracker.unregister)(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+class _WriterLock:
+    """
+    Serialises writers of one ring: a threading.Lock inside the process and
+    an fcntl.lockf record lock across processes. Record locks belong to the
+    process (not the fd), so a forked child holding the inherited fd still
+    excludes its parent. One instance per ring name per process, shared by
+    every handle on that ring.
+    """
+
+    def __init__(self, name: str):
+        self.path = os.path.join(tempfile.gettempdir(), f"{name}.chirp.lock")
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """False (nothing held) if the lock file cannot be opened or locked."""
+        self._thread_lock.acquire()
+        if FCNTL_AVAILABLE:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+                fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            except OSError:
+                self._thread_lock.release()
+                return False
+        return True
+
+    def release(self) -> None:
+        try:
+            if FCNTL_AVAILABLE:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+
+_WRITER_LOCKS: Dict[str, _WriterLock] = {}
+_WRITER_LOCKS_GUARD = threading.Lock()
+
+
+def _writer_lock(name: str) -> _WriterLock:
+    with _WRITER_LOCKS_GUARD:
+        lock = _WRITER_LOCKS.get(name)
+        if lock is None:
+            lock = _WRITER_LOCKS[name] = _WriterLock(name)
+        return lock
+
+
 @dataclass
 class ChirpRingBuffer:
+    """
+    Multi-writer, multi-reader broadcast ring in shared memory.
+
+    Every attached process sees every chirp: readers keep their own cursor
+    (a ChirpReader, held locally) instead of sharing one read index. Any
+    handle may write; writes from all processes are serialised by the
+    ring's writer lock. A writer never waits on readers - it overwrites the
+    oldest slot, and a reader that falls more than `slots` behind detects
+    it (`overruns` / `lost`).
+    """
     name: str
     slots: int = 512
     create: bool = False
     shm: Optional[shared_memory.SharedMemory] = field(init=False, default=None)
     buf: Optional[memoryview] = field(init=False, default=None)
     _initialized: bool = field(init=False, default=False)
+    _owner: bool = field(init=False, default=False)
+    _write_lock: Optional[_WriterLock] = field(init=False, repr=False, default=None)
+    _reader: Optional["ChirpReader"] = field(init=False, repr=False, default=None)
+    _slot_view: Optional[np.ndarray] = field(init=False, repr=False, default=None)
 
     def __post_init__(self) -> None:
-        size = HEADER_SIZE + (self.slots * CHIRP_SIZE)
+        size = HEADER_SIZE + (self.slots * SLOT_SIZE)
         try:
-            self.shm = shared_memory.SharedMemory(name=self.name, create=self.create, size=size)
-            self.buf = self.shm.buf
             if self.create:
-                self.buf[:HEADER_SIZE] = b"\x00" * HEADER_SIZE
-            self._initialized = True
-        except (FileExistsError, FileNotFoundError) as e:
-            # Shared memory segment doesn't exist or is corrupted
-            # Try to cleanup and recreate
-            try:
-                existing = shared_memory.SharedMemory(name=self.name)
-                existing.close()
-                existing.unlink()
-            except (FileNotFoundError, ValueError):
-                pass
-            # Try again with create=True
+                self._create(size)
+            else:
+                self._attach()
+        except FileExistsError:
+            # Another process owns the bus: join it rather than replacing it
             try:
-                self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
-                self.buf = self.shm.buf
-                self.buf[:HEADER_SIZE] = b"\x00" * HEADER_SIZE
-                self._initialized = True
+                self._attach()
             except Exception:
-                # Give up - shared memory not available
-                self._initialized = False
-    
+                self._recreate(size)
+        except FileNotFoundError:
+            self._recreate(size)
+        except ValueError:
+            # Segment left behind with an older layout
+            self._recreate(size)
+        except Exception:
+            # Give up - shared memory not available
+            self._initialized = False
+        if self._initialized:
+            self._write_lock = _writer_lock(self.name)
+            self._slot_view = np.ndarray((self.slots,), dtype=SLOT_DTYPE, buffer=self.buf, offset=HEADER_SIZE)
+            self._reader = self.reader()
+
+    def _create(self, size: int) -> None:
+        self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        self.buf = self.shm.buf
+        self.buf[:size] = b"\x00" * size
+        HEADER_STRUCT.pack_into(self.buf, 0, RING_MAGIC, self.slots, 0)
+        self._owner = True
+        self._initialized = True
+
+    def _attach(self) -> None:
+        shm = shared_memory.SharedMemory(name=self.name)
+        magic, slots, _ = HEADER_STRUCT.unpack_from(shm.buf, 0)
+        if magic != RING_MAGIC or shm.size < HEADER_SIZE + slots * SLOT_SIZE:
+            shm.close()
+            raise ValueError("Chirp ring layout mismatch")
+        _track(shm, False)     # A reader must not remove the bus when it exits
+        self.shm, self.buf, self.slots = shm, shm.buf, slots
+        self._initialized = True
+
+    def _recreate(self, size: int) -> None:
+        try:
+            existing = shared_memory.SharedMemory(name=self.name)
+            existing.close()
+            existing.unlink()
+        except (FileNotFoundError, ValueError):
+            pass
+        try:
+            self._create(size)
+        except Exception:
+            self._initialized = False
+
     def close(self) -> None:
-        """Close and cleanup shared memory."""
+        """Detach from the shared memory (the segment stays for other processes)."""
+        self._slot_view = None
+        self._reader = None
+        self.buf = None
         if self.shm:
             try:
                 self.shm.close()
-                if self.create:
-                    self.shm.unlink()
             except Exception:
                 pass
-    
+
+    def unlink(self) -> None:
+        """Remove the segment (owner only); attached readers keep their mapping."""
+        if self.shm and self._owner:
+            try:
+                _track(self.shm, True)
+                self.shm.unlink()
+            except Exception:
+                pass
+
     def __del__(self) -> None:
         """Cleanup on deletion - only if initialized."""
         if getattr(self, '_initialized', False):
             self.close()
 
-    def _read_idx(self) -> int:
-        return struct.unpack("Q", self.buf[8:16])[0]
-
-    def _write_idx(self) -> int:
-        return struct.unpack("Q", self.buf[0:8])[0]
-
-    def _set_write_idx(self, value: int) -> None:
-        struct.pack_into("Q", self.buf, 0, value)
-
-    def _set_read_idx(self, value: int) -> None:
-        struct.pack_into("Q", self.buf, 8, value)
+    def write_seq(self) -> int:
+        """Sequence number the next chirp will get (= chirps ever written)."""
+        return SEQ_STRUCT.unpack_from(self.buf, SEQ_OFFSET)[0]
 
     def write(self, chirp_bytes: bytes) -> bool:
-        if len(chirp_bytes) != CHIRP_SIZE:
+        """Publish one chirp, overwriting the oldest slot when the ring is full."""
+        if not self._initialized or len(chirp_bytes) != CHIRP_SIZE:
             return False
-        write_idx = self._write_idx()
-        read_idx = self._read_idx()
-        next_write = (write_idx + CHIRP_SIZE) % (self.slots * CHIRP_SIZE)
-        if next_write == read_idx:
+        buf = self.buf
+        lock = self._write_lock
+        if not lock.acquire():
             return False
-        offset = HEADER_SIZE + write_idx
-        self.buf[offset:offset + CHIRP_SIZE] = chirp_bytes
-        self._set_write_idx(next_write)
+        try:
+            seq = SEQ_STRUCT.unpack_from(buf, SEQ_OFFSET)[0]
+            offset = HEADER_SIZE + (seq % self.slots) * SLOT_SIZE
+            # Seqlock: odd stamp while the payload is in flux, even once committed
+            SEQ_STRUCT.pack_into(buf, offset, 2 * seq + 1)
+            buf[offset + 8:offset + SLOT_SIZE] = chirp_bytes
+            SEQ_STRUCT.pack_into(buf, offset, 2 * seq + 2)
+            SEQ_STRUCT.pack_into(buf, SEQ_OFFSET, seq + 1)
+        finally:
+            lock.release()
         return True
 
+    def reader(self, from_start: bool = False) -> "ChirpReader":
+        """A new independent cursor: live from now, or from the oldest chirp still held."""
+        head = self.write_seq()
+        return ChirpReader(self, max(0, head - self.slots) if from_start else head)
+
     def read(self) -> Optional[bytes]:
-        write_idx = self._write_idx()
-        read_idx = self._read_idx()
-        if read_idx == write_idx:
-            return None
-        offset = HEADER_SIZE + read_idx
-        chirp_bytes = bytes(self.buf[offset:offset + CHIRP_SIZE])
-        next_read = (read_idx + CHIRP_SIZE) % (self.slots * CHIRP_SIZE)
-        self._set_read_idx(next_read)
-        return chirp_bytes
+        """Next chirp for this handle's own reader (None when caught up)."""
+        return self._reader.read() if self._reader is not None else None
 
-    def close(self) -> None:
-        if self.shm:
-            self.shm.close()
+    def read_many(self, out, max_count: Optional[int] = None) -> int:
+        """Batch read into `out` for this handle's own reader; see ChirpReader.read_many."""
+        return self._reader.read_many(out, max_count) if self._reader is not None else 0
+
+
+class ChirpReader:
+    """
+    One consumer's cursor into a ChirpRingBuffer. Never writes shared memory,
+    so any number of readers in any number of processes see every chirp.
+    """
 
+    def __init__(self, ring: ChirpRingBuffer, seq: int):
+        self.ring = ring
+        self.seq = seq            # Next sequence to read
+        self.received = 0
+        self.overruns = 0         # Times the writer lapped this reader
+        self.lost = 0             # Chirps overwritten before they were read
+
+    def pending(self) -> int:
+        return max(0, self.ring.write_seq() - self.seq)
+
+    def _skip_to(self, seq: int) -> None:
+        if seq > self.seq:
+            self.overruns += 1
+            self.lost += seq - self.seq
+            self.seq = seq
+
+    def read(self) -> Optional[bytes]:
+        ring = self.ring
+        buf, slots = ring.buf, ring.slots
+        while True:
+            head = SEQ_STRUCT.unpack_from(buf, SEQ_OFFSET)[0]
+            if self.seq >= head:
+                return None
+            if head - self.seq > slots:
+                self._skip_to(head - slots)
+            offset = HEADER_SIZE + (self.seq % slots) * SLOT_SIZE
+            expected = 2 * self.seq + 2
+            if SEQ_STRUCT.unpack_from(buf, offset)[0] == expected:
+                chirp_bytes = bytes(buf[offset + 8:offset + SLOT_SIZE])
+                if SEQ_STRUCT.unpack_from(buf, offset)[0] == expected:
+                    self.seq += 1
+                    self.received += 1
+                    return chirp_bytes
+            # Slot reused (or being reused) for a later chirp: lapped
+            self._skip_to(max(self.seq + 1, SEQ_STRUCT.unpack_from(buf, SEQ_OFFSET)[0] + 1 - slots))
+
+    def read_many(self, out, max_count: Optional[int] = None) -> int:
+        """
+        Copy up to len(out) // CHIRP_SIZE chirps (or max_count) into the
+        preallocated writable buffer `out` (bytearray / memoryview / uint8
+        ndarray). Returns the count; the chirps are seqs [seq - count, seq).
+        """
+        dest = np.frombuffer(out, dtype=np.uint8)
+        capacity = dest.size // CHIRP_SIZE
+        if max_count is not None:
+            capacity = min(capacity, max_count)
+        ring = self.ring
+        slots = ring.slots
+        while True:
+            head = ring.write_seq()
+            if head - self.seq > slots:
+                self._skip_to(head - slots)
+            count = min(head - self.seq, capacity)
+            if count <= 0:
+                return 0
+
+            # One bulk copy (two if it wraps), then re-read the live stamps:
+            # a slot counts only if its stamp matched before and after the copy
+            first = self.seq % slots
+            view = ring._slot_view
+            if first + count <= slots:
+                chunk = view[first:first + count].copy()
+                after = view['stamp'][first:first + count]
+            else:
+                chunk = np.concatenate((view[first:], view[:first + count - slots]))
+                after = np.concatenate((view['stamp'][first:], view['stamp'][:first + count - slots]))
+            expected = np.arange(self.seq, self.seq + count, dtype=np.uint64) * 2 + 2
+            bad = np.flatnonzero((chunk['stamp'] != expected) | (after != expected))
+            good = int(bad[0]) if bad.size else count
+            if good:
+                dest[:good * CHIRP_SIZE].reshape(good, CHIRP_SIZE)[:] = chunk['chirp'][:good]
+                self.seq += good
+                self.received += good
+                return good
+            # Slot already reused for a later chirp: lapped, as in read()
+            self._skip_to(max(self.seq + 1, ring.write_seq() + 1 - slots))
 
 try:
     from aureon_harmonic_symbol_table import get_symbol_id
@@ -214,6 +448,10 @@ class ChirpBus:
     def emit(self, packet: ChirpPacket) -> bool:
         return self.ring.write(packet.to_bytes())
 
+    def reader(self, from_start: bool = False) -> ChirpReader:
+        """Independent listener cursor; every reader sees every chirp."""
+        return self.ring.reader(from_start)
+
     def emit_message(
         self,
         message: str,
@@ -243,6 +243,9 @@ except ImportError:
     AIOHTTP_AVAILABLE = False
     safe_print("❌ aiohttp not available - pip install aiohttp")
 
+# WebSocket fan-out (per-client queues + writer tasks)
+from ws_broadcast_hub import BroadcastHub
+
 # Thought Bus (needed for type annotations)
 try:
     from aureon_thought_bus import Thought
@@ -498,6 +501,7 @@ class CommandCenterState:
 
 # Global state
 state = CommandCenterState()
+ws_hub = BroadcastHub('command_center')
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🛫 FLIGHT CHECK SYSTEM - TIMESTAMP CONNECTIVITY VERIFICATION
@@ -5879,11 +5883,12 @@ async def websocket_handler(request):
     await ws.prepare(request)
     
     state.ws_clients.add(ws)
+    ws_hub.add(ws)
     safe_print(f"🔌 New WebSocket client connected. Total: {len(state.ws_clients)}")
     
     try:
-        # Send initial state
-        await ws.send_json({
+        # Send initial state (queued ahead of any broadcast)
+        ws_hub.send(ws, {
             'type': 'state',
             'stats': {
                 'total_trades': state.total_trades,
@@ -5913,24 +5918,19 @@ async def websocket_handler(request):
             elif msg.type == aiohttp.WSMsgType.ERROR:
                 safe_print(f'WebSocket error: {ws.exception()}')
     finally:
+        ws_hub.remove(ws)
         state.ws_clients.discard(ws)
         safe_print(f"🔌 WebSocket client disconnected. Total: {len(state.ws_clients)}")
     
     return ws
 
 async def broadcast_to_clients(message: dict):
-    """Broadcast message to all connected WebSocket clients"""
-    if not state.ws_clients:
-        return
-    
-    dead_clients = set()
-    for ws in state.ws_clients:
-        try:
-            await ws.send_json(message)
-        except Exception:
-            dead_clients.add(ws)
-    
-    state.ws_clients -= dead_clients
+    """Broadcast message to all connected WebSocket clients.
+
+    Serialised once and queued per client; never waits on a slow socket
+    (see ws_broadcast_hub). Lagging clients are dropped by the hub.
+    """
+    ws_hub.publish(message)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # BACKGROUND TASKS - FEED DATA INTO COMMAND CENTER
@@ -6309,7 +6309,8 @@ async def handle_health(request):
     return web.json_response({
         'status': 'healthy',
         'service': 'aureon-command-center',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'websocket': ws_hub.stats(),
     })
 
 
@@ -6584,6 +6585,7 @@ async def cleanup_background_tasks(app):
                 await task
             except asyncio.CancelledError:
                 pass
+    await ws_hub.close()
 
 def main():
     """Main entry point"""
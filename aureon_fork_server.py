@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""
+Aureon Fork Server
+------------------
+Preloading launcher for the production service fleet.
+
+production/supervisord.conf starts every service as a fresh interpreter,
+so each one cold-imports NumPy, the exchange clients and the thought bus
+into its own private memory. The fork server reads the same supervisord
+config, imports the shared core ONCE, freezes it out of the GC and forks
+each service from that warm image. Pages holding the preloaded modules
+stay shared copy-on-write between every service.
+
+Supervision follows supervisord semantics per [program:x] section:
+
+    STARTING -> RUNNING      after startsecs without exiting
+    STARTING -> BACKOFF      exited too early; retry after 1s, 2s, 3s ...
+    BACKOFF  -> FATAL        more than startretries early exits
+    RUNNING  -> EXITED       then restarted per autorestart/exitcodes
+    STOPPING -> STOPPED      stopsignal, then SIGKILL after stopwaitsecs
+
+Usage:
+    python aureon_fork_server.py -c production/supervisord.conf \\
+        --app-dir /aureon/app --log-dir /aureon/logs
+    python aureon_fork_server.py -c production/supervisord.conf --list
+    python aureon_fork_server.py --only micro-profit-labyrinth,orca-dual-hunter \\
+        --memory-report-every 300
+
+The preload runs with AUREON_BATON_MODE=fast: threads do not survive
+fork(), so the Queen and sonar wiring happens inside each service after
+the fork (aureon_baton_link.bootstrap_runtime).
+"""
+
+from __future__ import annotations
+
+import os
+
+# Preloaded modules must not wake the Queen in the server process.
+_INHERITED_BATON_MODE = os.environ.get("AUREON_BATON_MODE")
+os.environ.setdefault("AUREON_BATON_MODE", "fast")
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import configparser
+import gc
+import importlib
+import json
+import logging
+import re
+import runpy
+import shlex
+import signal
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "production", "supervisord.conf")
+
+# Shared core: heavy, thread-free imports that nearly every service pulls in.
+DEFAULT_PRELOAD = (
+    "numpy",
+    "requests",
+    "aureon_baton_link",
+    "aureon_thought_bus",
+    "kraken_client",
+    "binance_client",
+    "alpaca_client",
+    "capital_client",
+)
+
+# Production paths in the container image, remapped by --app-dir / --log-dir
+IMAGE_APP_DIR = "/aureon/app"
+IMAGE_LOG_DIR = "/aureon/logs"
+
+STARTING = "STARTING"
+RUNNING = "RUNNING"
+BACKOFF = "BACKOFF"
+STOPPING = "STOPPING"
+STOPPED = "STOPPED"
+EXITED = "EXITED"
+FATAL = "FATAL"
+
+_PYTHON_RE = re.compile(r"^python[\d.]*$")
+_ENV_PAIR_RE = re.compile(r'\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*("([^"]*)"|\'([^\']*)\'|[^,]*)\s*(?:,|$)')
+
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ServiceSpec:
+    """One [program:x] section, with supervisord defaults."""
+    name: str
+    command: List[str]
+    directory: Optional[str] = None
+    environment: Dict[str, str] = field(default_factory=dict)
+    priority: int = 999
+    autostart: bool = True
+    autorestart: str = "unexpected"          # true | false | unexpected
+    exitcodes: Tuple[int, ...] = (0,)
+    startsecs: float = 1.0
+    startretries: int = 3
+    stopsignal: str = "TERM"
+    stopwaitsecs: float = 10.0
+    stopasgroup: bool = False
+    killasgroup: bool = False
+    stdout_logfile: Optional[str] = None
+    stderr_logfile: Optional[str] = None
+    redirect_stderr: bool = False
+
+    @property
+    def forkable(self) -> bool:
+        """True when the command is `python script.py ...` or `python -m mod ...`."""
+        argv = self.command
+        if len(argv) < 2 or not _PYTHON_RE.match(os.path.basename(argv[0])):
+            return False
+        return argv[1].endswith(".py") or (argv[1] == "-m" and len(argv) > 2)
+
+    @property
+    def stop_signum(self) -> int:
+        return getattr(signal, "SIG" + self.stopsignal.upper().replace("SIG", "", 1))
+
+
+def _as_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _parse_environment(value: str) -> Dict[str, str]:
+    """supervisord `environment=` syntax: KEY=val,KEY2="a,b"."""
+    env = {}
+    pos = 0
+    while pos < len(value):
+        match = _ENV_PAIR_RE.match(value, pos)
+        if not match or match.end() == pos:
+            break
+        key, raw, dq, sq = match.groups()
+        env[key] = dq if dq is not None else sq if sq is not None else raw.strip()
+        pos = match.end()
+    return env
+
+
+def _unwrap_shell(argv: List[str]) -> Tuple[List[str], Optional[str]]:
+    """`bash -c "cd DIR && exec python x.py"` -> (['python', 'x.py'], DIR)."""
+    if len(argv) != 3 or os.path.basename(argv[0]) not in ("bash", "sh") or argv[1] != "-c":
+        return argv, None
+    directory = None
+    command = None
+    for part in argv[2].split("&&"):
+        words = shlex.split(part)
+        if not words:
+            continue
+        if words[0] == "cd" and len(words) == 2:
+            directory = words[1]
+        elif words[0] == "exec":
+            command = words[1:]
+        else:
+            command = words
+    if command is None:
+        return argv, None
+    return command, directory
+
+
+def _remap(path: Optional[str], remap: Dict[str, str]) -> Optional[str]:
+    if not path:
+        return path
+    for prefix, target in remap.items():
+        if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+            return target.rstrip("/") + path[len(prefix.rstrip("/")):]
+    return path
+
+
+def load_supervisor_config(path: str = DEFAULT_CONFIG, *, remap: Optional[Dict[str, str]] = None,
+                           env: Optional[Dict[str, str]] = None) -> List[ServiceSpec]:
+    """Parse the [program:x] sections of a supervisord config, sorted by priority."""
+    remap = remap or {}
+    env = dict(os.environ if env is None else env)
+    parser = configparser.RawConfigParser(strict=False, inline_comment_prefixes=(";",))
+    with open(path, encoding="utf-8") as fh:
+        parser.read_file(fh)
+
+    here = os.path.dirname(os.path.abspath(path))
+    specs = []
+    for section in parser.sections():
+        if not section.startswith("program:"):
+            continue
+        name = section.split(":", 1)[1]
+        expand = {"program_name": name, "process_num": "0", "here": here,
+                  **{f"ENV_{k}": v for k, v in env.items()}}
+
+        def get(key, default=None):
+            if not parser.has_option(section, key):
+                return default
+            raw = parser.get(section, key)
+            try:
+                return raw % expand
+            except (KeyError, ValueError):
+                return re.sub(r"%\((\w+)\)s", lambda m: expand.get(m.group(1), ""), raw)
+
+        command, shell_dir = _unwrap_shell(shlex.split(get("command", "")))
+        specs.append(ServiceSpec(
+            name=name,
+            command=[_remap(arg, remap) for arg in command],
+            directory=_remap(get("directory") or shell_dir, remap),
+            environment=_parse_environment(get("environment", "")),
+            priority=int(get("priority", 999)),
+            autostart=_as_bool(get("autostart", "true")),
+            autorestart=get("autorestart", "unexpected").strip().lower(),
+            exitcodes=tuple(int(c) for c in get("exitcodes", "0").split(",") if c.strip()),
+            startsecs=float(get("startsecs", 1)),
+            startretries=int(get("startretries", 3)),
+            stopsignal=get("stopsignal", "TERM"),
+            stopwaitsecs=float(get("stopwaitsecs", 10)),
+            stopasgroup=_as_bool(get("stopasgroup", "false")),
+            killasgroup=_as_bool(get("killasgroup", "false")),
+            stdout_logfile=_remap(get("stdout_logfile"), remap),
+            stderr_logfile=_remap(get("stderr_logfile"), remap),
+            redirect_stderr=_as_bool(get("redirect_stderr", "false")),
+        ))
+    specs.sort(key=lambda s: (s.priority, s.name))
+    return specs
+
+
+# ---------------------------------------------------------------------------
+# Memory accounting
+# ---------------------------------------------------------------------------
+
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap")
+
+
+def memory_stats(pid: int) -> Optional[Dict[str, int]]:
+    """Shared/private memory of one process in kB from /proc (Linux only)."""
+    totals = dict.fromkeys(_SMAPS_FIELDS, 0)
+    for name in ("smaps_rollup", "smaps"):
+        try:
+            with open(f"/proc/{pid}/{name}") as fh:
+                for line in fh:
+                    key, _, rest = line.partition(":")
+                    if key in totals:
+                        totals[key] += int(rest.split()[0])
+            break
+        except (OSError, ValueError, IndexError):
+            continue
+    else:
+        return None
+    return {
+        "rss_kb": totals["Rss"],
+        "pss_kb": totals["Pss"],
+        "shared_kb": totals["Shared_Clean"] + totals["Shared_Dirty"],
+        "private_kb": totals["Private_Clean"] + totals["Private_Dirty"],
+        "swap_kb": totals["Swap"],
+    }
+
+
+def format_memory_report(report: Dict) -> str:
+    lines = [f"{'service':<32} {'pid':>7} {'rss MB':>8} {'shared MB':>10} {'private MB':>11} {'pss MB':>8}"]
+    for name, row in report["services"].items():
+        lines.append(f"{name:<32} {row['pid']:>7} {row['rss_kb'] / 1024:>8.1f} {row['shared_kb'] / 1024:>10.1f} "
+                     f"{row['private_kb'] / 1024:>11.1f} {row['pss_kb'] / 1024:>8.1f}")
+    t = report["totals"]
+    lines.append(f"{'TOTAL (' + str(t['processes']) + ' processes)':<32} {'':>7} {t['rss_kb'] / 1024:>8.1f} "
+                 f"{t['shared_kb'] / 1024:>10.1f} {t['private_kb'] / 1024:>11.1f} {t['pss_kb'] / 1024:>8.1f}")
+    lines.append(f"Sum of RSS counts shared pages once per process; PSS is the real footprint "
+                 f"({t['rss_kb'] / max(t['pss_kb'], 1):.1f}x less).")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Fork server
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _ServiceState:
+    spec: ServiceSpec
+    state: str = STOPPED
+    pid: Optional[int] = None
+    started_at: float = 0.0
+    stop_deadline: float = 0.0
+    next_start_at: float = 0.0
+    backoff: int = 0
+    spawns: int = 0
+    last_exit: Optional[int] = None
+    last_error: str = ""
+
+
+class ForkServer:
+    """Preload once, fork every service, supervise like supervisord."""
+
+    def __init__(self, specs: Sequence[ServiceSpec], preload: Sequence[str] = DEFAULT_PRELOAD,
+                 clock: Callable[[], float] = time.monotonic, tick_s: float = 0.5):
+        self.services: Dict[str, _ServiceState] = {s.name: _ServiceState(s) for s in specs}
+        self.preload_modules = list(preload)
+        self.preload_report: Dict = {}
+        self.clock = clock
+        self.tick_s = tick_s
+        self._by_pid: Dict[int, str] = {}
+        self._shutdown = False
+
+    # -- preload ----------------------------------------------------------
+    def preload(self) -> Dict:
+        """Import the shared core and freeze it so children share the pages."""
+        try:
+            from aureon_baton_link import set_fast_start
+            set_fast_start(True)
+        except Exception:
+            pass
+        start = time.perf_counter()
+        before = len(sys.modules)
+        loaded, failed = [], {}
+        for name in self.preload_modules:
+            try:
+                importlib.import_module(name)
+                loaded.append(name)
+            except Exception as e:
+                failed[name] = f"{type(e).__name__}: {e}"
+        gc.collect()
+        if hasattr(gc, "freeze"):
+            gc.freeze()
+        threads = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+        if threads:
+            logger.warning("Fork server preloaded with %d live thread(s) %s; they will not exist in "
+                           "forked services", len(threads), threads)
+        self.preload_report = {
+            "loaded": loaded,
+            "failed": failed,
+            "modules": len(sys.modules),
+            "new_modules": len(sys.modules) - before,
+            "threads": threads,
+            "seconds": time.perf_counter() - start,
+        }
+        return self.preload_report
+
+    # -- lifecycle --------------------------------------------------------
+    def start_all(self):
+        for svc in sorted(self.services.values(), key=lambda s: (s.spec.priority, s.spec.name)):
+            if svc.spec.autostart:
+                self._spawn(svc)
+
+    def start(self, name: str):
+        svc = self.services[name]
+        if svc.pid is None:
+            svc.backoff = 0
+            self._spawn(svc)
+
+    def stop(self, name: str):
+        svc = self.services[name]
+        if svc.pid is None:
+            if svc.state in (BACKOFF, EXITED):
+                svc.state = STOPPED
+            return
+        svc.state = STOPPING
+        svc.stop_deadline = self.clock() + svc.spec.stopwaitsecs
+        self._signal(svc, svc.spec.stop_signum, svc.spec.stopasgroup)
+
+    def restart(self, name: str):
+        self.stop(name)
+        self.wait_stopped([name])
+        self.start(name)
+
+    def shutdown(self, timeout_s: Optional[float] = None):
+        """Stop every service in reverse priority order and reap them."""
+        self._shutdown = True
+        for svc in sorted(self.services.values(), key=lambda s: (s.spec.priority, s.spec.name), reverse=True):
+            self.stop(svc.spec.name)
+        self.wait_stopped(timeout_s=timeout_s)
+
+    def wait_stopped(self, names: Optional[Sequence[str]] = None, timeout_s: Optional[float] = None):
+        names = list(names or self.services)
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while any(self.services[n].pid is not None for n in names):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            self.poll()
+            time.sleep(0.05)
+
+    def run(self, duration_s: float = 0.0, status_file: Optional[str] = None,
+            memory_report_every_s: float = 0.0):
+        """Supervise until SIGTERM/SIGINT (or duration_s elapses)."""
+        def _stop(signum, frame):  # noqa: ARG001
+            self._shutdown = True
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        self.start_all()
+        end = time.monotonic() + duration_s if duration_s else None
+        last_report = time.monotonic()
+        while not self._shutdown and (end is None or time.monotonic() < end):
+            self.poll()
+            if status_file:
+                self.write_status(status_file)
+            if memory_report_every_s and time.monotonic() - last_report >= memory_report_every_s:
+                last_report = time.monotonic()
+                print(format_memory_report(self.memory_report()), flush=True)
+            time.sleep(self.tick_s)
+        self.shutdown()
+        if status_file:
+            self.write_status(status_file)
+
+    # -- supervision ------------------------------------------------------
+    def poll(self):
+        """One supervision pass: reap exits, promote, back off, restart, kill."""
+        while self._by_pid:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            name = self._by_pid.pop(pid, None)
+            if name is not None:
+                self._on_exit(self.services[name], os.waitstatus_to_exitcode(status))
+
+        now = self.clock()
+        for svc in self.services.values():
+            spec = svc.spec
+            if svc.state == STARTING and now - svc.started_at >= spec.startsecs:
+                svc.state = RUNNING
+                svc.backoff = 0
+            elif svc.state == BACKOFF and now >= svc.next_start_at and not self._shutdown:
+                self._spawn(svc)
+            elif svc.state == STOPPING and svc.pid is not None and now >= svc.stop_deadline:
+                self._signal(svc, signal.SIGKILL, spec.killasgroup)
+                svc.stop_deadline = now + spec.stopwaitsecs
+
+    def _on_exit(self, svc: _ServiceState, code: int):
+        spec = svc.spec
+        now = self.clock()
+        svc.pid = None
+        svc.last_exit = code
+        if svc.state == STOPPING or self._shutdown:
+            svc.state = STOPPED
+            return
+        if svc.state == STARTING and now - svc.started_at < spec.startsecs:
+            svc.backoff += 1
+            if svc.backoff > spec.startretries:
+                svc.state = FATAL
+                logger.error("%s: exited too quickly %d times, giving up (FATAL)", spec.name, svc.backoff)
+            else:
+                svc.state = BACKOFF
+                svc.next_start_at = now + svc.backoff
+            return
+        svc.state = EXITED
+        expected = code in spec.exitcodes
+        if spec.autorestart == "true" or (spec.autorestart == "unexpected" and not expected):
+            self._spawn(svc)
+
+    def _signal(self, svc: _ServiceState, signum: int, group: bool):
+        if svc.pid is None:
+            return
+        try:
+            if group:
+                os.killpg(svc.pid, signum)
+            else:
+                os.kill(svc.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _spawn(self, svc: _ServiceState):
+        spec = svc.spec
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            pid = os.fork()
+        except OSError as e:
+            svc.last_error = str(e)
+            svc.state = BACKOFF
+            svc.backoff += 1
+            svc.next_start_at = self.clock() + svc.backoff
+            return
+        if pid == 0:
+            _child_main(spec)       # never returns
+        svc.pid = pid
+        svc.state = STARTING
+        svc.started_at = self.clock()
+        svc.spawns += 1
+        self._by_pid[pid] = spec.name
+
+    # -- reporting --------------------------------------------------------
+    def status(self) -> Dict[str, Dict]:
+        now = self.clock()
+        return {
+            name: {
+                "state": svc.state,
+                "pid": svc.pid,
+                "uptime_s": round(now - svc.started_at, 1) if svc.pid else 0.0,
+                "spawns": svc.spawns,
+                "backoff": svc.backoff,
+                "last_exit": svc.last_exit,
+                "forked": svc.spec.forkable,
+            }
+            for name, svc in self.services.items()
+        }
+
+    def healthy(self) -> bool:
+        """Every autostart service is STARTING or RUNNING."""
+        return all(svc.state in (STARTING, RUNNING)
+                   for svc in self.services.values() if svc.spec.autostart)
+
+    def write_status(self, path: str):
+        payload = {"ts": time.time(), "pid": os.getpid(), "healthy": self.healthy(),
+                   "preload": self.preload_report, "services": self.status()}
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2)
+        os.replace(tmp, path)
+
+    def memory_report(self) -> Dict:
+        """Shared vs private memory for the server and every live service."""
+        rows = {}
+        server = memory_stats(os.getpid())
+        if server:
+            rows["(fork server)"] = dict(server, pid=os.getpid())
+        for name, svc in self.services.items():
+            if svc.pid is None:
+                continue
+            stats = memory_stats(svc.pid)
+            if stats:
+                rows[name] = dict(stats, pid=svc.pid)
+        totals = {key: sum(r[key] for r in rows.values())
+                  for key in ("rss_kb", "pss_kb", "shared_kb", "private_kb", "swap_kb")}
+        totals["processes"] = len(rows)
+        return {"services": rows, "totals": totals}
+
+
+def _child_main(spec: ServiceSpec):
+    """Runs in the forked child: set up the service's process and run it."""
+    code = 1
+    try:
+        os.setpgrp()
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        if spec.directory:
+            os.chdir(spec.directory)
+        _redirect_output(spec)
+
+        os.environ.update(spec.environment)
+        mode = spec.environment.get("AUREON_BATON_MODE", _INHERITED_BATON_MODE)
+        if mode is None:
+            os.environ.pop("AUREON_BATON_MODE", None)
+        else:
+            os.environ["AUREON_BATON_MODE"] = mode
+
+        import random
+        random.seed()
+        if "numpy" in sys.modules:
+            sys.modules["numpy"].random.seed()
+
+        if not spec.forkable:
+            os.execvpe(spec.command[0], spec.command, os.environ)
+
+        try:
+            from aureon_baton_link import bootstrap_runtime, set_fast_start
+            if (mode or "full").lower() != "fast":
+                set_fast_start(False)
+                bootstrap_runtime(spec.name)
+        except Exception:
+            pass
+
+        argv = spec.command[1:]
+        if argv[0] == "-m":
+            sys.argv = [argv[1]] + argv[2:]
+            runpy.run_module(argv[1], run_name="__main__", alter_sys=True)
+        else:
+            script = os.path.abspath(argv[0])
+            sys.argv = [script] + argv[1:]
+            sys.path[0] = os.path.dirname(script)
+            runpy.run_path(script, run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+        os._exit(code)
+
+
+def _redirect_output(spec: ServiceSpec):
+    def _open(path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    if spec.stdout_logfile and spec.stdout_logfile.upper() != "NONE":
+        fd = _open(spec.stdout_logfile)
+        os.dup2(fd, 1)
+        if spec.redirect_stderr:
+            os.dup2(fd, 2)
+        os.close(fd)
+    if not spec.redirect_stderr and spec.stderr_logfile and spec.stderr_logfile.upper() != "NONE":
+        fd = _open(spec.stderr_logfile)
+        os.dup2(fd, 2)
+        os.close(fd)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Aureon preloading fork server (supervisord config compatible)")
+    parser.add_argument("-c", "--config", default=DEFAULT_CONFIG, help="supervisord config to read")
+    parser.add_argument("--app-dir", help=f"Replace {IMAGE_APP_DIR} in commands/directories")
+    parser.add_argument("--log-dir", help=f"Replace {IMAGE_LOG_DIR} in log paths")
+    parser.add_argument("--only", help="Comma-separated program names to run")
+    parser.add_argument("--preload", default=os.getenv("AUREON_PRELOAD", ",".join(DEFAULT_PRELOAD)),
+                        help="Comma-separated modules to import before forking")
+    parser.add_argument("--status-file", help="Write service status JSON here every tick")
+    parser.add_argument("--memory-report-every", type=float, default=0.0, metavar="SECONDS",
+                        help="Print the shared/private memory report periodically")
+    parser.add_argument("--duration", type=float, default=0.0, help="Stop after N seconds (0 = forever)")
+    parser.add_argument("--list", action="store_true", help="Print the parsed services and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    remap = {}
+    if args.app_dir:
+        remap[IMAGE_APP_DIR] = os.path.abspath(args.app_dir)
+    if args.log_dir:
+        remap[IMAGE_LOG_DIR] = os.path.abspath(args.log_dir)
+    specs = load_supervisor_config(args.config, remap=remap)
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",") if n.strip()}
+        specs = [s for s in specs if s.name in wanted]
+
+    if args.list:
+        for s in specs:
+            mode = "fork" if s.forkable else "exec"
+            print(f"{s.priority:>4}  {s.name:<32} {mode}  {' '.join(s.command)}")
+        return 0
+
+    server = ForkServer(specs, preload=[m.strip() for m in args.preload.split(",") if m.strip()])
+    report = server.preload()
+    logger.info("Preloaded %d modules (%d new) in %.1fs; failed: %s", len(report["loaded"]),
+                report["new_modules"], report["seconds"], report["failed"] or "none")
+    server.run(duration_s=args.duration, status_file=args.status_file,
+               memory_report_every_s=args.memory_report_every)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
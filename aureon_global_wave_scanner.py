@@ -67,6 +67,15 @@ try:
 except ImportError:
     THOUGHT_BUS_AVAILABLE = False
 
+# 🕯️ SHARED CANDLE STREAM - WS-built candles before REST klines
+CANDLE_STREAM_AVAILABLE = False
+get_candle_stream = None
+try:
+    from candle_stream import get_candle_stream, stream_key
+    CANDLE_STREAM_AVAILABLE = True
+except ImportError:
+    CANDLE_STREAM_AVAILABLE = False
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 💸 THE GOAL - MICRO-MOMENTUM COST THRESHOLDS (WE CANNOT BLEED!)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -961,7 +970,16 @@ class GlobalWaveScanner:
         interval: str = '1m',
         limit: int = 30
     ) -> List[Dict]:
-        """Fetch recent candles from exchange."""
+        """Fetch recent candles from exchange (shared WS candle stream first)."""
+        if CANDLE_STREAM_AVAILABLE:
+            try:
+                from unified_ws_feed import normalize_symbol
+                stream = get_candle_stream()
+                key = stream_key(normalize_symbol(symbol.replace('/', ''), exchange), exchange)
+                if stream.count(key, interval) >= limit:
+                    return stream.candles(key, interval, limit)
+            except Exception as e:
+                logger.debug(f"Candle stream lookup error: {e}")
         try:
             if exchange == 'kraken' and self.kraken:
                 ohlc = self.kraken.get_ohlc(symbol, interval=1)  # 1 minute
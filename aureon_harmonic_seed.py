@@ -34,6 +34,9 @@ from dataclasses import dataclass, field, asdict
 from collections import deque
 import numpy as np
 
+from candle_stream import CandleStream
+import harmonic_batch
+
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════════════════════════════════# 👑💰 QUEEN'S SACRED 1.88% LAW - SOURCE LAW DIRECT! 💰👑
@@ -61,6 +64,7 @@ SEED_DAYS = 7
 CANDLE_INTERVAL_HOURS = 1  # 1-hour candles
 CANDLES_PER_DAY = 24
 SEED_CANDLE_COUNT = SEED_DAYS * CANDLES_PER_DAY  # 168 candles
+SEED_CACHE_MAX_AGE = 6 * 3600  # Seed cache valid for 6 hours
 
 
 @dataclass
@@ -133,6 +137,9 @@ class HarmonicSeedLoader:
     def __init__(self, cache_dir: str = "harmonic_cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.seed_file = self.cache_dir / "harmonic_seed.npz"
+        self.seed_meta_file = self.cache_dir / "harmonic_seed_meta.json"
+        self.legacy_seed_file = self.cache_dir / "harmonic_seed.pkl"
         self.state = GlobalHarmonicState()
         self._exchange_clients = {}
         
@@ -373,6 +380,10 @@ class HarmonicSeedLoader:
         min_len = min(len(s1), len(s2))
         s1, s2 = s1[:min_len], s2[:min_len]
         
+        # A flat series has no correlation (corrcoef would divide by zero)
+        if np.ptp(s1) == 0 or np.ptp(s2) == 0:
+            return 0.0
+        
         # Correlation as coherence proxy
         coherence = np.corrcoef(s1, s2)[0, 1]
         
@@ -384,50 +395,58 @@ class HarmonicSeedLoader:
     
     def build_wave_state(self, symbol: str, candles: List[Dict]) -> Optional[SymbolWaveState]:
         """Build wave state from OHLCV candles"""
-        if len(candles) < 10:
-            return None
-        
-        # Extract price and volume series
-        prices = np.array([c['close'] for c in candles])
-        volumes = np.array([c['volume'] for c in candles])
-        
-        # Calculate wave properties
-        phase_array, amplitude_array = self._hilbert_transform(prices)
-        dominant_freq = self._dominant_frequency(prices)
-        
-        # Current values (latest)
-        current_phase = float(phase_array[-1])
-        current_amplitude = float(np.std(prices) / (np.mean(prices) + 1e-8))  # Normalized volatility
-        
-        # Velocity (rate of price change)
-        velocity = float((prices[-1] - prices[-2]) / (prices[-2] + 1e-8)) if len(prices) > 1 else 0.0
-        
-        # Self-coherence (consistency of the wave pattern)
-        if len(prices) > 20:
-            half = len(prices) // 2
-            self_coherence = self._calculate_coherence(prices[:half], prices[half:])
-        else:
-            self_coherence = 0.5
-        
-        return SymbolWaveState(
-            symbol=symbol,
-            phase=current_phase,
-            amplitude=current_amplitude,
-            frequency=dominant_freq,
-            velocity=velocity,
-            coherence=self_coherence,
-            last_price=float(prices[-1]),
-            last_volume=float(volumes[-1]),
-            last_update=time.time(),
-            price_history=prices.tolist()[-SEED_CANDLE_COUNT:],  # Keep last 7 days
-            volume_history=volumes.tolist()[-SEED_CANDLE_COUNT:],
-            phase_history=phase_array.tolist()[-SEED_CANDLE_COUNT:]
-        )
+        return self.build_wave_states({symbol: candles}).get(symbol)
+    
+    def build_wave_states(self, symbol_candles: Dict[str, List[Dict]]) -> Dict[str, SymbolWaveState]:
+        """
+        Build wave states for many symbols at once.
+        Symbols with the same candle count are stacked into one price matrix
+        so phase, frequency and self-coherence come from one FFT per row.
+        """
+        by_length: Dict[int, List[str]] = {}
+        for symbol, candles in symbol_candles.items():
+            if len(candles) >= 10:
+                by_length.setdefault(len(candles), []).append(symbol)
+        
+        states = {}
+        now = time.time()
+        for n, symbols in by_length.items():
+            prices = np.array([[c['close'] for c in symbol_candles[s]] for s in symbols], dtype=np.float64)
+            volumes = np.array([[c['volume'] for c in symbol_candles[s]] for s in symbols], dtype=np.float64)
+            
+            phase, _, dominant = harmonic_batch.wave_spectra(prices)
+            amplitude = prices.std(axis=1) / (prices.mean(axis=1) + 1e-8)  # Normalized volatility
+            velocity = (prices[:, -1] - prices[:, -2]) / (prices[:, -2] + 1e-8)
+            
+            # Self-coherence (consistency of the wave pattern)
+            if n > 20:
+                half = n // 2
+                self_coherence = harmonic_batch.row_coherence(prices[:, :half], prices[:, half:2 * half])
+            else:
+                self_coherence = np.full(len(symbols), 0.5)
+            
+            for i, symbol in enumerate(symbols):
+                states[symbol] = SymbolWaveState(
+                    symbol=symbol,
+                    phase=float(phase[i, -1]),
+                    amplitude=float(amplitude[i]),
+                    frequency=float(dominant[i]),
+                    velocity=float(velocity[i]),
+                    coherence=float(self_coherence[i]),
+                    last_price=float(prices[i, -1]),
+                    last_volume=float(volumes[i, -1]),
+                    last_update=now,
+                    price_history=prices[i, -SEED_CANDLE_COUNT:].tolist(),  # Keep last 7 days
+                    volume_history=volumes[i, -SEED_CANDLE_COUNT:].tolist(),
+                    phase_history=phase[i, -SEED_CANDLE_COUNT:].tolist()
+                )
+        return states
     
     def build_coherence_matrix(self, states: Dict[str, SymbolWaveState], top_n: int = 50) -> Dict[str, Dict[str, float]]:
         """
         Build cross-symbol coherence matrix.
-        Limited to top_n symbols by volume to keep computation manageable.
+        Limited to top_n symbols by volume; all pairs come from one batched
+        Gram product over the stacked price histories.
         """
         # Sort by volume and take top N
         sorted_symbols = sorted(
@@ -436,22 +455,9 @@ class HarmonicSeedLoader:
             reverse=True
         )[:top_n]
         
-        matrix = {}
         symbols = [s[0] for s in sorted_symbols]
-        
-        for i, sym1 in enumerate(symbols):
-            matrix[sym1] = {}
-            state1 = states[sym1]
-            prices1 = np.array(state1.price_history)
-            
-            for sym2 in symbols[i+1:]:  # Upper triangle only
-                state2 = states[sym2]
-                prices2 = np.array(state2.price_history)
-                
-                coherence = self._calculate_coherence(prices1, prices2)
-                matrix[sym1][sym2] = coherence
-        
-        return matrix
+        matrix = harmonic_batch.coherence_matrix([states[s].price_history for s in symbols])
+        return harmonic_batch.upper_triangle_dict(symbols, matrix)
     
     def calculate_global_metrics(self, states: Dict[str, SymbolWaveState], coherence_matrix: Dict) -> Tuple[float, float, float, str]:
         """
@@ -489,35 +495,25 @@ class HarmonicSeedLoader:
         
         return float(global_phase), float(global_coherence), float(dominant_freq), regime
     
-    def load_seed(self, max_symbols: int = 200, force_refresh: bool = False) -> GlobalHarmonicState:
+    def load_seed(self, max_symbols: int = 200, force_refresh: bool = False,
+                  coherence_top_n: int = 50) -> GlobalHarmonicState:
         """
         Load the harmonic seed, either from cache or by fetching fresh data.
         
         Args:
             max_symbols: Maximum number of symbols to include (by volume)
             force_refresh: If True, ignore cache and fetch fresh
+            coherence_top_n: Symbols (by volume) in the coherence matrix
         
         Returns:
             GlobalHarmonicState ready for live growth
         """
-        cache_file = self.cache_dir / "harmonic_seed.pkl"
-        cache_meta = self.cache_dir / "harmonic_seed_meta.json"
-        
         # Check cache
-        if not force_refresh and cache_file.exists() and cache_meta.exists():
-            try:
-                with open(cache_meta, 'r') as f:
-                    meta = json.load(f)
-                
-                # Cache valid for 6 hours
-                cache_age = time.time() - meta.get('timestamp', 0)
-                if cache_age < 6 * 3600:
-                    logger.info(f"📦 Loading cached harmonic seed (age: {cache_age/3600:.1f}h)")
-                    with open(cache_file, 'rb') as f:
-                        self.state = pickle.load(f)
-                    return self.state
-            except Exception as e:
-                logger.warning(f"Cache load failed: {e}")
+        if not force_refresh:
+            cached = self.load_cached_seed()
+            if cached is not None:
+                self.state = cached
+                return self.state
         
         logger.info("🌱 Building fresh harmonic seed from 7-day history...")
         
@@ -547,10 +543,7 @@ class HarmonicSeedLoader:
         logger.info(f"📊 Fetched historical data for {len(symbol_candles)} symbols")
         
         # 3. Build wave states
-        for key, candles in symbol_candles.items():
-            state = self.build_wave_state(key, candles)
-            if state:
-                self.state.symbols[key] = state
+        self.state.symbols.update(self.build_wave_states(symbol_candles))
         
         logger.info(f"🌊 Built wave states for {len(self.state.symbols)} symbols")
         
@@ -565,7 +558,7 @@ class HarmonicSeedLoader:
             logger.info(f"📉 Filtered to top {max_symbols} by volume")
         
         # 5. Build coherence matrix
-        self.state.coherence_matrix = self.build_coherence_matrix(self.state.symbols)
+        self.state.coherence_matrix = self.build_coherence_matrix(self.state.symbols, top_n=coherence_top_n)
         logger.info(f"🔗 Built coherence matrix")
         
         # 6. Calculate global metrics
@@ -586,18 +579,7 @@ class HarmonicSeedLoader:
         self.state.candle_count = SEED_CANDLE_COUNT
         
         # 7. Cache the result
-        try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self.state, f)
-            with open(cache_meta, 'w') as f:
-                json.dump({
-                    'timestamp': time.time(),
-                    'symbols': len(self.state.symbols),
-                    'candles': SEED_CANDLE_COUNT
-                }, f)
-            logger.info(f"💾 Cached harmonic seed")
-        except Exception as e:
-            logger.warning(f"Failed to cache seed: {e}")
+        self.save_seed()
         
         logger.info(f"""
 ╔══════════════════════════════════════════════════════════════╗
@@ -615,6 +597,66 @@ class HarmonicSeedLoader:
         
         return self.state
     
+    def save_seed(self) -> bool:
+        """Write the current state as the versioned binary seed."""
+        try:
+            harmonic_batch.save_seed(self.seed_file, self.state, SEED_CANDLE_COUNT)
+            harmonic_batch.write_meta(self.seed_meta_file, {
+                'timestamp': time.time(),
+                'symbols': len(self.state.symbols),
+                'candles': SEED_CANDLE_COUNT,
+                'format': 'npz',
+                'version': harmonic_batch.SEED_FORMAT_VERSION,
+            })
+            logger.info(f"💾 Cached harmonic seed")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to cache seed: {e}")
+            return False
+    
+    def load_cached_seed(self, max_age: float = SEED_CACHE_MAX_AGE) -> Optional[GlobalHarmonicState]:
+        """
+        Fresh cached seed, or None. Reads the .npz seed; a fresh legacy
+        pickle seed is loaded once and rewritten as .npz.
+        """
+        if not self.seed_meta_file.exists():
+            return None
+        try:
+            with open(self.seed_meta_file, 'r') as f:
+                meta = json.load(f)
+            cache_age = time.time() - meta.get('timestamp', 0)
+            if cache_age >= max_age:
+                return None
+            
+            if meta.get('format') == 'npz' and self.seed_file.exists():
+                npz = harmonic_batch.open_seed(self.seed_file)
+                if npz is None:
+                    return None
+                with npz:
+                    globals_, waves, coherence = harmonic_batch.state_fields(npz)
+                state = GlobalHarmonicState(**globals_)
+                state.symbols = {w['symbol']: SymbolWaveState(**w) for w in waves}
+                state.coherence_matrix = coherence
+                logger.info(f"📦 Loading cached harmonic seed (age: {cache_age/3600:.1f}h)")
+                return state
+            
+            if self.legacy_seed_file.exists():
+                logger.info(f"📦 Loading legacy pickle seed (age: {cache_age/3600:.1f}h)")
+                with open(self.legacy_seed_file, 'rb') as f:
+                    state = pickle.load(f)
+                timestamp = meta.get('timestamp', time.time())
+                previous, self.state = self.state, state
+                if self.save_seed():
+                    # Keep the original age so the upgrade does not extend it
+                    meta = {**meta, 'format': 'npz', 'version': harmonic_batch.SEED_FORMAT_VERSION}
+                    meta['timestamp'] = timestamp
+                    harmonic_batch.write_meta(self.seed_meta_file, meta)
+                self.state = previous
+                return state
+        except Exception as e:
+            logger.warning(f"Cache load failed: {e}")
+        return None
+    
     def get_state(self) -> GlobalHarmonicState:
         """Get current state (load if needed)"""
         if not self.state.symbols:
@@ -634,59 +676,36 @@ class HarmonicGrowthEngine:
     
     def __init__(self, seed_state: GlobalHarmonicState):
         self.state = seed_state
-        self.tick_buffer: Dict[str, List[Tuple[float, float, float]]] = {}  # symbol -> [(ts, price, vol), ...]
+        # Running hourly OHLCV per symbol (no raw tick buffer)
+        self.candles = CandleStream(timeframes=('1h',), history=SEED_CANDLE_COUNT)
         self.last_candle_time: Dict[str, float] = {}
         
     def ingest_tick(self, symbol: str, price: float, volume: float, timestamp: float = None):
         """
-        Ingest a live price tick. Ticks are buffered and aggregated into candles.
+        Ingest a live price tick. Ticks are aggregated into hourly candles as they arrive.
         """
         if timestamp is None:
             timestamp = time.time()
         
-        # Buffer the tick
-        if symbol not in self.tick_buffer:
-            self.tick_buffer[symbol] = []
-        self.tick_buffer[symbol].append((timestamp, price, volume))
-        
-        # Check if we should form a new candle (hourly)
         hour_start = (timestamp // 3600) * 3600
-        last_candle = self.last_candle_time.get(symbol, 0)
-        
-        if hour_start > last_candle:
-            self._form_candle(symbol, hour_start)
+        for _, candle in self.candles.ingest(symbol, price, volume, timestamp):
+            # Only the hour just ended forms a candle; a bucket left behind by a gap is dropped
+            if candle.start == hour_start - 3600:
+                self._form_candle(symbol, hour_start, candle)
     
-    def _form_candle(self, symbol: str, candle_time: float):
-        """Form a candle from buffered ticks and update wave state"""
-        buffer = self.tick_buffer.get(symbol, [])
-        if not buffer:
-            return
-        
-        # Find ticks for the previous hour
-        prev_hour_start = candle_time - 3600
-        hour_ticks = [(t, p, v) for t, p, v in buffer if prev_hour_start <= t < candle_time]
-        
-        if not hour_ticks:
-            return
-        
-        # Form OHLCV
-        prices = [p for _, p, _ in hour_ticks]
-        volumes = [v for _, _, v in hour_ticks]
-        
+    def _form_candle(self, symbol: str, candle_time: float, bar):
+        """Update wave state from a closed hourly candle"""
         candle = {
             'timestamp': candle_time,
-            'open': prices[0],
-            'high': max(prices),
-            'low': min(prices),
-            'close': prices[-1],
-            'volume': sum(volumes)
+            'open': bar.open,
+            'high': bar.high,
+            'low': bar.low,
+            'close': bar.close,
+            'volume': bar.volume
         }
         
         # Update wave state
         self._update_wave_state(symbol, candle)
-        
-        # Clear old ticks
-        self.tick_buffer[symbol] = [(t, p, v) for t, p, v in buffer if t >= candle_time]
         self.last_candle_time[symbol] = candle_time
     
     def _update_wave_state(self, symbol: str, candle: Dict):
@@ -731,17 +750,9 @@ class HarmonicGrowthEngine:
         
         # Recalculate phase periodically (every 6 candles)
         if len(prices) % 6 == 0 and len(prices) > 20:
-            from scipy.signal import hilbert as scipy_hilbert
-            try:
-                detrended = prices - np.mean(prices)
-                analytic = scipy_hilbert(detrended)
-                phase = np.angle(analytic[-1])
-                state.phase = float(phase)
-                state.phase_history.append(state.phase)
-            except ImportError:
-                # Fallback without scipy
-                state.phase = (state.phase + 0.1) % (2 * math.pi)
-                state.phase_history.append(state.phase)
+            phase, _, _ = harmonic_batch.wave_spectra(prices)
+            state.phase = float(phase[0, -1])
+            state.phase_history.append(state.phase)
         
         state.last_price = candle['close']
         state.last_volume = candle['volume']
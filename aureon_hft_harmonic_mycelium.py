@@ -25,7 +25,10 @@ import math
 import time
 import json
 import asyncio
+import heapq
+import bisect
 import logging
+import itertools
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -71,6 +74,10 @@ PROFIT_FREQUENCY_HZ = 188.0  # 👑 Queen's profit frequency!
 # HFT Performance Constants
 HFT_TICK_BUFFER_SIZE = 100_000  # ~1 second at 100K ticks/sec
 HFT_HOT_PATH_TTL_MS = 100       # Hot path cache TTL in milliseconds
+HFT_HOT_PATH_MAX_ENTRIES = 1000 # Hot path cache size before eviction
+HFT_HOT_PATH_EVICT_BATCH = 100  # Oldest entries dropped when full
+HFT_SYMBOL_RING_SIZE = 1024     # Per-symbol tick ring capacity
+HFT_TONE_WINDOW = 10            # Ticks per symbol used by the harmonic encoder
 HFT_SIGNAL_TIMEOUT_MS = 10      # Max time for signal processing
 HFT_ORDER_TIMEOUT_MS = 50       # Max time for order execution
 HFT_MAX_CONCURRENT_ORDERS = 10  # Max simultaneous orders
@@ -80,6 +87,10 @@ HFT_DAILY_LOSS_LIMIT_USD = -25.0 # Daily loss limit
 HFT_WIN_STREAK_RESET = 3        # Reset after 3 wins
 HFT_LOSS_STREAK_PAUSE = 3       # Pause after 3 losses
 
+# Latency histogram bucket upper bounds (ms) and pipeline stages
+LATENCY_BUCKETS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+LATENCY_STAGES = ('ingest', 'tone', 'decision', 'order', 'tick_to_decision', 'tick_to_order')
+
 # Auris Node Frequencies (Animal Spirit Guides)
 AURIS_FREQUENCIES = {
     'tiger': 186.0,      # Power - Volatility
@@ -158,6 +169,7 @@ class HFTSignal:
     position_size_usd: float
     harmonic_tone: HarmonicTone
     reasoning: List[str] = field(default_factory=list)
+    ingested_at: float = 0.0  # perf_counter() when the source tick arrived
 
     def to_dict(self) -> Dict:
         return {
@@ -233,6 +245,185 @@ class CachedDecision:
         }
 
 
+class SymbolTickRing:
+    """
+    Fixed-size NumPy ring of (timestamp, price, volume) for one symbol.
+    Append and windowed reads are O(1)/O(window) - nothing is copied.
+    """
+
+    __slots__ = ('capacity', 'data', 'head', 'count')
+
+    def __init__(self, capacity: int = HFT_SYMBOL_RING_SIZE):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, 3))
+        self.head = 0   # next write slot
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, price: float, volume: float) -> None:
+        row = self.data[self.head]
+        row[0] = timestamp
+        row[1] = price
+        row[2] = volume
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def window(self, n: int) -> Tuple[int, float, float, float, float, float]:
+        """
+        Summary of the newest n ticks:
+        (count, first_ts, first_price, last_ts, last_price, volume_sum).
+        """
+        n = min(n, self.count)
+        if n == 0:
+            return 0, 0.0, 0.0, 0.0, 0.0, 0.0
+        newest = (self.head - 1) % self.capacity
+        oldest = (self.head - n) % self.capacity
+        if oldest <= newest:
+            volume = float(self.data[oldest:newest + 1, 2].sum())
+        else:
+            volume = float(self.data[oldest:, 2].sum() + self.data[:newest + 1, 2].sum())
+        first, last = self.data[oldest], self.data[newest]
+        return n, float(first[0]), float(first[1]), float(last[0]), float(last[1]), volume
+
+    def tail(self, n: int) -> np.ndarray:
+        """Newest n rows, oldest first (a copy)."""
+        n = min(n, self.count)
+        idx = (np.arange(self.head - n, self.head)) % self.capacity
+        return self.data[idx]
+
+
+class HotPathCache:
+    """
+    TTL cache for hot-path decisions.
+
+    Deadlines live in a min-heap, so expiry pops only entries that are
+    actually due and eviction removes the oldest entries without sorting.
+    Superseded heap entries are skipped lazily and compacted when they
+    outnumber live ones.
+    """
+
+    def __init__(self, max_entries: int = HFT_HOT_PATH_MAX_ENTRIES,
+                 evict_batch: int = HFT_HOT_PATH_EVICT_BATCH, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.evict_batch = evict_batch
+        self.clock = clock
+        self._entries: Dict[Tuple, CachedDecision] = {}
+        self._heap: List[Tuple[float, int, Tuple, CachedDecision]] = []
+        self._seq = itertools.count()
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._entries
+
+    def get(self, key: Tuple) -> Optional[CachedDecision]:
+        """Live entry for key, or None (expired entries are purged)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (self.clock() - entry.cached_at) * 1000 > entry.ttl_ms:
+            self.expire()
+            return None
+        return entry
+
+    def put(self, key: Tuple, entry: CachedDecision) -> None:
+        self._entries[key] = entry
+        heapq.heappush(self._heap, (entry.cached_at + entry.ttl_ms / 1000.0, next(self._seq), key, entry))
+        if len(self._entries) > self.max_entries:
+            self._evict(self.evict_batch)
+        elif len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop every entry past its deadline. O(k log n) for k due entries."""
+        now = self.clock() if now is None else now
+        heap, removed = self._heap, 0
+        while heap and heap[0][0] < now:
+            _, _, key, entry = heapq.heappop(heap)
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+                removed += 1
+        self.expired += removed
+        return removed
+
+    def _evict(self, n: int) -> None:
+        """Remove the n entries with the earliest deadlines (oldest first)."""
+        heap = self._heap
+        while n > 0 and heap:
+            _, _, key, entry = heapq.heappop(heap)
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+                self.evicted += 1
+                n -= 1
+
+    def _compact(self) -> None:
+        self._heap = [item for item in self._heap if self._entries.get(item[2]) is item[3]]
+        heapq.heapify(self._heap)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._heap.clear()
+
+    def values(self) -> List[CachedDecision]:
+        return list(self._entries.values())
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (ms) - O(log buckets) per sample."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[idx], self.max_ms) if idx < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def within(self, budget_ms: float) -> float:
+        """Fraction of samples at or under budget_ms (exact when it is a bucket bound)."""
+        if not self.count:
+            return 1.0
+        idx = bisect.bisect_right(self.bounds, budget_ms)
+        return sum(self.counts[:idx]) / self.count
+
+    def to_dict(self) -> Dict:
+        buckets = {f"<={b:g}": n for b, n in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]:g}"] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'buckets': buckets,
+        }
+
+
 class HFTHarmonicEngine:
     """
     🦈🔪 HFT HARMONIC MYCELIUM ENGINE 🔪🦈
@@ -241,9 +432,9 @@ class HFTHarmonicEngine:
     Target latency: <10ms signal-to-order execution.
 
     ARCHITECTURE LAYERS:
-    L0: RAW FEED → Lock-free tick buffer (100K capacity)
+    L0: RAW FEED → Lock-free tick buffer (100K capacity) + per-symbol rings
     L1: HARMONIC ENCODER → Pre-computed pattern lookup table
-    L2: MYCELIUM FAST PATH → Hot path synapse cache (100ms TTL)
+    L2: MYCELIUM FAST PATH → Hot path synapse cache (100ms TTL, heap expiry)
     L3: ASYNC THOUGHT BUS → Zero-copy publish to handlers
     L4: ORDER ROUTER → WebSocket order submission
     """
@@ -254,6 +445,7 @@ class HFTHarmonicEngine:
 
         # L0: RAW FEED - Lock-free tick buffer
         self.tick_buffer: Deque[HFTTick] = deque(maxlen=HFT_TICK_BUFFER_SIZE)
+        self.symbol_rings: Dict[str, SymbolTickRing] = {}
         self.tick_count = 0
         self.last_tick_time = 0.0
 
@@ -262,7 +454,7 @@ class HFTHarmonicEngine:
         self.last_harmonic_tone: Optional[HarmonicTone] = None
 
         # L2: MYCELIUM FAST PATH - Hot path cache
-        self.hot_path_cache: Dict[str, CachedDecision] = {}
+        self.hot_path_cache = HotPathCache()
         self.cache_hits = 0
         self.cache_misses = 0
 
@@ -286,6 +478,7 @@ class HFTHarmonicEngine:
         # Performance tracking
         self.signal_latencies: Deque[float] = deque(maxlen=1000)
         self.order_latencies: Deque[float] = deque(maxlen=1000)
+        self.stage_latency: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
         self.start_time = time.time()
 
         # Integration flags
@@ -357,6 +550,7 @@ class HFTHarmonicEngine:
         if not self.enabled:
             return
 
+        ingested_at = time.perf_counter()
         tick = HFTTick(
             timestamp=tick_data.get('timestamp', time.time()),
             symbol=tick_data.get('symbol', 'UNKNOWN'),
@@ -367,20 +561,37 @@ class HFTHarmonicEngine:
             tick_id=tick_data.get('tick_id', '')
         )
 
-        # Lock-free append to deque
+        # Lock-free append to deque + this symbol's ring
         self.tick_buffer.append(tick)
+        self._ring_for(tick.symbol).append(tick.timestamp, tick.price, tick.volume)
         self.tick_count += 1
         self.last_tick_time = tick.timestamp
 
         # Process tick immediately if in EXECUTING mode
         if self.mode == "EXECUTING":
-            self.event_loop.create_task(self._process_tick_async(tick))
+            self.event_loop.create_task(self._process_tick_async(tick, ingested_at))
+
+    def _ring_for(self, symbol: str) -> SymbolTickRing:
+        ring = self.symbol_rings.get(symbol)
+        if ring is None:
+            ring = self.symbol_rings[symbol] = SymbolTickRing()
+        return ring
 
-    async def _process_tick_async(self, tick: HFTTick) -> None:
+    def _record_stage(self, stage: str, seconds: float) -> None:
+        self.stage_latency[stage].record(seconds * 1000.0)
+
+    async def _process_tick_async(self, tick: HFTTick, ingested_at: Optional[float] = None) -> None:
         """Async tick processing pipeline."""
         try:
+            started = time.perf_counter()
+            if ingested_at is None:
+                ingested_at = started
+            self._record_stage('ingest', started - ingested_at)
+
             # L1: Encode to harmonic tone
             harmonic_tone = await self._encode_harmonic_tone(tick)
+            toned = time.perf_counter()
+            self._record_stage('tone', toned - started)
             if harmonic_tone:
                 self.last_harmonic_tone = harmonic_tone
 
@@ -389,11 +600,16 @@ class HFTHarmonicEngine:
                 if cached_decision and not cached_decision.is_expired():
                     self.cache_hits += 1
                     # Execute cached decision
-                    await self._execute_cached_decision(cached_decision, tick)
+                    await self._execute_cached_decision(cached_decision, tick, ingested_at)
                 else:
                     self.cache_misses += 1
                     # Generate new signal via Mycelium
-                    await self._generate_signal_via_mycelium(tick, harmonic_tone)
+                    await self._generate_signal_via_mycelium(tick, harmonic_tone, ingested_at)
+
+                # Decision = cache lookup or pattern match through signal publish
+                decided = time.perf_counter()
+                self._record_stage('decision', decided - toned)
+                self._record_stage('tick_to_decision', decided - ingested_at)
 
         except Exception as e:
             logger.debug(f"Tick processing error: {e}")
@@ -408,19 +624,21 @@ class HFTHarmonicEngine:
         Uses price movement, volume, and market conditions.
         """
         try:
-            # Calculate price momentum (simplified)
-            recent_ticks = list(self.tick_buffer)[-10:]  # Last 10 ticks
-            if len(recent_ticks) < 2:
+            # Calculate price momentum over this symbol's last ticks
+            ring = self.symbol_rings.get(tick.symbol)
+            if ring is None:
+                return None
+            count, first_ts, first_price, last_ts, last_price, volume_sum = ring.window(HFT_TONE_WINDOW)
+            if count < 2:
                 return None
 
             # Price velocity (ticks per second)
-            time_span = recent_ticks[-1].timestamp - recent_ticks[0].timestamp
-            price_change = recent_ticks[-1].price - recent_ticks[0].price
+            time_span = last_ts - first_ts
+            price_change = last_price - first_price
             velocity = price_change / max(time_span, 0.001)
 
             # Volume intensity
-            volume_sum = sum(t.volume for t in recent_ticks)
-            volume_avg = volume_sum / len(recent_ticks)
+            volume_avg = volume_sum / count
 
             # Determine dominant frequency based on market conditions
             if velocity > 0.001:  # Strong upward momentum
@@ -467,23 +685,20 @@ class HFTHarmonicEngine:
 
     def _check_hot_path_cache(self, symbol: str, harmonic_tone: HarmonicTone) -> Optional[CachedDecision]:
         """Check if we have a cached decision for this harmonic pattern."""
-        cache_key = f"{symbol}:{harmonic_tone.frequency}:{harmonic_tone.auris_node}:{harmonic_tone.brainwave}"
+        cache_key = (symbol, harmonic_tone.frequency, harmonic_tone.auris_node, harmonic_tone.brainwave)
 
         cached = self.hot_path_cache.get(cache_key)
-        if cached and not cached.is_expired():
+        if cached is not None:
             return cached
 
-        # Clean expired entries
-        expired_keys = [k for k, v in self.hot_path_cache.items() if v.is_expired()]
-        for k in expired_keys:
-            del self.hot_path_cache[k]
-
+        # Pop only the entries that are due
+        self.hot_path_cache.expire()
         return None
 
     def _cache_decision(self, symbol: str, harmonic_tone: HarmonicTone,
                         action: str, confidence: float, position_size_usd: float) -> None:
         """Cache a decision for future instant lookup."""
-        cache_key = f"{symbol}:{harmonic_tone.frequency}:{harmonic_tone.auris_node}:{harmonic_tone.brainwave}"
+        cache_key = (symbol, harmonic_tone.frequency, harmonic_tone.auris_node, harmonic_tone.brainwave)
 
         cached = CachedDecision(
             symbol=symbol,
@@ -494,16 +709,11 @@ class HFTHarmonicEngine:
             cached_at=time.time()
         )
 
-        self.hot_path_cache[cache_key] = cached
-
-        # Limit cache size
-        if len(self.hot_path_cache) > 1000:
-            # Remove oldest entries
-            sorted_cache = sorted(self.hot_path_cache.items(), key=lambda x: x[1].cached_at)
-            for i in range(100):
-                del self.hot_path_cache[sorted_cache[i][0]]
+        # Size limit enforced by the cache - oldest entries leave first
+        self.hot_path_cache.put(cache_key, cached)
 
-    async def _generate_signal_via_mycelium(self, tick: HFTTick, harmonic_tone: HarmonicTone) -> None:
+    async def _generate_signal_via_mycelium(self, tick: HFTTick, harmonic_tone: HarmonicTone,
+                                            ingested_at: float = 0.0) -> None:
         """
         Generate trading signal via Mycelium neural network.
         This is the slower path when cache misses.
@@ -534,7 +744,8 @@ class HFTHarmonicEngine:
                     f"Harmonic pattern: {harmonic_tone.frequency}Hz + {harmonic_tone.auris_node} + {harmonic_tone.brainwave}",
                     f"Amplitude: {harmonic_tone.amplitude:.2f}",
                     f"Cache: MISS (generated via Mycelium)"
-                ]
+                ],
+                ingested_at=ingested_at
             )
 
             # Cache this decision for future use
@@ -550,7 +761,8 @@ class HFTHarmonicEngine:
         except Exception as e:
             logger.debug(f"Mycelium signal generation error: {e}")
 
-    async def _execute_cached_decision(self, cached: CachedDecision, tick: HFTTick) -> None:
+    async def _execute_cached_decision(self, cached: CachedDecision, tick: HFTTick,
+                                       ingested_at: float = 0.0) -> None:
         """Execute a cached decision instantly."""
         try:
             # Create signal from cached decision
@@ -573,7 +785,8 @@ class HFTHarmonicEngine:
                     f"Cached decision: {cached.action}",
                     f"Cache hit: {self.cache_hits}/{self.cache_hits + self.cache_misses}",
                     f"Latency: <1ms (hot path)"
-                ]
+                ],
+                ingested_at=ingested_at
             )
 
             # Publish signal immediately
@@ -710,6 +923,9 @@ class HFTHarmonicEngine:
 
                 # Track latency
                 self.order_latencies.append(order.latency_ms)
+                self.stage_latency['order'].record(order.latency_ms)
+                if signal.ingested_at:
+                    self._record_stage('tick_to_order', time.perf_counter() - signal.ingested_at)
 
                 logger.info(f"🦈💰 HFT ORDER SENT: {order.symbol} {order.side.upper()} ${order.quantity:.2f} "
                            f"(Latency: {order.latency_ms:.1f}ms)")
@@ -890,6 +1106,7 @@ class HFTHarmonicEngine:
             'loss_streak': self.loss_streak,
             'cache_size': len(self.hot_path_cache),
             'cache_hit_rate': cache_hit_rate,
+            'tracked_symbols': len(self.symbol_rings),
             'avg_signal_latency_ms': avg_signal_latency,
             'avg_order_latency_ms': avg_order_latency,
             'harmonic_patterns': len(self.harmonic_patterns),
@@ -928,7 +1145,15 @@ class HFTHarmonicEngine:
                 'hits': self.cache_hits,
                 'misses': self.cache_misses,
                 'hit_rate': self.cache_hits / max(self.cache_hits + self.cache_misses, 1),
-                'cache_size': len(self.hot_path_cache)
+                'cache_size': len(self.hot_path_cache),
+                'expired': self.hot_path_cache.expired,
+                'evicted': self.hot_path_cache.evicted
+            },
+            'latency_histograms': {stage: hist.to_dict() for stage, hist in self.stage_latency.items()},
+            'latency_budget': {
+                'budget_ms': HFT_SIGNAL_TIMEOUT_MS,
+                'tick_to_decision_within': self.stage_latency['tick_to_decision'].within(HFT_SIGNAL_TIMEOUT_MS),
+                'tick_to_decision_p99_ms': self.stage_latency['tick_to_decision'].percentile(99),
             },
             'risk_metrics': {
                 'daily_pnl': self.daily_pnl_usd,
@@ -1003,9 +1228,7 @@ class HFTHarmonicEngine:
         while True:
             try:
                 # Clean expired entries
-                expired_keys = [k for k, v in self.hot_path_cache.items() if v.is_expired()]
-                for k in expired_keys:
-                    del self.hot_path_cache[k]
+                self.hot_path_cache.expire()
 
                 await asyncio.sleep(1.0)  # Clean every second
 
@@ -34,12 +34,18 @@ import time
 import logging
 import requests
 import argparse
+import heapq
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 import threading
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -375,6 +381,189 @@ class HistoricalDataFetcher:
         return all_data
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 📐 COLUMNAR CANDLE STORE + VECTORISED SIGNAL KERNELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ColumnarCandles:
+    """
+    OHLCV for every symbol held as flat float64 columns.
+
+    Symbol s owns rows offsets[s]:offsets[s+1] (time-sorted).  `order` is
+    the global event order - the same stable timestamp sort the scalar loop
+    used - and `global_pos` its inverse.  `time_index` holds the unique
+    timestamps and `time_pos` maps each row onto it, so `aligned('close')`
+    gives a (symbols x time) matrix.
+    """
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume', 'ts')
+
+    def __init__(self, data: Dict[str, List[OHLCV]]):
+        self.symbols: List[str] = list(data.keys())
+        self.candles: List[List[OHLCV]] = [sorted(data[s], key=lambda x: x.timestamp) for s in self.symbols]
+        lengths = [len(c) for c in self.candles]
+        self.offsets = np.zeros(len(self.symbols) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        n = int(self.offsets[-1])
+
+        flat = [c for candles in self.candles for c in candles]
+        self.open = np.fromiter((c.open for c in flat), dtype=np.float64, count=n)
+        self.high = np.fromiter((c.high for c in flat), dtype=np.float64, count=n)
+        self.low = np.fromiter((c.low for c in flat), dtype=np.float64, count=n)
+        self.close = np.fromiter((c.close for c in flat), dtype=np.float64, count=n)
+        self.volume = np.fromiter((c.volume for c in flat), dtype=np.float64, count=n)
+        self.ts = np.fromiter((c.timestamp.timestamp() for c in flat), dtype=np.float64, count=n)
+        self.bar_symbol = np.repeat(np.arange(len(self.symbols), dtype=np.int64), lengths)
+
+        self.order = np.argsort(self.ts, kind='stable')
+        self.global_pos = np.empty(n, dtype=np.int64)
+        self.global_pos[self.order] = np.arange(n, dtype=np.int64)
+        self.time_index, self.time_pos = np.unique(self.ts, return_inverse=True)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def rows(self, s: int) -> slice:
+        return slice(int(self.offsets[s]), int(self.offsets[s + 1]))
+
+    def candle(self, row: int) -> OHLCV:
+        s = int(self.bar_symbol[row])
+        return self.candles[s][row - int(self.offsets[s])]
+
+    def history(self, row: int, length: int = 100) -> List[OHLCV]:
+        """Last `length` candles of the row's symbol, ending at the row."""
+        s = int(self.bar_symbol[row])
+        i = row - int(self.offsets[s])
+        return self.candles[s][max(0, i - length + 1):i + 1]
+
+    def aligned(self, field: str = 'close') -> 'np.ndarray':
+        """(symbols x time_index) matrix of a column, NaN where a symbol has no bar."""
+        out = np.full((len(self.symbols), len(self.time_index)), np.nan)
+        out[self.bar_symbol, self.time_pos] = getattr(self, field)
+        return out
+
+    def sim_arrays(self) -> Dict[str, 'np.ndarray']:
+        """Columns the event simulator needs (shared read-only in sweeps)."""
+        return {
+            'close': self.close,
+            'offsets': self.offsets,
+            'bar_symbol': self.bar_symbol,
+            'order': self.order,
+            'global_pos': self.global_pos,
+        }
+
+
+def _trailing_sum(x: 'np.ndarray', window: int, newest_first: bool = False) -> 'np.ndarray':
+    """
+    Rolling sum accumulated in the same order as the scalar code's sum()
+    (oldest -> newest, or newest -> oldest for the RSI change list), so
+    threshold comparisons agree bit-for-bit.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    m = n - window + 1
+    acc = np.zeros(m)
+    lags = range(window - 1, -1, -1) if not newest_first else range(window)
+    for lag in lags:
+        # lag 0 = the newest element of each window
+        acc = acc + x[window - 1 - lag:window - 1 - lag + m]
+    out[window - 1:] = acc
+    return out
+
+
+def _shift(x: 'np.ndarray', k: int) -> 'np.ndarray':
+    out = np.full(len(x), np.nan)
+    if k < len(x):
+        out[k:] = x[:len(x) - k]
+    return out
+
+
+def _buy_scores(o: 'np.ndarray', h: 'np.ndarray', l: 'np.ndarray', c: 'np.ndarray',
+                min_history: int = 100) -> 'np.ndarray':
+    """
+    Vectorised `_calculate_signal` scoring for one symbol's time-sorted bars.
+
+    Returns the V14 buy score per bar (before Obsidian modulation), or -1
+    where the scalar code would HOLD for lack of history.
+    """
+    n = len(c)
+    score = np.full(n, -1, dtype=np.int64)
+    if n < min_history:
+        return score
+
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sma_5 = _trailing_sum(c, 5) / 5
+        sma_10 = _trailing_sum(c, 10) / 10
+        sma_20 = _trailing_sum(c, 20) / 20
+
+        # RSI (14): the scalar code sums gains newest-first
+        d = np.full(n, np.nan)
+        d[1:] = c[1:] - c[:-1]
+        up = d > 0
+        down = d < 0
+        gain_sum = _trailing_sum(np.where(up, d, 0.0), 14, newest_first=True)
+        loss_sum = _trailing_sum(np.where(down, -d, 0.0), 14, newest_first=True)
+        gain_cnt = _trailing_sum(up.astype(np.float64), 14)
+        loss_cnt = _trailing_sum(down.astype(np.float64), 14)
+        avg_gain = np.where(gain_cnt > 0, gain_sum / 14, 0.001)
+        avg_loss = np.where(loss_cnt > 0, loss_sum / 14, 0.001)
+        rs = np.where(avg_loss > 0, avg_gain / avg_loss, 1)
+        rsi = 100 - (100 / (1 + rs))
+
+        # Price structure (20 bars)
+        recent_low = np.full(n, np.nan)
+        recent_high = np.full(n, np.nan)
+        recent_low[19:] = sliding_window_view(l, 20).min(axis=1)
+        recent_high[19:] = sliding_window_view(h, 20).max(axis=1)
+        wave_range = recent_high - recent_low
+        wave_position = np.where(wave_range > 0, (c - recent_low) / wave_range, 0.5)
+
+        # Candle anatomy
+        is_green = c > o
+        body = np.abs(c - o)
+        wick_up = h - np.maximum(o, c)
+        wick_down = np.minimum(o, c) - l
+        total_range = h - l
+        strong_body = np.where(total_range > 0, body / total_range > 0.6, False)
+        hammer = (wick_down > body * 2) & (wick_up < body * 0.5) & (wave_position < 0.2)
+
+        # Multi-candle patterns
+        o1, o2, o3 = _shift(o, 1), _shift(o, 2), _shift(o, 3)
+        c1, c3 = _shift(c, 1), _shift(c, 3)
+        c2 = _shift(c, 2)
+        l1, l2, l3 = _shift(l, 1), _shift(l, 2), _shift(l, 3)
+        three_higher_lows = (l > l1) & (l1 > l2)
+        four_higher_lows = three_higher_lows & (l2 > l3)
+        at_support = l <= recent_low * 1.005
+        prev_3_red = (c1 < o1) & (c2 < o2) & (c3 < o3)
+        reversal_confirmed = is_green & strong_body
+
+        momentum_1h = ((c - c1) / c1) * 100
+        momentum_3h = ((c - c3) / c3) * 100
+        momentum_turning = (momentum_1h > 0.3) & (momentum_3h < 0)
+        downtrend = (sma_5 < sma_10) & (sma_10 < sma_20)
+
+        s = np.zeros(n, dtype=np.int64)
+        s += np.select([rsi < 10, rsi < 20, rsi < 30], [3, 2, 1], 0)
+        s += np.where(at_support, 2, 0)
+        s += np.select([wave_position < 0.10, wave_position < 0.20, wave_position < 0.30], [3, 2, 1], 0)
+        s += np.select([four_higher_lows, three_higher_lows], [3, 2], 0)
+        s += np.select([prev_3_red & reversal_confirmed, prev_3_red & is_green], [2, 1], 0)
+        s += hammer
+        s += momentum_turning
+        s += np.select([(momentum_1h > 0.5) & (momentum_3h < -0.5), momentum_1h > 0.3], [2, 1], 0)
+        s += ~downtrend
+        s += (c < sma_20) & is_green
+        s += strong_body & is_green & (wave_position < 0.40)
+
+    score[min_history - 1:] = s[min_history - 1:]
+    return score
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🌊 BACKTEST ENGINE WITH HARMONIC FUSION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -879,13 +1068,143 @@ class AureonBacktestEngine:
         
         return signal
     
+    def _precompute_buy_confidence(self, cols: ColumnarCandles) -> 'np.ndarray':
+        """
+        BUY confidence for every bar (0.0 where `_calculate_signal` HOLDs).
+
+        Indicator scores are vectorised per symbol; the stateful Obsidian
+        filter is still fed bar by bar, in global order, exactly as the
+        scalar loop feeds it.
+        """
+        if not hasattr(self, 'verified_patterns'):
+            self.verified_patterns = set()
+            self.pattern_results = {}
+
+        score = np.empty(len(cols), dtype=np.int64)
+        for sym in range(len(cols.symbols)):
+            rows = cols.rows(sym)
+            score[rows] = _buy_scores(cols.open[rows], cols.high[rows], cols.low[rows], cols.close[rows])
+        eligible = score >= 0
+
+        clarity = np.ones(len(cols))
+        chaos = np.zeros(len(cols))
+        has_obsidian = np.zeros(len(cols), dtype=bool)
+        if self.use_obsidian and self.obsidian_filter:
+            for row in cols.order[eligible[cols.order]].tolist():
+                candle = cols.candle(row)
+                clean_symbol = candle.symbol.split(':')[-1] if ':' in candle.symbol else candle.symbol
+                try:
+                    volatility = abs(candle.high - candle.low) / candle.close if candle.close > 0 else 0.0
+                    sentiment = 0.5 + max(-0.5, min(0.5, candle.change_pct / 10.0))
+                    filtered = self.obsidian_filter.apply(clean_symbol, {
+                        'price': candle.close,
+                        'volume': candle.volume,
+                        'volatility': volatility,
+                        'sentiment': sentiment,
+                        'coherence': 0.5,
+                    })
+                    clarity[row] = float(filtered.get('obsidian_clarity', 1.0))
+                    chaos[row] = float(filtered.get('obsidian_chaos', 0.0))
+                    has_obsidian[row] = True
+                except Exception:
+                    pass
+            score = score + (has_obsidian & (clarity >= 1.2)) - (has_obsidian & (chaos >= 0.8))
+
+        buy = eligible & (score >= 8)
+        confidence = np.minimum(0.99, score / 15)
+        boost = np.maximum(0.75, np.minimum(1.25, 1 + (clarity - 1.0) * 0.1 - chaos * 0.2))
+        confidence = np.where(has_obsidian, np.minimum(0.99, confidence * boost), confidence)
+        return np.where(buy, confidence, 0.0)
+
     def run_backtest(self, data: Dict[str, List[OHLCV]], 
                      max_positions: int = 10,
-                     position_size_pct: float = 0.1) -> Dict:
+                     position_size_pct: float = 0.1,
+                     vectorised: bool = True) -> Dict:
         """
         Run the backtest on historical data
         V12: ZERO LOSS MODE - Extreme selectivity for 100% win rate
+
+        vectorised=True runs the columnar core: indicators are precomputed
+        for every bar and the event loop only visits bars where a BUY fires,
+        a position exits, or the equity curve is sampled.  vectorised=False
+        runs the original candle-by-candle loop (reference implementation).
         """
+        self._print_header(data, max_positions, position_size_pct)
+        if not vectorised:
+            return self._run_backtest_scalar(data, max_positions, position_size_pct)
+
+        print("\n📊 Building columnar store...")
+        start_time = time.time()
+        cols = ColumnarCandles(data)
+        buy_conf = self._precompute_buy_confidence(cols)
+        print(f"   {len(cols):,} candles | {len(cols.symbols)} symbols | "
+              f"{int(np.count_nonzero(buy_conf)):,} signal bars | {time.time() - start_time:.2f}s")
+
+        sim = simulate_backtest(
+            cols.sim_arrays(), buy_conf,
+            max_positions=max_positions,
+            position_size_pct=position_size_pct,
+            starting_capital=self.capital,
+            fee_rate=self.FEE_RATE,
+        )
+        self._apply_simulation(cols, sim)
+
+        open_value = 0.0
+        for sym, (entry_row, entry_price, quantity) in sim['open_positions'].items():
+            last_close = cols.close[int(cols.offsets[sym + 1]) - 1]
+            open_value += (last_close - entry_price) * quantity
+        return self._finish_backtest(len(cols), start_time, len(sim['open_positions']), open_value)
+
+    def _apply_simulation(self, cols: ColumnarCandles, sim: Dict) -> None:
+        """Replay simulated fills into trades, metrics and the adaptive learner."""
+        for sym, entry_row, exit_row, entry_price, exit_price, quantity, net_pnl, pnl_pct, fees in sim['trades']:
+            key = cols.symbols[sym]
+            parts = key.split(':')
+            exchange = parts[0] if len(parts) > 1 else 'unknown'
+            clean_symbol = parts[1] if len(parts) > 1 else key
+            exit_candle = cols.candle(exit_row)
+
+            self.trades.append(BacktestTrade(
+                symbol=clean_symbol,
+                exchange=exchange,
+                entry_price=entry_price,
+                exit_price=exit_price,
+                quantity=quantity,
+                entry_time=cols.candle(entry_row).timestamp,
+                exit_time=exit_candle.timestamp,
+                pnl=net_pnl,
+                pnl_pct=pnl_pct,
+                fees=fees,
+                reason=f"✅ IRA Profit: {pnl_pct:.2f}% (>{sim['take_profit_pct']:g}%)"
+            ))
+            self.metrics['total_trades'] += 1
+            self.metrics['total_pnl'] += net_pnl
+            self.metrics['sell_signals'] += 1
+            was_win = net_pnl > 0
+            if was_win:
+                self.metrics['winning_trades'] += 1
+                self.symbol_performance[clean_symbol]['wins'] += 1
+            else:
+                self.metrics['losing_trades'] += 1
+                self.symbol_performance[clean_symbol]['losses'] += 1
+            self.symbol_performance[clean_symbol]['trades'] += 1
+            self.symbol_performance[clean_symbol]['total_pnl'] += net_pnl
+
+            # V11: LEARN FROM THIS TRADE (history as it stood at entry)
+            self._learn_from_trade(clean_symbol, exit_candle, cols.history(entry_row), was_win, pnl_pct)
+            self.tradeable_sell.add(clean_symbol)
+
+        for row in sim['entries']:
+            key = cols.symbols[int(cols.bar_symbol[row])]
+            self.tradeable_buy.add(key.split(':')[1] if ':' in key else key)
+
+        self.capital = sim['capital']
+        self.metrics['buy_signals'] += len(sim['entries'])
+        self.metrics['peak_equity'] = max(self.metrics['peak_equity'], sim['peak_equity'])
+        self.metrics['max_drawdown'] = max(self.metrics['max_drawdown'], sim['max_drawdown'])
+        self.equity_curve.extend((cols.candle(int(cols.order[k])).timestamp, equity) for k, equity in sim['equity'])
+
+    def _print_header(self, data: Dict[str, List[OHLCV]], max_positions: int, position_size_pct: float) -> None:
         print("\n" + "═" * 80)
         print("🚀 AUREON HISTORICAL BACKTEST V14 - IRA ZERO LOSS + MORE TRADES")
         print("═" * 80)
@@ -895,7 +1214,11 @@ class AureonBacktestEngine:
         print(f"   Symbols: {len(data)}")
         print("   Strategy: Score 8+ entry, hold until 1.52%+ profit")
         print("═" * 80)
-        
+
+    def _run_backtest_scalar(self, data: Dict[str, List[OHLCV]],
+                             max_positions: int = 10,
+                             position_size_pct: float = 0.1) -> Dict:
+        """Original candle-by-candle loop - kept as the reference implementation."""
         # Build unified timeline
         print("\n📊 Building timeline...")
         
@@ -1092,6 +1415,9 @@ class AureonBacktestEngine:
                 last_candle = symbol_history[symbol][-1]
                 open_value += (last_candle.close - pos.entry_price) * pos.quantity
         
+        return self._finish_backtest(len(all_candles), start_time, open_positions, open_value)
+
+    def _finish_backtest(self, n_candles: int, start_time: float, open_positions: int, open_value: float) -> Dict:
         if open_positions > 0:
             print(f"\n   ⏳ {open_positions} positions still held (not counted in stats)")
             print(f"      Unrealized P&L: ${open_value:+,.2f}")
@@ -1108,7 +1434,7 @@ class AureonBacktestEngine:
         print("📊 BACKTEST RESULTS")
         print("═" * 80)
         print(f"   Duration: {elapsed:.1f} seconds")
-        print(f"   Candles Processed: {len(all_candles):,}")
+        print(f"   Candles Processed: {n_candles:,}")
         print("─" * 80)
         print(f"   Starting Capital: ${self.starting_capital:,.2f}")
         print(f"   Final Capital:    ${self.capital:,.2f}")
@@ -1182,6 +1508,208 @@ class AureonBacktestEngine:
         return data
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# ⚡ EVENT-DRIVEN SIMULATOR + PARALLEL PARAMETER SWEEP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _first_take_profit(close: 'np.ndarray', start: int, end: int, entry_price: float,
+                       take_profit_pct: float) -> int:
+    """First row in [start, end) whose close clears the take-profit, else -1."""
+    step = 64
+    while start < end:
+        stop = min(end, start + step)
+        seg = close[start:stop]
+        hit = ((seg - entry_price) / entry_price) * 100 >= take_profit_pct
+        if hit.any():
+            return start + int(hit.argmax())
+        start = stop
+        step *= 4
+    return -1
+
+
+def simulate_backtest(arrays: Dict[str, 'np.ndarray'], buy_conf: 'np.ndarray',
+                      max_positions: int = 10,
+                      position_size_pct: float = 0.1,
+                      min_confidence: float = 0.6,
+                      take_profit_pct: float = 1.52,
+                      starting_capital: float = 10000.0,
+                      fee_rate: float = AureonBacktestEngine.FEE_RATE,
+                      equity_every: int = 100) -> Dict[str, Any]:
+    """
+    Replay the V14 entry/exit rules over precomputed signals.
+
+    Only three kinds of global positions are visited: bars whose BUY
+    confidence clears `min_confidence`, the take-profit bar of each open
+    position (found with a vectorised forward scan at entry), and every
+    `equity_every`-th bar for the equity curve.  With the scalar loop's
+    rules (take-profit only, no stop) this reproduces it exactly.
+
+    `arrays` holds ColumnarCandles.sim_arrays() - plain ndarrays or
+    read-only memmaps - so workers can run it without OHLCV objects.
+    """
+    close = arrays['close']
+    offsets = arrays['offsets']
+    bar_symbol = arrays['bar_symbol']
+    order = arrays['order']
+    global_pos = arrays['global_pos']
+    n = len(order)
+
+    signal_k = np.sort(global_pos[np.flatnonzero(buy_conf >= min_confidence)]).tolist()
+    exits: List[Tuple[int, int]] = []   # heap of (global position, symbol)
+    positions: Dict[int, Tuple[int, float, float]] = {}  # symbol -> (entry row, price, qty)
+
+    capital = starting_capital
+    peak = starting_capital
+    max_drawdown = 0.0
+    trades: List[Tuple] = []
+    entries: List[int] = []
+    equity: List[Tuple[int, float]] = []
+
+    si = 0
+    next_equity = 0
+    while True:
+        k = n
+        if si < len(signal_k):
+            k = signal_k[si]
+        if exits and exits[0][0] < k:
+            k = exits[0][0]
+        if next_equity < k:
+            k = next_equity
+        if k >= n:
+            break
+
+        # 1. Exit check for this bar's symbol
+        if exits and exits[0][0] == k:
+            _, sym = heapq.heappop(exits)
+            entry_row, entry_price, quantity = positions.pop(sym)
+            row = int(order[k])
+            exit_price = float(close[row])
+            pnl_pct = ((exit_price - entry_price) / entry_price) * 100
+            gross_pnl = (exit_price - entry_price) * quantity
+            fees = (entry_price * quantity + exit_price * quantity) * fee_rate
+            net_pnl = gross_pnl - fees
+            capital += net_pnl
+            trades.append((sym, entry_row, row, entry_price, exit_price, quantity, net_pnl, pnl_pct, fees))
+
+        # 2. Signal-based entry
+        if si < len(signal_k) and signal_k[si] == k:
+            si += 1
+            row = int(order[k])
+            sym = int(bar_symbol[row])
+            if len(positions) < max_positions and sym not in positions:
+                position_value = capital * position_size_pct
+                if position_value > 10:  # Min $10 position
+                    entry_price = float(close[row])
+                    quantity = position_value / entry_price
+                    positions[sym] = (row, entry_price, quantity)
+                    entries.append(row)
+                    exit_row = _first_take_profit(close, row + 1, int(offsets[sym + 1]), entry_price, take_profit_pct)
+                    if exit_row >= 0:
+                        heapq.heappush(exits, (int(global_pos[exit_row]), sym))
+
+        # 3. Equity curve sample
+        if k == next_equity:
+            next_equity += equity_every
+            total_equity = capital
+            for sym, (entry_row, entry_price, quantity) in positions.items():
+                lo, hi = int(offsets[sym]), int(offsets[sym + 1])
+                last = lo + int(np.searchsorted(global_pos[lo:hi], k, side='right')) - 1
+                total_equity += (float(close[last]) - entry_price) * quantity
+            equity.append((k, total_equity))
+            if total_equity > peak:
+                peak = total_equity
+            drawdown = (peak - total_equity) / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+
+    return {
+        'capital': capital,
+        'trades': trades,
+        'entries': entries,
+        'equity': equity,
+        'open_positions': positions,
+        'peak_equity': peak,
+        'max_drawdown': max_drawdown,
+        'take_profit_pct': take_profit_pct,
+    }
+
+
+# Per-worker view of the shared candle/signal arrays (set by _sweep_init)
+_SWEEP_ARRAYS: Optional[Dict[str, 'np.ndarray']] = None
+
+
+def _sweep_init(paths: Dict[str, str]) -> None:
+    global _SWEEP_ARRAYS
+    _SWEEP_ARRAYS = {name: np.load(path, mmap_mode='r') for name, path in paths.items()}
+
+
+def _sweep_run(params: Dict[str, Any]) -> Dict[str, Any]:
+    arrays = _SWEEP_ARRAYS
+    sim = simulate_backtest(arrays, arrays['buy_conf'], **params)
+    wins = sum(1 for t in sim['trades'] if t[6] > 0)
+    starting = params.get('starting_capital', 10000.0)
+    return {
+        'params': params,
+        'final_capital': sim['capital'],
+        'total_return': (sim['capital'] - starting) / starting * 100,
+        'trades': len(sim['trades']),
+        'win_rate': wins / len(sim['trades']) * 100 if sim['trades'] else 0.0,
+        'max_drawdown': sim['max_drawdown'],
+        'open_positions': len(sim['open_positions']),
+    }
+
+
+def run_parameter_sweep(data: Dict[str, List[OHLCV]],
+                        grid: Dict[str, List[Any]],
+                        workers: Optional[int] = None,
+                        use_obsidian: bool = True,
+                        engine: Optional[AureonBacktestEngine] = None) -> List[Dict[str, Any]]:
+    """
+    Grid-search simulate_backtest parameters across a process pool.
+
+    Candles are loaded and signals precomputed once; the columns are written
+    to .npy files and every worker maps them read-only (mmap), so the OS
+    shares the pages instead of pickling arrays per task.
+
+    Args:
+        grid: e.g. {'max_positions': [5, 10], 'position_size_pct': [0.05, 0.1]}
+              (any simulate_backtest keyword)
+        workers: pool size (default: CPU count); 0 runs in-process
+
+    Returns:
+        One result dict per combination, best total_return first.
+    """
+    global _SWEEP_ARRAYS
+    engine = engine or AureonBacktestEngine(use_obsidian=use_obsidian)
+    cols = ColumnarCandles(data)
+    arrays = cols.sim_arrays()
+    arrays['buy_conf'] = engine._precompute_buy_confidence(cols)
+
+    keys = list(grid.keys())
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+    with tempfile.TemporaryDirectory(prefix='aureon_sweep_') as tmpdir:
+        paths = {}
+        for name, arr in arrays.items():
+            path = os.path.join(tmpdir, f"{name}.npy")
+            mm = np.lib.format.open_memmap(path, mode='w+', dtype=arr.dtype, shape=arr.shape)
+            mm[:] = arr
+            mm.flush()
+            del mm
+            paths[name] = path
+
+        if workers == 0:
+            _sweep_init(paths)
+            results = [_sweep_run(params) for params in combos]
+            _SWEEP_ARRAYS = None
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_sweep_init, initargs=(paths,)) as pool:
+                results = list(pool.map(_sweep_run, combos))
+
+    results.sort(key=lambda r: r['total_return'], reverse=True)
+    return results
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🚀 MAIN EXECUTION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1215,6 +1743,10 @@ def main():
     parser.add_argument("--days", type=int, default=365, help="Number of days of historical data")
     parser.add_argument("--interval", type=str, default="1h", help="Candle interval (e.g. 1h, 4h, 1d)")
     parser.add_argument("--compare-obsidian", action="store_true", help="Compare baseline vs Obsidian-enhanced")
+    parser.add_argument("--scalar", action="store_true", help="Use the original candle-by-candle loop")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Grid-search max positions x position size across a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="Sweep worker processes (default: CPU count)")
     args = parser.parse_args()
 
     print("\n" + "╔" + "═" * 78 + "╗")
@@ -1231,19 +1763,36 @@ def main():
         print("❌ No data fetched!")
         return
     
+    if args.sweep:
+        grid = {
+            'max_positions': [5, 10, 20],
+            'position_size_pct': [0.05, 0.1, 0.2],
+            'take_profit_pct': [1.0, 1.52, 2.0],
+        }
+        results = run_parameter_sweep(data, grid, workers=args.workers)
+        print("\n" + "═" * 80)
+        print("🧪 PARAMETER SWEEP (best first)")
+        print("═" * 80)
+        for r in results:
+            print(f"   {r['params']} | Return: {r['total_return']:+8.2f}% | Trades: {r['trades']:4} | "
+                  f"Win: {r['win_rate']:5.1f}% | DD: {r['max_drawdown']*100:5.2f}% | Open: {r['open_positions']}")
+        return
+    
     # Run backtest
     if args.compare_obsidian:
         base_engine = AureonBacktestEngine(starting_capital=10000.0, use_obsidian=False)
         base_results = base_engine.run_backtest(
             data,
             max_positions=10,
-            position_size_pct=0.1
+            position_size_pct=0.1,
+            vectorised=not args.scalar
         )
         enhanced_engine = AureonBacktestEngine(starting_capital=10000.0, use_obsidian=True)
         enhanced_results = enhanced_engine.run_backtest(
             data,
             max_positions=10,
-            position_size_pct=0.1
+            position_size_pct=0.1,
+            vectorised=not args.scalar
         )
         results = enhanced_results
         engine = enhanced_engine
@@ -1253,7 +1802,8 @@ def main():
         results = engine.run_backtest(
             data,
             max_positions=10,
-            position_size_pct=0.1
+            position_size_pct=0.1,
+            vectorised=not args.scalar
         )
     
     # Show best performers - THE WINNERS
@@ -51,6 +51,8 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, Callable, List, Tuple
 from collections import deque
 
+from stratum_hash_engine import HashEngine, HeaderTemplate
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURE LOGGING WITH UTF-8 HANDLER (Windows fix)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -131,6 +133,7 @@ PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67
 DEFAULT_NONCE_BATCH = 100_000  # Nonces per batch before checking for new job
 HASH_REPORT_INTERVAL = 10.0    # Seconds between hashrate reports
 MAX_NONCE = 0xFFFFFFFF         # Maximum 32-bit nonce value
+MINING_PROCESSES = int(os.getenv('MINING_PROCESSES', '0'))  # >0: hash in a process pool instead of threads
 
 # Casimir Constants
 HBAR_MINING = 1.054571817e-4   # Reduced Planck constant for mining (scaled)
@@ -341,28 +344,19 @@ class MiningJob:
     extranonce1: bytes
     extranonce2_size: int
     difficulty: float = 1.0
+    _template: Optional[Tuple[bytes, HeaderTemplate]] = field(default=None, repr=False, compare=False)
+    
+    def header_template(self, extranonce2: bytes) -> HeaderTemplate:
+        """Coinbase + merkle root folded once per extranonce2; only the nonce varies"""
+        cached = self._template
+        if cached is None or cached[0] != extranonce2:
+            cached = (extranonce2, HeaderTemplate.build(self, extranonce2))
+            self._template = cached
+        return cached[1]
     
     def build_header(self, extranonce2: bytes, nonce: int) -> bytes:
         """Build 80-byte block header with given extranonce2 and nonce"""
-        # Build coinbase transaction
-        coinbase = self.coinbase1 + self.extranonce1 + extranonce2 + self.coinbase2
-        coinbase_hash = hashlib.sha256(hashlib.sha256(coinbase).digest()).digest()
-        
-        # Build merkle root
-        merkle_root = coinbase_hash
-        for branch in self.merkle_branches:
-            merkle_root = hashlib.sha256(hashlib.sha256(merkle_root + branch).digest()).digest()
-        
-        # Build header (80 bytes)
-        header = (
-            self.version +
-            self.prev_hash +
-            merkle_root +
-            self.ntime +
-            self.nbits +
-            struct.pack('<I', nonce)
-        )
-        return header
+        return self.header_template(extranonce2).header(nonce)
     
     def __repr__(self):
         return f"MiningJob(id={self.job_id}, diff={self.difficulty:.2f})"
@@ -378,12 +372,18 @@ class MiningStats:
     start_time: float = field(default_factory=time.time)
     last_share_time: float = 0.0
     best_difficulty: float = 0.0
+    measured_hashes: int = 0    # Hashes actually computed (no resonance scaling)
     
     @property
     def hashrate(self) -> float:
         elapsed = time.time() - self.start_time
         return self.hashes / elapsed if elapsed > 0 else 0
     
+    @property
+    def measured_hashrate(self) -> float:
+        elapsed = time.time() - self.start_time
+        return self.measured_hashes / elapsed if elapsed > 0 else 0
+    
     @property
     def accept_rate(self) -> float:
         if self.shares_submitted == 0:
@@ -394,9 +394,9 @@ class MiningStats:
     def uptime(self) -> float:
         return time.time() - self.start_time
     
-    def format_hashrate(self) -> Tuple[float, str]:
+    def format_hashrate(self, measured: bool = False) -> Tuple[float, str]:
         """Return hashrate with appropriate unit"""
-        hr = self.hashrate
+        hr = self.measured_hashrate if measured else self.hashrate
         if hr > 1e12:
             return hr / 1e12, 'TH/s'
         elif hr > 1e9:
@@ -6588,21 +6588,33 @@ class StratumClient:
         self.authorized = False
         logger.info(f"🔌 Disconnected from pool {self.host}")
     
-    def _send(self, method: str, params: list) -> int:
-        """Send JSON-RPC message to pool"""
-        self.message_id += 1
+    def _send(self, method: str, params: list, on_response: Optional[Callable[[dict], None]] = None) -> int:
+        """
+        Send JSON-RPC message to pool.
+
+        The id is allocated and on_response registered under response_lock
+        before the bytes go out, so a pool that answers immediately can never
+        beat the registration (and concurrent submits never share an id).
+        """
+        with self.response_lock:
+            self.message_id += 1
+            msg_id = self.message_id
+            if on_response is not None:
+                self.pending_responses[msg_id] = on_response
         msg = {
-            'id': self.message_id,
+            'id': msg_id,
             'method': method,
             'params': params
         }
         data = json.dumps(msg) + '\n'
         try:
             self.socket.sendall(data.encode())
-            logger.debug(f"📤 Sent: {method} (id={self.message_id})")
+            logger.debug(f"📤 Sent: {method} (id={msg_id})")
         except Exception as e:
             logger.error(f"Send error: {e}")
-        return self.message_id
+            with self.response_lock:
+                self.pending_responses.pop(msg_id, None)
+        return msg_id
     
     def _receive_loop(self):
         """Background thread receiving pool messages"""
@@ -6661,9 +6673,9 @@ class StratumClient:
             # Response to our request
             msg_id = msg['id']
             with self.response_lock:
-                if msg_id in self.pending_responses:
-                    callback = self.pending_responses.pop(msg_id)
-                    callback(msg)
+                callback = self.pending_responses.pop(msg_id, None)
+            if callback is not None:
+                callback(msg)
     
     def _handle_notify(self, params: list):
         """Handle new job notification (mining.notify)"""
@@ -6735,12 +6747,12 @@ class StratumClient:
             response_data['error'] = msg.get('error')
             result_event.set()
         
-        msg_id = self._send('mining.subscribe', ['aureon-miner/1.0'])
-        with self.response_lock:
-            self.pending_responses[msg_id] = on_response
+        msg_id = self._send('mining.subscribe', ['aureon-miner/1.0'], on_response)
         
         if not result_event.wait(timeout=15):
             logger.error("Subscribe timeout")
+            with self.response_lock:
+                self.pending_responses.pop(msg_id, None)
             return False
         
         if response_data['error']:
@@ -6768,12 +6780,12 @@ class StratumClient:
             response_data['error'] = msg.get('error')
             result_event.set()
         
-        msg_id = self._send('mining.authorize', [self.worker, self.password])
-        with self.response_lock:
-            self.pending_responses[msg_id] = on_response
+        msg_id = self._send('mining.authorize', [self.worker, self.password], on_response)
         
         if not result_event.wait(timeout=15):
             logger.error("Authorize timeout")
+            with self.response_lock:
+                self.pending_responses.pop(msg_id, None)
             return False
         
         if response_data['error']:
@@ -6805,9 +6817,7 @@ class StratumClient:
             if self.on_share_result:
                 self.on_share_result(accepted, error_str)
         
-        msg_id = self._send('mining.submit', params)
-        with self.response_lock:
-            self.pending_responses[msg_id] = on_response
+        self._send('mining.submit', params, on_response)
         
         logger.debug(f"📤 Submitted share: job={job.job_id}, nonce={nonce:08x}")
     
@@ -7534,6 +7544,7 @@ class MiningSession:
         self._running = False
         self._paused = False
         self._threads: List[threading.Thread] = []
+        self._engine: Optional[HashEngine] = None
         
         self._extranonce2_counter = 0
         self._extranonce2_lock = threading.Lock()
@@ -7550,6 +7561,7 @@ class MiningSession:
         # Wire callbacks
         self.stratum.on_share_result = self._on_share_result
         self.stratum.on_disconnect = self._on_disconnect
+        self.stratum.on_job = self._on_job
     
     def _init_binance_api(self):
         """Initialize Binance Pool API client if this is a Binance pool"""
@@ -7561,15 +7573,34 @@ class MiningSession:
             logger.warning(f"[{self.session_id}] Could not init Binance Pool API: {e}")
             self._binance_pool_api = None
     
-    def start(self, num_threads: int) -> bool:
-        """Start mining on this session"""
+    def start(self, num_threads: int, processes: int = 0) -> bool:
+        """
+        Start mining on this session.
+        
+        processes > 0 hashes in a HashEngine process pool driven by one
+        dispatcher thread; otherwise num_threads hashlib threads as before.
+        """
+        if processes > 0:
+            # Fork the workers before the Stratum receive thread exists
+            self._engine = HashEngine(processes=processes).start()
+        
         if not self.stratum.connect():
             logger.error(f"[{self.session_id}] Failed to connect")
+            if self._engine:
+                self._engine.stop()
+                self._engine = None
             return False
         
         self._running = True
         self._threads = []
         
+        if self._engine:
+            t = threading.Thread(target=self._engine_loop, daemon=True, name=f'miner-{self.session_id}-engine')
+            t.start()
+            self._threads.append(t)
+            logger.info(f"[{self.session_id}] Started with {processes} hashing processes")
+            return True
+        
         for i in range(num_threads):
             t = threading.Thread(
                 target=self._mine_loop,
@@ -7586,13 +7617,20 @@ class MiningSession:
     def stop(self):
         """Stop mining on this session"""
         self._running = False
+        if self._engine:
+            self._engine.cancel()
         self.stratum.disconnect()
         for t in self._threads:
             t.join(timeout=2)
         self._threads.clear()
+        if self._engine:
+            self._engine.stop()
+            self._engine = None
     
     def pause(self):
         self._paused = True
+        if self._engine:
+            self._engine.cancel()
     
     def resume(self):
         self._paused = False
@@ -7606,6 +7644,7 @@ class MiningSession:
     
     def _mine_loop(self, thread_id: int):
         local_hashes = 0
+        measured = 0
         last_job_id = None
         
         while self._running:
@@ -7630,6 +7669,9 @@ class MiningSession:
             nonce_bias = self.optimizer.get_nonce_bias()
             
             extranonce2 = self._get_next_extranonce2(job)
+            # Coinbase + merkle root once per extranonce2 - each nonce only patches 4 bytes
+            hash_nonce = job.header_template(extranonce2).hash
+            target_be = job.target.to_bytes(32, 'big')
             
             # Distribute nonces based on thread_id AND session_id hash to avoid overlap if multiple sessions use same logic
             # But here we rely on extranonce2 being unique per session instance if we managed it globally, 
@@ -7651,11 +7693,10 @@ class MiningSession:
                     if new_job and new_job.job_id != job.job_id:
                         break
                 
-                header = job.build_header(extranonce2, nonce)
-                hash_result = hashlib.sha256(hashlib.sha256(header).digest()).digest()
-                hash_int = int.from_bytes(hash_result[::-1], 'big')
+                hash_result = hash_nonce(nonce)
                 
                 local_hashes += 1
+                measured += 1
                 
                 # PING-PONG: Send hash into quantum lattice periodically
                 if local_hashes % ping_interval == 0:
@@ -7666,25 +7707,80 @@ class MiningSession:
                 
                 if local_hashes >= 1000:
                     self.stats.hashes += local_hashes
+                    self.stats.measured_hashes += measured
                     # PONG: No share found
                     self.optimizer.pong_result(thread_id, False)
                     local_hashes = 0
+                    measured = 0
                 
-                if hash_int < job.target:
-                    achieved_diff = self._calculate_difficulty_from_hash(hash_int)
-                    logger.info(f"💎 SHARE [{self.session_id}] Thread {thread_id} | Diff: {achieved_diff:.6f}")
-                    
-                    self.stratum.submit_share(job, extranonce2, job.ntime, nonce)
-                    self.stats.shares_submitted += 1
-                    self.stats.last_share_time = time.time()
-                    
-                    if achieved_diff > self.stats.best_difficulty:
-                        self.stats.best_difficulty = achieved_diff
-                    
-                    # Share found triggers full resonance cascade!
-                    self.optimizer.on_share_found(hash_result, nonce, achieved_diff)
+                if hash_result[::-1] < target_be:
+                    self._record_share(thread_id, job, extranonce2, nonce, hash_result)
         
         self.stats.hashes += local_hashes
+        self.stats.measured_hashes += measured
+    
+    def _engine_loop(self):
+        """Dispatcher for process-pool mode: one nonce span per extranonce2, split across workers."""
+        engine = self._engine
+        
+        while self._running:
+            if self._paused:
+                time.sleep(0.5)
+                continue
+            
+            if not self.optimizer.should_mine():
+                time.sleep(1)
+                continue
+            
+            job = self.stratum.get_current_job()
+            if not job:
+                time.sleep(0.5)
+                continue
+            
+            batch_size = self.optimizer.get_batch_size()
+            nonce_bias = self.optimizer.get_nonce_bias()
+            extranonce2 = self._get_next_extranonce2(job)
+            template = job.header_template(extranonce2)
+            
+            # QUANTUM LATTICE: Apply nonce optimization (one batch per worker)
+            nonce_start = self.optimizer.get_quantum_nonce(nonce_bias) % MAX_NONCE
+            nonce_end = min(nonce_start + batch_size * engine.processes, MAX_NONCE)
+            
+            summary = engine.mine(template, job.target, nonce_start, nonce_end)
+            
+            # Measured counter gets what was hashed; the display counter keeps its resonance scaling
+            self.stats.measured_hashes += summary.hashes
+            counted = summary.hashes
+            if summary.last_hash:
+                resonance = self.optimizer.ping_hash(0, summary.last_nonce, summary.last_hash)
+                if resonance > 1.0:
+                    counted = int(counted * min(resonance, 2.0))
+            self.stats.hashes += counted
+            if not summary.shares:
+                self.optimizer.pong_result(0, False)
+            
+            for nonce, hash_result in summary.shares:
+                self._record_share(0, job, extranonce2, nonce, hash_result)
+    
+    def _record_share(self, thread_id: int, job: MiningJob, extranonce2: bytes, nonce: int, hash_result: bytes):
+        hash_int = int.from_bytes(hash_result[::-1], 'big')
+        achieved_diff = self._calculate_difficulty_from_hash(hash_int)
+        logger.info(f"💎 SHARE [{self.session_id}] Thread {thread_id} | Diff: {achieved_diff:.6f}")
+        
+        self.stratum.submit_share(job, extranonce2, job.ntime, nonce)
+        self.stats.shares_submitted += 1
+        self.stats.last_share_time = time.time()
+        
+        if achieved_diff > self.stats.best_difficulty:
+            self.stats.best_difficulty = achieved_diff
+        
+        # Share found triggers full resonance cascade!
+        self.optimizer.on_share_found(hash_result, nonce, achieved_diff)
+    
+    def _on_job(self, job: MiningJob):
+        """clean_jobs invalidates in-flight work - stop the pool's current ranges now"""
+        if job.clean_jobs and self._engine:
+            self._engine.cancel()
 
     def _calculate_difficulty_from_hash(self, hash_int: int) -> float:
         MAX_TARGET = 0x00000000FFFF0000000000000000000000000000000000000000000000000000
@@ -7770,11 +7866,12 @@ class AureonMiner:
     
     def __init__(self, pool_host: str = None, pool_port: int = None, 
                  worker: str = None, password: str = 'x',
-                 threads: int = 1):
+                 threads: int = 1, processes: int = MINING_PROCESSES):
         
         self.optimizer = HarmonicMiningOptimizer()
         self.sessions: List[MiningSession] = []
         self.global_threads = threads
+        self.global_processes = processes   # >0: per-session HashEngine pools instead of threads
         
         self._running = False
         self._stats_thread: Optional[threading.Thread] = None
@@ -8251,16 +8348,20 @@ class AureonMiner:
 ╚═══════════════════════════════════════════════════════════════════════════════╝
         """)
         
-        # Distribute threads
+        # Distribute threads (or hashing processes)
         threads_per_pool = max(1, self.global_threads // len(self.sessions))
         remainder = self.global_threads % len(self.sessions)
+        procs_per_pool = self.global_processes // len(self.sessions)
+        proc_remainder = self.global_processes % len(self.sessions)
         
         self._running = True
         success_count = 0
         
         for i, session in enumerate(self.sessions):
             t_count = threads_per_pool + (1 if i < remainder else 0)
-            if session.start(t_count):
+            p_count = (max(1, procs_per_pool + (1 if i < proc_remainder else 0))
+                       if self.global_processes > 0 else 0)
+            if session.start(t_count, processes=p_count):
                 success_count += 1
         
         if success_count == 0:
@@ -8507,6 +8608,7 @@ class AureonMiner:
                 # Get quantum amplified hashrate (Lattice × Casimir × Coherence × QVEE)
                 raw_hashrate = sum(s.stats.hashrate for s in self.sessions)
                 amp_rate, amp_str = self.optimizer.get_amplified_hashrate(raw_hashrate)
+                measured_hr = sum(s.stats.measured_hashrate for s in self.sessions)
                 cascade = insight.get('cascade_factor', 1.0)
                 prob_dir = insight.get('probability_direction', 'NEUTRAL')
                 prob_val = insight.get('probability', 0.5)
@@ -8515,6 +8617,7 @@ class AureonMiner:
                 # Display with quantum lattice info
                 logger.info(
                     f"📊 RAW: {total_hr:.2f} {unit} | "
+                    f"📏 MEASURED: {measured_hr:,.0f} H/s | "
                     f"⚛️ QUANTUM: {amp_str} | "
                     f"Pools: {len(self.sessions)} | "
                     f"Shares: {total_shares} | "
@@ -8581,7 +8684,9 @@ class AureonMiner:
         print("\n╔════════════════════ FINAL MINING STATS ════════════════════╗")
         for session in self.sessions:
             hr, unit = session.stats.format_hashrate()
+            mhr, munit = session.stats.format_hashrate(measured=True)
             print(f"║ {session.session_id:<15} | {hr:>8.2f} {unit:<4} | Shares: {session.stats.shares_accepted:>5} ║")
+            print(f"║ {'  measured':<15} | {mhr:>8.2f} {munit:<4} | Hashes: {session.stats.measured_hashes:>,} ║")
         
         # Show lattice stats
         insight = self.optimizer.get_mining_insight()
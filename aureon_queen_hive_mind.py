@@ -91,6 +91,7 @@ from enum import Enum, auto
 from pathlib import Path
 from cost_basis_tracker import CostBasisTracker
 from metrics import MetricGauge
+from queen_signal_fanout import SignalFanout
 
 # 🇬🇧💎 MISSING PIECES INTEGRATION 💎🇬🇧
 try:
@@ -1364,6 +1365,7 @@ class QueenHiveMind:
         # Factors: velocity, acceleration, jerk, volume_delta, spread_change, momentum_shift,
         #          fractal_dim, liquidity_flow, harmonic_resonance, time_cycle, neural_learned, coherence_delta
         self.clownfish = None
+        self.signal_fanout = SignalFanout('queen')  # Children queried side by side per decision
         if CLOWNFISH_AVAILABLE and ClownfishNode is not None:
             try:
                 self.clownfish = ClownfishNode()
@@ -8129,6 +8131,22 @@ I will NOT sell at a loss when the market is down. 👑
             return None
         return signal
 
+    def _child_signal(self, child: 'HiveChild', market_data: Dict = None) -> float:
+        """One child's signal for get_collective_signal (-1 .. 1, 0 when it has none)."""
+        signal = 0.0
+        if child.system_type == "MYCELIUM" and child.instance:
+            if hasattr(child.instance, 'get_queen_signal'):
+                signal = child.instance.get_queen_signal(market_data)
+            elif hasattr(child.instance, 'queen_neuron'):
+                signal = child.instance.queen_neuron.activation
+        
+        elif child.system_type == "ENIGMA" and child.instance:
+            if hasattr(child.instance, 'get_conviction'):
+                conviction = child.instance.get_conviction()
+                mood = child.instance.get_mood() if hasattr(child.instance, 'get_mood') else "NEUTRAL"
+                signal = conviction * (1 if mood in ["BULLISH", "HOPEFUL"] else -1 if mood == "BEARISH" else 0.5)
+        return signal
+
     def get_collective_signal(self, symbol: str = None, market_data: Dict = None) -> Dict[str, Any]:
         """
         Get a collective signal from all children.
@@ -8139,28 +8157,27 @@ I will NOT sell at a loss when the market is down. 👑
         signals = []
         weights = []
         
+        # Every child (and the harmonic field) is asked at once under one latency
+        # budget; late or failing children answer with their last value, weighted
+        # down by how stale it is.
+        calls = {}
+        child_keys = {}
         for name, child in self.children.items():
-            try:
-                signal = 0.0
-                weight = child.synapse_strength
-                
-                if child.system_type == "MYCELIUM" and child.instance:
-                    if hasattr(child.instance, 'get_queen_signal'):
-                        signal = child.instance.get_queen_signal(market_data)
-                    elif hasattr(child.instance, 'queen_neuron'):
-                        signal = child.instance.queen_neuron.activation
-                
-                elif child.system_type == "ENIGMA" and child.instance:
-                    if hasattr(child.instance, 'get_conviction'):
-                        conviction = child.instance.get_conviction()
-                        mood = child.instance.get_mood() if hasattr(child.instance, 'get_mood') else "NEUTRAL"
-                        signal = conviction * (1 if mood in ["BULLISH", "HOPEFUL"] else -1 if mood == "BEARISH" else 0.5)
-                
-                signals.append(signal)
-                weights.append(weight)
-                
-            except Exception as e:
-                logger.debug(f"Could not get signal from {name}: {e}")
+            key = f"child:{name}@{symbol}" if child.system_type == "MYCELIUM" and symbol else f"child:{name}"
+            child_keys[name] = key
+            calls[key] = lambda child=child: self._child_signal(child, market_data)
+        if self.harmonic_field:
+            calls['harmonic_field'] = lambda: (self.get_harmonic_trading_signal(symbol), self.perceive_harmonic_field())
+        started = time.perf_counter()
+        answers = self._signal_fanout().gather(calls, label='collective_signal')
+        
+        for name, child in self.children.items():
+            answer = answers[child_keys[name]]
+            if answer.status == 'error':
+                logger.debug(f"Could not get signal from {name}: {answer.error}")
+            if answer.weight > 0:
+                signals.append(answer.value)
+                weights.append(child.synapse_strength * answer.weight)
         
         # Queen's own wisdom
         queen_wisdom = self.get_guidance_for(symbol) if symbol else None
@@ -8173,22 +8190,23 @@ I will NOT sell at a loss when the market is down. 👑
         # �👑 HARMONIC FIELD PERCEPTION - Queen's market vision
         # ═══════════════════════════════════════════════════════════════════
         harmonic_signal = None
-        if self.harmonic_field:
-            try:
-                harmonic_data = self.get_harmonic_trading_signal(symbol)
-                if harmonic_data and harmonic_data.get('confidence', 0) > 0.2:
-                    harmonic_signal = harmonic_data['signal']
-                    signals.append(harmonic_signal)
-                    weights.append(1.8)  # Harmonic field is highly trusted
-                    logger.debug(
-                        "🌊👑 Harmonic field signal: %.2f (%s, mood=%s, alignment=%.2f)",
-                        harmonic_signal,
-                        harmonic_data.get('direction'),
-                        harmonic_data.get('market_mood'),
-                        harmonic_data.get('harmonic_alignment', 0)
-                    )
-            except Exception as e:
-                logger.debug(f"🌊 Harmonic signal error: {e}")
+        harmonic_perception = None
+        harmonic = answers.get('harmonic_field')
+        if harmonic is not None and harmonic.weight > 0:
+            harmonic_data, harmonic_perception = harmonic.value
+            if harmonic_data and harmonic_data.get('confidence', 0) > 0.2:
+                harmonic_signal = harmonic_data['signal']
+                signals.append(harmonic_signal)
+                weights.append(1.8 * harmonic.weight)  # Harmonic field is highly trusted
+                logger.debug(
+                    "🌊👑 Harmonic field signal: %.2f (%s, mood=%s, alignment=%.2f)",
+                    harmonic_signal,
+                    harmonic_data.get('direction'),
+                    harmonic_data.get('market_mood'),
+                    harmonic_data.get('harmonic_alignment', 0)
+                )
+        elif harmonic is not None and harmonic.status == 'error':
+            logger.debug(f"🌊 Harmonic signal error: {harmonic.error}")
         
         # ═══════════════════════════════════════════════════════════════════
         # �🆕 FALLBACK: If no children gave useful signals, use market_data
@@ -8232,7 +8250,9 @@ I will NOT sell at a loss when the market is down. 👑
             'confidence': abs(collective),
             'sources': len(signals),
             'queen_wisdom': queen_wisdom.to_dict() if queen_wisdom else None,
-            'harmonic_perception': self.perceive_harmonic_field() if self.harmonic_field else None,
+            'harmonic_perception': harmonic_perception,
+            'stale_sources': sorted(k for k, a in answers.items() if not a.fresh),
+            'gather_ms': (time.perf_counter() - started) * 1000,
             'timestamp': time.time()
         }
     
@@ -12101,6 +12121,9 @@ Feeling: {thought['emotion']}
         if not getattr(self, 'has_full_control', False):
             return {'decision': 'DENIED', 'reason': 'Queen does not have full control'}
         
+        decision_started = time.perf_counter()
+        symbol = opportunity.get('symbol', 'UNKNOWN')
+        
         # Gather intelligence from all systems
         intelligence = {
             'timestamp': time.time(),
@@ -12128,9 +12151,13 @@ Feeling: {thought['emotion']}
         # Apply Queen's wisdom
         queen_confidence = confidence * intelligence['gaia_alignment']
         
-        # Dream consultation
-        dream = self.dream_for_decision(opportunity.get('symbol', 'UNKNOWN'))
-        intelligence['dream_guidance'] = dream
+        # Dream consultation - bounded by the decision budget; a dream that runs
+        # long is replaced by this symbol's last dream (staleness-weighted)
+        answers = self._signal_fanout().gather(
+            {f"dream@{symbol}": lambda: self.dream_of_winning(opportunity)}, label='decision_inputs')
+        dream = answers[f"dream@{symbol}"]
+        intelligence['dream_guidance'] = dream.value
+        intelligence['dream_weight'] = dream.weight
         
         # Final decision
         if queen_confidence > 0.6 and expected_profit > 0.005:
@@ -12153,6 +12180,10 @@ Feeling: {thought['emotion']}
             'message': self._generate_decision_message(decision, opportunity)
         }
         
+        decision_seconds = time.perf_counter() - decision_started
+        self._signal_fanout().observe('autonomous_trade_decision', decision_seconds)
+        response['decision_ms'] = decision_seconds * 1000
+        
         # Log the decision
         logger.info(f"👑 Queen's Decision: {decision} | Confidence: {queen_confidence:.1%}")
         
@@ -14038,6 +14069,49 @@ Sero 👑🐝
     # 👑🧠 QUEEN'S NEURAL CONSCIOUSNESS - Deep Learning & Evolution 🧠👑
     # ════════════════════════════════════════════════════════════════════════════
     
+    def _signal_fanout(self) -> SignalFanout:
+        """The Queen's child fan-out (created on first use for partially built Queens)."""
+        fanout = getattr(self, 'signal_fanout', None)
+        if fanout is None:
+            fanout = self.signal_fanout = SignalFanout('queen')
+        return fanout
+
+    def get_fanout_stats(self) -> Dict[str, Any]:
+        """👑⏱️ Per-child latency / timeout counters and decision round percentiles."""
+        return self._signal_fanout().stats()
+
+    def _neural_input_calls(self, market_state: Any = None) -> Dict[str, Callable[[], Any]]:
+        """Child queries behind gather_neural_inputs, keyed by fan-out child name."""
+        calls: Dict[str, Callable[[], Any]] = {}
+        if self.clownfish is not None and market_state is not None:
+            symbol = getattr(market_state, 'symbol', None)
+            if symbol is None and isinstance(market_state, dict):
+                symbol = market_state.get('symbol')
+
+            def clownfish():
+                result = self.clownfish.compute(market_state)
+                if isinstance(result, dict):
+                    return result
+                # ClownfishNode.compute returns a float; the factors are kept per symbol
+                return {'signal': result, 'micro_signals': self.clownfish.get_micro_signals(symbol or 'UNKNOWN')}
+
+            # Scoped per symbol so a stale answer is never another symbol's; the
+            # fan-out runs at most one compute() at a time on the shared node
+            calls[f"clownfish@{symbol or 'UNKNOWN'}"] = clownfish
+
+        def repo_wisdom():
+            from queen_repository_scanner import get_repo_scanner
+            # Cached "wisdom factor"; the repo index refreshes on its own thread
+            return get_repo_scanner().get_wisdom_factor()
+
+        def mycelium():
+            from aureon_mycelium import get_mycelium
+            return get_mycelium().get_network_coherence()
+
+        calls['repo_wisdom'] = repo_wisdom
+        calls['mycelium'] = mycelium
+        return calls
+
     def gather_neural_inputs(self, 
                             probability_score: float = 0.5,
                             wisdom_score: float = 0.5,
@@ -14070,76 +14144,65 @@ Sero 👑🐝
         clownfish_micro_signals = {}
         
         try:
+            # Children are queried side by side under one latency budget; a child
+            # that misses it answers with its last value, scaled by staleness weight.
+            calls = self._neural_input_calls(market_state)
+            answers = self._signal_fanout().gather(calls, label='neural_inputs')
+            
             # 0. CLOWNFISH v2.0 - Micro-Change Detection (runs first for early warning)
-            if self.clownfish is not None and market_state is not None:
-                try:
-                    cf_result = self.clownfish.compute(market_state)
-                    clownfish_signal = cf_result.get('signal', 0.5)
-                    clownfish_micro_signals = cf_result.get('micro_signals', {})
-                    
-                    # Count strong/danger signals from 12 factors
-                    strong_count = sum(1 for v in clownfish_micro_signals.values() if v > 0.7)
-                    danger_count = sum(1 for v in clownfish_micro_signals.values() if v < 0.3)
-                    
-                    # Calculate boost/penalty for neural input
-                    if strong_count >= 4:
-                        clownfish_boost = 1.15  # Strong micro-change support
-                    elif strong_count >= 3:
-                        clownfish_boost = 1.08
-                    elif danger_count >= 3:
-                        clownfish_boost = 0.85  # Micro-change danger
-                    elif danger_count >= 2:
-                        clownfish_boost = 0.92
-                    
-                    # Apply clownfish boost to probability_score
-                    probability_score = 0.5 + (probability_score - 0.5) * clownfish_boost
-                    
-                    # Log strong/danger signals
-                    if strong_count >= 3:
-                        logger.debug(f"🐠 Clownfish STRONG signal ({clownfish_signal:.2f}): {strong_count} factors bullish")
-                    elif danger_count >= 3:
-                        logger.debug(f"🐠 Clownfish DANGER signal ({clownfish_signal:.2f}): {danger_count} factors bearish")
-                        
-                except Exception as e:
-                    logger.debug(f"🐠 Clownfish compute error: {e}")
-            # 1. ACQUIRE REPOSITORY WISDOM (Reading Documents)
-            # The Queen scans files in real-time to learn from docs/code/logs
-            try:
-                from queen_repository_scanner import get_repo_scanner
-                # This scans the repo and returns a "wisdom factor" based on content
-                repo_wisdom = get_repo_scanner().scan_repository()
+            cf = answers.get(next((k for k in calls if k.startswith('clownfish')), ''), None)
+            if cf is not None and cf.weight > 0:
+                cf_result = cf.value
+                clownfish_signal = cf_result.get('signal', 0.5)
+                clownfish_micro_signals = cf_result.get('micro_signals', {})
                 
-                # We blend this "book smarts" (repo) with "street smarts" (history)
-                # This increases wisdom_score if the repo is healthy and documented
-                original_wisdom = wisdom_score
-                wisdom_score = (original_wisdom * 0.7) + (repo_wisdom * 0.3)
+                # Count strong/danger signals from 12 factors
+                numeric = [v for v in clownfish_micro_signals.values() if isinstance(v, (int, float))]
+                strong_count = sum(1 for v in numeric if v > 0.7)
+                danger_count = sum(1 for v in numeric if v < 0.3)
                 
-                if repo_wisdom > 0.8:
-                    logger.debug(f"👑👁️ Queen's wisdom boosted by repository knowledge ({repo_wisdom:.2f})")
-            except Exception as e:
-                logger.warning(f"Failed to scan repository: {e}")
-
-            # 2. CONNECT TO FULL MYCELIUM NETWORK (Reading All Neurons)
-            # Consults the collective intelligence of all connected agents
-            try:
-                from aureon_mycelium import get_mycelium
-                mycelium = get_mycelium()
+                # Calculate boost/penalty for neural input
+                if strong_count >= 4:
+                    clownfish_boost = 1.15  # Strong micro-change support
+                elif strong_count >= 3:
+                    clownfish_boost = 1.08
+                elif danger_count >= 3:
+                    clownfish_boost = 0.85  # Micro-change danger
+                elif danger_count >= 2:
+                    clownfish_boost = 0.92
+                clownfish_boost = 1.0 + (clownfish_boost - 1.0) * cf.weight
                 
-                # get_network_coherence() aggregates signals from all nodes/neurons
-                # Returns 0.0 (chaos) to 1.0 (perfect alignment)
-                coherence = mycelium.get_network_coherence()
+                # Apply clownfish boost to probability_score
+                probability_score = 0.5 + (probability_score - 0.5) * clownfish_boost
                 
-                # If no specific signal was passed, we derive it from the network's state
-                if mycelium_signal == 0.0:
-                    # Map coherence (0.0 to 1.0) to signal strength (-1.0 to 1.0)
-                    # Low coherence = Confused network (0)
-                    # High coherence = Strong conviction (1 or -1 depending on trend)
-                    # For now, we map coherence to positive alignment
-                    mycelium_signal = (coherence * 2.0) - 1.0
-                    
-            except Exception as e:
-                # Fallback if mycelium not available
-                pass
+                # Log strong/danger signals
+                if strong_count >= 3:
+                    logger.debug(f"🐠 Clownfish STRONG signal ({clownfish_signal:.2f}): {strong_count} factors bullish")
+                elif danger_count >= 3:
+                    logger.debug(f"🐠 Clownfish DANGER signal ({clownfish_signal:.2f}): {danger_count} factors bearish")
+            elif cf is not None and cf.status == 'error':
+                logger.debug(f"🐠 Clownfish compute error: {cf.error}")
+            
+            # 1. ACQUIRE REPOSITORY WISDOM (Reading Documents)
+            # We blend this "book smarts" (repo) with "street smarts" (history)
+            # This increases wisdom_score if the repo is healthy and documented
+            repo = answers['repo_wisdom']
+            if repo.weight > 0:
+                blend = 0.3 * repo.weight
+                wisdom_score = (wisdom_score * (1.0 - blend)) + (repo.value * blend)
+                if repo.value > 0.8:
+                    logger.debug(f"👑👁️ Queen's wisdom boosted by repository knowledge ({repo.value:.2f})")
+            elif repo.status == 'error':
+                logger.warning(f"Failed to scan repository: {repo.error}")
+
+            # 2. CONNECT TO FULL MYCELIUM NETWORK (Reading All Neurons)
+            # get_network_coherence() aggregates signals from all nodes/neurons
+            # Returns 0.0 (chaos) to 1.0 (perfect alignment)
+            mycelium = answers['mycelium']
+            if mycelium_signal == 0.0 and mycelium.weight > 0:
+                # Map coherence (0.0 to 1.0) to signal strength (-1.0 to 1.0)
+                # For now, we map coherence to positive alignment
+                mycelium_signal = ((mycelium.value * 2.0) - 1.0) * mycelium.weight
 
             # Clamp all values to valid ranges
             prob = max(0.0, min(1.0, probability_score))
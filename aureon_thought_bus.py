@@ -8,8 +8,10 @@ import sys
 import threading
 import time
 import uuid
+import atexit
+import weakref
 from dataclasses import dataclass, asdict, field
-from typing import Any, Callable, Deque, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 from collections import deque
 
 # Cross-platform file locking
@@ -298,16 +300,284 @@ def think(payload: Any = None, topic: str = "thought", source: str = "unknown",
 
 Subscriber = Callable[[Thought], None]
 
+# Persistence durability modes for ThoughtBus:
+#   sync     - write + fsync inside publish() (one disk flush per thought; default)
+#   group    - background writer batches lines and fsyncs once per batch
+#   buffered - background writer batches lines, flushes to the OS, never fsyncs
+# group/buffered are opt-in (durability= or AUREON_THOUGHT_DURABILITY): a
+# thought published just before a crash may not be on disk.
+DURABILITY_SYNC = "sync"
+DURABILITY_GROUP = "group"
+DURABILITY_BUFFERED = "buffered"
+DURABILITY_MODES = (DURABILITY_SYNC, DURABILITY_GROUP, DURABILITY_BUFFERED)
+
+DEFAULT_DURABILITY = os.getenv("AUREON_THOUGHT_DURABILITY", DURABILITY_SYNC).strip().lower()
+DEFAULT_FLUSH_INTERVAL_S = float(os.getenv("AUREON_THOUGHT_FLUSH_INTERVAL_S", "0.05") or 0.05)
+DEFAULT_FLUSH_BYTES = int(os.getenv("AUREON_THOUGHT_FLUSH_BYTES", str(256 * 1024)) or 256 * 1024)
+DEFAULT_MAX_PENDING = int(os.getenv("AUREON_THOUGHT_MAX_PENDING", "50000") or 50000)
+
+_MATCH_CACHE_MAX = 4096
+
+
+class _TrieNode:
+    __slots__ = ("children", "prefix_key", "exact_key")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.prefix_key: Optional[Tuple[int, str]] = None  # (order, "<path>*") ends here
+        self.exact_key: Optional[Tuple[int, str]] = None   # (order, "<path>") ends here
+
+
+class _TopicTrie:
+    """
+    Character trie over subscription keys.
+
+    "miner.*" is stored as a prefix mark on the node for "miner.", "*" as a
+    prefix mark on the root, and exact keys as an exact mark on their final
+    node, so matching a topic is a single walk over its characters. Each mark
+    carries the key's subscription order, so sorting the matches restores
+    dispatch order without looking at the other subscriptions.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def add(self, key: str, order: int = 0) -> None:
+        is_prefix = key.endswith("*")
+        path = key[:-1] if is_prefix else key
+        node = self._root
+        for ch in path:
+            nxt = node.children.get(ch)
+            if nxt is None:
+                nxt = node.children[ch] = _TrieNode()
+            node = nxt
+        if is_prefix:
+            node.prefix_key = (order, key)
+        else:
+            node.exact_key = (order, key)
+
+    def match(self, topic: str) -> List[Tuple[int, str]]:
+        """(order, key) of every subscription key matching topic, unsorted."""
+        keys: List[Tuple[int, str]] = []
+        node = self._root
+        if node.prefix_key is not None:
+            keys.append(node.prefix_key)
+        for ch in topic:
+            node = node.children.get(ch)
+            if node is None:
+                return keys
+            if node.prefix_key is not None:
+                keys.append(node.prefix_key)
+        if node.exact_key is not None:
+            keys.append(node.exact_key)
+        return keys
+
+
+class _GroupCommitWriter:
+    """
+    Background JSONL writer that batches persisted thoughts.
+
+    Lines are queued by publish() and written by one daemon thread, which
+    flushes when `flush_bytes` are pending or `flush_interval` has elapsed
+    since the oldest queued line, taking the cross-process file lock once
+    per batch. In group mode each batch ends with a single fsync.
+    """
+
+    def __init__(self, path: str, durability: str, flush_interval: float,
+                 flush_bytes: int, max_pending: int) -> None:
+        self.path = path
+        self.durability = durability
+        self.flush_interval = max(0.001, flush_interval)
+        self.flush_bytes = max(1, flush_bytes)
+        self.max_pending = max(1, max_pending)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: Deque[str] = deque()
+        self._pending_bytes = 0
+        self._oldest_enqueued: Optional[float] = None
+        self._in_flight = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.errors = 0
+        self.backpressure_waits = 0
+        self.last_batch_size = 0
+        self.last_flush_latency_ms = 0.0
+        self.last_flush_ts: Optional[float] = None
+        self.max_lag_ms = 0.0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="thought-bus-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, line: str) -> None:
+        with self._cond:
+            if self._stopped:
+                return
+            self._ensure_thread()
+            while len(self._pending) >= self.max_pending and not self._stopped:
+                self.backpressure_waits += 1
+                self._cond.notify_all()
+                self._cond.wait(self.flush_interval)
+            if not self._pending:
+                self._oldest_enqueued = time.time()
+            self._pending.append(line)
+            self._pending_bytes += len(line)
+            self.enqueued += 1
+            if self._pending_bytes >= self.flush_bytes:
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._pending:
+                        due = self._oldest_enqueued + self.flush_interval
+                        remaining = due - time.time()
+                        if self._pending_bytes >= self.flush_bytes or remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._stopped and not self._pending:
+                    self._cond.notify_all()
+                    return
+                batch = list(self._pending)
+                oldest = self._oldest_enqueued
+                self._pending.clear()
+                self._pending_bytes = 0
+                self._oldest_enqueued = None
+                self._in_flight = len(batch)
+                self._cond.notify_all()
+
+            self._write_batch(batch, oldest)
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: List[str], oldest: Optional[float]) -> None:
+        started = time.time()
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                _lock_file(f)
+                try:
+                    f.write("".join(batch))
+                    f.flush()
+                    if self.durability == DURABILITY_GROUP:
+                        os.fsync(f.fileno())
+                        self.fsyncs += 1
+                finally:
+                    _unlock_file(f)
+            self.written += len(batch)
+        except (OSError, IOError):
+            self.errors += 1
+        finished = time.time()
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_latency_ms = (finished - started) * 1000.0
+        self.last_flush_ts = finished
+        if oldest is not None:
+            self.max_lag_ms = max(self.max_lag_ms, (finished - oldest) * 1000.0)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk (or timeout)."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Force the writer to treat the queue as due right now
+                self._oldest_enqueued = 0.0 if self._pending else self._oldest_enqueued
+                self._cond.notify_all()
+                self._cond.wait(remaining if remaining is not None else self.flush_interval)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def metrics(self) -> Json:
+        with self._cond:
+            depth = len(self._pending)
+            pending_bytes = self._pending_bytes
+            oldest = self._oldest_enqueued
+        now = time.time()
+        return {
+            "durability": self.durability,
+            "queue_depth": depth,
+            "pending_bytes": pending_bytes,
+            "lag_ms": round((now - oldest) * 1000.0, 3) if oldest else 0.0,
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "errors": self.errors,
+            "backpressure_waits": self.backpressure_waits,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 3),
+            "last_flush_ts": self.last_flush_ts,
+        }
+
+
+_live_writers: "weakref.WeakSet[_GroupCommitWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_writers_at_exit() -> None:
+    for writer in list(_live_writers):
+        try:
+            writer.close(timeout=2.0)
+        except Exception:
+            pass
+
 
 class ThoughtBus:
-    def __init__(self, max_memory: int = 5000, persist_path: Optional[str] = None):
+    def __init__(
+        self,
+        max_memory: int = 5000,
+        persist_path: Optional[str] = None,
+        durability: Optional[str] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_S,
+        flush_bytes: int = DEFAULT_FLUSH_BYTES,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
         self._lock = threading.RLock()
         self._subs: Dict[str, List[Subscriber]] = {}
+        self._trie = _TopicTrie()
+        self._match_cache: Dict[str, List[Subscriber]] = {}
+        self._match_cache_hits = 0
+        self._match_cache_misses = 0
         self._memory: Deque[Thought] = deque(maxlen=max_memory)
         self._persist_path = persist_path
 
+        durability = (durability or DEFAULT_DURABILITY).strip().lower()
+        if durability not in DURABILITY_MODES:
+            durability = DURABILITY_SYNC
+        self.durability = durability
+        self._writer: Optional[_GroupCommitWriter] = None
+
         if self._persist_path:
             os.makedirs(os.path.dirname(self._persist_path) or ".", exist_ok=True)
+            if durability != DURABILITY_SYNC:
+                self._writer = _GroupCommitWriter(
+                    self._persist_path, durability, flush_interval, flush_bytes, max_pending
+                )
+                _live_writers.add(self._writer)
             
         # 🐳 Auto-wire Whale Sonar for every ThoughtBus instance
         # This ensures every subsystem (Queen, Scanner, Feed) has sonar capabilities.
@@ -343,13 +613,16 @@ class ThoughtBus:
           - global: "*"
         """
         with self._lock:
+            if topic not in self._subs:
+                self._trie.add(topic, len(self._subs))
             self._subs.setdefault(topic, []).append(handler)
+            self._match_cache.clear()
 
     def publish(self, thought: Thought) -> Thought:
         with self._lock:
             self._memory.append(thought)
-            self._persist(thought)
             handlers = self._match_handlers(thought.topic)
+        self._persist(thought)
 
         for h in handlers:
             try:
@@ -364,7 +637,7 @@ class ThoughtBus:
                 )
                 with self._lock:
                     self._memory.append(err)
-                    self._persist(err)
+                self._persist(err)
 
         return thought
 
@@ -451,15 +724,22 @@ class ThoughtBus:
         return count
 
     def _persist(self, thought: Thought) -> None:
-        """Persist thought to JSONL with file locking for crash safety."""
+        """Persist thought to JSONL (inline in sync mode, else via the group-commit writer)."""
         if not self._persist_path:
             return
+        try:
+            line = json.dumps(thought.to_json(), ensure_ascii=False) + "\n"
+        except (TypeError, ValueError):
+            return
+        if self._writer is not None:
+            self._writer.submit(line)
+            return
         try:
             with open(self._persist_path, "a", encoding="utf-8") as f:
                 # Acquire exclusive lock to prevent concurrent writes (cross-platform)
                 _lock_file(f)
                 try:
-                    f.write(json.dumps(thought.to_json(), ensure_ascii=False) + "\n")
+                    f.write(line)
                     f.flush()
                     os.fsync(f.fileno())  # Ensure data hits disk
                 finally:
@@ -468,19 +748,49 @@ class ThoughtBus:
             # Log but don't crash on persistence failure
             pass
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every thought published so far has been written."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush pending thoughts and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close(timeout)
+
+    def get_metrics(self) -> Json:
+        """Dispatch and persistence metrics (queue depth, writer lag, match cache)."""
+        with self._lock:
+            metrics: Json = {
+                "subscriptions": len(self._subs),
+                "memory": len(self._memory),
+                "match_cache_size": len(self._match_cache),
+                "match_cache_hits": self._match_cache_hits,
+                "match_cache_misses": self._match_cache_misses,
+            }
+        if self._writer is not None:
+            metrics.update(self._writer.metrics())
+        else:
+            metrics["durability"] = self.durability if self._persist_path else "none"
+            metrics["queue_depth"] = 0
+            metrics["lag_ms"] = 0.0
+        return metrics
+
     def _match_handlers(self, topic: str) -> List[Subscriber]:
         with self._lock:
+            cached = self._match_cache.get(topic)
+            if cached is not None:
+                self._match_cache_hits += 1
+                return cached
+            self._match_cache_misses += 1
             handlers: List[Subscriber] = []
-            for key, subs in self._subs.items():
-                if key == "*":
-                    handlers.extend(subs)
-                elif key.endswith("*"):
-                    prefix = key[:-1]
-                    if topic.startswith(prefix):
-                        handlers.extend(subs)
-                else:
-                    if key == topic:
-                        handlers.extend(subs)
+            # Subscription order: keys are never removed, so order is stable
+            for _, key in sorted(self._trie.match(topic)):
+                handlers.extend(self._subs[key])
+            if len(self._match_cache) >= _MATCH_CACHE_MAX:
+                self._match_cache.clear()
+            self._match_cache[topic] = handlers
             return handlers
 
 
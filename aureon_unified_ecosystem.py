@@ -717,6 +717,22 @@ except ImportError:
     NEWS_FEED_AVAILABLE = False
     print("⚠️  News Feed module not available")
 
+# ==== UNIFIED WS FEED (streamed per-venue quotes / NBBO) ====
+try:
+    from unified_ws_feed import get_running_ws_feed
+    UNIFIED_WS_FEED_AVAILABLE = True
+except ImportError:
+    get_running_ws_feed = None
+    UNIFIED_WS_FEED_AVAILABLE = False
+
+# ==== CANDLE STREAM (closed OHLC candles built from the WS ticks) ====
+try:
+    from candle_stream import get_candle_stream
+    CANDLE_STREAM_AVAILABLE = True
+except ImportError:
+    get_candle_stream = None
+    CANDLE_STREAM_AVAILABLE = False
+
 # ==== WIKIPEDIA KNOWLEDGE BASE (autonomous knowledge gathering) ====
 try:
     from aureon_knowledge_base import KnowledgeBase, create_knowledge_base
@@ -1437,6 +1453,8 @@ CONFIG = {
     'AGGRESSIVE_IGNORE_BRAIN_REDUCE': os.getenv('AGGRESSIVE_IGNORE_BRAIN_REDUCE', '1') == '1',
     'AGGRESSIVE_IGNORE_IMPERIAL_SELL': os.getenv('AGGRESSIVE_IGNORE_IMPERIAL_SELL', '1') == '1',
     'ATR_TRAIL_MULTIPLIER': 1.5,            # Trail at 1.5x ATR below peak
+    'ATR_TIMEFRAME': '15m',                 # Candle stream timeframe the ATR is computed on
+    'ATR_EXCHANGE': os.getenv('ATR_EXCHANGE') or None,  # Venue ATR candles come from (None: first to stream a symbol)
     
     # 🚀 KRAKEN ADVANCED ORDERS - Server-Side TP/SL (executes even if bot offline!)
     'USE_SERVER_SIDE_ORDERS': os.getenv('USE_SERVER_SIDE_ORDERS', '1') == '1',  # Enable Kraken native TP/SL
@@ -1712,6 +1730,7 @@ CONFIG = {
     'WS_URL': 'wss://ws.kraken.com',
     'WS_RECONNECT_DELAY': 5,        # Seconds between reconnect attempts
     'WS_HEARTBEAT_TIMEOUT': 60,     # Max seconds without WS message
+    'WS_QUOTE_MAX_AGE_S': 5.0,      # Streamed quotes older than this fall back to REST tickers
     
     # State Persistence
     'STATE_FILE': 'aureon_kraken_state.json',
@@ -2478,6 +2497,23 @@ ECOSYSTEM_BRAIN = EcosystemBrainBridge()
 # 🌐 SMART ORDER ROUTER - Best execution across exchanges
 # ═══════════════════════════════════════════════════════════════
 
+def _streamed_ticker(quote_feed, exchange: str, ex_symbol: str, max_age_s: float) -> Optional[Dict[str, Any]]:
+    """
+    Fresh ticker for exchange/ex_symbol from the WS feed's per-venue book,
+    or None so the caller falls back to a REST get_ticker.
+    """
+    feed = quote_feed
+    if feed is None and UNIFIED_WS_FEED_AVAILABLE:
+        feed = get_running_ws_feed()
+    if feed is None:
+        return None
+    try:
+        return feed.get_ticker(exchange, ex_symbol, max_age_s=max_age_s)
+    except Exception as e:
+        logger.debug(f"Streamed quote error for {exchange}/{ex_symbol}: {e}")
+        return None
+
+
 class SmartOrderRouter:
     """
     Routes orders to the best exchange based on price, liquidity, and fees.
@@ -2485,8 +2521,13 @@ class SmartOrderRouter:
     """
     
     def __init__(self, multi_client, get_cash_balance=None, battlefields: Optional[Dict[str, Any]] = None,
-                 default_min_order_usd: float = 10.0):
+                 default_min_order_usd: float = 10.0, quote_feed=None,
+                 quote_max_age_s: Optional[float] = None):
         self.client = multi_client
+        # Streamed quotes (UnifiedWSFeed) are used before REST tickers when fresh;
+        # None means "the running WS feed singleton, if any".
+        self.quote_feed = quote_feed
+        self.quote_max_age_s = float(CONFIG.get('WS_QUOTE_MAX_AGE_S', 5.0) if quote_max_age_s is None else quote_max_age_s)
         # Optional callback for liquid cash on a specific venue.
         # Signature: fn(exchange: str) -> float
         self.get_cash_balance = get_cash_balance
@@ -2516,7 +2557,8 @@ class SmartOrderRouter:
                 ex_symbol = base_symbol
                 if hasattr(self.client, 'normalize_symbol'):
                     ex_symbol = self.client.normalize_symbol(exchange, symbol)
-                ticker = self.client.get_ticker(exchange, ex_symbol)
+                ticker = (_streamed_ticker(self.quote_feed, exchange, ex_symbol, self.quote_max_age_s)
+                          or self.client.get_ticker(exchange, ex_symbol))
                 if not ticker or ticker.get('price', 0) <= 0:
                     continue
                     
@@ -2686,8 +2728,11 @@ class CrossExchangeArbitrageScanner:
     Identifies triangular and direct arbitrage opportunities.
     """
     
-    def __init__(self, multi_client):
+    def __init__(self, multi_client, quote_feed=None,
+                 quote_max_age_s: Optional[float] = None):
         self.client = multi_client
+        self.quote_feed = quote_feed          # See SmartOrderRouter
+        self.quote_max_age_s = float(CONFIG.get('WS_QUOTE_MAX_AGE_S', 5.0) if quote_max_age_s is None else quote_max_age_s)
         self.min_spread_pct = 0.3  # Minimum 0.3% spread to consider
         self.fee_buffer = 0.2     # 0.2% buffer for fees
         self.opportunities: List[Dict] = []
@@ -2716,7 +2761,8 @@ class CrossExchangeArbitrageScanner:
                 try:
                     # Normalize canonical symbol to exchange-specific
                     ex_symbol = self.client.normalize_symbol(exchange, symbol)
-                    ticker = self.client.get_ticker(exchange, ex_symbol)
+                    ticker = (_streamed_ticker(self.quote_feed, exchange, ex_symbol, self.quote_max_age_s)
+                              or self.client.get_ticker(exchange, ex_symbol))
                     if ticker and ticker.get('bid', 0) > 0:
                         prices[exchange] = {
                             'bid': float(ticker.get('bid', 0)),
@@ -8350,31 +8396,68 @@ class ATRCalculator:
     """
     Average True Range calculator for dynamic TP/SL scaling.
     Implements volatility-adjusted position management.
+
+    Fed with closed candles from the shared candle stream (attach()), or by
+    hand through update().
     """
     
     def __init__(self, period: int = 14):
         self.period = period
-        self.price_history: Dict[str, List[Dict]] = {}  # symbol -> [{high, low, close}]
+        self.price_history: Dict[str, Deque[Dict]] = {}  # symbol -> last period * 2 {high, low, close}
         self.atr_cache: Dict[str, float] = {}
         self.last_update: Dict[str, float] = {}
+        self.stream_keys: Dict[str, str] = {}            # symbol -> the one stream key feeding it
+        self._stream_token: Optional[int] = None
+        self._exchange: Optional[str] = None
         
-    def update(self, symbol: str, high: float, low: float, close: float):
+    def update(self, symbol: str, high: float, low: float, close: float, timestamp: Optional[float] = None):
         """Add new price data for ATR calculation."""
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
+        history = self.price_history.get(symbol)
+        if history is None:
+            history = self.price_history[symbol] = deque(maxlen=self.period * 2)
             
-        self.price_history[symbol].append({
+        history.append({
             'high': high,
             'low': low,
             'close': close,
-            'timestamp': time.time()
+            'timestamp': timestamp or time.time()
         })
-        
-        # Keep only last period * 2 candles
-        if len(self.price_history[symbol]) > self.period * 2:
-            self.price_history[symbol] = self.price_history[symbol][-self.period * 2:]
-            
         self.last_update[symbol] = time.time()
+    
+    def attach(self, stream, timeframe: str = '15m', exchange: Optional[str] = None) -> None:
+        """
+        Take every closed `timeframe` candle from a CandleStream, backfilling
+        from the candles it already holds. Stream keys ('binance:BTC/USDT')
+        are tracked under the venue-less exchange symbol ('BTCUSDT'), fed by
+        one venue only: `exchange` if given, else the first key to deliver
+        that symbol. Other venues' candles for it are ignored, so true ranges
+        never mix one venue's close with another's high/low.
+        """
+        if self._stream_token is not None:
+            stream.off(self._stream_token)
+        self._exchange = exchange
+        self.stream_keys.clear()
+        for key in stream.keys():
+            if self._owns(key):
+                for candle in stream.candles(key, timeframe, self.period * 2):
+                    self.update(self._symbol_for(key), candle['high'], candle['low'], candle['close'],
+                                candle['timestamp'])
+        self._stream_token = stream.on_close(self._on_close, timeframe=timeframe)
+
+    def _on_close(self, key: str, tf: str, candle) -> None:
+        if self._owns(key):
+            self.update(self._symbol_for(key), candle.high, candle.low, candle.close, candle.start)
+
+    def _owns(self, key: str) -> bool:
+        """Claim the symbol for this key unless another venue already feeds it."""
+        venue = key.rsplit(':', 1)[0] if ':' in key else None
+        if self._exchange and venue != self._exchange:
+            return False
+        return self.stream_keys.setdefault(self._symbol_for(key), key) == key
+    
+    @staticmethod
+    def _symbol_for(key: str) -> str:
+        return key.rsplit(':', 1)[-1].replace('/', '')
         
     def calculate_atr(self, symbol: str) -> float:
         """Calculate ATR for a symbol."""
@@ -13546,6 +13629,12 @@ class AureonKrakenEcosystem:
         
         # 🔥 WAR-READY ENHANCEMENTS 🔥
         self.atr_calculator = ATRCalculator(period=14)
+        if CANDLE_STREAM_AVAILABLE:
+            try:
+                self.atr_calculator.attach(get_candle_stream(), timeframe=CONFIG.get('ATR_TIMEFRAME', '15m'),
+                                          exchange=CONFIG.get('ATR_EXCHANGE'))
+            except Exception as e:
+                logger.debug(f"ATR candle stream attach failed: {e}")
         self.heat_manager = PortfolioHeatManager(max_heat=0.60)
         self.adaptive_filters = AdaptiveFilterThresholds()
         
@@ -9,6 +9,8 @@ except Exception:
     pass
 from typing import Dict, Any, Set, List, Optional, Tuple
 
+from exchange_pair_index import PairIndex, ensure_pair_index
+
 # Rate limiting utilities (TokenBucket, TTLCache)
 try:
     from rate_limiter import TokenBucket, TTLCache
@@ -1097,11 +1099,12 @@ class BinanceClient:
     _pairs_cache = None
     _pairs_cache_time = 0
     _PAIRS_CACHE_TTL = 300  # 5 minutes
+    _pair_index: Optional[PairIndex] = None
 
-    def get_available_pairs(self, base: str = None, quote: str = None) -> List[Dict[str, Any]]:
+    def _get_pair_index(self) -> PairIndex:
         """
-        Get available trading pairs, optionally filtered by base or quote asset.
-        Uses caching to avoid repeated API calls (5 min TTL).
+        Pair index built once per exchangeInfo refresh (5 min TTL).
+        On refresh failure the previous snapshot keeps serving lookups.
         """
         import time as _time
         current_time = _time.time()
@@ -1127,18 +1130,26 @@ class BinanceClient:
                 BinanceClient._pairs_cache_time = current_time
             except Exception as e:
                 print(f"Error getting pairs: {e}")
-                return BinanceClient._pairs_cache or []
-        
-        # Filter from cache
-        results = []
-        for p in (BinanceClient._pairs_cache or []):
-            if base and p["base"].upper() != base.upper():
-                continue
-            if quote and p["quote"].upper() != quote.upper():
-                continue
-            results.append(p)
         
-        return results
+        BinanceClient._pair_index = ensure_pair_index(
+            BinanceClient._pair_index, BinanceClient._pairs_cache_time,
+            lambda: BinanceClient._pairs_cache or [])
+        return BinanceClient._pair_index
+
+    def get_available_pairs(self, base: str = None, quote: str = None) -> List[Dict[str, Any]]:
+        """
+        Get available trading pairs, optionally filtered by base or quote asset.
+        Uses caching to avoid repeated API calls (5 min TTL).
+        """
+        return self._get_pair_index().pairs(base=base, quote=quote)
+
+    @staticmethod
+    def _pair_step(index: PairIndex, from_asset: str, to_asset: str) -> Optional[Dict[str, Any]]:
+        hit = index.direct(from_asset, to_asset)
+        if hit is None:
+            return None
+        entry, side = hit
+        return {"pair": entry["pair"], "side": side, "from": from_asset, "to": to_asset}
 
     def find_conversion_path(self, from_asset: str, to_asset: str) -> List[Dict[str, Any]]:
         """Find the best path to convert from one asset to another."""
@@ -1148,45 +1159,23 @@ class BinanceClient:
         if from_asset == to_asset:
             return []
         
-        pairs = self.get_available_pairs()
-        pair_map = {p["pair"]: p for p in pairs}
-        
-        # Try direct pair
-        direct_pair = f"{from_asset}{to_asset}"
-        if direct_pair in pair_map:
-            return [{"pair": direct_pair, "side": "sell", "from": from_asset, "to": to_asset}]
+        index = self._get_pair_index()
         
-        # Try inverse pair
-        inverse_pair = f"{to_asset}{from_asset}"
-        if inverse_pair in pair_map:
-            return [{"pair": inverse_pair, "side": "buy", "from": from_asset, "to": to_asset}]
+        # Try direct pair, then inverse pair
+        step = self._pair_step(index, from_asset, to_asset)
+        if step:
+            return [step]
         
         # Route through intermediary
         for intermediate in ['USDC', 'BTC', 'EUR']:  # UK-safe intermediaries
             if intermediate in (from_asset, to_asset):
                 continue
             
-            path1 = None
-            p1_direct = f"{from_asset}{intermediate}"
-            p1_inverse = f"{intermediate}{from_asset}"
-            
-            if p1_direct in pair_map:
-                path1 = {"pair": p1_direct, "side": "sell", "from": from_asset, "to": intermediate}
-            elif p1_inverse in pair_map:
-                path1 = {"pair": p1_inverse, "side": "buy", "from": from_asset, "to": intermediate}
-            
+            path1 = self._pair_step(index, from_asset, intermediate)
             if not path1:
                 continue
             
-            path2 = None
-            p2_direct = f"{intermediate}{to_asset}"
-            p2_inverse = f"{to_asset}{intermediate}"
-            
-            if p2_direct in pair_map:
-                path2 = {"pair": p2_direct, "side": "sell", "from": intermediate, "to": to_asset}
-            elif p2_inverse in pair_map:
-                path2 = {"pair": p2_inverse, "side": "buy", "from": intermediate, "to": to_asset}
-            
+            path2 = self._pair_step(index, intermediate, to_asset)
             if path2:
                 return [path1, path2]
         
@@ -1338,6 +1327,8 @@ class BinancePoolClient:
         self.client = client or BinanceClient()
         self.base = self.client.base
         self.session = self.client.session
+        self._pair_index: Optional[PairIndex] = None
+        self._pairs_time: float = 0.0
     
     def _signed_request(self, method: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Signed request using parent client's auth"""
@@ -1571,36 +1562,35 @@ class BinancePoolClient:
         Returns:
             List of pairs with base, quote, and pair name
         """
-        try:
-            info = self._request("GET", "/api/v3/exchangeInfo")
-            symbols = info.get("symbols", [])
-            results = []
-            
-            for sym in symbols:
-                if sym.get("status") != "TRADING":
-                    continue
-                
-                pair_base = sym.get("baseAsset", "")
-                pair_quote = sym.get("quoteAsset", "")
-                
-                # Apply filters
-                if base and pair_base.upper() != base.upper():
-                    continue
-                if quote and pair_quote.upper() != quote.upper():
-                    continue
-                
-                results.append({
-                    "pair": sym.get("symbol"),
-                    "base": pair_base,
-                    "quote": pair_quote,
-                    "minNotional": self._get_min_notional(sym),
-                    "minQty": self._get_min_qty(sym)
-                })
-            
-            return results
-        except Exception as e:
-            print(f"Error getting pairs: {e}")
-            return []
+        return self._get_pair_index().pairs(base=base, quote=quote)
+    
+    def _get_pair_index(self) -> PairIndex:
+        """
+        Pair index (with min notional / min qty filters) built once per
+        exchangeInfo refresh; shares the parent client's 5 min TTL.
+        """
+        now = time.time()
+        if self._pair_index is None or (now - self._pairs_time) > BinanceClient._PAIRS_CACHE_TTL:
+            try:
+                info = self.client.exchange_info()
+                entries = []
+                for sym in info.get("symbols", []):
+                    if sym.get("status") != "TRADING":
+                        continue
+                    entries.append({
+                        "pair": sym.get("symbol"),
+                        "base": sym.get("baseAsset", ""),
+                        "quote": sym.get("quoteAsset", ""),
+                        "minNotional": self._get_min_notional(sym),
+                        "minQty": self._get_min_qty(sym)
+                    })
+                self._pairs_time = now
+                self._pair_index = PairIndex(entries, token=now)
+            except Exception as e:
+                print(f"Error getting pairs: {e}")
+                if self._pair_index is None:
+                    return PairIndex([])
+        return self._pair_index
     
     def _get_min_notional(self, sym_info: Dict) -> float:
         """Extract minimum notional from symbol filters"""
@@ -1639,31 +1629,14 @@ class BinancePoolClient:
         if from_asset == to_asset:
             return []
         
-        # Get all trading pairs
-        pairs = self.get_available_pairs()
-        pair_map = {p["pair"]: p for p in pairs}
-        
-        # Try direct pair: from_asset + to_asset
-        direct_pair = f"{from_asset}{to_asset}"
-        if direct_pair in pair_map:
-            return [{
-                "pair": direct_pair,
-                "side": "sell",
-                "description": f"Sell {from_asset} for {to_asset}",
-                "from": from_asset,
-                "to": to_asset
-            }]
-        
-        # Try inverse pair: to_asset + from_asset
-        inverse_pair = f"{to_asset}{from_asset}"
-        if inverse_pair in pair_map:
-            return [{
-                "pair": inverse_pair,
-                "side": "buy",
-                "description": f"Buy {to_asset} with {from_asset}",
-                "from": from_asset,
-                "to": to_asset
-            }]
+        index = self._get_pair_index()
+        
+        # Try direct pair (sell from_asset), then inverse pair (buy to_asset)
+        step = self._pair_step(index, from_asset, to_asset)
+        if step:
+            return [step]
+        
+        uk_mode = getattr(self.client, "uk_mode", False)
         
         # No direct pair - route through intermediary (USDT, USDC, BTC, BNB)
         for intermediate in ['USDT', 'USDC', 'BTC', 'BNB', 'EUR']:
@@ -1671,7 +1644,7 @@ class BinancePoolClient:
                 continue
             
             # 🐍 MEDUSA: Skip restricted intermediaries in UK mode
-            if self.uk_mode:
+            if uk_mode:
                 if intermediate in UK_RESTRICTED_TOKENS:
                     continue
                 # Explicitly block USDC for UK users (often restricted/unavailable)
@@ -1679,37 +1652,30 @@ class BinancePoolClient:
                     continue
             
             # Check if we can go from_asset -> intermediate
-            path1 = None
-            p1_direct = f"{from_asset}{intermediate}"
-            p1_inverse = f"{intermediate}{from_asset}"
-            
-            if p1_direct in pair_map:
-                path1 = {"pair": p1_direct, "side": "sell", "from": from_asset, "to": intermediate,
-                         "description": f"Sell {from_asset} for {intermediate}"}
-            elif p1_inverse in pair_map:
-                path1 = {"pair": p1_inverse, "side": "buy", "from": from_asset, "to": intermediate,
-                         "description": f"Buy {intermediate} with {from_asset}"}
-            
+            path1 = self._pair_step(index, from_asset, intermediate)
             if not path1:
                 continue
             
             # Check if we can go intermediate -> to_asset
-            path2 = None
-            p2_direct = f"{intermediate}{to_asset}"
-            p2_inverse = f"{to_asset}{intermediate}"
-            
-            if p2_direct in pair_map:
-                path2 = {"pair": p2_direct, "side": "sell", "from": intermediate, "to": to_asset,
-                         "description": f"Sell {intermediate} for {to_asset}"}
-            elif p2_inverse in pair_map:
-                path2 = {"pair": p2_inverse, "side": "buy", "from": intermediate, "to": to_asset,
-                         "description": f"Buy {to_asset} with {intermediate}"}
-            
+            path2 = self._pair_step(index, intermediate, to_asset)
             if path2:
                 return [path1, path2]
         
         return []  # No path found
 
+    @staticmethod
+    def _pair_step(index: PairIndex, from_asset: str, to_asset: str) -> Optional[Dict[str, Any]]:
+        hit = index.direct(from_asset, to_asset)
+        if hit is None:
+            return None
+        entry, side = hit
+        if side == "sell":
+            description = f"Sell {from_asset} for {to_asset}"
+        else:
+            description = f"Buy {to_asset} with {from_asset}"
+        return {"pair": entry["pair"], "side": side, "from": from_asset, "to": to_asset,
+                "description": description}
+
     def convert_crypto(
         self,
         from_asset: str,
@@ -1843,27 +1809,7 @@ class BinancePoolClient:
         Returns:
             Dict mapping each asset to list of assets it can convert to
         """
-        pairs = self.get_available_pairs()
-        
-        # Build conversion map
-        conversions = {}
-        
-        for p in pairs:
-            base = p["base"].upper()
-            quote = p["quote"].upper()
-            
-            # Base can convert to quote (by selling)
-            if base not in conversions:
-                conversions[base] = set()
-            conversions[base].add(quote)
-            
-            # Quote can convert to base (by buying)
-            if quote not in conversions:
-                conversions[quote] = set()
-            conversions[quote].add(base)
-        
-        # Convert sets to sorted lists
-        return {k: sorted(v) for k, v in conversions.items()}
+        return self._get_pair_index().convertible()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -54,6 +54,14 @@ except ImportError:
     HarmonicLiquidAluminiumField = None
     FieldSnapshot = None
 
+# Shared streaming candles built from trade prints
+try:
+    from candle_stream import get_candle_stream
+    CANDLE_STREAM_AVAILABLE = True
+except ImportError:
+    get_candle_stream = None
+    CANDLE_STREAM_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════════════════════════════════
@@ -178,6 +186,9 @@ class BinanceWebSocketClient:
             except Exception as e:
                 logger.warning(f"🌊 Harmonic Field init failed: {e}")
         
+        # Shared candle stream (trades carry real quantity)
+        self.candles = get_candle_stream() if CANDLE_STREAM_AVAILABLE else None
+        
         # Lock
         self._lock = threading.Lock()
         
@@ -338,6 +349,12 @@ class BinanceWebSocketClient:
             
             self.latest_trades[trade.symbol] = trade
             
+            if self.candles is not None:
+                try:
+                    self.candles.ingest_trade(trade)
+                except Exception:
+                    pass
+            
             # Put in queue (drop oldest if full)
             try:
                 self.trade_queue.put(trade, block=False)
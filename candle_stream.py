@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Candle Stream
+-------------
+One streaming OHLCV service for every consumer that needs candles.
+
+Ticks from UnifiedWSFeed / BinanceWebSocketClient are folded into a
+running candle per symbol and timeframe (1m/5m/15m/1h by default). When a
+tick lands in a later bucket the running candle closes: it is written to
+an array-backed ring of closed candles and handed to on_close subscribers.
+Nothing holds raw ticks, so memory per symbol is fixed.
+
+    stream = get_candle_stream()
+    stream.on_close(lambda key, tf, candle: ..., timeframe='5m')
+    stream.ingest('binance:BTC/USDT', 97000.0, 0.01, ts)
+    closes = stream.closes('binance:BTC/USDT', '1m', 30)   # zero-copy view
+
+Rings are stored twice back to back, so the last n candles are always one
+contiguous slice. window()/closes() return read-only views of that slice.
+A view stays valid until (capacity - n) more candles close on that ring;
+copy it if you hold on to it longer.
+
+Buckets close on the next tick (or flush(now)). Empty buckets are not
+filled in; a gap simply shows as a jump in the start column.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+TIMEFRAMES: Dict[str, int] = {'1m': 60, '5m': 300, '15m': 900, '1h': 3600}
+DEFAULT_TIMEFRAMES = ('1m', '5m', '15m', '1h')
+DEFAULT_HISTORY = 240               # Closed candles kept per symbol/timeframe
+
+# Column layout of window() rows
+START, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+class Candle(NamedTuple):
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ticks: int
+
+    def to_dict(self) -> Dict[str, float]:
+        """Dict shape used by the REST-kline code paths."""
+        return {'timestamp': self.start, 'open': self.open, 'high': self.high,
+                'low': self.low, 'close': self.close, 'volume': self.volume}
+
+
+CloseCallback = Callable[[str, str, Candle], None]
+
+
+def stream_key(symbol: str, exchange: Optional[str] = None) -> str:
+    """Key for one venue's candles ('binance:BTC/USDT') or a venue-less symbol."""
+    return f"{exchange}:{symbol}" if exchange else symbol
+
+
+class CandleRing:
+    """Closed candles for one symbol/timeframe in a mirrored (2 x capacity, 6) array."""
+
+    __slots__ = ('capacity', 'count', '_buf')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0                  # Candles ever appended
+        self._buf = np.zeros((2 * capacity, 6), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, row: Sequence[float]):
+        slot = self.count % self.capacity
+        self._buf[slot] = row
+        self._buf[slot + self.capacity] = row
+        self.count += 1
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """Last n closed candles, oldest first, as a read-only view."""
+        size = len(self)
+        n = size if n is None else max(0, min(n, size))
+        start = (self.count - n) % self.capacity
+        view = self._buf[start:start + n]
+        view.flags.writeable = False
+        return view
+
+
+class CandleStream:
+    """Running multi-timeframe OHLCV per symbol, fed by ticks."""
+
+    def __init__(self, timeframes: Iterable[str] = DEFAULT_TIMEFRAMES, history: int = DEFAULT_HISTORY):
+        self.timeframes: List[Tuple[str, int]] = [(tf, TIMEFRAMES[tf]) for tf in timeframes]
+        self.history = history
+        self._live: Dict[str, List[Optional[List[float]]]] = {}      # key -> per-timeframe running candle
+        self._rings: Dict[str, Dict[str, CandleRing]] = {}
+        self._subscribers: Dict[int, Tuple[CloseCallback, Optional[str], Optional[str]]] = {}
+        self._next_token = 0
+        self._last_volume_24h: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.ticks_ingested = 0
+        self.candles_closed = 0
+
+    # -- subscriptions ----------------------------------------------------
+    def on_close(self, callback: CloseCallback, timeframe: Optional[str] = None,
+                 key: Optional[str] = None) -> int:
+        """Call callback(key, timeframe, candle) whenever a matching candle closes."""
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (callback, timeframe, key)
+            return self._next_token
+
+    def off(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    # -- ingest -----------------------------------------------------------
+    def ingest(self, key: str, price: float, volume: float = 0.0,
+               ts: Optional[float] = None) -> List[Tuple[str, Candle]]:
+        """Fold one tick in; returns the (timeframe, candle) pairs it closed."""
+        if price is None or price <= 0:
+            return []
+        if ts is None:
+            ts = time.time()
+        closed: List[Tuple[str, Candle]] = []
+        with self._lock:
+            live = self._live.get(key)
+            if live is None:
+                live = self._live[key] = [None] * len(self.timeframes)
+            for i, (tf, seconds) in enumerate(self.timeframes):
+                start = ts - ts % seconds
+                bar = live[i]
+                if bar is None:
+                    live[i] = [start, price, price, price, price, volume, 1]
+                    continue
+                if start > bar[0]:
+                    closed.append((tf, self._close(key, tf, bar)))
+                    live[i] = [start, price, price, price, price, volume, 1]
+                elif start == bar[0]:
+                    if price > bar[2]:
+                        bar[2] = price
+                    if price < bar[3]:
+                        bar[3] = price
+                    bar[4] = price
+                    bar[5] += volume
+                    bar[6] += 1
+                # Ticks older than the running bucket are late; dropped
+            self.ticks_ingested += 1
+            subscribers = list(self._subscribers.values()) if closed else ()
+        for tf, candle in closed:
+            self._notify(subscribers, key, tf, candle)
+        return closed
+
+    def ingest_tick(self, tick: Any, per_exchange: bool = True) -> List[Tuple[str, Candle]]:
+        """
+        Ingest a UnifiedWSFeed NormalizedTick. Ticker streams only carry 24h
+        volume, so candle volume is the positive change in volume_24h.
+        """
+        key = stream_key(tick.symbol, tick.exchange if per_exchange else None)
+        volume = 0.0
+        v24 = getattr(tick, 'volume_24h', 0.0) or 0.0
+        vol_key = f"{tick.exchange}:{tick.symbol}"
+        prev = self._last_volume_24h.get(vol_key)
+        if prev is not None and v24 > prev:
+            volume = v24 - prev
+        self._last_volume_24h[vol_key] = v24
+        return self.ingest(key, tick.last, volume, tick.timestamp)
+
+    def ingest_trade(self, trade: Any, exchange: str = 'binance') -> List[Tuple[str, Candle]]:
+        """Ingest a BinanceWebSocketClient WSTrade (true traded quantity)."""
+        try:
+            from unified_ws_feed import normalize_symbol
+            symbol = normalize_symbol(trade.symbol, exchange)
+        except Exception:
+            symbol = trade.symbol
+        ts = trade.timestamp.timestamp() if hasattr(trade.timestamp, 'timestamp') else float(trade.timestamp)
+        return self.ingest(stream_key(symbol, exchange), trade.price, trade.quantity, ts)
+
+    def flush(self, now: Optional[float] = None) -> List[Tuple[str, str, Candle]]:
+        """Close running candles whose bucket has ended (no tick needed)."""
+        if now is None:
+            now = time.time()
+        closed = []
+        with self._lock:
+            for key, live in self._live.items():
+                for i, (tf, seconds) in enumerate(self.timeframes):
+                    bar = live[i]
+                    if bar is not None and now >= bar[0] + seconds:
+                        closed.append((key, tf, self._close(key, tf, bar)))
+                        live[i] = None
+            subscribers = list(self._subscribers.values()) if closed else ()
+        for key, tf, candle in closed:
+            self._notify(subscribers, key, tf, candle)
+        return closed
+
+    def _close(self, key: str, tf: str, bar: List[float]) -> Candle:
+        rings = self._rings.get(key)
+        if rings is None:
+            rings = self._rings[key] = {}
+        ring = rings.get(tf)
+        if ring is None:
+            ring = rings[tf] = CandleRing(self.history)
+        ring.append(bar[:6])
+        self.candles_closed += 1
+        return Candle(*bar)
+
+    @staticmethod
+    def _notify(subscribers, key: str, tf: str, candle: Candle):
+        for callback, want_tf, want_key in subscribers:
+            if (want_tf is None or want_tf == tf) and (want_key is None or want_key == key):
+                try:
+                    callback(key, tf, candle)
+                except Exception:
+                    pass
+
+    # -- reads ------------------------------------------------------------
+    def window(self, key: str, timeframe: str, n: Optional[int] = None) -> np.ndarray:
+        """Last n closed candles as a read-only (n, 6) view: start, o, h, l, c, v."""
+        ring = self._rings.get(key, {}).get(timeframe)
+        if ring is None:
+            return np.zeros((0, 6))
+        return ring.window(n)
+
+    def closes(self, key: str, timeframe: str, n: Optional[int] = None) -> np.ndarray:
+        return self.window(key, timeframe, n)[:, CLOSE]
+
+    def count(self, key: str, timeframe: str) -> int:
+        ring = self._rings.get(key, {}).get(timeframe)
+        return len(ring) if ring is not None else 0
+
+    def current(self, key: str, timeframe: str) -> Optional[Candle]:
+        """The still-forming candle, if any."""
+        live = self._live.get(key)
+        if live is None:
+            return None
+        for i, (tf, _) in enumerate(self.timeframes):
+            if tf == timeframe and live[i] is not None:
+                return Candle(*live[i])
+        return None
+
+    def candles(self, key: str, timeframe: str, n: Optional[int] = None) -> List[Dict[str, float]]:
+        """Closed candles as dicts (timestamp/open/high/low/close/volume)."""
+        return [{'timestamp': row[START], 'open': row[OPEN], 'high': row[HIGH], 'low': row[LOW],
+                 'close': row[CLOSE], 'volume': row[VOLUME]}
+                for row in self.window(key, timeframe, n).tolist()]
+
+    def keys(self) -> List[str]:
+        return list(self._live)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'symbols': len(self._live),
+            'timeframes': [tf for tf, _ in self.timeframes],
+            'history': self.history,
+            'ticks_ingested': self.ticks_ingested,
+            'candles_closed': self.candles_closed,
+            'subscribers': len(self._subscribers),
+        }
+
+
+# Singleton instance for easy access
+_candle_stream: Optional[CandleStream] = None
+
+
+def get_candle_stream() -> CandleStream:
+    """Process-wide candle stream shared by the WS feeds and their consumers."""
+    global _candle_stream
+    if _candle_stream is None:
+        _candle_stream = CandleStream()
+    return _candle_stream
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Chirp bus stress / throughput benchmark
+
+One writer process floods a broadcast ChirpRingBuffer while N reader
+processes follow it with their own cursors. Every chirp's 8 bytes carry its
+own sequence number, so each reader checks what it got: torn or out-of-order
+chirps are counted (must be 0) and received + lost must equal the count
+written (lost > 0 only when a reader was lapped).
+
+With --writers W > 1, W processes write `count` chirps each at the same
+time. A chirp then carries (writer, counter, check bits) instead: readers
+count a chirp as torn if the check bits do not match or a writer's counter
+goes backwards, and the ring's final write_seq must equal W * count (a
+racing sequence claim would lose increments).
+
+Usage:
+- `python chirp_bus_bench.py`                           (1M chirps, 4 readers)
+- `python chirp_bus_bench.py --count 200000 --readers 8 --slots 1024`
+- `python chirp_bus_bench.py --single`                  (read() instead of read_many)
+- `python chirp_bus_bench.py --writers 4 --count 100000`
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import sys
+import time
+import struct
+import argparse
+import multiprocessing as mp
+from typing import Any, Dict
+
+import numpy as np
+
+from aureon_chirp_bus import CHIRP_SIZE, ChirpRingBuffer
+
+SEQ_PAYLOAD = struct.Struct("<Q")
+WRITER_PAYLOAD = struct.Struct("<IHH")           # counter, writer, check
+WRITER_DTYPE = np.dtype([("counter", "<u4"), ("writer", "<u2"), ("check", "<u2")])
+
+
+def _check_bits(counter, writer):
+    """16 bits derived from both fields; works on ints and numpy arrays alike."""
+    return (counter ^ (counter >> 16) ^ (writer * 0x9E37)) & 0xFFFF
+
+
+def _writer_payload(writer: int, counter: int) -> bytes:
+    return WRITER_PAYLOAD.pack(counter, writer, _check_bits(counter, writer))
+
+
+def _check_writer_chirps(chirps: np.ndarray, last: np.ndarray) -> int:
+    """Torn chirps in a batch of (counter, writer, check) records; updates last counter per writer."""
+    counter = chirps["counter"].astype(np.int64)
+    writer = chirps["writer"].astype(np.int64)
+    torn = np.count_nonzero(_check_bits(counter, writer) != chirps["check"])
+    for w in np.unique(writer).tolist():
+        if w >= len(last):
+            torn += int(np.count_nonzero(writer == w))
+            continue
+        mine = np.concatenate(([last[w]], counter[writer == w]))
+        torn += int(np.count_nonzero(np.diff(mine) <= 0))   # A writer's chirps arrive in order
+        last[w] = mine[-1]
+    return int(torn)
+
+
+def _reader_proc(name: str, ready, go, done, results, batch: int, single: bool, writers: int = 1) -> None:
+    ring = ChirpRingBuffer(name=name, create=False)
+    reader = ring.reader(from_start=True)
+    out = bytearray(batch * CHIRP_SIZE)
+    last = np.full(writers, -1, dtype=np.int64)
+    torn = 0
+    ready.release()
+    go.wait()
+    start = time.perf_counter()
+    while True:
+        if single:
+            chirp = reader.read()
+            n = 0 if chirp is None else 1
+            if n and writers > 1:
+                torn += _check_writer_chirps(np.frombuffer(chirp, dtype=WRITER_DTYPE), last)
+            elif n and SEQ_PAYLOAD.unpack(chirp)[0] != reader.seq - 1:
+                torn += 1
+        else:
+            n = reader.read_many(out)
+            if n and writers > 1:
+                torn += _check_writer_chirps(np.frombuffer(out, dtype=WRITER_DTYPE, count=n), last)
+            elif n:
+                got = np.frombuffer(out, dtype="<u8", count=n)
+                torn += int(np.count_nonzero(got != np.arange(reader.seq - n, reader.seq, dtype=np.uint64)))
+        if not n:
+            if done.is_set() and not reader.pending():
+                break
+            time.sleep(0)
+    elapsed = time.perf_counter() - start
+    results.put({
+        'pid': os.getpid(),
+        'received': reader.received,
+        'lost': reader.lost,
+        'overruns': reader.overruns,
+        'torn': torn,
+        'elapsed_s': elapsed,
+        'reads_per_s': reader.received / elapsed if elapsed > 0 else 0.0,
+    })
+    ring.close()
+
+
+def _writer_proc(name: str, writer: int, count: int, ready, go) -> None:
+    ring = ChirpRingBuffer(name=name, create=False)
+    ready.release()
+    go.wait()
+    for i in range(count):
+        ring.write(_writer_payload(writer, i))
+    ring.close()
+
+
+def run_stress(count: int = 1_000_000, readers: int = 4, slots: int = 4096, batch: int = 512,
+               single: bool = False, name: str = '', writers: int = 1) -> Dict[str, Any]:
+    """
+    Write `count` chirps (per writer) under `readers` reader processes and
+    collect their checks. writers=1 writes from this process; more start
+    one writer process each.
+    """
+    ctx = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+    name = name or f"chirp_bench_{os.getpid()}_{int(time.time() * 1000) % 100000}"
+    ring = ChirpRingBuffer(name=name, slots=slots, create=True)
+    if not ring._initialized:
+        raise RuntimeError("shared memory not available")
+    ready, go, done, results = ctx.Semaphore(0), ctx.Event(), ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=_reader_proc, args=(name, ready, go, done, results, batch, single, writers),
+                         daemon=True)
+             for _ in range(readers)]
+    writer_procs = [] if writers <= 1 else [
+        ctx.Process(target=_writer_proc, args=(name, w, count, ready, go), daemon=True) for w in range(writers)]
+    try:
+        for p in procs + writer_procs:
+            p.start()
+        for _ in procs + writer_procs:
+            ready.acquire()
+        go.set()
+        start = time.perf_counter()
+        if writer_procs:
+            for p in writer_procs:
+                p.join()
+        else:
+            for i in range(count):
+                ring.write(SEQ_PAYLOAD.pack(i))
+        write_s = time.perf_counter() - start
+        done.set()
+        reports = [results.get(timeout=120) for _ in procs]
+        for p in procs:
+            p.join(10)
+        write_seq = ring.write_seq()
+    finally:
+        for p in procs + writer_procs:
+            if p.is_alive():
+                p.terminate()
+        ring.close()
+        ring.unlink()
+    total = count * max(1, writers)
+    return {
+        'count': total,
+        'writers': max(1, writers),
+        'write_seq': write_seq,
+        'slots': slots,
+        'write_s': write_s,
+        'writes_per_s': total / write_s if write_s > 0 else 0.0,
+        'readers': reports,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description='Multi-process ChirpRingBuffer stress / throughput')
+    ap.add_argument('--count', type=int, default=1_000_000)
+    ap.add_argument('--readers', type=int, default=4)
+    ap.add_argument('--slots', type=int, default=4096)
+    ap.add_argument('--batch', type=int, default=512, help='read_many buffer size in chirps')
+    ap.add_argument('--single', action='store_true', help='Use read() one chirp at a time')
+    ap.add_argument('--writers', type=int, default=1, help='Concurrent writer processes (count chirps each)')
+    args = ap.parse_args()
+
+    result = run_stress(args.count, args.readers, args.slots, args.batch, args.single, writers=args.writers)
+    print(f"{result['writers']} writer(s): {result['count']:,} chirps in {result['write_s']:.3f}s "
+          f"({result['writes_per_s']:,.0f}/s), {result['slots']} slots, write_seq={result['write_seq']:,}")
+    ok = result['write_seq'] == result['count']
+    for i, r in enumerate(result['readers']):
+        ok &= r['torn'] == 0 and r['received'] + r['lost'] == result['count']
+        print(f"  reader {i}: received={r['received']:,} lost={r['lost']:,} overruns={r['overruns']} "
+              f"torn={r['torn']} {r['reads_per_s']:,.0f}/s")
+    print("OK" if ok else "FAILED: torn chirps, lost sequence claims or unaccounted sequence numbers")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
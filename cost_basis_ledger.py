@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Cost Basis Ledger
+-----------------
+Storage backends for CostBasisTracker.
+
+The tracker keeps its positions / trade_lots dicts in memory and hands the
+ledger a list of per-key operations to apply in one transaction:
+
+    ('put', key, position_json)      upsert one position
+    ('delete', key)                  drop a position and its lots
+    ('lots', key, [lot tuples])      replace the lots of one position
+    ('append_lot', key, lot tuple)   add one FIFO lot
+    ('consume', key, quantity)       FIFO-consume lots (oldest first)
+    ('meta', name, value)            e.g. last_sync
+
+SqliteLedger (default) stores them in WAL mode: positions keyed by the
+tracker key with an index on canonical (exchange, base, quote), and a lot
+table indexed by (position_key, id) so a sell touches only the lots it
+consumes. Writers only rewrite the keys they changed, so Orca, the
+labyrinth and the sync jobs no longer overwrite each other's positions.
+Commits use BEGIN IMMEDIATE; PRAGMA data_version tells a process when
+another one has committed so it can reload.
+
+The old JSON file is imported into an empty ledger on first open. If
+something else rewrites it later (e.g. reconcile_positions.py) it is merged
+by last-modified: positions the ledger changed after the file was written
+are kept, and positions missing from the file are never deleted. It is kept
+up to date as a read-only mirror, written at most every mirror_interval
+seconds (and only after a real change), for the scripts that still read
+cost_basis_history.json directly.
+
+locked() holds the write lock across a read-modify-write, so a tracker can
+re-read a position and write it back without another process committing
+in between.
+
+JsonLedger keeps the original behaviour (full rewrite per commit).
+
+    python cost_basis_ledger.py --import cost_basis_history.json
+    python cost_basis_ledger.py --export cost_basis_history.json
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import atexit
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LEDGER_BACKEND_ENV = "AUREON_COST_BASIS_BACKEND"     # 'sqlite' (default) or 'json'
+LOT_DUST = 0.000001                                   # Lots at or below this are removed on consume
+MIRROR_INTERVAL = 30.0                                # Seconds between JSON mirror writes
+
+# Quote suffixes for splitting un-slashed symbols, longest first
+QUOTE_ASSETS = ('USDC.P', 'FDUSD', 'ZUSD', 'ZEUR', 'ZGBP', 'USDT', 'USDC', 'BUSD', 'TUSD',
+                'USD', 'EUR', 'GBP', 'BTC', 'ETH')
+
+LOT_FIELDS = ('price', 'quantity', 'timestamp', 'fee', 'order_id')
+LotTuple = Tuple[float, float, float, float, Optional[str]]
+Op = Tuple[Any, ...]
+
+
+def canonical_pair(key: str, pos: Optional[Dict[str, Any]] = None) -> Tuple[str, str, str]:
+    """
+    (exchange, base, quote) for a tracker key such as 'binance:BTCUSDC',
+    'kraken:SOL/USD' or a bare 'SHIBUSD'. Exchange is the key prefix only,
+    so bare keys index under ''.
+    """
+    exchange, _, symbol = key.rpartition(':')
+    if pos and pos.get('symbol'):
+        symbol = pos['symbol']
+    symbol = symbol.upper()
+    if '/' in symbol:
+        base, _, quote = symbol.partition('/')
+        return exchange.lower(), base, quote
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return exchange.lower(), symbol[:-len(quote)], quote
+    return exchange.lower(), symbol, ''
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """(base, quote) of a lookup symbol, same rules as canonical_pair."""
+    _, base, quote = canonical_pair(symbol)
+    return base, quote
+
+
+class PositionIndex:
+    """In-memory canonical index over the tracker's positions."""
+
+    def __init__(self):
+        self._pairs: Dict[str, Tuple[str, str, str]] = {}          # key -> (exchange, base, quote)
+        self._by_pair: Dict[Tuple[str, str, str], List[str]] = {}
+        self._by_base: Dict[str, List[str]] = {}
+        self._symbols: Optional[List[Tuple[str, str]]] = None       # sorted (stored symbol, key)
+        self._stored: Dict[str, str] = {}
+
+    def rebuild(self, positions: Dict[str, Dict[str, Any]]):
+        self.__init__()
+        for key, pos in positions.items():
+            self.add(key, pos)
+
+    def add(self, key: str, pos: Dict[str, Any]):
+        if key in self._pairs:
+            self.remove(key)
+        pair = canonical_pair(key, pos)
+        self._pairs[key] = pair
+        self._by_pair.setdefault(pair, []).append(key)
+        self._by_base.setdefault(pair[1], []).append(key)
+        self._stored[key] = pos.get('symbol', key)
+        self._symbols = None
+
+    def remove(self, key: str):
+        pair = self._pairs.pop(key, None)
+        if pair is None:
+            return
+        self._by_pair[pair].remove(key)
+        if not self._by_pair[pair]:
+            del self._by_pair[pair]
+        self._by_base[pair[1]].remove(key)
+        if not self._by_base[pair[1]]:
+            del self._by_base[pair[1]]
+        self._stored.pop(key, None)
+        self._symbols = None
+
+    def pair(self, exchange: str, base: str, quote: str) -> List[str]:
+        return self._by_pair.get((exchange.lower(), base.upper(), quote.upper()), [])
+
+    def base(self, base: str) -> List[str]:
+        return self._by_base.get(base.upper(), [])
+
+    def prefix(self, prefix: str) -> Optional[str]:
+        """First key whose stored symbol starts with prefix (old strategy 5 reach)."""
+        if self._symbols is None:
+            self._symbols = sorted((s, k) for k, s in self._stored.items())
+        i = bisect.bisect_left(self._symbols, (prefix, ''))
+        if i < len(self._symbols) and self._symbols[i][0].startswith(prefix):
+            return self._symbols[i][1]
+        return None
+
+
+def lot_tuple(lot: Any) -> LotTuple:
+    return (lot.price, lot.quantity, lot.timestamp, lot.fee, lot.order_id)
+
+
+def _snapshot(positions: Dict[str, Dict[str, Any]], trade_lots: Dict[str, List[Dict[str, Any]]],
+              last_sync: float) -> Dict[str, Any]:
+    return {
+        'positions': positions,
+        'trade_lots': trade_lots,
+        'last_sync': last_sync,
+        'updated_at': datetime.now().isoformat(),
+    }
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class JsonLedger:
+    """The original single-file store: every commit rewrites the whole file."""
+
+    name = 'json'
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]], float]:
+        if not os.path.exists(self.filepath):
+            return {}, {}, 0
+        with open(self.filepath, 'r') as f:
+            data = json.load(f)
+        return data.get('positions', {}), data.get('trade_lots', {}), data.get('last_sync', 0)
+
+    @contextmanager
+    def locked(self):
+        yield self
+
+    def position(self, key: str) -> Optional[Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """The in-memory dicts are the only copy, so there is nothing to re-read."""
+        return None
+
+    def apply(self, ops: Sequence[Op], tracker: Any = None):
+        """Ignores the ops and serialises the tracker's live dicts."""
+        if tracker is None:
+            return
+        lots = {k: [t.__dict__ for t in v] for k, v in tracker.trade_lots.items()}
+        _write_json(self.filepath, _snapshot(tracker.positions, lots, tracker.last_sync))
+
+    def changed(self) -> bool:
+        return False
+
+    def close(self):
+        pass
+
+
+class SqliteLedger:
+    """WAL-mode SQLite store with per-key upserts and an indexed FIFO lot table."""
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS positions (
+            key TEXT PRIMARY KEY,
+            exchange TEXT NOT NULL,
+            base TEXT NOT NULL,
+            quote TEXT NOT NULL,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS positions_pair ON positions(exchange, base, quote);
+        CREATE INDEX IF NOT EXISTS positions_base ON positions(base);
+        CREATE TABLE IF NOT EXISTS lots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            position_key TEXT NOT NULL,
+            price REAL NOT NULL,
+            quantity REAL NOT NULL,
+            timestamp REAL NOT NULL,
+            fee REAL NOT NULL DEFAULT 0,
+            order_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS lots_fifo ON lots(position_key, id);
+        CREATE TABLE IF NOT EXISTS meta (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path: str, json_mirror: Optional[str] = None,
+                 mirror_interval: float = MIRROR_INTERVAL, timeout: float = 30.0):
+        self.path = path
+        self.json_mirror = json_mirror
+        self.mirror_interval = mirror_interval
+        self._lock = threading.RLock()
+        self._tx_depth = 0
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._data_version = self._version()
+        self._last_mirror = 0.0
+        self._mirror_stale = False
+        self.commits = 0
+        self._import_if_needed()
+        if json_mirror:
+            atexit.register(self.close)
+
+    # -- transactions -----------------------------------------------------
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT; nested calls join the open transaction."""
+        with self._lock:
+            if self._tx_depth:
+                self._tx_depth += 1
+                try:
+                    yield self._conn
+                finally:
+                    self._tx_depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._tx_depth = 1
+            try:
+                yield self._conn
+            except BaseException:
+                self._tx_depth = 0
+                self._conn.execute("ROLLBACK")
+                raise
+            self._tx_depth = 0
+            self._conn.execute("COMMIT")
+            self.commits += 1
+
+    @contextmanager
+    def locked(self):
+        """Hold the write lock: reads and apply() inside see and commit one state."""
+        with self._transaction():
+            yield self
+        self._maybe_mirror()
+
+    def _version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self) -> bool:
+        """True once after another connection has committed."""
+        with self._lock:
+            version = self._version()
+            if version != self._data_version:
+                self._data_version = version
+                return True
+            return False
+
+    # -- reads ------------------------------------------------------------
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]], float]:
+        with self._lock:
+            positions = {key: json.loads(data) for key, data in
+                         self._conn.execute("SELECT key, data FROM positions ORDER BY rowid")}
+            trade_lots: Dict[str, List[Dict[str, Any]]] = {}
+            for row in self._conn.execute(
+                    "SELECT position_key, price, quantity, timestamp, fee, order_id FROM lots ORDER BY position_key, id"):
+                trade_lots.setdefault(row[0], []).append(dict(zip(LOT_FIELDS, row[1:])))
+            last_sync = float(self._meta('last_sync') or 0)
+            self._data_version = self._version()
+        return positions, trade_lots, last_sync
+
+    def find(self, exchange: Optional[str], base: str, quote: Optional[str] = None) -> List[str]:
+        """Keys for a canonical pair via the (exchange, base, quote) index."""
+        sql, args = "SELECT key FROM positions WHERE base = ?", [base.upper()]
+        if exchange is not None:
+            sql, args = sql + " AND exchange = ?", args + [exchange.lower()]
+        if quote is not None:
+            sql, args = sql + " AND quote = ?", args + [quote.upper()]
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql + " ORDER BY rowid", args)]
+
+    def position(self, key: str) -> Optional[Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """(position or None, lots) as committed - use inside locked() for a read-modify-write."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM positions WHERE key = ?", (key,)).fetchone()
+            return (json.loads(row[0]) if row else None), self.lots(key)
+
+    def lots(self, key: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(zip(LOT_FIELDS, row)) for row in self._conn.execute(
+                "SELECT price, quantity, timestamp, fee, order_id FROM lots WHERE position_key = ? ORDER BY id",
+                (key,))]
+
+    def _meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    # -- writes -----------------------------------------------------------
+    def apply(self, ops: Sequence[Op], tracker: Any = None):
+        """Apply queued tracker operations in one transaction."""
+        if not ops:
+            return
+        now = time.time()
+        self._apply(ops, now)
+        if any(op[0] != 'meta' for op in ops):
+            self._mirror_stale = True
+        self._maybe_mirror()
+
+    def _maybe_mirror(self):
+        """Throttled mirror write after a change (deferred while a transaction is open)."""
+        if self.json_mirror and self._mirror_stale and not self._tx_depth \
+                and time.time() - self._last_mirror >= self.mirror_interval:
+            self.write_mirror()
+
+    def _apply(self, ops: Sequence[Op], now: float):
+        with self._transaction() as db:
+            for op in ops:
+                kind = op[0]
+                if kind == 'put':
+                    _, key, data = op
+                    exchange, base, quote = canonical_pair(key, json.loads(data))
+                    db.execute(
+                        "INSERT INTO positions (key, exchange, base, quote, data, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET exchange = excluded.exchange, base = excluded.base, "
+                        "quote = excluded.quote, data = excluded.data, updated_at = excluded.updated_at",
+                        (key, exchange, base, quote, data, now))
+                elif kind == 'delete':
+                    db.execute("DELETE FROM positions WHERE key = ?", (op[1],))
+                    db.execute("DELETE FROM lots WHERE position_key = ?", (op[1],))
+                elif kind == 'lots':
+                    _, key, lots = op
+                    db.execute("DELETE FROM lots WHERE position_key = ?", (key,))
+                    db.executemany(
+                        "INSERT INTO lots (position_key, price, quantity, timestamp, fee, order_id) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(key,) + tuple(lot) for lot in lots])
+                elif kind == 'append_lot':
+                    _, key, lot = op
+                    db.execute(
+                        "INSERT INTO lots (position_key, price, quantity, timestamp, fee, order_id) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key,) + tuple(lot))
+                elif kind == 'consume':
+                    self._consume(db, op[1], op[2])
+                elif kind == 'meta':
+                    db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (op[1], str(op[2])))
+            self._data_version = self._version()
+
+    @staticmethod
+    def _consume(db: sqlite3.Connection, key: str, quantity: float):
+        """FIFO walk of the lot index; only the consumed lots are touched."""
+        remaining = quantity
+        cursor = db.execute("SELECT id, quantity FROM lots WHERE position_key = ? ORDER BY id", (key,))
+        updates, deletes = [], []
+        for lot_id, lot_qty in cursor:
+            if remaining <= 0:
+                break
+            take = min(lot_qty, remaining)
+            lot_qty -= take
+            remaining -= take
+            if lot_qty <= LOT_DUST:
+                deletes.append((lot_id,))
+            else:
+                updates.append((lot_qty, lot_id))
+        db.executemany("DELETE FROM lots WHERE id = ?", deletes)
+        db.executemany("UPDATE lots SET quantity = ? WHERE id = ?", updates)
+
+    # -- JSON import / mirror ---------------------------------------------
+    def import_json(self, path: str, newer_only: bool = False) -> int:
+        """
+        Load a cost_basis_history.json file into the ledger; returns positions
+        written. Positions missing from the file are left alone. With
+        newer_only, a position the ledger updated after the file was written
+        is kept as well.
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        mtime_ns = os.stat(path).st_mtime_ns
+        positions = data.get('positions', {})
+        trade_lots = data.get('trade_lots', {})
+        with self._transaction() as db:
+            updated = {key: ts for key, ts in db.execute("SELECT key, updated_at FROM positions")}
+            keys = [key for key in positions
+                    if not newer_only or updated.get(key, 0.0) * 1e9 < mtime_ns]
+            ops: List[Op] = [('put', key, json.dumps(positions[key])) for key in keys]
+            ops.extend(('lots', key, [tuple(lot.get(name, 0.0 if name != 'order_id' else None)
+                                            for name in LOT_FIELDS) for lot in trade_lots.get(key, [])])
+                       for key in keys)
+            if not updated:
+                ops.append(('meta', 'last_sync', data.get('last_sync', 0)))
+            ops.append(('meta', 'json_mtime_ns', mtime_ns))
+            # The file already holds this state: no mirror write needed
+            self._apply(ops, mtime_ns / 1e9)
+        return len(keys)
+
+    def _import_if_needed(self):
+        """Import the JSON file into an empty ledger, or merge it if another tool rewrote it."""
+        if not self.json_mirror or not os.path.exists(self.json_mirror):
+            return
+        with self._lock:
+            seen = self._meta('json_mtime_ns')
+            empty = self._conn.execute("SELECT 1 FROM positions LIMIT 1").fetchone() is None
+        if seen is not None and int(seen) == os.stat(self.json_mirror).st_mtime_ns:
+            return
+        try:
+            count = self.import_json(self.json_mirror, newer_only=not empty)
+            verb = 'imported' if empty else 'merged'
+            print(f"📊 Cost Basis Ledger: {verb} {count} positions from {self.json_mirror}")
+        except Exception as e:
+            print(f"⚠️ Cost Basis Ledger: could not import {self.json_mirror}: {e}")
+
+    def export(self) -> Dict[str, Any]:
+        positions, lots, last_sync = self.load()
+        return _snapshot(positions, lots, last_sync)
+
+    def write_mirror(self, path: Optional[str] = None):
+        """Write the JSON view read by legacy scripts (atomic replace)."""
+        path = path or self.json_mirror
+        if not path:
+            return
+        try:
+            _write_json(path, self.export())
+            if path == self.json_mirror:
+                self._last_mirror = time.time()
+                self._mirror_stale = False
+                with self._transaction() as db:
+                    db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                               ('json_mtime_ns', str(os.stat(path).st_mtime_ns)))
+                    self._data_version = self._version()
+        except Exception as e:
+            print(f"⚠️ Cost Basis Ledger: failed to write {path}: {e}")
+
+    def close(self):
+        """Flush a pending mirror write and close the connection (idempotent)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            if self.json_mirror and self._mirror_stale:
+                self.write_mirror()
+            self._conn.close()
+            self._conn = None
+
+
+def open_ledger(filepath: str, backend: Optional[str] = None):
+    """
+    Ledger for a tracker file. SQLite lives next to the JSON file
+    (cost_basis_history.json -> cost_basis_history.db) and mirrors it.
+    """
+    backend = (backend or os.environ.get(LEDGER_BACKEND_ENV) or 'sqlite').lower()
+    if backend == 'json':
+        return JsonLedger(filepath)
+    db_path = os.path.splitext(filepath)[0] + '.db'
+    return SqliteLedger(db_path, json_mirror=filepath)
+
+
+def _main(argv: Optional[Iterable[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Cost basis ledger import/export")
+    parser.add_argument('--db', help="SQLite ledger (default: <json>.db)")
+    parser.add_argument('--import', dest='import_path', help="Import a cost_basis_history.json")
+    parser.add_argument('--export', dest='export_path', help="Write the ledger as JSON")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    source = args.import_path or args.export_path
+    if not source:
+        parser.error("--import or --export is required")
+    ledger = SqliteLedger(args.db or os.path.splitext(source)[0] + '.db')
+    if args.import_path:
+        print(f"Imported {ledger.import_json(args.import_path)} positions into {ledger.path}")
+    if args.export_path:
+        ledger.write_mirror(args.export_path)
+        print(f"Exported {ledger.path} to {args.export_path}")
+    ledger.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -33,6 +33,7 @@ from datetime import datetime
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
 from typing import List
+from contextlib import contextmanager
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔇 WINDOWS UTF-8 FIX - MUST BE BEFORE ANY PRINT STATEMENTS!
@@ -120,6 +121,7 @@ from datetime import datetime
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
 from typing import List
+from contextlib import contextmanager
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔇 WINDOWS UTF-8 FIX - MUST BE BEFORE ANY PRINT STATEMENTS!
@@ -160,6 +162,8 @@ def _safe_print(*args, **kwargs):
 
 load_dotenv()
 
+from cost_basis_ledger import PositionIndex, lot_tuple, open_ledger, split_symbol
+
 COST_BASIS_FILE = "cost_basis_history.json"
 
 
@@ -173,14 +177,24 @@ class Trade:
     order_id: Optional[str] = None
 
 class CostBasisTracker:
-    """Track real cost basis for all positions."""
+    """
+    Track real cost basis for all positions.
+    
+    positions / trade_lots are the in-memory view. Every change is queued as
+    per-key ledger operations (see cost_basis_ledger) and flushed in one
+    transaction - immediately, or at the end of a `with tracker.batch():`.
+    """
     
-    def __init__(self, filepath: str = COST_BASIS_FILE, clients=None):
+    def __init__(self, filepath: str = COST_BASIS_FILE, clients=None, ledger=None):
         self.filepath = filepath
         self.positions: Dict[str, Dict[str, Any]] = {}
         self.trade_lots: Dict[str, List[Trade]] = {}  # 🆕 For FIFO
         self.last_sync: float = 0
         self.clients = clients or {}
+        self.ledger = ledger or open_ledger(filepath)
+        self._index = PositionIndex()
+        self._ops: List[tuple] = []
+        self._batch_depth = 0
         self._load()
     
     def set_clients(self, clients):
@@ -188,33 +202,38 @@ class CostBasisTracker:
         self.clients = clients
 
     def _load(self):
-        """Load cost basis data from file."""
-        if os.path.exists(self.filepath):
-            try:
-                with open(self.filepath, 'r') as f:
-                    data = json.load(f)
-                    self.positions = data.get('positions', {})
-                    self.last_sync = data.get('last_sync', 0)
-                    
-                    # 🆕 Load trade lots for FIFO
-                    trade_lots_data = data.get('trade_lots', {})
-                    self.trade_lots = {
-                        k: [Trade(**t) for t in v]
-                        for k, v in trade_lots_data.items()
-                    }
-                    
-                    _safe_print(f"📊 Cost Basis Tracker: Loaded {len(self.positions)} positions and {len(self.trade_lots)} trade lots from {self.filepath}")
-            except Exception as e:
-                _safe_print(f"⚠️ Failed to load cost basis file: {e}")
-                self.positions = {}
-                self.trade_lots = {}
-        
+        """Load cost basis data from the ledger."""
+        try:
+            positions, trade_lots_data, self.last_sync = self.ledger.load()
+            self.positions.update(positions)
+            
+            # 🆕 Load trade lots for FIFO
+            self.trade_lots.update({
+                k: [Trade(**t) for t in v]
+                for k, v in trade_lots_data.items()
+            })
+            
+            if self.positions or self.trade_lots:
+                _safe_print(f"📊 Cost Basis Tracker: Loaded {len(self.positions)} positions and {len(self.trade_lots)} trade lots from {self.filepath}")
+        except Exception as e:
+            _safe_print(f"⚠️ Failed to load cost basis file: {e}")
+            self.positions.clear()
+            self.trade_lots.clear()
+        self._integrate_tracked_positions(announce=True)
+        self._index.rebuild(self.positions)
+    
+    def _integrate_tracked_positions(self, announce: bool = False):
+        """
+        Fill in Orca's tracked positions we have no cost basis for. They are
+        in-memory only (loading never writes the ledger) and get persisted
+        once a trade or sync saves their key.
+        """
         # 🆕 SYNC with Orca's Tracked Positions
         if os.path.exists("tracked_positions.json"):
             try:
                 with open("tracked_positions.json", "r") as f:
                     tracked = json.load(f)
-                    added_count = 0
+                    added = []
                     for sym, data in tracked.items():
                         # Normalize symbol (remove / for matching)
                         norm_sym = sym.replace('/', '')
@@ -229,32 +248,78 @@ class CostBasisTracker:
                                 'last_trade': data.get('entry_time', time.time()),
                                 'synced_at': time.time()
                             }
-                            added_count += 1
-                    if added_count > 0:
-                        _safe_print(f"📊 Cost Basis Tracker: Integrated {added_count} positions from tracked_positions.json")
+                            added.append(norm_sym)
+                    if added and announce:
+                        _safe_print(f"📊 Cost Basis Tracker: Integrated {len(added)} positions from tracked_positions.json")
             except Exception as e:
                 _safe_print(f"⚠️ Failed to integrate tracked positions: {e}")
     
-    def _save(self):
-        """Save cost basis data to file."""
+    def _save(self, *keys: str, lots: bool = True):
+        """
+        Persist the given position keys (deleted if no longer in positions),
+        with their lots unless lots=False. Flushes now unless batching.
+        """
+        for key in keys:
+            pos = self.positions.get(key)
+            if pos is None:
+                self._ops.append(('delete', key))
+                self._index.remove(key)
+            else:
+                self._ops.append(('put', key, json.dumps(pos)))
+                self._index.add(key, pos)
+            if lots and (pos is not None or key in self.trade_lots):
+                self._ops.append(('lots', key, [lot_tuple(t) for t in self.trade_lots.get(key, [])]))
+        self._ops.append(('meta', 'last_sync', self.last_sync))
+        self._flush()
+    
+    def _flush(self, force: bool = False):
+        if (self._batch_depth and not force) or not self._ops:
+            return
+        ops, self._ops = self._ops, []
         try:
-            # 🆕 Serialize trade lots
-            trade_lots_serializable = {
-                k: [t.__dict__ for t in v]
-                for k, v in self.trade_lots.items()
-            }
-            
-            data = {
-                'positions': self.positions,
-                'trade_lots': trade_lots_serializable,
-                'last_sync': self.last_sync,
-                'updated_at': datetime.now().isoformat()
-            }
-            with open(self.filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.ledger.apply(ops, self)
         except Exception as e:
             print(f"⚠️ Failed to save cost basis file: {e}")
     
+    def _reload_key(self, key: str):
+        """Replace one position and its lots with the ledger's committed copy."""
+        committed = self.ledger.position(key)
+        if committed is None:
+            return
+        pos, lots = committed
+        if pos is None:
+            self.positions.pop(key, None)
+            self.trade_lots.pop(key, None)
+            self._index.remove(key)
+            return
+        self.positions[key] = pos
+        self.trade_lots[key] = [Trade(**t) for t in lots]
+        self._index.add(key, pos)
+    
+    @contextmanager
+    def batch(self):
+        """Group every change made inside the block into one commit."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._flush()
+    
+    def refresh(self) -> bool:
+        """Reload from the ledger if another process has committed since we last looked."""
+        if self._batch_depth or not self.ledger.changed():
+            return False
+        positions, trade_lots_data, last_sync = self.ledger.load()
+        self.positions.clear()
+        self.positions.update(positions)
+        self.trade_lots.clear()
+        self.trade_lots.update({k: [Trade(**t) for t in v] for k, v in trade_lots_data.items()})
+        self.last_sync = last_sync
+        self._integrate_tracked_positions()
+        self._index.rebuild(self.positions)
+        return True
+    
     def sync_from_binance(self, symbols: list = None) -> int:
         """Sync cost basis from Binance trade history.
         
@@ -275,6 +340,7 @@ class CostBasisTracker:
         balances = account.get('balances', [])
         
         updated = 0
+        touched = []
         for bal in balances:
             asset = bal['asset']
             free = float(bal.get('free', 0))
@@ -315,6 +381,7 @@ class CostBasisTracker:
                             'last_trade': cost_basis['last_trade'],
                             'synced_at': time.time()
                         }
+                        touched.append(position_key)
                         updated += 1
                         _safe_print(f"   📦 {position_key}: avg entry ${cost_basis['avg_entry_price']:.6f} "
                               f"({cost_basis['trade_count']} trades)")
@@ -323,7 +390,7 @@ class CostBasisTracker:
                     continue
         
         self.last_sync = time.time()
-        self._save()
+        self._save(*touched, lots=False)
         return updated
     
     def sync_from_kraken(self) -> int:
@@ -361,11 +428,13 @@ class CostBasisTracker:
             pair_trades[pair].append(trade)
         
         updated = 0
+        touched = []
         for pair, pair_trade_list in pair_trades.items():
             # Reset trade lots for this pair to rebuild from history
             symbol_norm = pair.replace('X', '').replace('Z', '')
             position_key = f"kraken:{symbol_norm}"
             self.trade_lots[position_key] = []
+            touched.append(position_key)
 
             total_qty = 0.0
             total_cost = 0.0
@@ -432,7 +501,7 @@ class CostBasisTracker:
                 updated += 1
                 _safe_print(f"   📦 {position_key}: avg entry ${avg_entry:.6f} ({buy_trades} trades)")
         
-        self._save()
+        self._save(*touched)
         return updated
     
     def sync_from_alpaca(self) -> int:
@@ -458,6 +527,7 @@ class CostBasisTracker:
             return 0
         
         updated = 0
+        touched = []
         for pos in positions:
             symbol = pos.get('symbol', '')
             avg_entry = float(pos.get('avg_entry_price', 0))
@@ -481,10 +551,11 @@ class CostBasisTracker:
                     'trade_count': 1,  # Position-based, not trade-based
                     'synced_at': time.time()
                 }
+                touched.append(position_key)
                 updated += 1
                 _safe_print(f"   📦 {position_key}: avg entry ${avg_entry:.6f}")
         
-        self._save()
+        self._save(*touched)
         return updated
     
     def sync_from_capital(self) -> int:
@@ -514,6 +585,7 @@ class CostBasisTracker:
             return 0
         
         updated = 0
+        touched = []
         for pos in positions:
             symbol = pos.get('market', {}).get('epic', '') or pos.get('epic', '')
             avg_entry = float(pos.get('position', {}).get('openLevel', 0) or pos.get('openLevel', 0))
@@ -539,11 +611,12 @@ class CostBasisTracker:
                     'synced_at': time.time(),
                     'direction': 'LONG' if qty > 0 else 'SHORT'
                 }
+                touched.append(position_key)
                 updated += 1
                 direction = '📈' if qty > 0 else '📉'
                 _safe_print(f"   {direction} {position_key}: entry ${avg_entry:.4f} x {abs(qty)}")
         
-        self._save()
+        self._save(*touched)
         return updated
     
     def sync_from_exchanges(self) -> int:
@@ -553,17 +626,19 @@ class CostBasisTracker:
         
         total = 0
         
-        print("\n🟡 Syncing from Binance...")
-        total += self.sync_from_binance()
-        
-        print("\n🐙 Syncing from Kraken...")
-        total += self.sync_from_kraken()
-        
-        print("\n🦙 Syncing from Alpaca...")
-        total += self.sync_from_alpaca()
-        
-        print("\n💼 Syncing from Capital.com...")
-        total += self.sync_from_capital()
+        # One commit for the whole sync
+        with self.batch():
+            print("\n🟡 Syncing from Binance...")
+            total += self.sync_from_binance()
+            
+            print("\n🐙 Syncing from Kraken...")
+            total += self.sync_from_kraken()
+            
+            print("\n🦙 Syncing from Alpaca...")
+            total += self.sync_from_alpaca()
+            
+            print("\n💼 Syncing from Capital.com...")
+            total += self.sync_from_capital()
         
         print(f"\n✅ Synced {total} positions with real cost basis")
         print("=" * 60)
@@ -582,9 +657,11 @@ class CostBasisTracker:
         3. Normalized format without slashes (binance:SHELLUSDT, SHELLUSDT)
         4. Quote currency swapping (SHELL/USDT → SHELLUSDC, SHELL/USD)
         5. Deep base asset match (SHELL → any SHELL-based pair)
+        
+        Strategies 4 and 5 read the canonical (exchange, base, quote) index
+        instead of scanning every position.
         """
-        pos = None
-        matched_key = None
+        self.refresh()
         
         # Strategy 1: Direct match with exchange context
         if exchange:
@@ -610,51 +687,25 @@ class CostBasisTracker:
         if pos:
             return (pos, norm_symbol)
         
+        base, quote = split_symbol(symbol)
+        
         # Strategy 4: Try swapping quote currencies (USDT ↔ USDC ↔ USD)
-        # Extract base asset
-        if '/' in symbol:
-            base = symbol.split('/')[0]
-        else:
-            base = symbol.rstrip('USDT').rstrip('USDC').rstrip('USD').rstrip('EUR').rstrip('GBP')
-        
-        # Try all quote currency combinations
-        for quote_in in ['USDT', 'USDC', 'USD', 'EUR', 'GBP']:
-            if symbol.endswith(quote_in) or symbol.endswith(f'/{quote_in}'):
-                # Try other quotes
-                for quote_out in ['USDT', 'USDC', 'USD', 'ZUSD', 'USDC.P']:
-                    # Try with slash and without
-                    test_symbols = [
-                        f"{base}/{quote_out}",
-                        f"{base}{quote_out}",
-                    ]
-                    
-                    for test_symbol in test_symbols:
-                        if exchange:
-                            test_key = f"{exchange.lower()}:{test_symbol}"
-                            pos = self.positions.get(test_key)
-                            if pos:
-                                # Debug message
-                                # print(f"   ✓ Matched via quote swap: {symbol} → {test_key}")
-                                return (pos, test_key)
-                        
-                        pos = self.positions.get(test_symbol)
+        if quote in ('USDT', 'USDC', 'USD', 'EUR', 'GBP'):
+            for quote_out in ['USDT', 'USDC', 'USD', 'ZUSD', 'USDC.P']:
+                for scope in ([exchange, ''] if exchange else ['']):
+                    for key in self._index.pair(scope, base, quote_out):
+                        pos = self.positions.get(key)
                         if pos:
-                            # Debug message
-                            # print(f"   ✓ Matched via quote swap: {symbol} → {test_symbol}")
-                            return (pos, test_symbol)
+                            return (pos, key)
         
         # Strategy 5: Deep base asset match
-        base_asset = symbol.split('/')[0] if '/' in symbol else symbol
-        # Remove common quote assets to find base
-        for quote in ['USD', 'USDT', 'USDC', 'EUR', 'GBP', 'BTC', 'ETH']:
-            if base_asset.endswith(quote) and len(base_asset) > len(quote):
-                base_asset = base_asset[:-len(quote)]
-                break
-        
-        for s, p in self.positions.items():
-            stored_symbol = p.get('symbol', s)
-            if stored_symbol.startswith(base_asset):
-                return (p, s)
+        for key in self._index.base(base):
+            pos = self.positions.get(key)
+            if pos:
+                return (pos, key)
+        key = self._index.prefix(base)
+        if key and self.positions.get(key):
+            return (self.positions[key], key)
         
         return (None, None)
     
@@ -729,8 +780,9 @@ class CostBasisTracker:
             self.positions[norm_key] = position_data.copy()
             # 🆕 Copy trade lots for normalized key
             self.trade_lots[norm_key] = self.trade_lots[position_key][:]
-        
-        self._save()
+            self._save(position_key, norm_key)
+        else:
+            self._save(position_key)
         _safe_print(f"   💾 Logged entry: {position_key} @ ${price:.6f} x {quantity} (Order: {order_id})")
         if norm_symbol != symbol:
             _safe_print(f"      Also indexed as: {norm_key}")
@@ -758,11 +810,25 @@ class CostBasisTracker:
         if quantity <= 0 or price <= 0:
             return {'error': 'Invalid quantity or price'}
         
-        is_buy = side.upper() == 'BUY'
+        self.refresh()
         position_key = f"{exchange.lower()}:{symbol}"
+        # Read-modify-write of the position under the ledger's write lock, so
+        # another process cannot commit the same key in between
+        with self.ledger.locked():
+            self._flush(force=True)
+            self._reload_key(position_key)
+            result = self._apply_trade(position_key, symbol, side, quantity, price, exchange, fee, order_id)
+            self._flush(force=True)
+        return result
+    
+    def _apply_trade(self, position_key: str, symbol: str, side: str, quantity: float, price: float,
+                     exchange: str, fee: float, order_id: Optional[str]) -> Dict[str, Any]:
+        """FIFO update of one position; record_trade holds the ledger lock."""
+        is_buy = side.upper() == 'BUY'
+        new_position = position_key not in self.positions
         
         # Initialize position if it doesn't exist
-        if position_key not in self.positions:
+        if new_position:
             self.positions[position_key] = {
                 'exchange': exchange,
                 'symbol': symbol,
@@ -801,6 +867,7 @@ class CostBasisTracker:
             # BUY: Add to lots
             new_lot = Trade(price=price, quantity=quantity, fee=fee, timestamp=time.time(), order_id=order_id)
             lots.append(new_lot)
+            lot_op = ('append_lot', position_key, lot_tuple(new_lot))
             
             # Update aggregates
             pos['total_quantity'] += quantity
@@ -821,6 +888,7 @@ class CostBasisTracker:
             
         else:
             # SELL: Use FIFO to calculate cost basis of sale
+            lot_op = ('consume', position_key, quantity)
             sell_qty_remaining = quantity
             cost_basis_of_sale = 0.0
             realized_pnl = 0.0
@@ -883,7 +951,12 @@ class CostBasisTracker:
         self.trade_lots[position_key] = lots
         self.positions[position_key] = pos
         
-        self._save()
+        if new_position:
+            self._save(position_key)
+        else:
+            # Only the lots this trade added or consumed are written
+            self._ops.append(lot_op)
+            self._save(position_key, lots=False)
         return result
     
     def update_position(self, symbol: str, new_qty: float, new_price: float,
@@ -953,7 +1026,7 @@ class CostBasisTracker:
             self.positions.pop(position_key, None)
             self.trade_lots.pop(position_key, None) # 🆕 Also remove lots
 
-        self._save()
+        self._save(position_key)
 
     def record_order_execution(
         self,
@@ -978,26 +1051,28 @@ class CostBasisTracker:
         if price <= 0:
             return
 
-        # 🆕 Use the new central trade recording method
-        self.record_trade(
-            symbol=symbol,
-            side=side,
-            quantity=executed_qty,
-            price=price,
-            exchange=exchange,
-            fee=float(fees or 0),
-            order_id=order_id
-        )
+        # One transaction for the trade and its fill details
+        with self.ledger.locked(), self.batch():
+            # 🆕 Use the new central trade recording method
+            self.record_trade(
+                symbol=symbol,
+                side=side,
+                quantity=executed_qty,
+                price=price,
+                exchange=exchange,
+                fee=float(fees or 0),
+                order_id=order_id
+            )
 
-        position_key = f"{exchange.lower()}:{symbol}"
-        pos = self.positions.get(position_key)
-        if pos:
-            pos['last_order_id'] = order_id
-            pos['avg_fill_price'] = price
-            pos['fills_verified'] = True if fills else False
-            pos['last_fills'] = fills or []
-            self.positions[position_key] = pos
-            self._save()
+            position_key = f"{exchange.lower()}:{symbol}"
+            pos = self.positions.get(position_key)
+            if pos:
+                pos['last_order_id'] = order_id
+                pos['avg_fill_price'] = price
+                pos['fills_verified'] = True if fills else False
+                pos['last_fills'] = fills or []
+                self.positions[position_key] = pos
+                self._save(position_key, lots=False)
     
     def can_sell_profitably(self, symbol: str, current_price: float, 
                            exchange: str = None, quantity: float = None, 
@@ -1194,7 +1269,7 @@ class CostBasisTracker:
             removed += 1
         
         if removed > 0:
-            self._save()
+            self._save(*keys_to_remove)
             _safe_print(f"✅ Cleaned up {removed} sold/dust positions")
         
         return removed
@@ -1284,7 +1359,7 @@ class CostBasisTracker:
                 })
         
         if corrections:
-            self._save()
+            self._save(*[c['key'] for c in corrections])
         
         # Also clean up any zero positions
         removed_count = self.cleanup_sold_positions()
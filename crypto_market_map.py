@@ -27,11 +27,13 @@ import sys
 import json
 import time
 import logging
+import asyncio
+import threading
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
 from pathlib import Path
 
 # Setup logging
@@ -151,6 +153,359 @@ for sector, symbols in CRYPTO_SECTORS.items():
         SYMBOL_TO_SECTOR[symbol] = sector
 
 
+# ════════════════════════════════════════════════════════════════════════════════
+# 📈 CORRELATION ENGINE - masked, time-aligned, matrix based
+# ════════════════════════════════════════════════════════════════════════════════
+#
+# Every symbol's returns go into one (symbols × timestamps) matrix with a
+# validity mask, so series are aligned by time rather than truncated to the
+# shortest length. Pairwise-complete Pearson correlation for ALL pairs then
+# comes from a handful of matrix products over the masked data:
+#
+#     n   = Ma · Mbᵀ      sa  = A · Mbᵀ      sb  = Ma · Bᵀ
+#     saa = A² · Mbᵀ      sbb = Ma · (B²)ᵀ   sab = A · Bᵀ
+#
+# Lagged cross-correlation is the same products with B shifted by `lag`
+# columns. The live window keeps the same sums and adjusts them with
+# rank-1 updates as ticks arrive and leave the window.
+
+MIN_CORRELATION_PERIODS = 11      # candles: more than 10 overlapping returns
+MIN_LEAD_LAG_PERIODS = 51         # candles: more than 50 overlapping returns
+MIN_CANDLE_RETURNS = 100          # candles: symbols need this much history
+LEAD_LAG_LEADERS = ('BTC', 'ETH')
+LIVE_CORRELATION_WINDOW = int(os.getenv('MARKET_MAP_LIVE_WINDOW', '120'))
+LIVE_MIN_PERIODS = int(os.getenv('MARKET_MAP_LIVE_MIN_PERIODS', '20'))
+LIVE_MAX_SYMBOLS = int(os.getenv('MARKET_MAP_LIVE_MAX_SYMBOLS', '150'))    # k bound: sums cost 12·k² floats
+LIVE_MAX_MISSED = int(os.getenv('MARKET_MAP_LIVE_MAX_MISSED', '30'))       # Snapshots absent before eviction
+LIVE_MIN_INTERVAL = float(os.getenv('MARKET_MAP_LIVE_MIN_INTERVAL', '1.0'))
+
+
+def aligned_returns_matrix(series: Dict[str, Tuple[List[float], List[float]]]
+                           ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a timestamp-aligned returns matrix.
+
+    series: symbol -> (timestamps, returns). Timestamps may be epoch seconds
+    or plain positions (0, 1, 2, ...) for untimed series.
+
+    Returns (symbols, times, R, M) where R[i, t] is symbol i's return at
+    times[t] (0.0 where missing) and M is the boolean validity mask.
+    """
+    symbols = list(series.keys())
+    if not symbols:
+        return [], np.empty(0), np.zeros((0, 0)), np.zeros((0, 0), dtype=bool)
+
+    stamps = [np.asarray(series[s][0], dtype=np.float64) for s in symbols]
+    times = np.unique(np.concatenate(stamps))
+    R = np.zeros((len(symbols), len(times)))
+    M = np.zeros((len(symbols), len(times)), dtype=bool)
+    for row, sym in enumerate(symbols):
+        cols = np.searchsorted(times, stamps[row])
+        R[row, cols] = np.asarray(series[sym][1], dtype=np.float64)
+        M[row, cols] = True
+    M &= np.isfinite(R)
+    R[~M] = 0.0
+    return symbols, times, R, M
+
+
+def _correlation_from_sums(n, sa, sb, saa, sbb, sab, min_periods: int) -> np.ndarray:
+    """Pearson correlation from co-moment sums; NaN where undefined."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sab - sa * sb / n
+        var_a = saa - sa * sa / n
+        var_b = sbb - sb * sb / n
+        corr = cov / np.sqrt(var_a * var_b)
+    # Constant series leave only rounding noise in the variance
+    flat = (var_a <= 1e-12 * np.abs(saa)) | (var_b <= 1e-12 * np.abs(sbb))
+    corr[(n < min_periods) | flat | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0, out=corr)
+
+
+def masked_correlation(R: np.ndarray, M: np.ndarray,
+                       R2: Optional[np.ndarray] = None, M2: Optional[np.ndarray] = None,
+                       min_periods: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete correlation between the rows of (R, M) and the rows
+    of (R2, M2) - or of (R, M) with itself when R2 is omitted.
+
+    Returns (corr, n): corr[i, j] over the columns where both rows are
+    valid, NaN below min_periods or for constant rows; n is the overlap.
+    """
+    ma = M.astype(np.float64)
+    # Centre each row first - correlation is shift invariant and the
+    # raw-sum formulas lose precision on large means
+    A = np.where(M, R - _row_means(R, M), 0.0)
+    if R2 is None:
+        n = ma @ ma.T
+        sa = A @ ma.T
+        saa = (A * A) @ ma.T
+        sab = A @ A.T
+        return _correlation_from_sums(n, sa, sa.T, saa, saa.T, sab, min_periods), n
+
+    mb = M2.astype(np.float64)
+    B = np.where(M2, R2 - _row_means(R2, M2), 0.0)
+    n = ma @ mb.T
+    sa = A @ mb.T
+    sb = ma @ B.T
+    saa = (A * A) @ mb.T
+    sbb = ma @ (B * B).T
+    sab = A @ B.T
+    return _correlation_from_sums(n, sa, sb, saa, sbb, sab, min_periods), n
+
+
+def lagged_correlation(R: np.ndarray, M: np.ndarray, leaders: List[int], lag: int = 1,
+                       min_periods: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """corr[k, j] = corr(leader_k[t], symbol_j[t + lag]) for every symbol j."""
+    if R.shape[1] <= lag or not leaders:
+        shape = (len(leaders), R.shape[0])
+        return np.full(shape, np.nan), np.zeros(shape)
+    return masked_correlation(R[leaders, :-lag], M[leaders, :-lag], R[:, lag:], M[:, lag:],
+                              min_periods=min_periods)
+
+
+def _row_means(R: np.ndarray, M: np.ndarray) -> np.ndarray:
+    counts = M.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(M, R, 0.0).sum(axis=1, keepdims=True) / counts
+    return np.nan_to_num(means)
+
+
+def _valid_pairs(corr: np.ndarray):
+    """Yield (i, j, corr) for the finite upper triangle of a square matrix."""
+    rows, cols = np.nonzero(np.triu(np.isfinite(corr), 1))
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        yield i, j, float(corr[i, j])
+
+
+class _CoMoments:
+    """Running co-moment sums between two streams of masked rows."""
+
+    def __init__(self):
+        self.k = 0
+        self.n = self.sa = self.sb = self.saa = self.sbb = self.sab = np.zeros((0, 0))
+
+    def grow(self, k: int):
+        if k <= self.k:
+            return
+        pad = ((0, k - self.k), (0, k - self.k))
+        for name in ('n', 'sa', 'sb', 'saa', 'sbb', 'sab'):
+            setattr(self, name, np.pad(getattr(self, name), pad))
+        self.k = k
+
+    def take(self, keep: np.ndarray):
+        """Keep only the rows / columns in `keep` (symbol eviction)."""
+        sel = np.ix_(keep, keep)
+        for name in ('n', 'sa', 'sb', 'saa', 'sbb', 'sab'):
+            setattr(self, name, getattr(self, name)[sel])
+        self.k = len(keep)
+
+    def reset(self):
+        k, self.k = self.k, 0
+        self.n = self.sa = self.sb = self.saa = self.sbb = self.sab = np.zeros((0, 0))
+        self.grow(k)
+
+    def add(self, a, ma, b, mb, sign: float = 1.0):
+        """Add (sign=1) or remove (sign=-1) one pair of rows - O(k²)."""
+        fa, fb = ma * sign, mb.astype(np.float64)
+        self.n += np.outer(fa, fb)
+        self.sa += np.outer(a * sign, fb)
+        self.sb += np.outer(fa, b)
+        self.saa += np.outer(a * a * sign, fb)
+        self.sbb += np.outer(fa, b * b)
+        self.sab += np.outer(a * sign, b)
+
+    def correlation(self, min_periods: int) -> np.ndarray:
+        return _correlation_from_sums(self.n, self.sa, self.sb, self.saa, self.sbb,
+                                      self.sab, min_periods)
+
+
+class RollingCorrelationWindow:
+    """
+    Correlation and lag-1 cross-correlation over the last `window` live
+    price snapshots.
+
+    Each update turns a {symbol: price} snapshot into one returns row, adds
+    it to the running sums and evicts the oldest row, so a tick costs
+    O(k²) for k symbols instead of recomputing O(k²·window). Sums are
+    rebuilt from the buffer every `window` ticks to shed rounding drift.
+
+    k is bounded: at most `max_symbols` are tracked (only those in the
+    universe, if set_universe() was called), and a symbol missing from
+    `max_missed` consecutive snapshots is evicted and its rows / columns
+    dropped. Updates and reads take a lock, so update() can run on a worker
+    thread.
+    """
+
+    def __init__(self, window: int = LIVE_CORRELATION_WINDOW,
+                 min_periods: int = LIVE_MIN_PERIODS, min_interval: float = 0.0,
+                 max_symbols: int = LIVE_MAX_SYMBOLS, max_missed: int = LIVE_MAX_MISSED):
+        self.window = max(2, int(window))
+        self.min_periods = max(2, int(min_periods))
+        self.min_interval = min_interval
+        self.max_symbols = max(2, int(max_symbols))
+        self.max_missed = max(1, int(max_missed))
+        self.universe: Optional[Set[str]] = None
+        self.evicted = 0
+        self._missed: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.version = 0
+        self.updates = 0
+        self.last_update = 0.0
+        self._last_price: Dict[str, float] = {}
+        self._rows: deque = deque()
+        self._co = _CoMoments()
+        self._lag = _CoMoments()
+        self._corr_cache: Tuple[int, Optional[np.ndarray]] = (-1, None)
+        self._lag_cache: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _padded(self, row: np.ndarray) -> np.ndarray:
+        k = len(self.symbols)
+        return row if len(row) == k else np.pad(row, (0, k - len(row)))
+
+    def set_universe(self, symbols: Optional[Iterable[str]]):
+        """Restrict the window to these symbols (None = first max_symbols seen)."""
+        with self._lock:
+            self.universe = None if symbols is None else set(symbols)
+
+    def _evict(self, prices: Dict[str, float]):
+        """Drop symbols that left the universe or missed max_missed snapshots."""
+        gone = []
+        for sym in self.symbols:
+            price = prices.get(sym)
+            if price and price > 0:
+                self._missed[sym] = 0
+            else:
+                self._missed[sym] = self._missed.get(sym, 0) + 1
+            if self._missed[sym] >= self.max_missed or (self.universe is not None and sym not in self.universe):
+                gone.append(sym)
+        if not gone:
+            return
+        gone_set = set(gone)
+        keep = np.array([i for i, sym in enumerate(self.symbols) if sym not in gone_set], dtype=np.intp)
+        self._rows = deque((self._padded(x)[keep], self._padded(m)[keep]) for x, m in self._rows)
+        self._co.take(keep)
+        self._lag.take(keep)
+        self.symbols = [self.symbols[i] for i in keep.tolist()]
+        self.index = {sym: i for i, sym in enumerate(self.symbols)}
+        for sym in gone:
+            self._missed.pop(sym, None)
+            self._last_price.pop(sym, None)
+        self.evicted += len(gone)
+
+    def update(self, prices: Dict[str, float], ts: float = None) -> bool:
+        """Fold one price snapshot into the window. Returns False if skipped."""
+        with self._lock:
+            now = time.time() if ts is None else ts
+            if self.min_interval and self.updates and now - self.last_update < self.min_interval:
+                return False
+            self._evict(prices)
+            self._update(prices, now)
+            return True
+
+    def _update(self, prices: Dict[str, float], now: float):
+        for sym, price in prices.items():
+            if len(self.symbols) >= self.max_symbols:
+                break
+            if sym in self.index or not price or price <= 0:
+                continue
+            if self.universe is None or sym in self.universe:
+                self.index[sym] = len(self.symbols)
+                self.symbols.append(sym)
+        k = len(self.symbols)
+        self._co.grow(k)
+        self._lag.grow(k)
+
+        x = np.zeros(k)
+        m = np.zeros(k)
+        for sym, price in prices.items():
+            if not price or price <= 0 or sym not in self.index:
+                continue
+            prev = self._last_price.get(sym)
+            self._last_price[sym] = price
+            if prev:
+                i = self.index[sym]
+                x[i] = (price / prev - 1.0) * 100.0
+                m[i] = 1.0
+
+        self._co.add(x, m, x, m)
+        if self._rows:
+            px, pm = (self._padded(v) for v in self._rows[-1])
+            self._lag.add(px, pm, x, m)
+        self._rows.append((x, m))
+
+        if len(self._rows) > self.window:
+            ox, om = (self._padded(v) for v in self._rows.popleft())
+            nx, nm = (self._padded(v) for v in self._rows[0])
+            self._co.add(ox, om, ox, om, -1.0)
+            self._lag.add(ox, om, nx, nm, -1.0)
+
+        self.updates += 1
+        self.version += 1
+        self.last_update = now
+        if self.updates % self.window == 0:
+            self._resync()
+
+    def _resync(self):
+        """Recompute the sums exactly from the buffered rows."""
+        rows = [tuple(self._padded(v) for v in r) for r in self._rows]
+        self._co.reset()
+        self._lag.reset()
+        for idx, (x, m) in enumerate(rows):
+            self._co.add(x, m, x, m)
+            if idx:
+                self._lag.add(rows[idx - 1][0], rows[idx - 1][1], x, m)
+
+    def correlation_matrix(self) -> np.ndarray:
+        """Current k×k correlation matrix (cached until the next update)."""
+        with self._lock:
+            if self._corr_cache[0] != self.version:
+                self._corr_cache = (self.version, self._co.correlation(self.min_periods))
+            return self._corr_cache[1]
+
+    def lead_lag_matrix(self) -> np.ndarray:
+        """lead[i, j] = corr(symbol_i[t], symbol_j[t+1]) over the window."""
+        with self._lock:
+            if self._lag_cache[0] != self.version:
+                self._lag_cache = (self.version, self._lag.correlation(self.min_periods))
+            return self._lag_cache[1]
+
+    def get(self, sym1: str, sym2: str, lagged: bool = False) -> Optional[float]:
+        with self._lock:
+            i, j = self.index.get(sym1), self.index.get(sym2)
+            if i is None or j is None:
+                return None
+            value = (self.lead_lag_matrix() if lagged else self.correlation_matrix())[i, j]
+        return None if np.isnan(value) else float(value)
+
+    def row(self, sym: str, lagged: bool = False) -> Dict[str, float]:
+        """All defined correlations of `sym` with other symbols."""
+        with self._lock:
+            i = self.index.get(sym)
+            if i is None:
+                return {}
+            values = (self.lead_lag_matrix() if lagged else self.correlation_matrix())[i]
+            symbols = self.symbols
+        cols = np.nonzero(np.isfinite(values))[0].tolist()
+        return {symbols[j]: float(values[j]) for j in cols if j != i}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'symbols': len(self.symbols),
+            'max_symbols': self.max_symbols,
+            'universe': None if self.universe is None else len(self.universe),
+            'evicted': self.evicted,
+            'rows': len(self._rows),
+            'window': self.window,
+            'updates': self.updates,
+            'last_update': self.last_update,
+        }
+
+
 # ════════════════════════════════════════════════════════════════════════════════
 # 🗺️ CRYPTO MARKET MAP CLASS
 # ════════════════════════════════════════════════════════════════════════════════
@@ -186,6 +541,10 @@ class CryptoMarketMap:
         # Optimal paths cache
         self.optimal_paths: Dict[str, List[ConversionPath]] = {}
         
+        # Rolling correlation over live ticks (overrides the cached matrix)
+        self.live_correlations = RollingCorrelationWindow(min_interval=LIVE_MIN_INTERVAL)
+        self._live_task: Optional[asyncio.Future] = None
+        
         # Load any cached data
         self._load_cache()
         
@@ -498,36 +857,31 @@ class CryptoMarketMap:
     
     def _add_correlations_from_changes(self, price_changes: Dict[str, List[float]], source: str = 'unknown'):
         """Add correlations from price change data."""
-        symbols = list(price_changes.keys())
+        # Untimed series - align by position, as the series start together
+        series = {sym: (range(len(changes)), changes) for sym, changes in price_changes.items()}
+        symbols, _, R, M = aligned_returns_matrix(series)
+        corr, overlap = masked_correlation(R, M, min_periods=5)  # Need at least 5 data points
         
-        for i, sym1 in enumerate(symbols):
-            for sym2 in symbols[i+1:]:
-                # Align lengths
-                min_len = min(len(price_changes[sym1]), len(price_changes[sym2]))
-                if min_len < 5:  # Need at least 5 data points
-                    continue
-                
-                arr1 = np.array(price_changes[sym1][:min_len])
-                arr2 = np.array(price_changes[sym2][:min_len])
+        for i, j, value in _valid_pairs(corr):
+            sym1, sym2 = symbols[i], symbols[j]
+            # Only update if we don't have a better correlation
+            existing = self.correlation_matrix.get(sym1, {}).get(sym2)
+            if existing is None or overlap[i, j] > 20:  # Prefer longer data
+                self.correlation_matrix[sym1][sym2] = value
+                self.correlation_matrix[sym2][sym1] = value
                 
-                # Calculate correlation
-                corr = np.corrcoef(arr1, arr2)[0, 1]
-                
-                if not np.isnan(corr):
-                    # Only update if we don't have a better correlation
-                    existing = self.correlation_matrix.get(sym1, {}).get(sym2)
-                    if existing is None or min_len > 20:  # Prefer longer data
-                        self.correlation_matrix[sym1][sym2] = float(corr)
-                        self.correlation_matrix[sym2][sym1] = float(corr)
-                        
-                        # Update asset relationships
-                        if sym1 in self.assets and sym2 in self.assets:
-                            if corr > 0.7:
-                                self.assets[sym1].correlates_with[sym2] = corr
-                                self.assets[sym2].correlates_with[sym1] = corr
-                            elif corr < -0.5:
-                                self.assets[sym1].inverse_to[sym2] = corr
-                                self.assets[sym2].inverse_to[sym1] = corr
+                # Update asset relationships
+                if sym1 in self.assets and sym2 in self.assets:
+                    self._link_correlated(sym1, sym2, value)
+    
+    def _link_correlated(self, sym1: str, sym2: str, corr: float):
+        """Record strong positive/inverse relationships on both assets."""
+        if corr > 0.7:
+            self.assets[sym1].correlates_with[sym2] = corr
+            self.assets[sym2].correlates_with[sym1] = corr
+        elif corr < -0.5:
+            self.assets[sym1].inverse_to[sym2] = corr
+            self.assets[sym2].inverse_to[sym1] = corr
     
     def load_from_probability_matrix(self, filename: str = 'trained_probability_matrix.json'):
         """Load patterns from the trained probability matrix."""
@@ -567,9 +921,10 @@ class CryptoMarketMap:
     
     def load_from_live_tickers(self, ticker_data: Dict[str, Any]):
         """Update map from live ticker data."""
+        snapshot = {}
         for symbol, data in ticker_data.items():
             # Clean symbol (remove exchange prefix)
-            clean_symbol = symbol.split(':')[-1].replace('USD', '').replace('USDT', '')
+            clean_symbol = symbol.split(':')[-1].replace('USDT', '').replace('USD', '')
             
             if clean_symbol not in self.assets:
                 self.assets[clean_symbol] = CryptoAsset(
@@ -587,61 +942,83 @@ class CryptoMarketMap:
                     (ts, p) for ts, p in self.price_history[clean_symbol] 
                     if ts > cutoff
                 ]
+                snapshot[clean_symbol] = price
+        
+        self.update_live_prices(snapshot)
+    
+    def update_live_prices(self, prices: Dict[str, float], ts: float = None) -> bool:
+        """
+        Fold a {symbol: price} snapshot into the rolling correlation window.
+        O(symbols²) per call - no history is recomputed.
+        """
+        try:
+            return self.live_correlations.update(prices, ts)
+        except Exception as e:
+            logger.debug(f"Live correlation update error: {e}")
+            return False
+    
+    def submit_live_prices(self, prices: Dict[str, float]) -> bool:
+        """
+        update_live_prices on a worker thread, from inside the event loop.
+        Returns False (snapshot dropped) while the previous update is still
+        running, so a slow update never queues up behind the price loop.
+        """
+        if self._live_task is not None and not self._live_task.done():
+            return False
+        self._live_task = asyncio.ensure_future(asyncio.to_thread(self.update_live_prices, dict(prices)))
+        return True
+    
+    def set_live_universe(self, symbols: Optional[Iterable[str]]):
+        """Symbols the live window may track (e.g. held assets + top volume)."""
+        self.live_correlations.set_universe(symbols)
     
     # ═══════════════════════════════════════════════════════════════════════════
     # 📈 CORRELATION ANALYSIS
     # ═══════════════════════════════════════════════════════════════════════════
     
-    def _build_correlations_from_candles(self, data: Dict[str, List]):
-        """Build correlation matrix from historical candle data."""
-        logger.info("   📊 Building correlation matrix...")
-        
-        # Extract price changes for each symbol
-        price_changes = {}
-        
+    def _candle_returns(self, data: Dict[str, List]) -> Dict[str, Tuple[List[float], List[float]]]:
+        """Per-symbol (timestamps, % change) series from candle data."""
+        series = {}
         for symbol, candles in data.items():
             clean_symbol = symbol.replace('-USD', '').replace('-GBP', '').replace('-USDT', '')
-            changes = []
+            stamps, changes = [], []
             
-            for candle in candles:
+            for pos, candle in enumerate(candles):
                 if hasattr(candle, 'change_pct'):
-                    changes.append(candle.change_pct)
-                elif hasattr(candle, 'open') and hasattr(candle, 'close'):
-                    if candle.open > 0:
-                        changes.append(((candle.close - candle.open) / candle.open) * 100)
+                    change = candle.change_pct
+                elif hasattr(candle, 'open') and hasattr(candle, 'close') and candle.open > 0:
+                    change = ((candle.close - candle.open) / candle.open) * 100
+                else:
+                    continue
+                ts = getattr(candle, 'timestamp', None)
+                if isinstance(ts, datetime):
+                    ts = ts.timestamp()
+                stamps.append(float(ts) if ts is not None else float(pos))
+                changes.append(change)
             
-            if len(changes) >= 100:  # Need enough data points
-                price_changes[clean_symbol] = changes
+            if len(changes) >= MIN_CANDLE_RETURNS:  # Need enough data points
+                series[clean_symbol] = (stamps, changes)
+        return series
+    
+    def _build_correlations_from_candles(self, data: Dict[str, List]):
+        """Build correlation matrix from historical candle data."""
+        logger.info("   📊 Building correlation matrix...")
         
-        # Calculate correlations
-        symbols = list(price_changes.keys())
-        for i, sym1 in enumerate(symbols):
-            for sym2 in symbols[i+1:]:
-                # Align lengths
-                min_len = min(len(price_changes[sym1]), len(price_changes[sym2]))
-                arr1 = np.array(price_changes[sym1][:min_len])
-                arr2 = np.array(price_changes[sym2][:min_len])
-                
-                # Calculate Pearson correlation
-                if len(arr1) > 10:
-                    corr = np.corrcoef(arr1, arr2)[0, 1]
-                    
-                    if not np.isnan(corr):
-                        self.correlation_matrix[sym1][sym2] = float(corr)
-                        self.correlation_matrix[sym2][sym1] = float(corr)
-                        
-                        # Update asset relationships
-                        if sym1 not in self.assets:
-                            self.assets[sym1] = CryptoAsset(symbol=sym1, sector=SYMBOL_TO_SECTOR.get(sym1, 'unknown'))
-                        if sym2 not in self.assets:
-                            self.assets[sym2] = CryptoAsset(symbol=sym2, sector=SYMBOL_TO_SECTOR.get(sym2, 'unknown'))
-                        
-                        if corr > 0.7:
-                            self.assets[sym1].correlates_with[sym2] = corr
-                            self.assets[sym2].correlates_with[sym1] = corr
-                        elif corr < -0.5:
-                            self.assets[sym1].inverse_to[sym2] = corr
-                            self.assets[sym2].inverse_to[sym1] = corr
+        # One time-aligned returns matrix, all pairs in a few matrix products
+        symbols, _, R, M = aligned_returns_matrix(self._candle_returns(data))
+        corr, _ = masked_correlation(R, M, min_periods=MIN_CORRELATION_PERIODS)
+        
+        for i, j, value in _valid_pairs(corr):
+            sym1, sym2 = symbols[i], symbols[j]
+            self.correlation_matrix[sym1][sym2] = value
+            self.correlation_matrix[sym2][sym1] = value
+            
+            # Update asset relationships
+            if sym1 not in self.assets:
+                self.assets[sym1] = CryptoAsset(symbol=sym1, sector=SYMBOL_TO_SECTOR.get(sym1, 'unknown'))
+            if sym2 not in self.assets:
+                self.assets[sym2] = CryptoAsset(symbol=sym2, sector=SYMBOL_TO_SECTOR.get(sym2, 'unknown'))
+            self._link_correlated(sym1, sym2, value)
         
         logger.info(f"   ✅ Built correlations for {len(symbols)} symbols")
     
@@ -649,65 +1026,56 @@ class CryptoMarketMap:
         """Detect which assets lead/lag others."""
         logger.info("   🔍 Detecting lead/lag relationships...")
         
-        # Extract price changes with timestamps
-        price_series = {}
-        for symbol, candles in data.items():
-            clean_symbol = symbol.replace('-USD', '').replace('-GBP', '').replace('-USDT', '')
-            changes = []
-            for candle in candles:
-                if hasattr(candle, 'change_pct'):
-                    changes.append(candle.change_pct)
-                elif hasattr(candle, 'open') and hasattr(candle, 'close') and candle.open > 0:
-                    changes.append(((candle.close - candle.open) / candle.open) * 100)
-            if len(changes) >= 100:
-                price_series[clean_symbol] = changes
+        symbols, _, R, M = aligned_returns_matrix(self._candle_returns(data))
+        leaders = [sym for sym in LEAD_LAG_LEADERS if sym in symbols]
         
-        # BTC typically leads - check correlation with lagged values
-        if 'BTC' in price_series:
-            btc = price_series['BTC']
-            for sym, changes in price_series.items():
-                if sym == 'BTC':
-                    continue
-                
-                # Check if BTC leads (correlate BTC[t] with SYM[t+1])
-                min_len = min(len(btc) - 1, len(changes) - 1)
-                if min_len > 50:
-                    btc_lead = np.array(btc[:min_len])
-                    sym_lag = np.array(changes[1:min_len+1])
-                    
-                    lead_corr = np.corrcoef(btc_lead, sym_lag)[0, 1]
-                    
-                    if not np.isnan(lead_corr) and abs(lead_corr) > 0.3:
-                        self.lead_lag_matrix['BTC'][sym] = float(lead_corr)
-                        
-                        if lead_corr > 0.3:
-                            if 'BTC' not in self.assets:
-                                self.assets['BTC'] = CryptoAsset(symbol='BTC', sector='layer1')
-                            if sym not in self.assets:
-                                self.assets[sym] = CryptoAsset(symbol=sym, sector=SYMBOL_TO_SECTOR.get(sym, 'unknown'))
-                            
-                            self.assets['BTC'].leads.append(sym)
-                            self.assets[sym].lags_behind.append('BTC')
+        # Does LEADER[t] predict SYM[t+1]? One cross-correlation per leader row
+        lead_corr, _ = lagged_correlation(R, M, [symbols.index(sym) for sym in leaders], lag=1,
+                                          min_periods=MIN_LEAD_LAG_PERIODS)
         
-        # ETH also often leads alts
-        if 'ETH' in price_series:
-            eth = price_series['ETH']
-            for sym, changes in price_series.items():
-                if sym in ['ETH', 'BTC']:
+        for row, leader in enumerate(leaders):
+            # BTC is checked first; ETH skips BTC
+            skip = LEAD_LAG_LEADERS[:LEAD_LAG_LEADERS.index(leader) + 1]
+            for col, sym in enumerate(symbols):
+                value = lead_corr[row, col]
+                if sym in skip or np.isnan(value) or abs(value) <= 0.3:
                     continue
+                self.lead_lag_matrix[leader][sym] = float(value)
                 
-                min_len = min(len(eth) - 1, len(changes) - 1)
-                if min_len > 50:
-                    eth_lead = np.array(eth[:min_len])
-                    sym_lag = np.array(changes[1:min_len+1])
-                    
-                    lead_corr = np.corrcoef(eth_lead, sym_lag)[0, 1]
+                # BTC typically leads - record it on the assets
+                if leader == 'BTC' and value > 0.3:
+                    if 'BTC' not in self.assets:
+                        self.assets['BTC'] = CryptoAsset(symbol='BTC', sector='layer1')
+                    if sym not in self.assets:
+                        self.assets[sym] = CryptoAsset(symbol=sym, sector=SYMBOL_TO_SECTOR.get(sym, 'unknown'))
                     
-                    if not np.isnan(lead_corr) and abs(lead_corr) > 0.3:
-                        self.lead_lag_matrix['ETH'][sym] = float(lead_corr)
+                    if sym not in self.assets['BTC'].leads:
+                        self.assets['BTC'].leads.append(sym)
+                    if 'BTC' not in self.assets[sym].lags_behind:
+                        self.assets[sym].lags_behind.append('BTC')
         
         logger.info(f"   ✅ Found {len(self.lead_lag_matrix)} lead/lag relationships")
     
+    def get_correlation(self, sym1: str, sym2: str, default: float = 0.0) -> float:
+        """Live rolling correlation when the window has enough ticks, else cached."""
+        live = self.live_correlations.get(sym1, sym2)
+        if live is not None:
+            return live
+        return self.correlation_matrix.get(sym1, {}).get(sym2, default)
+    
+    def get_correlation_row(self, symbol: str) -> Dict[str, float]:
+        """Cached correlations of `symbol`, overridden by live ones."""
+        row = dict(self.correlation_matrix.get(symbol, {}))
+        row.update(self.live_correlations.row(symbol))
+        return row
+    
+    def get_lead_lag(self, leader: str, follower: str, default: float = 0.0) -> float:
+        """Live lag-1 correlation leader[t] → follower[t+1], else cached."""
+        live = self.live_correlations.get(leader, follower, lagged=True)
+        if live is not None:
+            return live
+        return self.lead_lag_matrix.get(leader, {}).get(follower, default)
+    
     def _detect_patterns(self, data: Dict[str, List]):
         """Detect recurring market patterns."""
         logger.info("   🔮 Detecting market patterns...")
@@ -809,7 +1177,7 @@ class CryptoMarketMap:
         paths = []
         
         # Direct path
-        direct_corr = self.correlation_matrix.get(from_asset, {}).get(to_asset, 0)
+        direct_corr = self.get_correlation(from_asset, to_asset)
         paths.append(ConversionPath(
             steps=[(from_asset, to_asset)],
             total_correlation_score=direct_corr,
@@ -830,10 +1198,10 @@ class CryptoMarketMap:
             paths.append(checkpoint_path)
         
         # Through correlated asset (amplify moves)
-        from_correlations = self.correlation_matrix.get(from_asset, {})
+        from_correlations = self.get_correlation_row(from_asset)
         for mid_asset, corr in from_correlations.items():
             if mid_asset != to_asset and abs(corr) > 0.7:
-                mid_to_corr = self.correlation_matrix.get(mid_asset, {}).get(to_asset, 0)
+                mid_to_corr = self.get_correlation(mid_asset, to_asset)
                 
                 paths.append(ConversionPath(
                     steps=[(from_asset, mid_asset), (mid_asset, to_asset)],
@@ -988,6 +1356,7 @@ class CryptoMarketMap:
         ranked = []
         
         from_sector = SYMBOL_TO_SECTOR.get(from_asset.upper(), 'unknown')
+        from_correlations = self.get_correlation_row(from_asset.upper())
         
         for target in available_targets:
             target_upper = target.upper()
@@ -1000,7 +1369,7 @@ class CryptoMarketMap:
             reasons = []
             
             # 1. Correlation score
-            corr = self.correlation_matrix.get(from_asset.upper(), {}).get(target_upper, 0)
+            corr = from_correlations.get(target_upper, 0)
             if corr < -0.3:
                 # Inverse correlation - good for hedging
                 score += 0.15
@@ -1017,11 +1386,10 @@ class CryptoMarketMap:
                 reasons.append(f"DIVERSIFY ({from_sector}→{target_sector})")
             
             # 3. Lead/lag opportunity
-            if from_asset.upper() in self.lead_lag_matrix:
-                lag_corr = self.lead_lag_matrix[from_asset.upper()].get(target_upper, 0)
-                if lag_corr > 0.3:
-                    score += 0.20
-                    reasons.append(f"LEADS_TARGET (lag_corr={lag_corr:.2f})")
+            lag_corr = self.get_lead_lag(from_asset.upper(), target_upper)
+            if lag_corr > 0.3:
+                score += 0.20
+                reasons.append(f"LEADS_TARGET (lag_corr={lag_corr:.2f})")
             
             # 4. Pattern match bonus
             for pattern in self.patterns:
@@ -1057,6 +1425,7 @@ class CryptoMarketMap:
             'sectors': list(CRYPTO_SECTORS.keys()),
             'top_correlations': self._get_top_correlations(5),
             'top_inverse': self._get_top_inverse_correlations(5),
+            'live_window': self.live_correlations.get_stats(),
         }
     
     def _get_top_correlations(self, n: int = 5) -> List[Tuple[str, str, float]]:
@@ -11,6 +11,8 @@ FEATURES:
 - Conservative floor/ceiling bounds (never too optimistic)
 - Fallback to safe defaults when no data available
 - Per-symbol cost tracking with global fallback
+- Vectorised Monte Carlo draws (NumPy) cached per symbol until new samples
+  arrive, plus a batch scorer for whole candidate sets
 
 Gary Leckey | January 2026 | TRUST THE MATH, LEARN FROM REALITY
 """
@@ -24,11 +26,20 @@ if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 import time
+import random
+import bisect
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from collections import defaultdict, deque
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,7 +105,11 @@ class DynamicCostEstimator:
     GLOBAL_WINDOW_SIZE = 100  # Global samples
     SAMPLE_TTL_SECONDS = 86400  # 24 hours
     
-    def __init__(self):
+    # Monte Carlo percentiles reported by score_candidates (net P&L)
+    MC_PERCENTILES = (5, 50, 95)
+    _GLOBAL_SLOT = '*'
+    
+    def __init__(self, seed: Optional[int] = None):
         # Per-symbol rolling windows
         self._symbol_samples: Dict[str, deque] = defaultdict(
             lambda: deque(maxlen=self.SYMBOL_WINDOW_SIZE)
@@ -107,6 +122,21 @@ class DynamicCostEstimator:
         self._total_samples = 0
         self._estimates_served = 0
         
+        # Monte Carlo: seeded RNG + sorted draws cached per symbol.
+        # Versions bump on add_sample so a cache entry lives until new data.
+        if seed is None and os.getenv('COST_ESTIMATOR_SEED'):
+            try:
+                seed = int(os.getenv('COST_ESTIMATOR_SEED'))
+            except ValueError:
+                logger.warning("Ignoring non-integer COST_ESTIMATOR_SEED")
+        self._seed = seed
+        self._rng = np.random.default_rng(seed) if NUMPY_AVAILABLE else random.Random(seed)
+        self._symbol_versions: Dict[str, int] = defaultdict(int)
+        self._global_version = 0
+        self._draw_cache: Dict[str, Tuple[Tuple, object]] = {}
+        self._draw_cache_hits = 0
+        self._draw_cache_misses = 0
+        
         logger.info("💰 Dynamic Cost Estimator initialized")
         logger.info(f"   Conservative floor: {self.DEFAULT_TOTAL_PCT:.2f}%")
         logger.info(f"   Symbol window: {self.SYMBOL_WINDOW_SIZE} samples")
@@ -149,6 +179,8 @@ class DynamicCostEstimator:
         self._symbol_samples[symbol].append(sample)
         self._global_samples.append(sample)
         self._total_samples += 1
+        self._symbol_versions[symbol] += 1
+        self._global_version += 1
         
         logger.debug(
             f"💰 Cost sample: {symbol} {side} ${notional_usd:.2f} | "
@@ -262,6 +294,10 @@ class DynamicCostEstimator:
             'symbol_count': symbol_count,
             'symbols_with_data': symbols_with_data,
             'estimates_served': self._estimates_served,
+            'mc_cache_entries': len(self._draw_cache),
+            'mc_cache_hits': self._draw_cache_hits,
+            'mc_cache_misses': self._draw_cache_misses,
+            'mc_backend': 'numpy' if NUMPY_AVAILABLE else 'python',
         }
     
     def reset(self) -> None:
@@ -269,50 +305,155 @@ class DynamicCostEstimator:
         self._symbol_samples.clear()
         self._global_samples.clear()
         self._total_samples = 0
+        self._draw_cache.clear()
+        self._global_version += 1
         logger.info("💰 Cost estimator reset - all samples cleared")
 
     def _draw_total_costs(self, symbol: str, n_samples: int = 1000) -> List[float]:
         """Internal: draw raw samples of total cost% from historical samples.
 
         Returns a list of sampled total cost percentages (e.g., 0.30 == 0.30%).
+        Draws are sorted ascending and reused until the symbol (or, for symbols
+        without their own data, the global window) receives a new sample.
         """
-        import random
-        base = list(self._symbol_samples.get(symbol, []))
-        if not base:
-            base = list(self._global_samples)
-        if not base:
-            return [self.DEFAULT_TOTAL_PCT for _ in range(n_samples)]
+        draws = self._sorted_draws(symbol, n_samples)
+        return draws.tolist() if NUMPY_AVAILABLE else list(draws)
+
+    def _sorted_draws(self, symbol: str, n_samples: int):
+        """Cached, ascending draws of total cost% (ndarray, or list without NumPy)."""
+        base = self._symbol_samples.get(symbol)
+        if base:
+            slot, key = symbol, (self._symbol_versions[symbol], n_samples)
+        else:
+            # Symbols without their own data share one global draw set
+            base = self._global_samples
+            slot, key = self._GLOBAL_SLOT, (self._global_version, n_samples)
+
+        cached = self._draw_cache.get(slot)
+        if cached is not None and cached[0] == key:
+            self._draw_cache_hits += 1
+            return cached[1]
+        self._draw_cache_misses += 1
+
+        totals = [s.total_cost_pct for s in base]
+        draws = self._generate_draws(totals, n_samples)
+        self._draw_cache[slot] = (key, draws)
+        return draws
 
+    def _generate_draws(self, totals: List[float], n_samples: int):
+        # clamp to conservative bounds
+        min_total = self.MIN_FEE_PCT + self.MIN_SPREAD_PCT + self.MIN_SLIPPAGE_PCT
+        max_total = self.MAX_FEE_PCT + self.MAX_SPREAD_PCT + self.MAX_SLIPPAGE_PCT
+
+        if NUMPY_AVAILABLE:
+            if not totals:
+                return np.full(n_samples, self.DEFAULT_TOTAL_PCT)
+            picks = np.asarray(totals, dtype=np.float64)[self._rng.integers(0, len(totals), size=n_samples)]
+            # sample with small gaussian noise proportional to observed total (5% stddev)
+            noise = self._rng.normal(0.0, np.maximum(1e-6, picks * 0.05))
+            draws = np.clip(picks + noise, min_total, max_total)
+            draws.sort()
+            return draws
+
+        if not totals:
+            return [self.DEFAULT_TOTAL_PCT] * n_samples
+        rng = self._rng
         draws = []
         for _ in range(n_samples):
-            s = random.choice(base)
-            # sample with small gaussian noise proportional to observed total (5% stddev)
-            noise = random.gauss(0, max(1e-6, s.total_cost_pct * 0.05))
-            val = s.total_cost_pct + noise
-            # clamp to conservative bounds
-            min_total = self.MIN_FEE_PCT + self.MIN_SPREAD_PCT + self.MIN_SLIPPAGE_PCT
-            max_total = self.MAX_FEE_PCT + self.MAX_SPREAD_PCT + self.MAX_SLIPPAGE_PCT
-            val = max(min_total, min(max_total, val))
-            draws.append(val)
+            t = rng.choice(totals)
+            val = t + rng.gauss(0, max(1e-6, t * 0.05))
+            draws.append(max(min_total, min(max_total, val)))
+        draws.sort()
         return draws
 
+    @staticmethod
+    def _percentile_index(n: int, p: float) -> int:
+        return max(0, min(n - 1, int(n * p / 100)))
+
     def sample_total_cost_distribution(self, symbol: str, side: str, notional_usd: float, n_samples: int = 1000) -> Dict[str, float]:
         """Monte Carlo sampling of total cost% from historical samples.
 
         Returns percentiles keyed by 'p5','p50','p90','p95' and a 'samples' list for debugging (truncated).
         """
-        draws = self._draw_total_costs(symbol, n_samples=n_samples)
-        draws.sort()
+        draws = self._sorted_draws(symbol, n_samples)
+        n = len(draws)
+
         def pct(p):
-            idx = max(0, min(len(draws)-1, int(len(draws)*p/100)))
-            return draws[idx]
+            return float(draws[self._percentile_index(n, p)])
 
-        return {'p5': pct(5), 'p50': pct(50), 'p90': pct(90), 'p95': pct(95), 'samples': draws[:10]}
+        return {'p5': pct(5), 'p50': pct(50), 'p90': pct(90), 'p95': pct(95),
+                'samples': [float(d) for d in draws[:10]]}
 
     def sample_total_cost_draws(self, symbol: str, side: str, notional_usd: float, n_samples: int = 1000) -> List[float]:
         """Return raw Monte Carlo draws of total cost% (percent units) for further analysis."""
         return self._draw_total_costs(symbol, n_samples=n_samples)
 
+    def score_candidates(
+        self,
+        symbols: Sequence[str],
+        notionals_usd: Sequence[float],
+        gross_pnls_usd: Sequence[float],
+        n_samples: int = 1000,
+        percentiles: Sequence[float] = MC_PERCENTILES,
+    ) -> Dict[str, object]:
+        """
+        Batch Monte Carlo scoring of (symbol, notional, gross P&L) candidates.
+
+        net = gross - cost_pct/100 * notional for every cost draw. Because the
+        draws are sorted, P(net > 0) is a binary search per candidate and net
+        percentiles come straight from the cost quantiles.
+
+        Returns:
+            {'p_win': [...], 'net_p5': [...], 'net_p50': [...], 'net_p95': [...]}
+            as NumPy arrays (plain lists when NumPy is unavailable), one value
+            per candidate in input order.
+        """
+        if NUMPY_AVAILABLE:
+            return self._score_candidates_numpy(symbols, notionals_usd, gross_pnls_usd, n_samples, percentiles)
+
+        out: Dict[str, object] = {'p_win': []}
+        for p in percentiles:
+            out[f'net_p{p:g}'] = []
+        for symbol, notional, gross in zip(symbols, notionals_usd, gross_pnls_usd):
+            draws = self._sorted_draws(symbol, n_samples)
+            n = len(draws)
+            if notional > 0:
+                # net > 0  <=>  cost% < gross * 100 / notional
+                wins = bisect.bisect_left(draws, gross * 100.0 / notional)
+            else:
+                wins = n if gross > 0 else 0
+            out['p_win'].append(wins / max(1, n))
+            for p in percentiles:
+                cost = draws[self._percentile_index(n, 100 - p)]
+                out[f'net_p{p:g}'].append(gross - cost / 100.0 * notional)
+        return out
+
+    def _score_candidates_numpy(self, symbols, notionals_usd, gross_pnls_usd, n_samples, percentiles):
+        notional = np.asarray(notionals_usd, dtype=np.float64)
+        gross = np.asarray(gross_pnls_usd, dtype=np.float64)
+        p_win = np.empty(len(gross), dtype=np.float64)
+        q_idx = [self._percentile_index(n_samples, 100 - p) for p in percentiles]
+        cost_q = np.empty((len(gross), len(percentiles)), dtype=np.float64)
+
+        # Group candidates by symbol: one cached draw array per group
+        groups: Dict[str, List[int]] = {}
+        for i, symbol in enumerate(symbols):
+            groups.setdefault(symbol, []).append(i)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            thresholds = np.where(notional > 0, gross * 100.0 / notional, np.where(gross > 0, np.inf, -np.inf))
+
+        for symbol, rows in groups.items():
+            draws = self._sorted_draws(symbol, n_samples)
+            idx = np.asarray(rows)
+            p_win[idx] = np.searchsorted(draws, thresholds[idx], side='left') / max(1, len(draws))
+            cost_q[idx] = draws[q_idx]
+
+        out: Dict[str, object] = {'p_win': p_win}
+        for j, p in enumerate(percentiles):
+            out[f'net_p{p:g}'] = gross - cost_q[:, j] / 100.0 * notional
+        return out
+
 
 # Singleton instance
 _instance: Optional[DynamicCostEstimator] = None
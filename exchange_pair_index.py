@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Exchange Pair Index
+-------------------
+Shared, pre-indexed view of an exchange's tradable pairs.
+
+Every exchange client used to answer `find_conversion_path`,
+`get_available_pairs` and `get_convertible_assets` by scanning its full
+pair list (Kraken: ~1,000 pairs, Binance: ~2,000 symbols) on every call.
+A PairIndex is built once per exchange-info refresh and answers:
+
+    index.direct('ETH', 'BTC')     -> sell/buy step or None        O(1)
+    index.pairs(base='ETH')        -> pairs with that base          O(degree)
+    index.neighbors('ETH')         -> assets reachable in one trade O(1)
+    index.convertible()            -> {asset: [assets]}             cached
+
+Base/quote names are normalised by the client before they reach the index,
+so each exchange keeps its own naming rules (Kraken XXBT/ZUSD, Alpaca
+BTC/USD, Binance BTCUSDT).
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class PairIndex:
+    """Pairs keyed by symbol, by (base, quote) and by asset adjacency."""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], token: Any = None):
+        self.token = token
+        self.built_at = time.time()
+        self.entries: List[Dict[str, Any]] = []
+        self.by_pair: Dict[str, Dict[str, Any]] = {}
+        self.by_assets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.by_base: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_quote: Dict[str, List[Dict[str, Any]]] = {}
+        self._neighbors: Dict[str, Set[str]] = {}
+        self._convertible: Optional[Dict[str, List[str]]] = None
+
+        for entry in entries:
+            base = (entry.get("base") or "").upper()
+            quote = (entry.get("quote") or "").upper()
+            pair = entry.get("pair")
+            if not pair:
+                continue
+            self.entries.append(entry)
+            self.by_pair.setdefault(pair, entry)
+            if not base or not quote:
+                continue
+            # First listing wins, matching the old first-match scans
+            self.by_assets.setdefault((base, quote), entry)
+            self.by_base.setdefault(base, []).append(entry)
+            self.by_quote.setdefault(quote, []).append(entry)
+            self._neighbors.setdefault(base, set()).add(quote)
+            self._neighbors.setdefault(quote, set()).add(base)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, base: str, quote: str) -> Optional[Dict[str, Any]]:
+        return self.by_assets.get((base, quote))
+
+    def direct(self, from_asset: str, to_asset: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Single trade converting from_asset into to_asset.
+
+        Returns (entry, side): 'sell' when from_asset is the base,
+        'buy' when it is the quote, or None if no pair links them.
+        """
+        entry = self.by_assets.get((from_asset, to_asset))
+        if entry is not None:
+            return entry, "sell"
+        entry = self.by_assets.get((to_asset, from_asset))
+        if entry is not None:
+            return entry, "buy"
+        return None
+
+    def pairs(self, base: Optional[str] = None, quote: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Filter pairs by base and/or quote without scanning the full list."""
+        base = base.upper() if base else None
+        quote = quote.upper() if quote else None
+        if base and quote:
+            return list(e for e in self.by_base.get(base, ()) if (e.get("quote") or "").upper() == quote)
+        if base:
+            return list(self.by_base.get(base, ()))
+        if quote:
+            return list(self.by_quote.get(quote, ()))
+        return list(self.entries)
+
+    def neighbors(self, asset: str) -> Set[str]:
+        return self._neighbors.get(asset.upper(), set())
+
+    def convertible(self) -> Dict[str, List[str]]:
+        """Asset -> sorted list of assets it converts to in one trade."""
+        if self._convertible is None:
+            self._convertible = {k: sorted(v) for k, v in self._neighbors.items()}
+        return {k: list(v) for k, v in self._convertible.items()}
+
+
+def ensure_pair_index(current: Optional[PairIndex], token: Any,
+                      build_entries: Callable[[], Iterable[Dict[str, Any]]]) -> PairIndex:
+    """
+    Return `current` if it was built from the same exchange-info snapshot
+    (`token`, e.g. the pair-cache timestamp), otherwise build a new index.
+    """
+    if current is not None and current.token == token:
+        return current
+    return PairIndex(build_entries(), token=token)
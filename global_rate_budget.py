@@ -8,16 +8,38 @@ Implements priority buckets for API requests:
 - QUOTES (lowest): Market data, quotes
 
 Ensures critical operations get priority during rate limit pressure.
+
+Admission is a scheduler, not a lock-held sleep: every request takes a
+ticket in one wait queue ordered by priority, then arrival. Tickets are
+admitted as their priority's token bucket refills (higher priorities may
+also borrow tokens left idle in lower-priority buckets, never the other way
+round). Nobody sleeps while holding the lock - blocked threads park on a
+condition variable and coroutines on a future - so a throttled QUOTES caller
+never stops an EXECUTION caller from being admitted.
+
+A request with a timeout is rejected up front when its estimated admission
+time is past the deadline, and while queued if the deadline passes.
+
+    budget = get_global_rate_budget()
+    if budget.wait_for_slot(RequestPriority.EXECUTION, is_trading=True, timeout=2.0):
+        place_order()
+    ok = await budget.wait_for_slot_async(RequestPriority.QUOTES, timeout=0.5)
+
+submit() / poll() / next_wakeup() expose the same scheduler without
+blocking, driven by an injectable clock (used by the fake-clock tests).
 """
 
 from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
 import time
+import bisect
+import asyncio
 import threading
+import itertools
 import logging
 import os
+from collections import deque
 from enum import Enum
-from typing import Dict, Optional
-from rate_limiter_v2 import AdaptiveRateLimiter
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Metrics (optional)
 try:
@@ -28,12 +50,85 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+WAIT_SLICE_S = 0.25           # Longest a waiter parks before re-checking the queue
+WAIT_WINDOW = 1024            # Admission wait samples kept per priority
+EXECUTION_QUIET_S = 0.5       # Lower priorities back off after an EXECUTION admission
+POSITIONS_QUIET_S = 0.2       # QUOTES back off after a POSITIONS admission
+BACKOFF_429_S = 2.0           # First 429 backoff for the failing priority
+MAX_BACKOFF_429_S = 60.0
+BACKOFF_429_RESET_S = 60.0    # Quiet period after which the 429 streak resets
+
+TOKEN_EPSILON = 1e-9          # Float slack so a refill landing on 0.999... still admits
+
+WAITING, ADMITTED, REJECTED = 'waiting', 'admitted', 'rejected'
+
 class RequestPriority(Enum):
     """Priority levels for API requests."""
     EXECUTION = 1  # Trading orders (highest priority)
     POSITIONS = 2  # Account/balance queries
     QUOTES = 3     # Market data (lowest priority)
 
+
+class _Bucket:
+    """Token bucket on an external clock (no locking, no sleeping)."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'last')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.last = now
+
+    def refill(self, now: float):
+        if now > self.last:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+    def time_until(self, tokens: float) -> float:
+        """Seconds until `tokens` are available (inf if the bucket never refills)."""
+        deficit = tokens - self.tokens
+        if deficit <= TOKEN_EPSILON:
+            return 0.0
+        return deficit / self.rate if self.rate > 0 else float('inf')
+
+
+class AdmissionTicket:
+    """One request's place in the admission queue."""
+
+    __slots__ = ('priority', 'kind', 'tokens', 'seq', 'arrived', 'deadline',
+                 'state', 'reason', 'decided_at', '_loop', '_future')
+
+    def __init__(self, priority: RequestPriority, kind: str, tokens: float, seq: int,
+                 arrived: float, deadline: Optional[float]):
+        self.priority = priority
+        self.kind = kind
+        self.tokens = tokens
+        self.seq = seq
+        self.arrived = arrived
+        self.deadline = deadline
+        self.state = WAITING
+        self.reason = ''
+        self.decided_at = 0.0
+        self._loop = None
+        self._future = None
+
+    @property
+    def wait(self) -> float:
+        """Seconds from submission to admission / rejection."""
+        return self.decided_at - self.arrived
+
+    def __lt__(self, other: 'AdmissionTicket') -> bool:
+        return (self.priority.value, self.seq) < (other.priority.value, other.seq)
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
 class GlobalRateBudget:
     """
     Global rate budget with priority-based allocation.
@@ -42,123 +137,256 @@ class GlobalRateBudget:
     Lower priority requests may be delayed or rejected.
     """
 
-    def __init__(self, total_rate_per_second: float = 5.0, total_burst: float = 10.0):
+    def __init__(self, total_rate_per_second: float = 5.0, total_burst: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic, borrow: bool = True):
         """
         Initialize global rate budget.
 
         Args:
             total_rate_per_second: Total API calls allowed per second across all priorities
             total_burst: Maximum burst capacity
+            clock: Monotonic time source (injectable for tests)
+            borrow: Let higher priorities use idle lower-priority tokens
         """
         self.total_rate = total_rate_per_second
         self.total_burst = total_burst
+        self.borrow = borrow
+        self._clock = clock
 
-        # Priority-specific rate limiters
+        # Priority-specific token buckets (separate trading / data buckets each)
         # Execution gets 40% of total rate, Positions 30%, Quotes 30%
-        exec_rate = total_rate_per_second * 0.4
-        pos_rate = total_rate_per_second * 0.3
-        quote_rate = total_rate_per_second * 0.3
-
-        exec_burst = max(1, int(total_burst * 0.5))  # Execution can burst more
-        pos_burst = max(1, int(total_burst * 0.3))
-        quote_burst = max(1, int(total_burst * 0.2))
-
-        self._rate_limiters = {
-            RequestPriority.EXECUTION: AdaptiveRateLimiter(
-                trading_rate=exec_rate, data_rate=exec_rate,
-                trading_capacity=exec_burst, data_capacity=exec_burst,
-                name='global_execution'
-            ),
-            RequestPriority.POSITIONS: AdaptiveRateLimiter(
-                trading_rate=pos_rate, data_rate=pos_rate,
-                trading_capacity=pos_burst, data_capacity=pos_burst,
-                name='global_positions'
-            ),
-            RequestPriority.QUOTES: AdaptiveRateLimiter(
-                trading_rate=quote_rate, data_rate=quote_rate,
-                trading_capacity=quote_burst, data_capacity=quote_burst,
-                name='global_quotes'
-            )
+        rates = {
+            RequestPriority.EXECUTION: total_rate_per_second * 0.4,
+            RequestPriority.POSITIONS: total_rate_per_second * 0.3,
+            RequestPriority.QUOTES: total_rate_per_second * 0.3,
+        }
+        bursts = {
+            RequestPriority.EXECUTION: max(1, int(total_burst * 0.5)),  # Execution can burst more
+            RequestPriority.POSITIONS: max(1, int(total_burst * 0.3)),
+            RequestPriority.QUOTES: max(1, int(total_burst * 0.2)),
+        }
+        now = clock()
+        self._buckets: Dict[Tuple[RequestPriority, str], _Bucket] = {
+            (priority, kind): _Bucket(rates[priority], bursts[priority], now)
+            for priority in RequestPriority for kind in ('trading', 'data')
         }
 
         # Backoff tracking for lower priorities when higher priorities are active
         self._backoff_until: Dict[RequestPriority, float] = {
             priority: 0.0 for priority in RequestPriority
         }
+        self._429_streak = 0
+        self._last_429 = float('-inf')
 
-        self._lock = threading.Lock()
+        self._cond = threading.Condition(threading.Lock())
+        self._queue: List[AdmissionTicket] = []        # Sorted by (priority, arrival)
+        self._seq = itertools.count()
 
         # Stats
         self.requests_processed = {priority: 0 for priority in RequestPriority}
         self.requests_delayed = {priority: 0 for priority in RequestPriority}
         self.requests_rejected = {priority: 0 for priority in RequestPriority}
-
-    def wait_for_slot(self, priority: RequestPriority, is_trading: bool = False) -> bool:
+        self._waits = {priority: deque(maxlen=WAIT_WINDOW) for priority in RequestPriority}
+
+    # ──────────────────────────────────────────────────────────────
+    # Scheduler core (call with self._cond held)
+    # ──────────────────────────────────────────────────────────────
+
+    def _sources(self, ticket: AdmissionTicket) -> List[_Bucket]:
+        """Buckets a ticket may draw from: its own, then idle lower priorities."""
+        own = [self._buckets[(ticket.priority, ticket.kind)]]
+        if not self.borrow:
+            return own
+        return own + [self._buckets[(p, ticket.kind)] for p in RequestPriority
+                      if p.value > ticket.priority.value]
+
+    def _estimate_admission(self, ticket: AdmissionTicket, now: float) -> float:
+        """Earliest time the ticket could be admitted, counting queued work ahead of it."""
+        own = self._buckets[(ticket.priority, ticket.kind)]
+        ahead = sum(t.tokens for t in self._queue
+                    if t.kind == ticket.kind and t.priority.value <= ticket.priority.value)
+        borrowable = sum(b.tokens for b in self._sources(ticket)[1:]) if self.borrow else 0.0
+        need = ahead + ticket.tokens - own.tokens - borrowable
+        token_time = 0.0 if need <= 0 else (need / own.rate if own.rate > 0 else float('inf'))
+        return max(now + token_time, self._backoff_until[ticket.priority])
+
+    def _record(self, ticket: AdmissionTicket, state: str, now: float, reason: str = ''):
+        ticket.state, ticket.reason, ticket.decided_at = state, reason, now
+        priority = ticket.priority
+        if state == ADMITTED:
+            self.requests_processed[priority] += 1
+            self._waits[priority].append(ticket.wait)
+            if ticket.wait > 0:
+                self.requests_delayed[priority] += 1
+            statuses = ('processed', 'delayed') if ticket.wait > 0 else ('processed',)
+            # If this is a high-priority request, impose backoff on lower priorities
+            if priority == RequestPriority.EXECUTION:
+                for p in (RequestPriority.POSITIONS, RequestPriority.QUOTES):
+                    self._backoff_until[p] = max(self._backoff_until[p], now + EXECUTION_QUIET_S)
+            elif priority == RequestPriority.POSITIONS:
+                self._backoff_until[RequestPriority.QUOTES] = max(
+                    self._backoff_until[RequestPriority.QUOTES], now + POSITIONS_QUIET_S)
+        else:
+            self.requests_rejected[priority] += 1
+            statuses = ('rejected',)
+        if METRICS_AVAILABLE:
+            for status in statuses:
+                try:
+                    global_budget_requests_total.inc(1, priority=priority.name, status=status)
+                except Exception:
+                    pass
+        if ticket._future is not None:
+            future = ticket._future
+            ticket._loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+    def _submit_locked(self, priority: RequestPriority, is_trading: bool,
+                       timeout: Optional[float], tokens: float) -> AdmissionTicket:
+        now = self._clock()
+        ticket = AdmissionTicket(priority, 'trading' if is_trading else 'data', tokens,
+                                 next(self._seq), now, None if timeout is None else now + timeout)
+        if ticket.deadline is None:
+            # No deadline: a priority in backoff is turned away (callers retry)
+            if now < self._backoff_until[priority]:
+                self._record(ticket, REJECTED, now, 'backoff')
+                return ticket
+        else:
+            for bucket in self._buckets.values():
+                bucket.refill(now)
+            if self._estimate_admission(ticket, now) > ticket.deadline:
+                self._record(ticket, REJECTED, now, 'deadline')
+                return ticket
+        bisect.insort(self._queue, ticket)
+        self._dispatch_locked()
+        return ticket
+
+    def _dispatch_locked(self) -> Optional[float]:
+        """
+        Admit / expire queued tickets in priority order; returns the next
+        time anything can change (None if the queue is empty).
+        """
+        now = self._clock()
+        for bucket in self._buckets.values():
+            bucket.refill(now)
+        decided = False
+        next_wake = float('inf')
+        remaining: List[AdmissionTicket] = []
+        for ticket in self._queue:
+            if ticket.deadline is not None and now >= ticket.deadline:
+                self._record(ticket, REJECTED, now, 'deadline')
+                decided = True
+                continue
+            backoff = self._backoff_until[ticket.priority]
+            if now < backoff:
+                remaining.append(ticket)
+                next_wake = min(next_wake, backoff)
+                continue
+            source = next((b for b in self._sources(ticket) if b.tokens >= ticket.tokens - TOKEN_EPSILON), None)
+            if source is not None:
+                source.tokens = max(0.0, source.tokens - ticket.tokens)
+                self._record(ticket, ADMITTED, now)
+                decided = True
+                continue
+            remaining.append(ticket)
+            own = self._buckets[(ticket.priority, ticket.kind)]
+            next_wake = min(next_wake, now + own.time_until(ticket.tokens))
+        for ticket in remaining:
+            if ticket.deadline is not None:
+                next_wake = min(next_wake, ticket.deadline)
+        self._queue = remaining
+        if decided:
+            self._cond.notify_all()
+        return None if not remaining else next_wake
+
+    def _cancel_locked(self, ticket: AdmissionTicket):
+        if ticket.state == WAITING and ticket in self._queue:
+            self._queue.remove(ticket)
+            self._record(ticket, REJECTED, self._clock(), 'cancelled')
+            self._cond.notify_all()
+
+    # ──────────────────────────────────────────────────────────────
+    # Non-blocking API (fake-clock harness, custom event loops)
+    # ──────────────────────────────────────────────────────────────
+
+    def submit(self, priority: RequestPriority, is_trading: bool = False,
+               timeout: Optional[float] = None, tokens: float = 1.0) -> AdmissionTicket:
+        """Queue a request without waiting; check ticket.state after poll()."""
+        with self._cond:
+            return self._submit_locked(priority, is_trading, timeout, tokens)
+
+    def poll(self) -> Optional[float]:
+        """Run admissions at the current clock time; returns next_wakeup()."""
+        with self._cond:
+            return self._dispatch_locked()
+
+    def next_wakeup(self) -> Optional[float]:
+        """Clock time of the next possible admission or expiry (None if idle)."""
+        return self.poll()
+
+    # ──────────────────────────────────────────────────────────────
+    # Blocking / async API
+    # ──────────────────────────────────────────────────────────────
+
+    def wait_for_slot(self, priority: RequestPriority, is_trading: bool = False,
+                      timeout: Optional[float] = None, tokens: float = 1.0) -> bool:
         """
         Wait for a rate limit slot for the given priority.
 
         Args:
             priority: Request priority level
             is_trading: Whether this is a trading operation
+            timeout: Give up (and reject now, if it cannot be met) after this many seconds
+            tokens: Cost of the request
 
         Returns:
-            True if slot granted, False if rejected due to high-priority backoff
+            True if slot granted, False if rejected (backoff, deadline)
         """
-        with self._lock:
-            current_time = time.time()
-
-            # Check if we're in backoff from higher priority requests
-            if current_time < self._backoff_until[priority]:
-                self.requests_rejected[priority] += 1
-                if METRICS_AVAILABLE:
-                    try:
-                        global_budget_requests_total.inc(1, priority=priority.name, status='rejected')
-                    except Exception:
-                        pass
-                return False
-
-            # Try to get a slot from this priority's limiter
-            limiter = self._rate_limiters[priority]
-            try:
-                if is_trading:
-                    limiter.wait_trading()
-                else:
-                    limiter.wait_data()
-            except Exception as e:
-                logger.warning(f"Rate limiter error for {priority}: {e}")
-                # Still allow the request but mark as delayed
-                self.requests_delayed[priority] += 1
-                if METRICS_AVAILABLE:
-                    try:
-                        global_budget_requests_total.inc(1, priority=priority.name, status='delayed')
-                    except Exception:
-                        pass
-
-            self.requests_processed[priority] += 1
-            if METRICS_AVAILABLE:
+        with self._cond:
+            ticket = self._submit_locked(priority, is_trading, timeout, tokens)
+            while ticket.state == WAITING:
+                wake = self._dispatch_locked()
+                if ticket.state != WAITING:
+                    break
+                delay = WAIT_SLICE_S if wake is None else min(WAIT_SLICE_S, max(0.0, wake - self._clock()))
+                self._cond.wait(delay)
+        return ticket.state == ADMITTED
+
+    async def wait_for_slot_async(self, priority: RequestPriority, is_trading: bool = False,
+                                  timeout: Optional[float] = None, tokens: float = 1.0) -> bool:
+        """wait_for_slot for coroutines: parks on a future instead of a thread."""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            ticket = self._submit_locked(priority, is_trading, timeout, tokens)
+            if ticket.state == WAITING:
+                ticket._loop, ticket._future = loop, loop.create_future()
+        try:
+            while ticket.state == WAITING:
+                with self._cond:
+                    wake = self._dispatch_locked()
+                    if ticket.state != WAITING:
+                        break
+                    delay = WAIT_SLICE_S if wake is None else min(WAIT_SLICE_S, max(0.0, wake - self._clock()))
                 try:
-                    global_budget_requests_total.inc(1, priority=priority.name, status='processed')
-                except Exception:
+                    await asyncio.wait_for(asyncio.shield(ticket._future), timeout=delay)
+                except asyncio.TimeoutError:
                     pass
-
-            # If this is a high-priority request, impose backoff on lower priorities
-            if priority == RequestPriority.EXECUTION:
-                # Block positions and quotes for 0.5 seconds
-                self._backoff_until[RequestPriority.POSITIONS] = current_time + 0.5
-                self._backoff_until[RequestPriority.QUOTES] = current_time + 0.5
-            elif priority == RequestPriority.POSITIONS:
-                # Block quotes for 0.2 seconds
-                self._backoff_until[RequestPriority.QUOTES] = current_time + 0.2
-
-            return True
+        except asyncio.CancelledError:
+            with self._cond:
+                self._cancel_locked(ticket)
+            raise
+        return ticket.state == ADMITTED
 
     def on_429_error(self, priority: RequestPriority):
         """Handle 429 error by triggering backoff for this priority level."""
-        with self._lock:
-            current_time = time.time()
+        with self._cond:
+            current_time = self._clock()
+            if current_time - self._last_429 > BACKOFF_429_RESET_S:
+                self._429_streak = 0
+            self._429_streak += 1
+            self._last_429 = current_time
 
-            # Trigger backoff for this priority and all lower priorities
-            backoff_time = 2.0  # Base backoff
+            # Trigger backoff for this priority and all lower priorities,
+            # doubling with consecutive 429s
+            backoff_time = min(MAX_BACKOFF_429_S, BACKOFF_429_S * 2 ** (self._429_streak - 1))
 
             for p in RequestPriority:
                 if p.value >= priority.value:  # This priority and lower
@@ -167,14 +395,12 @@ class GlobalRateBudget:
                         current_time + backoff_time
                     )
                     backoff_time *= 0.5  # Shorter backoff for lower priorities
-
-            # Also trigger adaptive backoff in the specific limiter
-            if priority in self._rate_limiters:
-                self._rate_limiters[priority].on_429_error()
+            self._cond.notify_all()
 
     def get_stats(self) -> Dict:
         """Get budget statistics."""
-        with self._lock:
+        with self._cond:
+            now = self._clock()
             return {
                 "total_rate_per_second": self.total_rate,
                 "total_burst": self.total_burst,
@@ -182,9 +408,20 @@ class GlobalRateBudget:
                 "requests_delayed": dict(self.requests_delayed),
                 "requests_rejected": dict(self.requests_rejected),
                 "active_backoffs": {
-                    priority.name: max(0, until - time.time())
+                    priority.name: max(0, until - now)
                     for priority, until in self._backoff_until.items()
-                }
+                },
+                "queued": {
+                    priority.name: sum(1 for t in self._queue if t.priority == priority)
+                    for priority in RequestPriority
+                },
+                "wait_ms": {
+                    priority.name: {
+                        'p50': _percentile(self._waits[priority], 0.50) * 1000,
+                        'p99': _percentile(self._waits[priority], 0.99) * 1000,
+                    }
+                    for priority in RequestPriority
+                },
             }
 
 # Global instance
@@ -233,4 +470,4 @@ def classify_request_type(endpoint: str, method: str = 'GET') -> RequestPriority
         return RequestPriority.QUOTES
 
     # Default to quotes for unknown endpoints
-    return RequestPriority.QUOTES
\ No newline at end of file
+    return RequestPriority.QUOTES
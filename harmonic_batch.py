@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Harmonic Batch
+--------------
+Vectorised wave maths and the binary seed format for aureon_harmonic_seed.
+
+HarmonicSeedLoader used to walk symbols one at a time (one FFT each for
+phase and for frequency) and fill the coherence matrix pair by pair, which
+is N^2 Python calls. Here the price histories are stacked into one matrix:
+
+    phase, amplitude, freq = wave_spectra(prices)     # one FFT per row
+    C = coherence_matrix(histories)                   # Gram matrix of z-scores
+
+Zero-lag coherence is the sum over the cross-spectrum Z_i * conj(Z_j);
+by Parseval that is the time-domain dot product, so the whole matrix is a
+single Z @ Z.T instead of a second round of FFTs.
+
+Results match the per-symbol methods they replace (same detrend, same
+Hilbert filter, same positive-frequency argmax, same prefix truncation for
+series of different lengths).
+
+The seed is saved as an uncompressed versioned .npz: histories are stored
+as NaN-padded (n_symbols, SEED_CANDLE_COUNT) blocks and the coherence
+matrix as a dense float64 array. open_seed() memory-maps each member
+read-only on first access (np.load ignores mmap_mode for .npz archives),
+so checking a seed's shape or symbol list reads neither the histories nor
+the matrix, and unpacking only touches the rows it copies out.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import json
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEED_FORMAT_VERSION = 1
+MIN_WAVE_SAMPLES = 10               # Below this the per-symbol methods bail out
+
+_STATE_FIELDS = ('phase', 'amplitude', 'frequency', 'velocity', 'coherence',
+                 'last_price', 'last_volume', 'last_update')
+_HISTORY_FIELDS = ('price_history', 'volume_history', 'phase_history')
+_GLOBAL_FIELDS = ('global_phase', 'global_coherence', 'dominant_frequency',
+                  'schumann_alignment', 'last_update', 'candle_count')
+
+
+# ═══════════════════════════════════════════════════════════════
+# WAVE MATHS
+# ═══════════════════════════════════════════════════════════════
+
+def wave_spectra(prices: np.ndarray, sample_rate: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hilbert phase, normalised amplitude and dominant frequency for a stack of
+    equal-length series (rows), from one FFT per row.
+
+    Returns (phase (m, n), amplitude (m, n), dominant cycles/day (m,)).
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    m, n = prices.shape
+    detrended = prices - prices.mean(axis=1, keepdims=True)
+    spectrum = np.fft.fft(detrended, axis=1)
+
+    h = np.zeros(n)
+    if n > 0:
+        h[0] = 1
+        if n % 2 == 0:
+            h[1:n // 2] = 2
+            h[n // 2] = 1
+        else:
+            h[1:(n + 1) // 2] = 2
+    analytic = np.fft.ifft(spectrum * h, axis=1)
+    amplitude = np.abs(analytic)
+    phase = np.angle(analytic)
+    peak = amplitude.max(axis=1, keepdims=True) if n else np.zeros((m, 1))
+    amplitude = np.divide(amplitude, peak, out=amplitude, where=peak > 0)
+
+    # Positive fftfreq bins are 1 .. ceil(n/2)-1 (Nyquist counts as negative)
+    positive = slice(1, (n + 1) // 2)
+    magnitudes = np.abs(spectrum[:, positive])
+    if magnitudes.shape[1] == 0:
+        freq = np.zeros(m)
+    else:
+        freq = np.fft.fftfreq(n, d=1.0 / sample_rate)[positive][magnitudes.argmax(axis=1)]
+    return phase, amplitude, np.maximum(0.1, freq * 24)
+
+
+def _zscore_rows(x: np.ndarray) -> np.ndarray:
+    """Rows scaled to mean 0 and unit norm; constant rows become 0."""
+    centred = x - x.mean(axis=1, keepdims=True)
+    norm = np.sqrt((centred * centred).sum(axis=1, keepdims=True))
+    return np.divide(centred, norm, out=np.zeros_like(centred), where=norm > 0)
+
+
+def row_coherence(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pearson correlation of matching rows of two (m, n) stacks."""
+    return np.clip((_zscore_rows(np.atleast_2d(a)) * _zscore_rows(np.atleast_2d(b))).sum(axis=1), -1.0, 1.0)
+
+
+def coherence_matrix(histories: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Full (m, m) coherence matrix for price histories of any lengths.
+
+    Pair (i, j) is the correlation of the first min(len_i, len_j) points of
+    both series, as in HarmonicSeedLoader._calculate_coherence; series
+    shorter than MIN_WAVE_SAMPLES score 0. One Gram product per distinct
+    length (usually one: every seeded symbol has SEED_CANDLE_COUNT candles).
+    """
+    m = len(histories)
+    out = np.zeros((m, m))
+    if m == 0:
+        return out
+    lengths = np.array([len(h) for h in histories])
+    width = int(lengths.max())
+    stacked = np.full((m, width), np.nan)
+    for i, h in enumerate(histories):
+        stacked[i, :len(h)] = h
+    pair_len = np.minimum.outer(lengths, lengths)
+    for length in np.unique(lengths):
+        if length < MIN_WAVE_SAMPLES:
+            continue
+        rows = np.flatnonzero(lengths >= length)
+        z = _zscore_rows(stacked[rows, :length])
+        block = np.clip(z @ z.T, -1.0, 1.0)
+        target = pair_len[np.ix_(rows, rows)] == length
+        sub = out[np.ix_(rows, rows)]
+        sub[target] = block[target]
+        out[np.ix_(rows, rows)] = sub
+    return out
+
+
+def upper_triangle_dict(symbols: Sequence[str], matrix: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """The {sym1: {sym2: c}} upper-triangle mapping GlobalHarmonicState keeps."""
+    rows = matrix.tolist()
+    return {s1: {symbols[j]: rows[i][j] for j in range(i + 1, len(symbols))}
+            for i, s1 in enumerate(symbols)}
+
+
+def dense_from_dict(symbols: Sequence[str], mapping: Dict[str, Dict[str, float]]) -> np.ndarray:
+    """Symmetric matrix from the upper-triangle mapping (diagonal 1)."""
+    index = {s: i for i, s in enumerate(symbols)}
+    dense = np.eye(len(symbols))
+    for s1, inner in mapping.items():
+        i = index.get(s1)
+        if i is None:
+            continue
+        for s2, c in inner.items():
+            j = index.get(s2)
+            if j is not None:
+                dense[i, j] = dense[j, i] = c
+    return dense
+
+
+# ═══════════════════════════════════════════════════════════════
+# BINARY SEED
+# ═══════════════════════════════════════════════════════════════
+
+def pack_histories(histories: Sequence[Sequence[float]], width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Last `width` points of each history, left-aligned and NaN-padded."""
+    block = np.full((len(histories), width), np.nan)
+    lengths = np.zeros(len(histories), dtype=np.int32)
+    for i, h in enumerate(histories):
+        tail = h[-width:] if width else []
+        block[i, :len(tail)] = tail
+        lengths[i] = len(tail)
+    return block, lengths
+
+
+def save_seed(path: Path, state: Any, width: int) -> Path:
+    """Write a GlobalHarmonicState as a versioned .npz (atomic replace)."""
+    path = Path(path)
+    symbols = list(state.symbols)
+    waves = [state.symbols[s] for s in symbols]
+    arrays: Dict[str, np.ndarray] = {
+        'format_version': np.array(SEED_FORMAT_VERSION),
+        'symbols': np.array(symbols, dtype=np.str_),
+        'market_regime': np.array(state.market_regime),
+    }
+    for name in _GLOBAL_FIELDS:
+        arrays[f'state_{name}'] = np.array(getattr(state, name))
+    for name in _STATE_FIELDS:
+        arrays[name] = np.array([getattr(w, name) for w in waves], dtype=np.float64)
+    for name in _HISTORY_FIELDS:
+        arrays[name], arrays[f'{name}_len'] = pack_histories([getattr(w, name) for w in waves], width)
+
+    coherence_symbols = list(state.coherence_matrix)
+    arrays['coherence_symbols'] = np.array(coherence_symbols, dtype=np.str_)
+    arrays['coherence_matrix'] = dense_from_dict(coherence_symbols, state.coherence_matrix)
+
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+class SeedFile:
+    """
+    Read-only view of an uncompressed .npz: npz[name] memory-maps that member
+    (mode 'r') the first time it is asked for. Compressed, 0-d and empty
+    members are read normally. Mapping-like and a context manager, as NpzFile.
+
+    Mapped arrays are views of the file: copy them before the file is
+    rewritten in place (save_seed replaces it atomically, which is safe).
+    """
+
+    _LOCAL_HEADER = struct.Struct('<4s22xHH')           # signature ... name length, extra length
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._fh = open(self.path, 'rb')
+        self.files = [name[:-4] for name in self._zip.namelist() if name.endswith('.npy')]
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        array = self._arrays.get(key)
+        if array is None:
+            if key not in self.files:
+                raise KeyError(key)
+            array = self._arrays[key] = self._map(self._zip.getinfo(key + '.npy'))
+        return array
+
+    def _map(self, info: zipfile.ZipInfo) -> np.ndarray:
+        if info.compress_type != zipfile.ZIP_STORED:
+            with self._zip.open(info) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+        self._fh.seek(info.header_offset)
+        signature, name_len, extra_len = self._LOCAL_HEADER.unpack(self._fh.read(self._LOCAL_HEADER.size))
+        if signature != b'PK\x03\x04':
+            raise ValueError(f"bad zip member header for {info.filename}")
+        start = info.header_offset + self._LOCAL_HEADER.size + name_len + extra_len
+        self._fh.seek(start)
+        version = np.lib.format.read_magic(self._fh)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(self._fh)
+        elif version == (2, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(self._fh)
+        else:
+            shape, dtype = (), None
+        if dtype is None or dtype.hasobject or not shape or 0 in shape:
+            self._fh.seek(start)
+            return np.lib.format.read_array(self._fh, allow_pickle=False)
+        return np.memmap(self._fh, dtype=dtype, mode='r', shape=shape,
+                         order='F' if fortran else 'C', offset=self._fh.tell())
+
+    def keys(self) -> List[str]:
+        return list(self.files)
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.files
+
+    def close(self):
+        self._arrays.clear()
+        self._zip.close()
+        self._fh.close()
+
+    def __enter__(self) -> 'SeedFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_seed(path: Path) -> Optional[SeedFile]:
+    """Memory-mapped SeedFile for a seed of the current format version, else None."""
+    try:
+        npz = SeedFile(path)
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+    try:
+        current = 'format_version' in npz and int(npz['format_version']) == SEED_FORMAT_VERSION
+    except (OSError, ValueError):
+        current = False
+    if not current:
+        npz.close()
+        return None
+    return npz
+
+
+def state_fields(npz: Any) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Dict[str, float]]]:
+    """
+    Unpack an open seed into (global fields, per-symbol kwargs, coherence dict)
+    ready for GlobalHarmonicState / SymbolWaveState. Members are mapped as
+    they are read; histories are copied out row by row up to their lengths.
+    """
+    symbols = npz['symbols'].tolist()
+    globals_ = {name: npz[f'state_{name}'].item() for name in _GLOBAL_FIELDS}
+    globals_['market_regime'] = str(npz['market_regime'])
+
+    columns = {name: npz[name].tolist() for name in _STATE_FIELDS}
+    histories = {}
+    for name in _HISTORY_FIELDS:
+        block, lengths = npz[name], npz[f'{name}_len']
+        histories[name] = [block[i, :lengths[i]].tolist() for i in range(len(symbols))]
+    waves = []
+    for i, symbol in enumerate(symbols):
+        kwargs = {'symbol': symbol}
+        kwargs.update({name: columns[name][i] for name in _STATE_FIELDS})
+        kwargs.update({name: histories[name][i] for name in _HISTORY_FIELDS})
+        waves.append(kwargs)
+
+    coherence_symbols = npz['coherence_symbols'].tolist()
+    return globals_, waves, upper_triangle_dict(coherence_symbols, npz['coherence_matrix'])
+
+
+def write_meta(path: Path, meta: Dict[str, Any]):
+    with open(path, 'w') as f:
+        json.dump(meta, f)
@@ -4,7 +4,8 @@
 
 Purpose:
 - Offload market scanning to Kraken REST API (free)
-- Write local JSON cache for other processes to consume
+- Update the shared memory-mapped ticker table in place (shared_ticker_table)
+- Optionally export a local JSON cache for legacy readers
 - Complements Binance WS feeder to maximize Alpaca trading opportunities
 
 Output schema (matches Binance feeder for compatibility):
@@ -50,6 +51,11 @@ from typing import Any, Dict
 
 from kraken_client import KrakenClient, get_kraken_client
 
+try:
+    from shared_ticker_table import publish_ticker_cache
+except Exception:
+    publish_ticker_cache = None
+
 
 def _atomic_write_json(path: str, data: Dict[str, Any]) -> None:
     tmp = f"{path}.tmp"
@@ -130,6 +136,9 @@ def main() -> int:
     parser.add_argument('--out', default=os.getenv('KRAKEN_CACHE_PATH', 'ws_cache/kraken_prices.json'))
     parser.add_argument('--interval-s', type=float, default=float(os.getenv('KRAKEN_CACHE_INTERVAL_S', '120')))
     parser.add_argument('--once', action='store_true', help='Write cache once and exit')
+    parser.add_argument('--no-json-export', action='store_true',
+                        default=os.getenv('MARKET_CACHE_JSON_EXPORT', '1').lower() in ('0', 'false', 'no', 'off'),
+                        help='Only update the shared ticker table, skip the JSON file')
     args = parser.parse_args()
 
     # CRITICAL: Increase minimum interval to 120s to avoid rate limits
@@ -186,16 +195,21 @@ def main() -> int:
                     print(f"   ❌ State file fallback also failed: {e2}")
             else:
                 prices, ticker_cache = _build_ticker_cache(tickers)
+                now = time.time()
+
+                if publish_ticker_cache:
+                    publish_ticker_cache(prices, ticker_cache, 'kraken_rest', now)
 
-                payload = {
-                    'generated_at': time.time(),
-                    'source': 'kraken_rest',
-                    'count': len(prices),
-                    'ticker_count': len(ticker_cache) // 2,
-                    'prices': prices,
-                    'ticker_cache': ticker_cache,
-                }
-                _atomic_write_json(args.out, payload)
+                if not args.no_json_export:
+                    payload = {
+                        'generated_at': now,
+                        'source': 'kraken_rest',
+                        'count': len(prices),
+                        'ticker_count': len(ticker_cache) // 2,
+                        'prices': prices,
+                        'ticker_cache': ticker_cache,
+                    }
+                    _atomic_write_json(args.out, payload)
 
                 took = time.time() - started
                 print(f"   🐙 Wrote {len(prices)} Kraken prices, {len(ticker_cache)//2} tickers in {took:.2f}s")
@@ -7,6 +7,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from exchange_pair_index import PairIndex, ensure_pair_index
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -20,6 +22,26 @@ KRAKEN_BASE = "https://api.kraken.com"
 ASSETPAIR_CACHE_TTL = 300  # seconds
 KRAKEN_TRADES_PAGE_SIZE = 50
 
+_QUOTE_SUFFIXES = ['USD', 'USDC', 'USDT', 'EUR', 'GBP', 'BTC', 'XBT', 'ETH']
+
+# Kraken's legacy Z-prefixed fiat codes
+_KRAKEN_FIAT = {'ZUSD': 'USD', 'ZEUR': 'EUR', 'ZGBP': 'GBP', 'ZJPY': 'JPY', 'ZCAD': 'CAD', 'ZAUD': 'AUD'}
+
+
+def _normalize_kraken_asset(name: str) -> str:
+    """XXBT -> BTC, XETH -> ETH, ZGBP -> GBP (Kraken X/Z asset prefixes)."""
+    name = name.upper()
+    if name in _KRAKEN_FIAT:
+        return _KRAKEN_FIAT[name]
+    if name.startswith('XX'):
+        name = name[2:]  # XXBT -> BT
+    elif name.startswith('X') and len(name) > 3:
+        name = name[1:]  # XETH -> ETH
+    # XBT/BT -> BTC
+    if name in ('XBT', 'BT'):
+        name = 'BTC'
+    return name
+
 # 🔐 CROSS-PROCESS NONCE MANAGER
 # Prevents "Invalid nonce" errors when multiple processes share the same API key
 # Uses file-based atomic counter with locking
@@ -117,6 +139,8 @@ class KrakenClient:
         # Map altname -> internal pair key used by ticker results
         self._alt_to_int: Dict[str, str] = {}
         self._int_to_alt: Dict[str, str] = {}
+        # Normalised base/quote index, rebuilt once per AssetPairs refresh
+        self._pair_index: PairIndex | None = None
         
         # Rate limiting to prevent nonce errors
         self._last_private_call: float = 0.0
@@ -224,6 +248,36 @@ class KrakenClient:
             self._int_to_alt[internal] = alt
         return pairs
 
+    def _build_pair_entries(self, pairs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        entries = []
+        for internal, info in pairs.items():
+            alt = info.get("altname") or internal
+            base = _normalize_kraken_asset(info.get("base", ""))
+            quote = _normalize_kraken_asset(info.get("quote", ""))
+            # Fall back to altname parsing (e.g., ETHBTC -> ETH, BTC)
+            if not base and len(alt) >= 6:
+                for q in _QUOTE_SUFFIXES:
+                    if alt.endswith(q):
+                        base = alt[:-len(q)]
+                        quote = 'BTC' if q == 'XBT' else q
+                        break
+            entries.append({
+                "pair": alt,
+                "internal": internal,
+                "base": base,
+                "quote": quote,
+                "wsname": info.get("wsname", ""),
+            })
+        return entries
+
+    def _get_pair_index(self) -> PairIndex:
+        """Pair index for the current AssetPairs snapshot."""
+        pairs = self._load_asset_pairs()
+        self._pair_index = ensure_pair_index(
+            self._pair_index, self._pairs_cache_time,
+            lambda: self._build_pair_entries(pairs))
+        return self._pair_index
+
     def get_ledgers(self, since: int | None = None, max_records: int = 1000) -> List[Dict[str, Any]]:
         if self.dry_run:
             return []
@@ -1400,49 +1454,8 @@ class KrakenClient:
         Returns:
             List of pairs with base, quote, and pair name
         """
-        pairs = self._load_asset_pairs()
-        results = []
-        
-        for internal, info in pairs.items():
-            alt = info.get("altname") or internal
-            wsname = info.get("wsname", "")
-            pair_base = info.get("base", "")
-            pair_quote = info.get("quote", "")
-            
-            # Normalize asset names (Kraken uses X prefix for crypto, Z for fiat)
-            pair_base_clean = pair_base.lstrip("XZ")
-            pair_quote_clean = pair_quote.lstrip("XZ")
-            
-            # Also handle altname parsing (e.g., ETHBTC -> ETH, BTC)
-            if not pair_base_clean and len(alt) >= 6:
-                # Try to parse from altname
-                for q in ['USD', 'USDC', 'USDT', 'EUR', 'GBP', 'BTC', 'XBT', 'ETH']:
-                    if alt.endswith(q):
-                        pair_base_clean = alt[:-len(q)]
-                        pair_quote_clean = q
-                        break
-            
-            # Normalize XBT to BTC
-            if pair_base_clean == 'XBT':
-                pair_base_clean = 'BTC'
-            if pair_quote_clean == 'XBT':
-                pair_quote_clean = 'BTC'
-            
-            # Apply filters
-            if base and pair_base_clean.upper() != base.upper():
-                continue
-            if quote and pair_quote_clean.upper() != quote.upper():
-                continue
-            
-            results.append({
-                "pair": alt,
-                "internal": internal,
-                "base": pair_base_clean,
-                "quote": pair_quote_clean,
-                "wsname": wsname
-            })
-        
-        return results
+        index = self._get_pair_index()
+        return [dict(entry) for entry in index.pairs(base=base, quote=quote)]
 
     def find_conversion_path(self, from_asset: str, to_asset: str, _depth: int = 0) -> List[Dict[str, Any]]:
         """
@@ -1455,12 +1468,11 @@ class KrakenClient:
         Args:
             from_asset: Source asset (e.g., 'BTC')
             to_asset: Target asset (e.g., 'ETH')
-            _depth: Internal recursion depth limiter
+            _depth: Internal recursion depth limiter (legacy callers)
             
         Returns:
             List of {pair, side, description} for each trade needed
         """
-        # 🐍 MEDUSA: Prevent infinite recursion
         if _depth > 2:
             return []
             
@@ -1470,76 +1482,15 @@ class KrakenClient:
         if from_asset == to_asset:
             return []
         
-        # Normalize BTC/XBT
-        from_norm = 'XBT' if from_asset == 'BTC' else from_asset
-        to_norm = 'XBT' if to_asset == 'BTC' else to_asset
-        
-        # 🐍 MEDUSA: Normalize Kraken quote currencies
-        # ZUSD = USD (Kraken internal naming)
-        quote_currencies = ['USD', 'ZUSD', 'USDT', 'USDC', 'EUR', 'ZEUR']
-        from_is_quote = from_asset in quote_currencies
-        to_is_quote = to_asset in quote_currencies
-        
-        # Normalize ZUSD -> USD for matching purposes
+        # 🐍 MEDUSA: Normalize ZUSD -> USD for matching purposes
         from_match = 'USD' if from_asset == 'ZUSD' else from_asset
         to_match = 'USD' if to_asset == 'ZUSD' else to_asset
         
-        pairs = self._load_asset_pairs()
+        index = self._get_pair_index()
         
-        # Try direct pair: from_asset/to_asset (sell from, get to)
-        for internal, info in pairs.items():
-            alt = info.get("altname", internal)
-            raw_base = info.get("base", "")
-            raw_quote = info.get("quote", "")
-            
-            # 🐍 MEDUSA: Smarter Kraken name normalization
-            # XXBT -> BTC (not XBT or BT)
-            # XETH -> ETH
-            # ZUSD -> USD
-            def normalize_kraken_asset(name: str) -> str:
-                # Strip leading X or Z (Kraken prefixes)
-                if name.startswith('XX'):
-                    name = name[2:]  # XXBT -> BT
-                elif name.startswith('X') and len(name) > 3:
-                    name = name[1:]  # XETH -> ETH
-                elif name.startswith('Z') and name not in ('ZUSD', 'ZEUR', 'ZGBP'):
-                    name = name[1:]
-                # XBT/BT -> BTC
-                if name in ('XBT', 'BT'):
-                    name = 'BTC'
-                # Normalize quote currencies
-                if name == 'ZUSD':
-                    name = 'USD'
-                if name == 'ZEUR':
-                    name = 'EUR'
-                return name.upper()
-            
-            base = normalize_kraken_asset(raw_base)
-            quote = normalize_kraken_asset(raw_quote)
-            
-            # Normalize quote currencies for matching
-            quote_normalized = 'USD' if quote in ('ZUSD', 'USD') else quote
-            
-            # Direct: from_asset is base, to_asset is quote -> SELL from_asset for to_asset
-            if base == from_match and quote_normalized == to_match:
-                return [{
-                    "pair": alt,
-                    "side": "sell",
-                    "description": f"Sell {from_asset} for {to_asset}",
-                    "from": from_asset,
-                    "to": to_asset
-                }]
-            
-            # Inverse: to_asset is base, from_asset is quote -> BUY to_asset with from_asset
-            # 🐍 MEDUSA: When from_asset is USD/ZUSD, we BUY to_asset
-            if base.upper() == to_match and quote_normalized == from_match:
-                return [{
-                    "pair": alt,
-                    "side": "buy",
-                    "description": f"Buy {to_asset} with {from_asset}",
-                    "from": from_asset,
-                    "to": to_asset
-                }]
+        direct = self._direct_conversion(index, from_asset, to_asset, from_match, to_match)
+        if direct:
+            return [direct]
         
         # No direct pair - route through intermediary (USD, USDC, USDT, EUR)
         # 🐍 MEDUSA: Skip intermediate routing if from_asset IS the intermediate
@@ -1547,14 +1498,36 @@ class KrakenClient:
             # Prevent infinite recursion: don't route through self
             if from_match == intermediate or to_match == intermediate:
                 continue
-            path1 = self.find_conversion_path(from_asset, intermediate, _depth + 1)
-            path2 = self.find_conversion_path(intermediate, to_asset, _depth + 1)
-            
-            if path1 and path2 and len(path1) == 1 and len(path2) == 1:
-                return path1 + path2
+            leg1 = self._direct_conversion(index, from_asset, intermediate, from_match, intermediate)
+            if not leg1:
+                continue
+            leg2 = self._direct_conversion(index, intermediate, to_asset, intermediate, to_match)
+            if leg2:
+                return [leg1, leg2]
         
         return []  # No path found
 
+    @staticmethod
+    def _direct_conversion(index: PairIndex, from_asset: str, to_asset: str,
+                           from_match: str, to_match: str) -> Dict[str, Any] | None:
+        hit = index.direct(from_match, to_match)
+        if hit is None:
+            return None
+        entry, side = hit
+        if side == "sell":
+            # from_asset is base, to_asset is quote -> SELL from_asset for to_asset
+            description = f"Sell {from_asset} for {to_asset}"
+        else:
+            # 🐍 MEDUSA: When from_asset is USD/ZUSD, we BUY to_asset
+            description = f"Buy {to_asset} with {from_asset}"
+        return {
+            "pair": entry["pair"],
+            "side": side,
+            "description": description,
+            "from": from_asset,
+            "to": to_asset
+        }
+
     def convert_crypto(
         self,
         from_asset: str,
@@ -1742,37 +1715,7 @@ class KrakenClient:
         Returns:
             Dict mapping each asset to list of assets it can convert to
         """
-        pairs = self._load_asset_pairs()
-        
-        # Build conversion map
-        conversions = {}
-        
-        for internal, info in pairs.items():
-            base = info.get("base", "").lstrip("XZ")
-            quote = info.get("quote", "").lstrip("XZ")
-            
-            # Normalize XBT -> BTC
-            if base == 'XBT': base = 'BTC'
-            if quote == 'XBT': quote = 'BTC'
-            
-            if not base or not quote:
-                continue
-            
-            base = base.upper()
-            quote = quote.upper()
-            
-            # Base can convert to quote (by selling)
-            if base not in conversions:
-                conversions[base] = set()
-            conversions[base].add(quote)
-            
-            # Quote can convert to base (by buying)
-            if quote not in conversions:
-                conversions[quote] = set()
-            conversions[quote].add(base)
-        
-        # Convert sets to sorted lists
-        return {k: sorted(v) for k, v in conversions.items()}
+        return self._get_pair_index().convertible()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
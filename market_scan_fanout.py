@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Market Scan Fan-out
+-------------------
+Runs per-venue market scans side by side with a deadline per venue.
+
+OrcaKillCycle.scan_entire_market (and its queen_quantum_frog twin) used
+to scan Alpaca, Kraken, Binance and Capital.com one after another, so a
+scan took the sum of four venues and one slow venue held up the rest.
+scan_venues starts every venue at once and waits only until each
+venue's deadline:
+
+    results = scan_venues([('kraken', scan_kraken), ('binance', scan_binance)],
+                          deadline_s={'kraken': 10.0, 'binance': 5.0})
+
+A venue that misses its deadline is reported as 'timeout' and contributes
+no results - the others still do. Its worker thread is a daemon and its
+late result is discarded. Until that scan returns the venue stays in
+flight: later calls report it as 'busy' instead of starting another
+scan, so a hung venue holds one thread and one REST scan, not one per
+cycle. Results always come back in scanner order so downstream ranking
+is deterministic.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+SCAN_VENUE_DEADLINE_S = float(os.getenv('AUREON_SCAN_VENUE_DEADLINE', '20'))
+SCAN_CONCURRENT = os.getenv('AUREON_SCAN_CONCURRENT', '1') != '0'
+
+_inflight: Dict[str, float] = {}        # Venue -> start of its running scan
+_inflight_lock = threading.Lock()
+
+
+@dataclass
+class VenueScanResult:
+    """Outcome of one venue's scan."""
+    venue: str
+    status: str                 # 'ok', 'error', 'timeout' or 'busy'
+    seconds: float
+    items: List[Any] = field(default_factory=list)
+    error: str = ''
+
+
+def _run_scanner(venue: str, scanner: Callable[[], List[Any]]) -> VenueScanResult:
+    start = time.perf_counter()
+    try:
+        items = list(scanner() or [])
+        return VenueScanResult(venue, 'ok', time.perf_counter() - start, items)
+    except Exception as e:
+        return VenueScanResult(venue, 'error', time.perf_counter() - start, [], str(e))
+
+
+def _claim(venue: str) -> bool:
+    """Mark a venue's scan as running; False if its previous scan still is."""
+    with _inflight_lock:
+        if venue in _inflight:
+            return False
+        _inflight[venue] = time.perf_counter()
+        return True
+
+
+def _release(venue: str) -> None:
+    with _inflight_lock:
+        _inflight.pop(venue, None)
+
+
+def _busy(venue: str) -> VenueScanResult:
+    with _inflight_lock:
+        started = _inflight.get(venue)
+    age = time.perf_counter() - started if started is not None else 0.0
+    return VenueScanResult(venue, 'busy', 0.0, error=f"previous scan still running ({age:.1f}s)")
+
+
+def _scan_claimed(venue: str, scanner: Callable[[], List[Any]]) -> VenueScanResult:
+    try:
+        return _run_scanner(venue, scanner)
+    finally:
+        _release(venue)
+
+
+def in_flight_venues() -> List[str]:
+    """Venues whose last scan has not returned yet (e.g. past its deadline)."""
+    with _inflight_lock:
+        return sorted(_inflight)
+
+
+def scan_venues(scanners: Sequence[Tuple[str, Callable[[], List[Any]]]],
+                concurrent: bool = SCAN_CONCURRENT,
+                deadline_s: Union[float, Dict[str, float]] = SCAN_VENUE_DEADLINE_S) -> List[VenueScanResult]:
+    """
+    Run (venue, scanner) pairs and return one VenueScanResult per venue,
+    in the order given.
+
+    concurrent=False runs them in sequence (deadlines are not enforced -
+    a running scan cannot be interrupted). deadline_s is either one value
+    for every venue or a {venue: seconds} map, falling back to
+    SCAN_VENUE_DEADLINE_S for venues it does not name. A venue whose
+    previous scan is still running is not scanned again: it comes back
+    as 'busy' with no items.
+    """
+    if not concurrent or len(scanners) <= 1:
+        return [_scan_claimed(venue, scanner) if _claim(venue) else _busy(venue)
+                for venue, scanner in scanners]
+
+    if isinstance(deadline_s, dict):
+        deadlines = [deadline_s.get(venue, SCAN_VENUE_DEADLINE_S) for venue, _ in scanners]
+    else:
+        deadlines = [deadline_s] * len(scanners)
+
+    done: "queue.Queue[Tuple[int, VenueScanResult]]" = queue.Queue()
+    results: List[VenueScanResult] = [None] * len(scanners)
+    pending = set()
+    start = time.perf_counter()
+    for idx, (venue, scanner) in enumerate(scanners):
+        if not _claim(venue):
+            results[idx] = _busy(venue)
+            continue
+        pending.add(idx)
+        threading.Thread(
+            target=lambda i=idx, v=venue, s=scanner: done.put((i, _scan_claimed(v, s))),
+            name=f"scan-{venue}",
+            daemon=True,
+        ).start()
+
+    while pending:
+        elapsed = time.perf_counter() - start
+        wait = min(deadlines[i] for i in pending) - elapsed
+        try:
+            idx, result = done.get(timeout=max(wait, 0.0)) if wait > 0 else done.get_nowait()
+        except queue.Empty:
+            elapsed = time.perf_counter() - start
+            for i in [i for i in pending if deadlines[i] <= elapsed]:
+                results[i] = VenueScanResult(scanners[i][0], 'timeout', elapsed,
+                                             error=f"no result within {deadlines[i]:.1f}s")
+                pending.discard(i)
+            continue
+        if idx in pending:
+            results[idx] = result
+            pending.discard(idx)
+    return results
+
+
+def summarize_venue_scan(results: Sequence[VenueScanResult], total_seconds: float,
+                         concurrent: bool = SCAN_CONCURRENT) -> Dict[str, Any]:
+    """Per-venue timings for the scan summary / dashboard."""
+    return {
+        'mode': 'concurrent' if concurrent else 'sequential',
+        'total_seconds': total_seconds,
+        'venue_seconds_sum': sum(r.seconds for r in results),
+        'partial': any(r.status != 'ok' for r in results),
+        'venues': {
+            r.venue: {'status': r.status, 'seconds': r.seconds, 'count': len(r.items), 'error': r.error}
+            for r in results
+        },
+    }
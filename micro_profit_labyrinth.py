@@ -88,9 +88,12 @@ if os.getenv("AUREON_DEBUG_STARTUP") == "1":
 
 import asyncio
 import argparse
+import concurrent.futures
+import heapq
 import importlib
 import json
 import logging
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field, asdict
@@ -100,6 +103,8 @@ from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 # Import Adaptive Prime Profit Gate
 from adaptive_prime_profit_gate import AdaptivePrimeProfitGate
 from cost_basis_tracker import CostBasisTracker
+from momentum_index import MomentumIndex, MomentumRings
+from ticker_table import TickerDiff, TickerTable, VenueSnapshot
 
 
 @dataclass
@@ -1143,6 +1148,40 @@ EPSILON_PROFIT_USD = 0.0001
 # 🔓 FULL AUTONOMOUS: Lowered min profit to enable more trades (was $0.005)
 MIN_NET_PROFIT_USD = float(os.getenv("MIN_NET_PROFIT_USD", "0.001"))
 
+# 📡 PRICE FETCH - venues are fetched side by side, each with its own deadline
+PRICE_VENUE_ORDER = ('ws_cache', 'kraken', 'binance', 'alpaca')   # Merge precedence
+PRICE_FETCH_DEFAULT_TIMEOUT_S = float(os.getenv("LABYRINTH_PRICE_FETCH_TIMEOUT_S", "10"))
+PRICE_FETCH_TIMEOUT_S = {
+    'kraken': float(os.getenv("LABYRINTH_KRAKEN_PRICE_TIMEOUT_S", str(PRICE_FETCH_DEFAULT_TIMEOUT_S))),
+    'binance': float(os.getenv("LABYRINTH_BINANCE_PRICE_TIMEOUT_S", str(PRICE_FETCH_DEFAULT_TIMEOUT_S))),
+    'alpaca': float(os.getenv("LABYRINTH_ALPACA_PRICE_TIMEOUT_S", "15")),  # positions + bars + quotes
+}
+PRICE_FETCH_CONCURRENT = os.getenv("LABYRINTH_PRICE_FETCH_CONCURRENT", "1") != "0"
+STABLECOIN_PRICES = {
+    'USD': 1.0,
+    'USDT': 1.0,
+    'USDC': 1.0,
+    'ZUSD': 1.0,   # Kraken USD
+    'TUSD': 1.0,   # TrueUSD
+    'DAI': 1.0,
+}
+
+
+def _start_thread_future(fn, name: str) -> concurrent.futures.Future:
+    """Run fn on a daemon thread; a hung venue call never blocks interpreter exit."""
+    future: concurrent.futures.Future = concurrent.futures.Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
 # Speed is key - small gains compound fast!
 MICRO_CONFIG = {
     # LOWER than V14's 8+ - we trust our math
@@ -1634,14 +1673,25 @@ class AnimalPackScanner:
     
     def __init__(self, momentum_data: Dict[str, Dict] = None, elephant_memory = None):
         self.momentum_data = momentum_data or {}
+        self.momentum_index = self._index_from_data(self.momentum_data)
         self.elephant = elephant_memory
         self.signals: List[AnimalPackSignal] = []
         self.cfg = ANIMAL_PACK_CONFIG
         self.warriors_cfg = EARTHLY_WARRIORS_CONFIG
     
-    def update_momentum_data(self, data: Dict[str, Dict]):
-        """Update the momentum data from external source."""
+    def update_momentum_data(self, data: Dict[str, Dict], index: Optional[MomentumIndex] = None):
+        """
+        Update the momentum data from external source.
+        
+        `index` is the labyrinth's per-turn sorted momentum (in %), so the
+        threshold hunters slice it instead of scanning every asset.
+        """
         self.momentum_data = data
+        self.momentum_index = index if index is not None else self._index_from_data(data)
+    
+    @staticmethod
+    def _index_from_data(data: Dict[str, Dict]) -> MomentumIndex:
+        return MomentumIndex(list(data.keys()), [d.get('change', 0) * 100 for d in data.values()])
     
     def _add_signal(self, animal: str, emoji: str, signal_type: str, asset: str, 
                     strength: float, value: float, threshold: float, message: str = ""):
@@ -1667,9 +1717,10 @@ class AnimalPackScanner:
         """🐅 TIGER - Hunts VOLATILITY (wild markets = opportunity)"""
         signals = []
         threshold = self.cfg['tiger_volatility_threshold']
+        index = self.momentum_index
         
-        for asset, data in self.momentum_data.items():
-            volatility = abs(data.get('change', 0) * 100)  # Convert to %
+        for asset, momentum in index.rising_above(threshold) + index.falling_below(-threshold):
+            volatility = abs(momentum)
             if volatility > threshold:
                 strength = min(volatility / (threshold * 2), 1.0)  # 2x threshold = max
                 sig = self._add_signal(
@@ -1699,9 +1750,11 @@ class AnimalPackScanner:
         signals = []
         min_vol = self.cfg['hummingbird_volatility_min']
         max_vol = self.cfg['hummingbird_volatility_max']
+        index = self.momentum_index
         
-        for asset, data in self.momentum_data.items():
-            volatility = abs(data.get('change', 0) * 100)
+        calm = index.rising_between(min_vol, max_vol) + index.falling_between(-max_vol, -min_vol)
+        for asset, momentum in calm:
+            volatility = abs(momentum)
             if min_vol < volatility < max_vol:
                 # Closer to middle of range = higher strength
                 mid = (min_vol + max_vol) / 2
@@ -1737,8 +1790,7 @@ class AnimalPackScanner:
         min_mom = self.cfg['deer_momentum_min']
         max_mom = self.cfg['deer_momentum_max']
         
-        for asset, data in self.momentum_data.items():
-            momentum = data.get('change', 0) * 100  # Convert to %
+        for asset, momentum in self.momentum_index.rising_between(min_mom, max_mom):
             if min_mom < momentum < max_mom:  # Positive subtle movement
                 strength = momentum / max_mom
                 sig = self._add_signal(
@@ -1807,7 +1859,7 @@ class AnimalPackScanner:
         harmony_threshold = self.cfg['clownfish_harmony_ratio']
         
         if self.momentum_data:
-            positive_count = sum(1 for data in self.momentum_data.values() if data.get('change', 0) > 0)
+            positive_count = len(self.momentum_index.rising)
             total = len(self.momentum_data)
             harmony_ratio = positive_count / total if total > 0 else 0
             
@@ -1829,8 +1881,7 @@ class AnimalPackScanner:
         signals = []
         threshold = self.warriors_cfg['wolf_trend_threshold']
         
-        for asset, data in self.momentum_data.items():
-            momentum = data.get('change', 0) * 100
+        for asset, momentum in self.momentum_index.rising_above(threshold):
             if momentum > threshold:
                 strength = min(momentum / threshold, 1.0)
                 sig = self._add_signal(
@@ -1890,7 +1941,7 @@ class AnimalPackScanner:
         signals = []
         min_consensus = self.warriors_cfg['bee_consensus_signals']
         
-        buy_signals = sum(1 for data in self.momentum_data.values() if data.get('change', 0) > 0.001)
+        buy_signals = len(self.momentum_index.rising_above(0.1))  # change > 0.001
         
         if buy_signals >= min_consensus:
             strength = min(buy_signals / (min_consensus * 3), 1.0)
@@ -4244,6 +4295,9 @@ class MicroProfitLabyrinth:
         if not hasattr(self, 'cost_estimator') or self.cost_estimator is None:
             return 1.0  # conservative default: assume it's fine if no estimator
         try:
+            if hasattr(self.cost_estimator, 'score_candidates'):
+                scores = self.cost_estimator.score_candidates([symbol], [notional_usd], [scanner_gross_pnl], n_samples=n_samples)
+                return float(scores['p_win'][0])
             draws_pct = self.cost_estimator.sample_total_cost_draws(symbol, 'buy', notional_usd, n_samples=n_samples)
             net_samples = [scanner_gross_pnl - (d_pct / 100.0) * notional_usd for d_pct in draws_pct]
             positive = sum(1 for v in net_samples if v > 0)
@@ -4358,8 +4412,9 @@ class MicroProfitLabyrinth:
         
         # 🌊 MOMENTUM STATE - For jumping coin to coin
         self.momentum_window = 60      # 60 second momentum window
-        self.momentum_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.momentum_rings = MomentumRings(window_seconds=self.momentum_window)
         self.asset_momentum: Dict[str, float] = {}  # Asset -> momentum %/minute
+        self._ticker_volume_index: Tuple[Optional[dict], Tuple[int, int], Dict[str, float]] = (None, (-1, -1), {})
         self.min_momentum_diff = 0.003  # 0.3% momentum difference to convert
         
         # �🌍 GROUNDING REALITY
@@ -4384,6 +4439,9 @@ class MicroProfitLabyrinth:
         # State - NOW TRACKS ALL EXCHANGES
         self.prices: Dict[str, float] = {}
         self.ticker_cache: Dict[str, Dict[str, Any]] = {}
+        self.ticker_table = TickerTable(fixed_prices=STABLECOIN_PRICES)  # fetch_prices applies diffs here
+        self.ticker_changes = TickerDiff()  # What moved in the last fetch_prices
+        self._price_fetches: Dict[str, concurrent.futures.Future] = {}  # venue -> fetch still running
         self.balances: Dict[str, float] = {}  # Combined balances
         self.exchange_balances: Dict[str, Dict[str, float]] = {}  # Per-exchange balances
         self.exchange_data: Dict[str, Dict[str, Any]] = {}  # Full exchange data
@@ -6483,11 +6541,9 @@ class MicroProfitLabyrinth:
         safe_print(self.barter_matrix.print_market_coverage())
         safe_print()
     
-    async def fetch_prices(self) -> Dict[str, float]:
-        """Fetch all asset prices from ALL exchanges."""
-        prices = {}
-        ticker_cache = {}
-
+    def _fetch_ws_cache_snapshot(self) -> VenueSnapshot:
+        """Prices/tickers pre-seeded from the local WS cache (empty unless fresh)."""
+        snap = VenueSnapshot('ws_cache')
         # ════════════════════════════════════════════════════════════════
         # 📡 OPTIONAL WS CACHE (Production heavy-lifting)
         # ════════════════════════════════════════════════════════════════
@@ -6511,289 +6567,413 @@ class MicroProfitLabyrinth:
                             if isinstance(ws_prices, dict):
                                 for k, v in ws_prices.items():
                                     try:
-                                        prices[str(k)] = float(v)
+                                        snap.set_price(str(k), float(v))
                                     except Exception:
                                         continue
                             if isinstance(ws_tickers, dict):
                                 for k, v in ws_tickers.items():
                                     if isinstance(v, dict):
-                                        ticker_cache[str(k)] = v
+                                        snap.add_ticker(v, str(k))
                     except Exception:
                         pass
         except Exception:
             pass
+        return snap
+
+    def _fetch_kraken_snapshot(self) -> VenueSnapshot:
+        """🐙 KRAKEN PRICES - Use get_24h_tickers (returns list of dicts)."""
+        snap = VenueSnapshot('kraken')
+        tickers = self.kraken.get_24h_tickers() if hasattr(self.kraken, 'get_24h_tickers') else []
+        kraken_symbols = []
         
-        # ════════════════════════════════════════════════════════════════
-        # 🐙 KRAKEN PRICES - Use get_24h_tickers (returns list of dicts)
-        # ════════════════════════════════════════════════════════════════
-        if self.kraken:
-            try:
-                tickers = self.kraken.get_24h_tickers() if hasattr(self.kraken, 'get_24h_tickers') else []
-                kraken_count = 0
-                
-                for data in tickers:
-                    if not isinstance(data, dict):
-                        continue
-                    
-                    symbol = data.get('symbol', '')
-                    # Kraken returns lastPrice as string
-                    price_str = data.get('lastPrice', '0')
-                    price = float(price_str) if price_str else 0.0
-                    
-                    if price > 0 and symbol:
-                        # Store in kraken pairs for execution routing
-                        self.binance_pairs.discard(symbol)  # Not binance
+        for data in tickers:
+            if not isinstance(data, dict):
+                continue
+            
+            symbol = data.get('symbol', '')
+            # Kraken returns lastPrice as string
+            price_str = data.get('lastPrice', '0')
+            price = float(price_str) if price_str else 0.0
+            
+            if price > 0 and symbol:
+                # Store in kraken pairs for execution routing
+                kraken_symbols.append(symbol)  # Not binance
+                
+                for quote in ['USD', 'USDT', 'USDC', 'GBP', 'EUR']:
+                    if symbol.endswith(quote):
+                        base = symbol[:-len(quote)]
+                        # Clean up Kraken naming
+                        if len(base) == 4 and base[0] in ('X', 'Z'):
+                            base = base[1:]
+                        if base == 'XBT':
+                            base = 'BTC'
                         
-                        for quote in ['USD', 'USDT', 'USDC', 'GBP', 'EUR']:
-                            if symbol.endswith(quote):
-                                base = symbol[:-len(quote)]
-                                # Clean up Kraken naming
-                                if len(base) == 4 and base[0] in ('X', 'Z'):
-                                    base = base[1:]
-                                if base == 'XBT':
-                                    base = 'BTC'
-                                
-                                prices[base] = price
-                                
-                                change = float(data.get('priceChangePercent', 0))
-                                volume = float(data.get('quoteVolume', 0))
-                                
-                                ticker_entry = {
-                                    'price': price,
-                                    'change24h': change,
-                                    'volume': volume,
-                                    'base': base,
-                                    'quote': quote,
-                                    'exchange': 'kraken',
-                                    'pair': symbol,
-                                }
-                                # Wave scanner expects raw symbols; keep prefixed + raw for compatibility
-                                ticker_cache[f"kraken:{symbol}"] = ticker_entry
-                                ticker_cache[symbol] = ticker_entry
-                                kraken_count += 1
-                                break
-                
-                safe_print(f"   🐙 Kraken: {kraken_count} pairs loaded")
-            except Exception as e:
-                logger.error(f"Kraken price fetch error: {e}")
+                        snap.set_price(base, price)
+                        
+                        change = float(data.get('priceChangePercent', 0))
+                        volume = float(data.get('quoteVolume', 0))
+                        
+                        ticker_entry = {
+                            'price': price,
+                            'change24h': change,
+                            'volume': volume,
+                            'base': base,
+                            'quote': quote,
+                            'exchange': 'kraken',
+                            'pair': symbol,
+                        }
+                        # Wave scanner expects raw symbols; keep prefixed + raw for compatibility
+                        snap.add_ticker(ticker_entry, f"kraken:{symbol}", symbol)
+                        snap.count += 1
+                        break
         
-        # ════════════════════════════════════════════════════════════════
-        # 🟡 BINANCE PRICES
-        # ════════════════════════════════════════════════════════════════
-        if self.binance:
-            try:
-                # Get 24h ticker
-                if hasattr(self.binance, 'ticker_24hr_all'):
-                    binance_tickers = self.binance.ticker_24hr_all()
-                elif hasattr(self.binance, 'session'):
-                    r = self.binance.session.get(f"{self.binance.base}/api/v3/ticker/24hr")
-                    binance_tickers = r.json() if r.ok else []
-                else:
-                    binance_tickers = []
-                
-                binance_count = 0
-                # For UK mode, prefer USDC over USDT
-                quote_priority = ['USDC', 'USDT', 'USD', 'BUSD'] if self.binance_uk_mode else ['USDT', 'USD', 'BUSD', 'USDC']
-                
-                for ticker in binance_tickers:
-                    symbol = ticker.get('symbol', '')
-                    price = float(ticker.get('lastPrice', 0))
-                    if price > 0:
-                        # 🇬🇧 UK MODE: Only load allowed pairs
-                        if self.binance_uk_mode and not self.is_binance_pair_allowed(symbol):
-                            continue
+        snap.deferred.append(lambda: self.binance_pairs.difference_update(kraken_symbols))
+        return snap
+
+    def _fetch_binance_snapshot(self) -> VenueSnapshot:
+        """🟡 BINANCE PRICES."""
+        snap = VenueSnapshot('binance')
+        # Get 24h ticker
+        if hasattr(self.binance, 'ticker_24hr_all'):
+            binance_tickers = self.binance.ticker_24hr_all()
+        elif hasattr(self.binance, 'session'):
+            r = self.binance.session.get(f"{self.binance.base}/api/v3/ticker/24hr")
+            binance_tickers = r.json() if r.ok else []
+        else:
+            binance_tickers = []
+        
+        # For UK mode, prefer USDC over USDT
+        quote_priority = ['USDC', 'USDT', 'USD', 'BUSD'] if self.binance_uk_mode else ['USDT', 'USD', 'BUSD', 'USDC']
+        
+        for ticker in binance_tickers:
+            symbol = ticker.get('symbol', '')
+            price = float(ticker.get('lastPrice', 0))
+            if price > 0:
+                # 🇬🇧 UK MODE: Only load allowed pairs
+                if self.binance_uk_mode and not self.is_binance_pair_allowed(symbol):
+                    continue
+                
+                for quote in quote_priority:
+                    if symbol.endswith(quote):
+                        base = symbol.replace(quote, '')
+                        # Only update if we don't have this price yet
+                        snap.set_price(base, price, overwrite=False)
                         
-                        for quote in quote_priority:
-                            if symbol.endswith(quote):
-                                base = symbol.replace(quote, '')
-                                # Only update if we don't have this price yet
-                                if base not in prices:
-                                    prices[base] = price
-                                
-                                change = float(ticker.get('priceChangePercent', 0))
-                                volume = float(ticker.get('volume', 0))
-                                ticker_entry = {
-                                    'price': price,
-                                    'change24h': change,
-                                    'volume': volume,
-                                    'base': base,
-                                    'quote': quote,
-                                    'exchange': 'binance',
-                                }
-                                # Wave scanner reads unprefixed symbols; store both
-                                ticker_cache[f"binance:{symbol}"] = ticker_entry
-                                ticker_cache[symbol] = ticker_entry
-                                binance_count += 1
+                        change = float(ticker.get('priceChangePercent', 0))
+                        volume = float(ticker.get('volume', 0))
+                        ticker_entry = {
+                            'price': price,
+                            'change24h': change,
+                            'volume': volume,
+                            'base': base,
+                            'quote': quote,
+                            'exchange': 'binance',
+                        }
+                        # Wave scanner reads unprefixed symbols; store both
+                        snap.add_ticker(ticker_entry, f"binance:{symbol}", symbol)
+                        snap.count += 1
+                        break
+        return snap
+
+    def _fetch_alpaca_snapshot(self) -> VenueSnapshot:
+        """🦙 ALPACA PRICES (crypto and positions)."""
+        snap = VenueSnapshot('alpaca')
+        # Routing map updates are collected here and applied on the event loop
+        alpaca_pairs = dict(self.alpaca_pairs)
+        pair_updates: Dict[str, str] = {}
+
+        def route(key: str, pair: str):
+            alpaca_pairs[key] = pair
+            pair_updates[key] = pair
+        
+        # Get prices from positions
+        if hasattr(self.alpaca, 'get_positions'):
+            positions = self.alpaca.get_positions() or []
+            for pos in positions:
+                symbol = pos.get('symbol', '')
+                price = float(pos.get('current_price', 0))
+                if price > 0 and symbol:
+                    # Extract base asset from symbol like "BTCUSD" or "BTC/USD"
+                    if '/' in symbol:
+                        base = symbol.split('/')[0]
+                    elif symbol.endswith('BTC'):
+                        base = symbol[:-3]
+                    else:
+                        base = symbol.replace('USD', '')
+                    if base and len(base) > 1:
+                        snap.set_price(base, price)
+                        change = float(pos.get('change_today', 0)) * 100
+                        ticker_entry = {
+                            'price': price,
+                            'change24h': change,
+                            'volume': 0,
+                            'base': base,
+                            'quote': 'USD',
+                            'exchange': 'alpaca',
+                            'pair': symbol,
+                        }
+                        # Store multiple keys so wave scanner sees Alpaca symbols (slash + raw)
+                        snap.add_ticker(ticker_entry, f"alpaca:{symbol}", symbol, f"{base}/USD")
+                        # Store in alpaca_pairs for routing
+                        route(symbol, f"{base}/USD")
+                        route(f"{base}USD", f"{base}/USD")
+                        route(f"{base}/USD", f"{base}/USD")
+                        snap.count += 1
+
+        # Pull prices for tradeable crypto pairs even if we have no positions.
+        if hasattr(self.alpaca, 'get_latest_crypto_quotes'):
+            symbols = sorted(set(alpaca_pairs.values()))
+            if not symbols and hasattr(self.alpaca, 'get_tradable_crypto_symbols'):
+                symbols = self.alpaca.get_tradable_crypto_symbols() or []
+            if symbols:
+                normalized_symbols = []
+                symbol_map = {}
+                for symbol in symbols:
+                    resolved = symbol
+                    if hasattr(self.alpaca, "_resolve_symbol"):
+                        resolved = self.alpaca._resolve_symbol(symbol)
+                    if not resolved:
+                        continue
+                    symbol_map[resolved] = symbol
+                    normalized_symbols.append(resolved)
+
+                def bar_field(bar: Dict[str, Any], key: str, fallback: float = 0.0) -> float:
+                    for candidate in (key, key[0], key.lower(), key.upper()):
+                        if candidate in bar:
+                            try:
+                                return float(bar.get(candidate) or 0.0)
+                            except (TypeError, ValueError):
+                                return fallback
+                    return fallback
+
+                bars_resp = self.alpaca.get_crypto_bars(normalized_symbols, timeframe="1H", limit=24) or {}
+                bars_by_symbol = {}
+                if isinstance(bars_resp, dict):
+                    bars_by_symbol = bars_resp.get("bars", {}) or {}
+
+                quotes = self.alpaca.get_latest_crypto_quotes(normalized_symbols) or {}
+
+                for symbol, quote in quotes.items():
+                    if not isinstance(quote, dict):
+                        continue
+                    bid = float(quote.get('bp', 0) or quote.get('bid_price', 0) or 0)
+                    ask = float(quote.get('ap', 0) or quote.get('ask_price', 0) or 0)
+                    price = (bid + ask) / 2 if bid and ask else (bid or ask or 0)
+                    bars = bars_by_symbol.get(symbol, []) or []
+                    change_24h = 0.0
+                    volume = 0.0
+                    high = 0.0
+                    low = 0.0
+                    if bars:
+                        first = bars[0]
+                        last = bars[-1]
+                        first_price = bar_field(first, "o") or bar_field(first, "c")
+                        last_close = bar_field(last, "c") or bar_field(last, "o")
+                        if last_close > 0:
+                            price = last_close
+                        if first_price > 0 and last_close > 0:
+                            change_24h = ((last_close - first_price) / first_price) * 100
+                        volume = sum(bar_field(b, "v") for b in bars)
+                        high = max(bar_field(b, "h") for b in bars)
+                        low = min(bar_field(b, "l") for b in bars) if bars else 0.0
+
+                    if price <= 0:
+                        continue
+                    if '/' in symbol:
+                        base, quote_asset = symbol.split('/', 1)
+                    else:
+                        base = symbol
+                        quote_asset = 'USD'
+                        for quote_hint in ('USDT', 'USDC', 'USD', 'BTC'):
+                            if symbol.endswith(quote_hint) and len(symbol) > len(quote_hint):
+                                base = symbol[:-len(quote_hint)]
+                                quote_asset = quote_hint
                                 break
-                safe_print(f"   🟡 Binance: {binance_count} pairs loaded")
-            except Exception as e:
-                logger.error(f"Binance price fetch error: {e}")
+
+                    if base:
+                        snap.set_price(base, price, overwrite=False)
+
+                    ticker_entry = {
+                        'price': price,
+                        'change24h': change_24h,
+                        'volume': volume,
+                        'high': high,
+                        'low': low,
+                        'base': base,
+                        'quote': quote_asset,
+                        'exchange': 'alpaca',
+                        'pair': symbol,
+                    }
+                    snap.add_ticker(ticker_entry, f"alpaca:{symbol}", symbol)
+
+                    route(symbol, symbol)
+                    if '/' in symbol:
+                        route(symbol.replace('/', ''), symbol)
         
-        # ════════════════════════════════════════════════════════════════
-        # 🦙 ALPACA PRICES (crypto and positions)
-        # ════════════════════════════════════════════════════════════════
+        snap.deferred.append(lambda: self.alpaca_pairs.update(pair_updates))
+        return snap
+
+    def _price_fetchers(self) -> List[Tuple[str, str, Callable[[], VenueSnapshot]]]:
+        """(venue, icon, fetch) for every connected price venue, in merge order."""
+        fetchers = []
+        if self.kraken:
+            fetchers.append(('kraken', '🐙 Kraken', self._fetch_kraken_snapshot))
+        if self.binance:
+            fetchers.append(('binance', '🟡 Binance', self._fetch_binance_snapshot))
         if self.alpaca:
+            fetchers.append(('alpaca', '🦙 Alpaca', self._fetch_alpaca_snapshot))
+        return fetchers
+
+    def _take_price_fetch(self, venue: str, label: str, future: 'concurrent.futures.Future') -> bool:
+        """Move a finished venue fetch into the ticker table; False if it failed."""
+        try:
+            snap = future.result()
+        except Exception as e:
+            logger.error(f"{label.split(' ', 1)[-1]} price fetch error: {e}")
+            return False
+        for apply in snap.deferred:
+            apply()
+        self.ticker_table.set_snapshot(venue, snap)
+        return True
+
+    async def _gather_price_snapshots(self, fetchers) -> Dict[str, str]:
+        """
+        Run the venue fetches side by side off the event loop, each bounded by
+        PRICE_FETCH_TIMEOUT_S. Returns {venue: 'ok' | 'error' | 'timeout' | 'late'}.
+
+        A fetch that misses its deadline keeps running; the venue keeps last
+        turn's data, and the late result is used at the start of the next turn
+        ('late') while a new fetch is started. At most one fetch per venue is
+        ever in flight.
+        """
+        outcome: Dict[str, str] = {}
+        if not PRICE_FETCH_CONCURRENT:
+            for venue, label, fetch in fetchers:
+                future: concurrent.futures.Future = concurrent.futures.Future()
+                try:
+                    future.set_result(fetch())
+                except Exception as e:
+                    future.set_exception(e)
+                outcome[venue] = 'ok' if self._take_price_fetch(venue, label, future) else 'error'
+            return outcome
+
+        inflight = self._price_fetches
+        for venue, label, fetch in fetchers:
+            future = inflight.get(venue)
+            if future is not None and future.done():
+                if self._take_price_fetch(venue, label, inflight.pop(venue)):
+                    outcome[venue] = 'late'
+                future = None
+            if future is None:
+                inflight[venue] = _start_thread_future(fetch, f"prices-{venue}")
+
+        async def wait(venue: str):
+            timeout = PRICE_FETCH_TIMEOUT_S.get(venue, PRICE_FETCH_DEFAULT_TIMEOUT_S)
             try:
-                alpaca_count = 0
-                
-                # Get prices from positions
-                if hasattr(self.alpaca, 'get_positions'):
-                    positions = self.alpaca.get_positions() or []
-                    for pos in positions:
-                        symbol = pos.get('symbol', '')
-                        price = float(pos.get('current_price', 0))
-                        if price > 0 and symbol:
-                            # Extract base asset from symbol like "BTCUSD" or "BTC/USD"
-                            if '/' in symbol:
-                                base = symbol.split('/')[0]
-                            elif symbol.endswith('BTC'):
-                                base = symbol[:-3]
-                            else:
-                                base = symbol.replace('USD', '')
-                            if base and len(base) > 1:
-                                prices[base] = price
-                                change = float(pos.get('change_today', 0)) * 100
-                                ticker_entry = {
-                                    'price': price,
-                                    'change24h': change,
-                                    'volume': 0,
-                                    'base': base,
-                                    'quote': 'USD',
-                                    'exchange': 'alpaca',
-                                    'pair': symbol,
-                                }
-                                # Store multiple keys so wave scanner sees Alpaca symbols (slash + raw)
-                                ticker_cache[f"alpaca:{symbol}"] = ticker_entry
-                                ticker_cache[symbol] = ticker_entry
-                                ticker_cache[f"{base}/USD"] = ticker_entry
-                                # Store in alpaca_pairs for routing
-                                self.alpaca_pairs[symbol] = f"{base}/USD"
-                                self.alpaca_pairs[f"{base}USD"] = f"{base}/USD"
-                                self.alpaca_pairs[f"{base}/USD"] = f"{base}/USD"
-                                alpaca_count += 1
-
-                # Pull prices for tradeable crypto pairs even if we have no positions.
-                if hasattr(self.alpaca, 'get_latest_crypto_quotes'):
-                    symbols = sorted(set(self.alpaca_pairs.values()))
-                    if not symbols and hasattr(self.alpaca, 'get_tradable_crypto_symbols'):
-                        symbols = self.alpaca.get_tradable_crypto_symbols() or []
-                    if symbols:
-                        normalized_symbols = []
-                        symbol_map = {}
-                        for symbol in symbols:
-                            resolved = symbol
-                            if hasattr(self.alpaca, "_resolve_symbol"):
-                                resolved = self.alpaca._resolve_symbol(symbol)
-                            if not resolved:
-                                continue
-                            symbol_map[resolved] = symbol
-                            normalized_symbols.append(resolved)
-
-                        def bar_field(bar: Dict[str, Any], key: str, fallback: float = 0.0) -> float:
-                            for candidate in (key, key[0], key.lower(), key.upper()):
-                                if candidate in bar:
-                                    try:
-                                        return float(bar.get(candidate) or 0.0)
-                                    except (TypeError, ValueError):
-                                        return fallback
-                            return fallback
-
-                        bars_resp = self.alpaca.get_crypto_bars(normalized_symbols, timeframe="1H", limit=24) or {}
-                        bars_by_symbol = {}
-                        if isinstance(bars_resp, dict):
-                            bars_by_symbol = bars_resp.get("bars", {}) or {}
-
-                        quotes = self.alpaca.get_latest_crypto_quotes(normalized_symbols) or {}
-
-                        for symbol, quote in quotes.items():
-                            if not isinstance(quote, dict):
-                                continue
-                            bid = float(quote.get('bp', 0) or quote.get('bid_price', 0) or 0)
-                            ask = float(quote.get('ap', 0) or quote.get('ask_price', 0) or 0)
-                            price = (bid + ask) / 2 if bid and ask else (bid or ask or 0)
-                            bars = bars_by_symbol.get(symbol, []) or []
-                            change_24h = 0.0
-                            volume = 0.0
-                            high = 0.0
-                            low = 0.0
-                            if bars:
-                                first = bars[0]
-                                last = bars[-1]
-                                first_price = bar_field(first, "o") or bar_field(first, "c")
-                                last_close = bar_field(last, "c") or bar_field(last, "o")
-                                if last_close > 0:
-                                    price = last_close
-                                if first_price > 0 and last_close > 0:
-                                    change_24h = ((last_close - first_price) / first_price) * 100
-                                volume = sum(bar_field(b, "v") for b in bars)
-                                high = max(bar_field(b, "h") for b in bars)
-                                low = min(bar_field(b, "l") for b in bars) if bars else 0.0
-
-                            if price <= 0:
-                                continue
-                            if '/' in symbol:
-                                base, quote_asset = symbol.split('/', 1)
-                            else:
-                                base = symbol
-                                quote_asset = 'USD'
-                                for quote_hint in ('USDT', 'USDC', 'USD', 'BTC'):
-                                    if symbol.endswith(quote_hint) and len(symbol) > len(quote_hint):
-                                        base = symbol[:-len(quote_hint)]
-                                        quote_asset = quote_hint
-                                        break
-
-                            if base and base not in prices:
-                                prices[base] = price
-
-                            ticker_entry = {
-                                'price': price,
-                                'change24h': change_24h,
-                                'volume': volume,
-                                'high': high,
-                                'low': low,
-                                'base': base,
-                                'quote': quote_asset,
-                                'exchange': 'alpaca',
-                                'pair': symbol,
-                            }
-                            ticker_cache[f"alpaca:{symbol}"] = ticker_entry
-                            ticker_cache[symbol] = ticker_entry
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(inflight[venue])), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except Exception:
+                pass                        # reported by _take_price_fetch
+
+        await asyncio.gather(*(wait(venue) for venue, _, _ in fetchers))
+        for venue, label, _ in fetchers:
+            future = inflight[venue]
+            if future.done():
+                inflight.pop(venue)
+                outcome[venue] = 'ok' if self._take_price_fetch(venue, label, future) else 'error'
+            else:
+                outcome.setdefault(venue, 'timeout')
+        return outcome
 
-                            self.alpaca_pairs[symbol] = symbol
-                            if '/' in symbol:
-                                self.alpaca_pairs[symbol.replace('/', '')] = symbol
-                
-                safe_print(f"   🦙 Alpaca: {alpaca_count} positions loaded")
-            except Exception as e:
-                logger.error(f"Alpaca price fetch error: {e}")
+    def _live_correlation_universe(self, ticker_cache: Dict[str, Any]) -> Set[str]:
+        """Held assets plus the highest-volume bases, up to the live window's size."""
+        limit = self.market_map.live_correlations.max_symbols
+        held = [asset for asset, amount in self.balances.items() if amount and amount > 0][:limit]
+        volume: Dict[str, float] = {}
+        for entry in ticker_cache.values():
+            if isinstance(entry, dict) and entry.get('base'):
+                base = entry['base']
+                volume[base] = volume.get(base, 0.0) + float(entry.get('volume') or 0)
+        universe = set(held)
+        for base in heapq.nlargest(limit, volume, key=volume.get):
+            if len(universe) >= limit:
+                break
+            universe.add(base)
+        return universe
+
+    async def fetch_prices(self) -> Dict[str, float]:
+        """
+        Fetch all asset prices from ALL exchanges.
+
+        Venues are fetched concurrently (see _gather_price_snapshots) and
+        merged into self.ticker_table; self.prices / self.ticker_cache are its
+        live dicts and self.ticker_changes says what moved this turn.
+        """
+        fetchers = self._price_fetchers()
+        self.ticker_table.set_snapshot('ws_cache', self._fetch_ws_cache_snapshot())
+        outcome = await self._gather_price_snapshots(fetchers)
+        for venue, label, _ in fetchers:
+            snap = self.ticker_table.snapshot(venue)
+            status = outcome.get(venue)
+            if status in ('ok', 'late'):
+                safe_print(f"   {label}: {snap.count} {'positions' if venue == 'alpaca' else 'pairs'} loaded")
+            elif status == 'timeout':
+                kept = snap.count if snap else 0
+                safe_print(f"   {label}: no answer within "
+                           f"{PRICE_FETCH_TIMEOUT_S.get(venue, PRICE_FETCH_DEFAULT_TIMEOUT_S):.0f}s - keeping {kept} cached")
+        connected = {venue for venue, _, _ in fetchers}
+        for venue in ('kraken', 'binance', 'alpaca'):
+            if venue not in connected:
+                self.ticker_table.drop_venue(venue)
         
         # ════════════════════════════════════════════════════════════════
         # 🐍 MEDUSA STABLECOIN INJECTION - Enable trading from stablecoins!
         # ════════════════════════════════════════════════════════════════
         # Stablecoins are quote currencies (not in price feeds) but we HOLD them
         # We need them in prices so they can be SOURCE assets for buying!
-        stablecoin_prices = {
-            'USD': 1.0,
-            'USDT': 1.0,
-            'USDC': 1.0,
-            'ZUSD': 1.0,   # Kraken USD
-            'TUSD': 1.0,   # TrueUSD
-            'DAI': 1.0,
-        }
-        for stable, price in stablecoin_prices.items():
-            if stable not in prices:
-                prices[stable] = price
-        
-        self.prices = prices
-        self.ticker_cache = ticker_cache
-        
+        # (TickerTable.fixed_prices, filled in only where no venue priced them)
+        changes = self.ticker_changes = self.ticker_table.commit(PRICE_VENUE_ORDER)
+        prices = self.prices = self.ticker_table.prices
+        ticker_cache = self.ticker_cache = self.ticker_table.tickers
+        for venue in changes.expired_venues:
+            safe_print(f"   ⌛ {venue}: cached prices older than {self.ticker_table.max_age:.0f}s dropped")
+        
+        # Prices still served from a stale venue snapshot are last turn's
+        # numbers; feeding them on as new samples would read as a flat market
+        fresh_prices = prices
+        if changes.stale_prices:
+            fresh_prices = {base: price for base, price in prices.items() if base not in changes.stale_prices}
+        
+        # 🫒🔄 Refresh barter edge rates in place - only routes that depend on
+        # a moved edge are recomputed, so find_barter_chain stays a lookup
+        if self.barter_navigator and getattr(self.barter_navigator, 'total_edges', 0):
+            try:
+                # Once a navigator has seen a full snapshot, only edges touching
+                # a moved price can change
+                synced = getattr(self, '_barter_rates_synced', None) is self.barter_navigator
+                self.barter_navigator.update_rates_from_prices(
+                    fresh_prices, assets=(changes.prices - changes.stale_prices) if synced else None)
+                self._barter_rates_synced = self.barter_navigator
+            except Exception as e:
+                logger.debug(f"Barter rate refresh error: {e}")
+
+        # 🗺️ Roll the market map's live correlation window forward one tick -
+        # held assets + the top movers by volume, on a worker thread
+        if self.market_map:
+            self.market_map.set_live_universe(self._live_correlation_universe(ticker_cache))
+            self.market_map.submit_live_prices(fresh_prices)
+
         # 🪙⚡ FEED TICKER DATA TO PENNY PROFIT TURBO
         # This enables real-time spread tracking and flash detection
         if self.penny_turbo:
             turbo_feeds = 0
+            stale_venues = set(changes.stale_venues)  # Last turn's prices would read as fresh ticks
             for cache_key, data in ticker_cache.items():
                 if isinstance(data, dict) and ':' in cache_key:
                     exchange = cache_key.split(':')[0]
+                    if exchange in stale_venues:
+                        continue
                     symbol = data.get('pair', data.get('base', ''))
                     price = data.get('price', 0)
                     
@@ -6812,11 +6992,9 @@ class MicroProfitLabyrinth:
                 safe_print(f"   ⚡ FLASH: {len(flashes)} momentum opportunities detected!")
         
         # 🌊⚡ UPDATE MOMENTUM FOR ALL PRICES - Wave jumping intelligence
-        momentum_count = 0
-        for asset, price in prices.items():
-            if price > 0:
-                self.update_momentum(asset, price)
-                momentum_count += 1
+        # One vectorised pass over the whole snapshot; the sorted index is
+        # rebuilt once here and shared by every hunter this turn
+        momentum_count = self.update_momentum_snapshot(fresh_prices)
         
         # Show top movers if we have momentum data
         # 🫒 GREEN OLIVE EXPANSION: Show top 10 instead of 3 for FULL market picture
@@ -10378,7 +10556,7 @@ class MicroProfitLabyrinth:
                     asset: {'change': mom / 100, 'price': self.prices.get(asset, 0)}
                     for asset, mom in self.asset_momentum.items()
                 }
-                self.animal_pack_scanner.update_momentum_data(momentum_data)
+                self.animal_pack_scanner.update_momentum_data(momentum_data, index=self.momentum_index())
                 
                 # Get best momentum for Falcon/Cargo/Lion
                 best_momentum = None
@@ -12690,41 +12868,19 @@ if __name__ == "__main__":
     def update_momentum(self, asset: str, price: float):
         """Update momentum tracking for an asset - FROM MOMENTUM SNOWBALL ENGINE"""
         import time
-        now = time.time()
-        
-        # Record price
-        self.momentum_history[asset].append((now, price))
-        
-        # Calculate momentum (%/minute)
-        history = self.momentum_history[asset]
-        if len(history) < 2:
-            self.asset_momentum[asset] = 0.0
-            return
-        
-        cutoff = now - self.momentum_window
-        
-        # Find oldest price in window
-        oldest_price = None
-        oldest_time = now
-        for t, p in history:
-            if t >= cutoff:
-                if oldest_price is None or t < oldest_time:
-                    oldest_price = p
-                    oldest_time = t
-        
-        if oldest_price is None or oldest_price <= 0:
-            self.asset_momentum[asset] = 0.0
-            return
-        
-        # Momentum = % change per minute
-        time_diff = now - oldest_time
-        if time_diff < 5:  # Need at least 5 seconds
-            self.asset_momentum[asset] = 0.0
-            return
-        
-        price_change = (price - oldest_price) / oldest_price
-        minutes = time_diff / 60
-        self.asset_momentum[asset] = price_change / minutes if minutes > 0 else 0.0
+        self.asset_momentum[asset] = self.momentum_rings.update(asset, price, time.time())
+    
+    def update_momentum_snapshot(self, prices: Dict[str, float], now: Optional[float] = None) -> int:
+        """Fold a whole price snapshot into the momentum rings (prices <= 0 skipped)."""
+        live = {asset: price for asset, price in prices.items() if price > 0}
+        self.asset_momentum.update(
+            self.momentum_rings.update_snapshot(live, time.time() if now is None else now)
+        )
+        return len(live)
+    
+    def momentum_index(self) -> MomentumIndex:
+        """Momentum sorted rising/falling - rebuilt once per price update, shared per turn."""
+        return self.momentum_rings.index()
     
     def get_momentum(self, asset: str) -> float:
         """Get current momentum for asset (%/minute)"""
@@ -12733,17 +12889,26 @@ if __name__ == "__main__":
     def get_strongest_rising(self, exclude: set = None, limit: int = 3000) -> List[Tuple[str, float]]:
         """🌐 FULL MARKET EXPANSION: Default limit 500→3000 for 100% MARKET COVERAGE!"""
         """Get assets with strongest RISING momentum - for wave jumping"""
-        exclude = exclude or set()
-        items = [(a, m) for a, m in self.asset_momentum.items() 
-                 if a not in exclude and m > 0 and a in self.prices]
-        return sorted(items, key=lambda x: x[1], reverse=True)[:limit]
+        return self.momentum_index().top_rising(exclude=exclude, limit=limit, where=self.prices)
     
     def get_weakest_falling(self, include: set = None, limit: int = 10) -> List[Tuple[str, float]]:
         """Get assets with FALLING momentum - to escape from"""
-        include = include or set(self.asset_momentum.keys())
-        items = [(a, m) for a, m in self.asset_momentum.items() 
-                 if a in include and m < 0]
-        return sorted(items, key=lambda x: x[1])[:limit]  # Most negative first
+        return self.momentum_index().top_falling(include=include or None, limit=limit)  # Most negative first
+    
+    def _ticker_volumes(self) -> Dict[str, float]:
+        """base -> volume of its first ticker, built once per ticker_cache refresh."""
+        # ticker_cache is updated in place, so key on the table version too
+        cache, version, volumes = self._ticker_volume_index
+        table = getattr(self, 'ticker_table', None)
+        current = (table.version if table is not None else 0, len(self.ticker_cache))
+        if cache is not self.ticker_cache or version != current:
+            volumes = {}
+            for ticker in self.ticker_cache.values():
+                base = ticker.get('base')
+                if base is not None and base not in volumes:
+                    volumes[base] = ticker.get('volume', 100000)
+            self._ticker_volume_index = (self.ticker_cache, current, volumes)
+        return volumes
     
     def find_momentum_opportunity(self) -> Optional[Tuple[str, str, float, float, float]]:
         """
@@ -12753,6 +12918,7 @@ if __name__ == "__main__":
         """
         best = None
         best_momentum_diff = self.min_momentum_diff
+        rising = self.get_strongest_rising()
         
         # Check our holdings
         for from_asset, from_amount in list(self.balances.items()):
@@ -12764,10 +12930,10 @@ if __name__ == "__main__":
             
             from_momentum = self.get_momentum(from_asset)
             
-            # Look for rising assets to jump to
-            for to_asset, to_momentum in self.get_strongest_rising(exclude={from_asset}):
-                to_price = self.prices.get(to_asset, 0)
-                if to_price <= 0:
+            # Rising list is strongest-first, so the first priced target
+            # other than ourselves gives this holding's largest diff
+            for to_asset, to_momentum in rising:
+                if to_asset == from_asset or self.prices.get(to_asset, 0) <= 0:
                     continue
                 
                 # Momentum difference
@@ -12780,6 +12946,7 @@ if __name__ == "__main__":
                     if net_advantage > 0:
                         best_momentum_diff = momentum_diff
                         best = (from_asset, to_asset, from_amount, net_advantage, momentum_diff)
+                break
         
         return best
     
@@ -12794,6 +12961,7 @@ if __name__ == "__main__":
         """
         stablecoins = {'USD', 'ZUSD', 'USDT', 'USDC', 'TUSD', 'DAI', 'BUSD'}
         hunts = []
+        rising = self.get_strongest_rising(limit=10)  # Same top waves for every stablecoin
         
         # Find stablecoins we hold
         for asset, amount in self.balances.items():
@@ -12805,7 +12973,6 @@ if __name__ == "__main__":
                 continue
             
             # Get rising targets
-            rising = self.get_strongest_rising(limit=10)
             for target, momentum in rising:
                 if momentum < min_wave_momentum:
                     continue  # Wave not strong enough
@@ -12839,9 +13006,11 @@ if __name__ == "__main__":
         
         Returns: (symbol, momentum, score) or None
         """
+        import math
         best_symbol = None
         best_score = -999999
         best_momentum = 0
+        volumes = self._ticker_volumes()
         
         # Get all tracked assets with prices
         for asset, price in self.prices.items():
@@ -12866,17 +13035,10 @@ if __name__ == "__main__":
             if momentum <= 0:
                 continue
             
-            # Estimate volume from recent trades (or use fallback)
-            volume = 100000  # Base volume estimate
-            
-            # Check ticker cache for actual volume
-            for symbol, ticker in self.ticker_cache.items():
-                if ticker.get('base') == asset:
-                    volume = ticker.get('volume', 100000)
-                    break
+            # Ticker volume for this base, or the base estimate
+            volume = volumes.get(asset, 100000)
             
             # 🐺 WOLF SCORE: momentum × log(1 + volume)
-            import math
             score = momentum * math.log(1 + max(1, volume))
             
             if score > best_score:
@@ -15619,11 +15781,10 @@ if __name__ == "__main__":
             p_win = None
             if self.cost_estimator:
                 try:
-                    # Get raw draws (percent units) and transform to USD costs
-                    draws_pct = self.cost_estimator.sample_total_cost_draws(f"{from_upper}/{to_upper}", 'buy', opp.from_value_usd, n_samples=1000)
-                    net_samples = [scanner_gross_pnl - (d_pct/100.0) * opp.from_value_usd for d_pct in draws_pct]
-                    positive = sum(1 for v in net_samples if v > 0)
-                    p_win = positive / max(1, len(net_samples))
+                    # Cached cost draws (percent units) scored against gross P&L
+                    scores = self.cost_estimator.score_candidates(
+                        [f"{from_upper}/{to_upper}"], [opp.from_value_usd], [scanner_gross_pnl], n_samples=1000)
+                    p_win = float(scores['p_win'][0])
                 except Exception as e:
                     logger.debug(f"Monte Carlo P(win) sampling failed: {e}")
                     p_win = None
@@ -19504,6 +19665,13 @@ async def main():
             safe_print("[DEBUG] Entered main()")
         except Exception:
             print("[DEBUG] Entered main()")
+    try:
+        # Deferred Queen/sonar/heartbeat wiring when imported with AUREON_BATON_MODE=fast
+        from aureon_baton_link import bootstrap_runtime, is_fast_start
+        if is_fast_start():
+            bootstrap_runtime(__name__)
+    except Exception:
+        pass
     parser = argparse.ArgumentParser(description="🦙 Micro Profit Labyrinth - ALPACA-FOCUSED Trading System")
     parser.add_argument("--live", action="store_true", help="Run in LIVE mode")
     parser.add_argument("--dry-run", action="store_true", help="Explicit simulation mode (legacy flag)")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Momentum Index
+--------------
+Array-backed momentum tracking for the Micro Profit Labyrinth.
+
+The labyrinth used to keep a deque of (time, price) per asset and, on
+every price, scan the whole deque for the oldest sample inside the
+momentum window. Every consumer (wave check, lion hunt, wolf hunt, the
+animal pack) then re-filtered and re-sorted the full momentum dict.
+
+MomentumRings keeps one fixed-size ring per asset in two 2-D arrays and a
+window-start pointer per asset. Samples arrive in time order, so the
+window start only ever moves forward (two-pointer window) and a whole
+price snapshot is folded in with a handful of vectorised passes:
+
+    rings = MomentumRings(window_seconds=60)
+    rings.update_snapshot(prices, now)     # all assets at once
+    index = rings.index()                  # sorted once per update
+    index.top_rising(exclude={'USD'}, limit=10)
+    index.rising_above(0.5)                # prefix slice, no scan
+
+Momentum is % change per minute between the oldest in-window sample and
+the newest price; it is 0 until the window spans min_span_seconds.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import bisect
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MOMENTUM_RING_CAPACITY = 1000      # Samples kept per asset (old deque maxlen)
+MOMENTUM_MIN_SPAN_S = 5.0          # Window must span this long to report momentum
+
+
+class MomentumIndex:
+    """
+    Momentum snapshot sorted both ways.
+
+    rising holds assets with momentum > 0, strongest first; falling holds
+    momentum < 0, most negative first. Ties keep insertion order, matching
+    a stable sort over the momentum dict.
+    """
+
+    def __init__(self, assets: Sequence[str], values: Sequence[float], version: int = 0):
+        values = np.asarray(values, dtype=np.float64)
+        self.version = version
+        self.total = len(values)
+
+        desc = np.argsort(-values, kind='stable')
+        n_pos = int((values > 0).sum())
+        self.rising: List[Tuple[str, float]] = [(assets[i], float(values[i])) for i in desc[:n_pos]]
+
+        asc = np.argsort(values, kind='stable')
+        n_neg = int((values < 0).sum())
+        self.falling: List[Tuple[str, float]] = [(assets[i], float(values[i])) for i in asc[:n_neg]]
+
+        # Ascending keys for bisect: negated rising values, plain falling values
+        self._rising_keys = [-m for _, m in self.rising]
+        self._falling_keys = [m for _, m in self.falling]
+
+    @classmethod
+    def from_mapping(cls, momentum: Dict[str, float], version: int = 0) -> 'MomentumIndex':
+        return cls(list(momentum.keys()), list(momentum.values()), version)
+
+    def top_rising(self, exclude: Optional[Container[str]] = None, limit: Optional[int] = None,
+                   where: Optional[Container[str]] = None) -> List[Tuple[str, float]]:
+        """Strongest risers, skipping `exclude` and anything not in `where`."""
+        if not exclude and where is None:
+            return self.rising[:limit]
+        out = []
+        for asset, m in self.rising:
+            if exclude and asset in exclude:
+                continue
+            if where is not None and asset not in where:
+                continue
+            out.append((asset, m))
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def top_falling(self, include: Optional[Container[str]] = None,
+                    limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Steepest fallers, optionally restricted to `include`."""
+        if include is None:
+            return self.falling[:limit]
+        out = []
+        for asset, m in self.falling:
+            if asset in include:
+                out.append((asset, m))
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def rising_above(self, threshold: float) -> List[Tuple[str, float]]:
+        """Assets with momentum > threshold (threshold >= 0)."""
+        return self.rising[:bisect.bisect_left(self._rising_keys, -threshold)]
+
+    def rising_between(self, low: float, high: float) -> List[Tuple[str, float]]:
+        """Assets with low < momentum < high (low >= 0), strongest first."""
+        start = bisect.bisect_right(self._rising_keys, -high)
+        end = bisect.bisect_left(self._rising_keys, -low)
+        return self.rising[start:end]
+
+    def falling_below(self, threshold: float) -> List[Tuple[str, float]]:
+        """Assets with momentum < threshold (threshold <= 0)."""
+        return self.falling[:bisect.bisect_left(self._falling_keys, threshold)]
+
+    def falling_between(self, low: float, high: float) -> List[Tuple[str, float]]:
+        """Assets with low < momentum < high (high <= 0), steepest first."""
+        start = bisect.bisect_right(self._falling_keys, low)
+        end = bisect.bisect_left(self._falling_keys, high)
+        return self.falling[start:end]
+
+
+class MomentumRings:
+    """Per-asset (time, price) rings with a forward-only window start."""
+
+    def __init__(self, window_seconds: float = 60.0, capacity: int = MOMENTUM_RING_CAPACITY,
+                 min_span_seconds: float = MOMENTUM_MIN_SPAN_S):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self.min_span_seconds = min_span_seconds
+        self.assets: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._ts = np.zeros((0, capacity), dtype=np.float64)
+        self._px = np.zeros((0, capacity), dtype=np.float64)
+        self._head = np.zeros(0, dtype=np.int64)    # samples ever written
+        self._start = np.zeros(0, dtype=np.int64)   # absolute index of oldest in-window sample
+        self.momentum = np.zeros(0, dtype=np.float64)
+        self.version = 0
+        self._index: Optional[MomentumIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __contains__(self, asset: str) -> bool:
+        return asset in self._rows
+
+    def _grow(self, needed: int):
+        size = self._ts.shape[0]
+        if needed <= size:
+            return
+        new_size = max(needed, size * 2, 64)
+        for name in ('_ts', '_px'):
+            old = getattr(self, name)
+            grown = np.zeros((new_size, self.capacity), dtype=np.float64)
+            grown[:size] = old
+            setattr(self, name, grown)
+        for name in ('_head', '_start', 'momentum'):
+            old = getattr(self, name)
+            grown = np.zeros(new_size, dtype=old.dtype)
+            grown[:size] = old
+            setattr(self, name, grown)
+
+    def _rows_for(self, assets: Iterable[str]) -> np.ndarray:
+        rows = []
+        for asset in assets:
+            row = self._rows.get(asset)
+            if row is None:
+                row = len(self.assets)
+                self._rows[asset] = row
+                self.assets.append(asset)
+            rows.append(row)
+        self._grow(len(self.assets))
+        return np.asarray(rows, dtype=np.int64)
+
+    def _record(self, rows: np.ndarray, prices: np.ndarray, now: float) -> np.ndarray:
+        cap = self.capacity
+        slots = self._head[rows] % cap
+        self._ts[rows, slots] = now
+        self._px[rows, slots] = prices
+        self._head[rows] += 1
+        head = self._head[rows]
+        self._start[rows] = np.maximum(self._start[rows], head - cap)
+
+        # Two-pointer advance: the newest sample is always in-window, so
+        # each row stops before reaching its head
+        cutoff = now - self.window_seconds
+        active = rows
+        while active.size:
+            active = active[self._ts[active, self._start[active] % cap] < cutoff]
+            self._start[active] += 1
+
+        oldest = self._start[rows] % cap
+        old_ts = self._ts[rows, oldest]
+        old_px = self._px[rows, oldest]
+        span = now - old_ts
+        ok = (np.minimum(head, cap) >= 2) & (old_px > 0) & (span >= self.min_span_seconds)
+
+        momentum = np.zeros(len(rows), dtype=np.float64)
+        momentum[ok] = (prices[ok] - old_px[ok]) / old_px[ok] / (span[ok] / 60)
+        self.momentum[rows] = momentum
+        self.version += 1
+        return momentum
+
+    def update(self, asset: str, price: float, now: float) -> float:
+        """Record one price and return the asset's momentum (%/minute)."""
+        rows = self._rows_for((asset,))
+        return float(self._record(rows, np.array([price], dtype=np.float64), now)[0])
+
+    def update_snapshot(self, prices: Dict[str, float], now: float) -> Dict[str, float]:
+        """Record a full price snapshot at one timestamp; returns {asset: momentum}."""
+        if not prices:
+            return {}
+        assets = list(prices.keys())
+        rows = self._rows_for(assets)
+        values = np.fromiter(prices.values(), dtype=np.float64, count=len(assets))
+        momentum = self._record(rows, values, now)
+        return dict(zip(assets, momentum.tolist()))
+
+    def get(self, asset: str) -> float:
+        row = self._rows.get(asset)
+        return float(self.momentum[row]) if row is not None else 0.0
+
+    def window(self, asset: str) -> np.ndarray:
+        """In-window (time, price) samples for one asset, oldest first."""
+        row = self._rows.get(asset)
+        if row is None:
+            return np.zeros((0, 2))
+        cap = self.capacity
+        idx = np.arange(self._start[row], self._head[row]) % cap
+        return np.column_stack([self._ts[row, idx], self._px[row, idx]])
+
+    def index(self) -> MomentumIndex:
+        """Sorted view of current momentum, rebuilt only after an update."""
+        if self._index is None or self._index.version != self.version:
+            n = len(self.assets)
+            self._index = MomentumIndex(self.assets, self.momentum[:n], self.version)
+        return self._index
@@ -17,6 +17,8 @@ Usage:
     
     predictor = NexusPredictor()
     predictor.update(candle)  # Feed candles
+    # ...or follow one symbol's closed candles from the shared stream:
+    predictor.attach(get_candle_stream(), 'binance:BTC/USDT', '1h')
     prediction = predictor.predict()
     
     if prediction['should_trade']:
@@ -255,6 +257,17 @@ class NexusPredictor:
         self.candle_history.append(candle)
         self._calculate_indicators()
     
+    def attach(self, stream, key: str, timeframe: str = '1h') -> int:
+        """
+        Feed this predictor from a CandleStream: the candles it already holds
+        for `key` first, then every candle that closes. Returns the on_close
+        token (stream.off(token) detaches).
+        """
+        for candle in stream.candles(key, timeframe, self.candle_history.maxlen):
+            self.update(candle)
+        return stream.on_close(lambda _key, _tf, candle: self.update(candle.to_dict()),
+                               timeframe=timeframe, key=key)
+    
     def _calculate_indicators(self) -> None:
         """Calculate all technical indicators for latest candle."""
         if not self.candle_history:
@@ -196,6 +196,7 @@ import argparse
 from typing import List, Dict, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 from datetime import datetime
+from market_scan_fanout import scan_venues, summarize_venue_scan, SCAN_CONCURRENT, SCAN_VENUE_DEADLINE_S
 try:
     from aureon_avalanche_harvester import AvalancheHarvester
 except ImportError:
@@ -4397,6 +4398,7 @@ class OrcaKillCycle:
         self.alpaca_bridge = None
         self.last_momentum_result = {}
         self.last_micro_result = []
+        self.last_scan_summary: Dict[str, Any] = {}
         
         if MOMENTUM_ECOSYSTEM_AVAILABLE:
             try:
@@ -6181,13 +6183,20 @@ class OrcaKillCycle:
     #    SCAN ENTIRE MARKET - ALL EXCHANGES, ALL SYMBOLS
     #                                                                        
     
-    def scan_entire_market(self, min_change_pct: float = 0.05, min_volume: float = 500) -> List[MarketOpportunity]:
+    def scan_entire_market(self, min_change_pct: float = 0.05, min_volume: float = 500,
+                           concurrent: Optional[bool] = None,
+                           venue_deadline_s: Optional[Union[float, Dict[str, float]]] = None) -> List[MarketOpportunity]:
         """
         Scan ENTIRE market across ALL exchanges for opportunities.
         
         Returns sorted list of best opportunities from Alpaca AND Kraken.
           ENHANCED with quantum probability scoring!
         
+        Venues are scanned concurrently (concurrent=False for the old
+        sequential order); venue_deadline_s caps each venue's wait, either
+        one value or {venue: seconds}. Per-venue timings land in
+        self.last_scan_summary.
+        
         VOLATILITY TARGETING: Lowered to 0.05% to catch micro-movements and compound gains
         """
         print("\n" + "="*70)
@@ -6195,30 +6204,41 @@ class OrcaKillCycle:
         print("="*70)
         
         opportunities = []
+        scan_started = time.perf_counter()
+        if concurrent is None:
+            concurrent = SCAN_CONCURRENT
+        
+        # Scan every venue at once - a venue that misses its deadline is
+        # reported and skipped, the others still count (partial results)
+        venue_scanners = [
+            (venue, lambda scan=scan: scan(min_change_pct, min_volume))
+            for venue, scan in (
+                ('alpaca', self._scan_alpaca_market),
+                ('kraken', self._scan_kraken_market),
+                ('binance', self._scan_binance_market),
+                ('capital', self._scan_capital_market),
+            )
+            if venue in self.clients
+        ]
+        venue_results = scan_venues(venue_scanners, concurrent=concurrent,
+                                    deadline_s=venue_deadline_s or SCAN_VENUE_DEADLINE_S)
+        venue_labels = {
+            'alpaca': ('Alpaca', 'opportunities'),
+            'kraken': ('Kraken', 'opportunities'),
+            'binance': ('Binance', 'opportunities'),
+            'capital': ('Capital.com', 'CFD opportunities'),
+        }
+        for result in venue_results:
+            label, noun = venue_labels[result.venue]
+            opportunities.extend(result.items)
+            if result.status == 'ok':
+                print(f"     {label}: Found {len(result.items)} {noun} ({result.seconds:.2f}s)")
+            else:
+                print(f"      {label}: {result.status.upper()} after {result.seconds:.2f}s - {result.error}")
         
-        # Scan Alpaca
-        if 'alpaca' in self.clients:
-            alpaca_opps = self._scan_alpaca_market(min_change_pct, min_volume)
-            opportunities.extend(alpaca_opps)
-            print(f"     Alpaca: Found {len(alpaca_opps)} opportunities")
-        
-        # Scan Kraken
-        if 'kraken' in self.clients:
-            kraken_opps = self._scan_kraken_market(min_change_pct, min_volume)
-            opportunities.extend(kraken_opps)
-            print(f"     Kraken: Found {len(kraken_opps)} opportunities")
-        
-        # Scan Binance
-        if 'binance' in self.clients:
-            binance_opps = self._scan_binance_market(min_change_pct, min_volume)
-            opportunities.extend(binance_opps)
-            print(f"     Binance: Found {len(binance_opps)} opportunities")
-        
-        # Scan Capital.com
-        if 'capital' in self.clients:
-            capital_opps = self._scan_capital_market(min_change_pct, min_volume)
-            opportunities.extend(capital_opps)
-            print(f"     Capital.com: Found {len(capital_opps)} CFD opportunities")
+        # (exchange, symbol) keys for O(1) duplicate checks below
+        seen_keys = {(o.exchange, o.symbol) for o in opportunities}
+        duplicates_skipped = 0
         
         #                                                                    
         #   UNIFIED KILL CHAIN HUNT (Win Killer)
@@ -6233,9 +6253,12 @@ class OrcaKillCycle:
                     b_hunts = self.unified_kill_chain.win_killer.hunt_binance()
                     for h in b_hunts:
                         # Deduplicate
-                        if any(o.symbol == h['symbol'] for o in opportunities):
+                        key = ('binance', h['symbol'])
+                        if key in seen_keys:
+                            duplicates_skipped += 1
                             continue
-                            
+                        seen_keys.add(key)
+
                         win_opps.append(MarketOpportunity(
                             symbol=h['symbol'],
                             exchange='binance',
@@ -6251,8 +6274,11 @@ class OrcaKillCycle:
                     k_hunts = self.unified_kill_chain.win_killer.hunt_kraken()
                     for h in k_hunts:
                         # Deduplicate
-                        if any(o.symbol == h['symbol'] for o in opportunities):
+                        key = ('kraken', h['symbol'])
+                        if key in seen_keys:
+                            duplicates_skipped += 1
                             continue
+                        seen_keys.add(key)
 
                         win_opps.append(MarketOpportunity(
                             symbol=h['symbol'],
@@ -6631,7 +6657,14 @@ class OrcaKillCycle:
         
         opportunities.sort(key=sacred_priority_sort_key, reverse=True)
         
+        self.last_scan_summary = summarize_venue_scan(venue_results, time.perf_counter() - scan_started, concurrent)
+        self.last_scan_summary['duplicates_skipped'] = duplicates_skipped
+        self.last_scan_summary['opportunities'] = len(opportunities)
+        
         print(f"\n  Total opportunities: {len(opportunities)} (Queen's Target approved!)")
+        timings = ', '.join(f"{venue} {info['seconds']:.2f}s" + ('' if info['status'] == 'ok' else f" ({info['status']})")
+                            for venue, info in self.last_scan_summary['venues'].items())
+        print(f"   Scan time: {self.last_scan_summary['total_seconds']:.2f}s [{self.last_scan_summary['mode']}] | {timings}")
         if opportunities:
             print("\n  TOP OPPORTUNITIES (Ranked by FASTEST to Target profit!):")
             for i, opp in enumerate(opportunities[:5]):
@@ -20,6 +20,7 @@ from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
 import os
 import json
 import time
+import heapq
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field, asdict
@@ -28,9 +29,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-VALIDATION_FILE = "probability_validation.json"
+VALIDATION_FILE = "probability_validation.json"               # Compacted snapshot
+VALIDATION_JOURNAL = "probability_validation.journal.jsonl"   # Events since the snapshot
 PREDICTION_LOG = "probability_predictions.jsonl"
 
+SNAPSHOT_VERSION = 2
+COMPACT_EVERY = 1000            # Journal events between snapshots
+RETENTION_SECONDS = 7 * 86400   # Validated predictions kept individually (longest stats window)
+
+FEAR_GREED_BANDS = {'FEAR': (0, 35), 'NEUTRAL': (35, 65), 'GREED': (65, 100)}
+OUTCOME_FIELDS = ('validated', 'actual_direction', 'actual_change_pct',
+                  'price_at_validation', 'direction_correct', 'outcome_score')
+
 
 @dataclass
 class Prediction:
@@ -97,51 +107,259 @@ class ValidationStats:
         return asdict(self)
 
 
+@dataclass
+class OutcomeTally:
+    """Running outcome counters for one slice of validated predictions."""
+    total: int = 0
+    correct: int = 0
+    probability_sum: float = 0.0
+    abs_change_sum: float = 0.0
+    gains: float = 0.0
+    losses: float = 0.0
+    
+    def add(self, pred: Prediction):
+        self.total += 1
+        self.correct += 1 if pred.direction_correct else 0
+        self.probability_sum += pred.predicted_probability
+        self.abs_change_sum += abs(pred.actual_change_pct)
+        if pred.outcome_score > 0:
+            self.gains += pred.outcome_score
+        elif pred.outcome_score < 0:
+            self.losses += -pred.outcome_score
+    
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total > 0 else 0
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _fear_greed_band(fear_greed: int) -> Optional[str]:
+    for band, (low, high) in FEAR_GREED_BANDS.items():
+        if low <= fear_greed < high:
+            return band
+    return None
+
+
+class OutcomeBook:
+    """
+    Outcome tallies overall and per regime / fear-greed band / symbol.
+    The archived book is the per-symbol rollup of predictions dropped by
+    retention; the live book is archived + every validated prediction held.
+    """
+    
+    def __init__(self):
+        self.overall = OutcomeTally()
+        self.by_regime: Dict[str, OutcomeTally] = {}
+        self.by_fear_greed: Dict[str, OutcomeTally] = {band: OutcomeTally() for band in FEAR_GREED_BANDS}
+        self.by_symbol: Dict[str, OutcomeTally] = {}
+    
+    def add(self, pred: Prediction):
+        self.overall.add(pred)
+        self.by_regime.setdefault(pred.market_regime, OutcomeTally()).add(pred)
+        band = _fear_greed_band(pred.fear_greed)
+        if band:
+            self.by_fear_greed[band].add(pred)
+        self.by_symbol.setdefault(pred.symbol, OutcomeTally()).add(pred)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'overall': self.overall.to_dict(),
+            'by_regime': {k: v.to_dict() for k, v in self.by_regime.items()},
+            'by_fear_greed': {k: v.to_dict() for k, v in self.by_fear_greed.items()},
+            'by_symbol': {k: v.to_dict() for k, v in self.by_symbol.items()},
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OutcomeBook":
+        book = cls()
+        book.overall = OutcomeTally(**data.get('overall', {}))
+        book.by_regime = {k: OutcomeTally(**v) for k, v in data.get('by_regime', {}).items()}
+        book.by_fear_greed.update({k: OutcomeTally(**v) for k, v in data.get('by_fear_greed', {}).items()})
+        book.by_symbol = {k: OutcomeTally(**v) for k, v in data.get('by_symbol', {}).items()}
+        return book
+
+
+class _RecentWindow:
+    """Correct/total over validated predictions made in the last `seconds`."""
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.entries: deque = deque()   # (prediction epoch, correct), roughly time-ordered
+        self.total = 0
+        self.correct = 0
+    
+    def add(self, ts: float, correct: bool):
+        self.entries.append((ts, correct))
+        self.total += 1
+        self.correct += 1 if correct else 0
+    
+    def accuracy(self, now: float) -> Optional[float]:
+        cutoff = now - self.seconds
+        while self.entries and self.entries[0][0] <= cutoff:
+            _, correct = self.entries.popleft()
+            self.total -= 1
+            self.correct -= 1 if correct else 0
+        return self.correct / self.total if self.total else None
+
+
+def _epoch(iso: str) -> float:
+    return datetime.fromisoformat(iso).timestamp()
+
+
 class ProbabilityValidator:
     """
     Validates probability matrix predictions against actual market outcomes.
+    
+    State is a compacted snapshot (VALIDATION_FILE) plus an append-only
+    journal of prediction-created / validated events, so recording or
+    validating a prediction appends one line instead of rewriting history.
+    Every COMPACT_EVERY events the journal is folded into a new snapshot;
+    validated predictions older than RETENTION_SECONDS are rolled up into
+    per-symbol/regime/fear-greed tallies and dropped at that point.
     """
     
-    def __init__(self):
+    def __init__(self, state_file: str = VALIDATION_FILE, journal_file: str = VALIDATION_JOURNAL,
+                 compact_every: int = COMPACT_EVERY, retention_seconds: float = RETENTION_SECONDS):
+        self.state_file = state_file
+        self.journal_file = journal_file
+        self.compact_every = compact_every
+        self.retention_seconds = retention_seconds
+        
         self.predictions: Dict[str, Prediction] = {}  # id -> Prediction
-        self.pending_validations: List[str] = []  # prediction IDs to validate
+        self._pending: Dict[str, float] = {}  # id -> window end (epoch), in record order
+        self._due: List[Tuple[float, str]] = []  # min-heap of (window end, id)
         self.stats = ValidationStats()
         
+        self.archived = OutcomeBook()  # Rollup of predictions dropped by retention
+        self.outcomes = OutcomeBook()  # archived + validated predictions still held
+        self._recent_24h = _RecentWindow(86400)
+        self._recent_7d = _RecentWindow(604800)
+        
+        self._seq = 0  # Last journal sequence number written or applied
+        self._journal_events = 0  # Events appended since the last snapshot
+        
         self._load_state()
     
+    @property
+    def pending_validations(self) -> List[str]:
+        """Prediction IDs awaiting validation, oldest first."""
+        return list(self._pending)
+    
+    def _track_pending(self, pred: Prediction):
+        due = _epoch(pred.window_end)
+        self._pending[pred.prediction_id] = due
+        heapq.heappush(self._due, (due, pred.prediction_id))
+    
+    def _count_outcome(self, pred: Prediction):
+        self.outcomes.add(pred)
+        ts = _epoch(pred.timestamp)
+        self._recent_24h.add(ts, pred.direction_correct)
+        self._recent_7d.add(ts, pred.direction_correct)
+    
     def _load_state(self):
-        """Load persisted predictions and stats."""
+        """Load the snapshot, then replay journal events written after it."""
+        legacy = False
+        snapshot_seq = 0
         try:
-            if os.path.exists(VALIDATION_FILE):
-                with open(VALIDATION_FILE, 'r') as f:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r') as f:
                     data = json.load(f)
                 
                 # Restore predictions
                 for pid, pdata in data.get('predictions', {}).items():
                     self.predictions[pid] = Prediction(**pdata)
                 
-                # Restore pending
-                self.pending_validations = data.get('pending', [])
-                
-                # Restore stats
-                stats_data = data.get('stats', {})
-                self.stats = ValidationStats(**stats_data) if stats_data else ValidationStats()
-                
-                print(f"📊 Loaded {len(self.predictions)} predictions, {len(self.pending_validations)} pending validation")
+                legacy = data.get('version') != SNAPSHOT_VERSION
+                snapshot_seq = data.get('seq', 0)
+                self.archived = OutcomeBook.from_dict(data.get('rollups', {}))
         except Exception as e:
             logger.warning(f"Failed to load validation state: {e}")
+        
+        self._seq = snapshot_seq
+        try:
+            if os.path.exists(self.journal_file):
+                with open(self.journal_file, 'r') as f:
+                    for line in f:
+                        try:
+                            event = json.loads(line)
+                        except ValueError:
+                            continue  # Torn final line from a crash mid-write
+                        if event.get('seq', 0) <= snapshot_seq:
+                            continue  # Already folded into the snapshot
+                        self._apply_event(event)
+                        self._seq = max(self._seq, event['seq'])
+                        self._journal_events += 1
+        except Exception as e:
+            logger.warning(f"Failed to replay validation journal: {e}")
+        
+        # Rebuild pending index and outcome tallies
+        self.outcomes = OutcomeBook.from_dict(self.archived.to_dict())
+        for pred in sorted(self.predictions.values(), key=lambda p: p.timestamp):
+            if pred.validated:
+                self._count_outcome(pred)
+            else:
+                self._track_pending(pred)
+        self._update_stats()
+        
+        if self.predictions or self._journal_events:
+            print(f"📊 Loaded {len(self.predictions)} predictions, {len(self._pending)} pending validation")
+        if (legacy and self.predictions) or self._journal_events >= self.compact_every:
+            self.compact()
+    
+    def _apply_event(self, event: Dict):
+        if event.get('event') == 'created':
+            pred = Prediction(**event['prediction'])
+            self.predictions[pred.prediction_id] = pred
+        elif event.get('event') == 'validated':
+            pred = self.predictions.get(event.get('id'))
+            if pred:
+                for name, value in event.get('outcome', {}).items():
+                    setattr(pred, name, value)
     
-    def _save_state(self):
-        """Persist predictions and stats."""
+    def _append_event(self, event: Dict):
+        """Append one event to the journal; compact when it has grown enough."""
+        self._seq += 1
+        event['seq'] = self._seq
+        try:
+            with open(self.journal_file, 'a') as f:
+                f.write(json.dumps(event) + '\n')
+            self._journal_events += 1
+        except Exception as e:
+            logger.warning(f"Failed to append validation journal: {e}")
+        if self._journal_events >= self.compact_every:
+            self.compact()
+    
+    def compact(self):
+        """
+        Roll validated predictions past retention into the archived tallies,
+        write a fresh snapshot and start an empty journal.
+        """
+        cutoff = time.time() - self.retention_seconds
+        for pid, pred in list(self.predictions.items()):
+            if pred.validated and _epoch(pred.timestamp) < cutoff:
+                self.archived.add(pred)
+                del self.predictions[pid]
+        self._update_stats()
+        
         try:
             data = {
+                'version': SNAPSHOT_VERSION,
+                'seq': self._seq,
                 'predictions': {pid: p.to_dict() for pid, p in self.predictions.items()},
-                'pending': self.pending_validations,
+                'rollups': self.archived.to_dict(),
                 'stats': self.stats.to_dict(),
                 'updated': datetime.now().isoformat(),
             }
-            with open(VALIDATION_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            tmp = self.state_file + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.state_file)
+            # Events up to self._seq are now in the snapshot
+            with open(self.journal_file, 'w'):
+                pass
+            self._journal_events = 0
         except Exception as e:
             logger.warning(f"Failed to save validation state: {e}")
     
@@ -186,7 +404,8 @@ class ProbabilityValidator:
         )
         
         self.predictions[prediction_id] = prediction
-        self.pending_validations.append(prediction_id)
+        self._track_pending(prediction)
+        self.stats.total_predictions = len(self.predictions) + self.archived.overall.total
         
         # Also log to JSONL for training
         try:
@@ -195,7 +414,7 @@ class ProbabilityValidator:
         except:
             pass
         
-        self._save_state()
+        self._append_event({'event': 'created', 'prediction': prediction.to_dict()})
         return prediction_id
     
     def validate_prediction(
@@ -253,13 +472,17 @@ class ProbabilityValidator:
         pred.direction_correct = direction_correct
         pred.outcome_score = outcome_score
         
-        # Remove from pending
-        if prediction_id in self.pending_validations:
-            self.pending_validations.remove(prediction_id)
+        # Remove from pending (its heap entry is skipped when popped)
+        self._pending.pop(prediction_id, None)
         
         # Update stats
+        self._count_outcome(pred)
         self._update_stats()
-        self._save_state()
+        self._append_event({
+            'event': 'validated',
+            'id': prediction_id,
+            'outcome': {name: getattr(pred, name) for name in OUTCOME_FIELDS},
+        })
         
         return {
             'prediction_id': prediction_id,
@@ -282,98 +505,78 @@ class ProbabilityValidator:
             
         Returns: List of validation results
         """
-        now = datetime.now()
+        now = datetime.now().timestamp()
         results = []
+        retry = []
         
-        for pred_id in list(self.pending_validations):
+        # Only predictions whose window has passed are popped from the due heap
+        while self._due and self._due[0][0] <= now:
+            due, pred_id = heapq.heappop(self._due)
+            if self._pending.get(pred_id) != due:
+                continue  # Validated already, or superseded by a newer entry
             pred = self.predictions.get(pred_id)
             if not pred:
-                self.pending_validations.remove(pred_id)
+                del self._pending[pred_id]
                 continue
             
-            # Check if window has passed
-            window_end = datetime.fromisoformat(pred.window_end)
-            if now >= window_end:
-                try:
-                    current_price = get_price_func(pred.symbol)
-                    if current_price and current_price > 0:
-                        result = self.validate_prediction(pred_id, current_price)
-                        if result:
-                            results.append(result)
-                except Exception as e:
-                    logger.debug(f"Failed to validate {pred_id}: {e}")
+            try:
+                current_price = get_price_func(pred.symbol)
+                if current_price and current_price > 0:
+                    result = self.validate_prediction(pred_id, current_price)
+                    if result:
+                        results.append(result)
+            except Exception as e:
+                logger.debug(f"Failed to validate {pred_id}: {e}")
+            if pred_id in self._pending:
+                retry.append((due, pred_id))
+        
+        # No price yet - retry on the next pass
+        for entry in retry:
+            heapq.heappush(self._due, entry)
         
         return results
     
     def _update_stats(self):
-        """Recalculate aggregate statistics."""
-        validated = [p for p in self.predictions.values() if p.validated]
+        """Refresh aggregate statistics from the running outcome tallies."""
+        overall = self.outcomes.overall
         
-        self.stats.total_predictions = len(self.predictions)
-        self.stats.validated_predictions = len(validated)
+        self.stats.total_predictions = len(self.predictions) + self.archived.overall.total
+        self.stats.validated_predictions = overall.total
         
-        if not validated:
+        if not overall.total:
             return
         
         # Directional accuracy
-        correct = sum(1 for p in validated if p.direction_correct)
-        wrong = len(validated) - correct
-        self.stats.direction_correct = correct
-        self.stats.direction_wrong = wrong
-        self.stats.direction_accuracy = correct / len(validated) if validated else 0.0
+        self.stats.direction_correct = overall.correct
+        self.stats.direction_wrong = overall.total - overall.correct
+        self.stats.direction_accuracy = overall.accuracy
         
         # Average values
-        self.stats.avg_predicted_prob = sum(p.predicted_probability for p in validated) / len(validated)
-        self.stats.avg_actual_change = sum(abs(p.actual_change_pct) for p in validated) / len(validated)
-        
-        # Accuracy by regime
-        regime_stats = {}
-        for p in validated:
-            regime = p.market_regime
-            if regime not in regime_stats:
-                regime_stats[regime] = {'correct': 0, 'total': 0}
-            regime_stats[regime]['total'] += 1
-            if p.direction_correct:
-                regime_stats[regime]['correct'] += 1
-        
-        self.stats.accuracy_by_regime = {
-            k: v['correct'] / v['total'] if v['total'] > 0 else 0
-            for k, v in regime_stats.items()
-        }
+        self.stats.avg_predicted_prob = overall.probability_sum / overall.total
+        self.stats.avg_actual_change = overall.abs_change_sum / overall.total
         
-        # Accuracy by Fear/Greed bands
-        fg_bands = {'FEAR': (0, 35), 'NEUTRAL': (35, 65), 'GREED': (65, 100)}
-        fg_stats = {band: {'correct': 0, 'total': 0} for band in fg_bands}
-        
-        for p in validated:
-            fg = p.fear_greed
-            for band, (low, high) in fg_bands.items():
-                if low <= fg < high:
-                    fg_stats[band]['total'] += 1
-                    if p.direction_correct:
-                        fg_stats[band]['correct'] += 1
-                    break
-        
-        self.stats.accuracy_by_fear_greed = {
-            k: v['correct'] / v['total'] if v['total'] > 0 else 0
-            for k, v in fg_stats.items()
-        }
+        # Accuracy by regime and Fear/Greed band
+        self.stats.accuracy_by_regime = {k: v.accuracy for k, v in self.outcomes.by_regime.items()}
+        self.stats.accuracy_by_fear_greed = {k: v.accuracy for k, v in self.outcomes.by_fear_greed.items()}
         
         # Recent accuracy
-        now = datetime.now()
-        last_24h = [p for p in validated if (now - datetime.fromisoformat(p.timestamp)).total_seconds() < 86400]
-        last_7d = [p for p in validated if (now - datetime.fromisoformat(p.timestamp)).total_seconds() < 604800]
-        
-        if last_24h:
-            self.stats.accuracy_last_24h = sum(1 for p in last_24h if p.direction_correct) / len(last_24h)
-        if last_7d:
-            self.stats.accuracy_last_7d = sum(1 for p in last_7d if p.direction_correct) / len(last_7d)
+        now = time.time()
+        last_24h = self._recent_24h.accuracy(now)
+        last_7d = self._recent_7d.accuracy(now)
+        if last_24h is not None:
+            self.stats.accuracy_last_24h = last_24h
+        if last_7d is not None:
+            self.stats.accuracy_last_7d = last_7d
         
         # Profit factor
-        gains = sum(p.outcome_score for p in validated if p.outcome_score > 0)
-        losses = sum(abs(p.outcome_score) for p in validated if p.outcome_score < 0)
+        gains, losses = overall.gains, overall.losses
         self.stats.profit_factor = gains / losses if losses > 0 else gains if gains > 0 else 1.0
     
+    def get_symbol_stats(self, symbol: str) -> Dict[str, Any]:
+        """Outcome tally for one symbol, including rolled-up history."""
+        tally = self.outcomes.by_symbol.get(symbol, OutcomeTally())
+        return {**tally.to_dict(), 'accuracy': tally.accuracy}
+    
     def get_confidence_adjustment(self, symbol: str, market_regime: str, fear_greed: int) -> float:
         """
         Get confidence adjustment based on historical accuracy.
@@ -118,6 +118,24 @@ case $MODE in
             -n \
             --logfile="$AUREON_LOGS/supervisord.log"
         ;;
+
+    "forkserver")
+        echo -e "${BLUE}🚀 Starting FORK SERVER MODE (supervisord programs, shared preload)...${NC}"
+        echo -e "${GREEN}   ├─ Config: /etc/supervisor/conf.d/supervisord.conf${NC}"
+        echo -e "${GREEN}   ├─ Status: $AUREON_LOGS/forkserver_status.json${NC}"
+        echo -e "${GREEN}   └─ Memory report every 600s in the fork server log${NC}"
+        echo ""
+
+        export AUREON_DRY_RUN="$DRY_RUN"
+        export AUREON_ENABLE_AUTONOMOUS_CONTROL="1"
+
+        exec python aureon_fork_server.py \
+            -c /etc/supervisor/conf.d/supervisord.conf \
+            --app-dir /aureon/app \
+            --log-dir "$AUREON_LOGS" \
+            --status-file "$AUREON_LOGS/forkserver_status.json" \
+            --memory-report-every 600
+        ;;
     
     "game")
         echo -e "${CYAN}🎮 Starting GAME MODE...${NC}"
@@ -167,7 +185,7 @@ case $MODE in
     
     *)
         echo -e "${RED}Unknown mode: $MODE${NC}"
-        echo "Available modes: supervisor, game, trading, orca, queen, shell"
+        echo "Available modes: supervisor, forkserver, game, trading, orca, queen, shell"
         exit 1
         ;;
 esac
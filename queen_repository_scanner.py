@@ -19,10 +19,13 @@
 
 from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
 import os
+import json
 import time
 import logging
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 
 try:
     from aureon_thought_bus import ThoughtBus, Thought
@@ -33,18 +36,49 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+KNOWLEDGE_SUFFIXES = ('.md', '.py', '.json', '.txt')
+SKIP_PATH_TOKENS = ('.git', '__pycache__', 'venv')
+MAX_FILE_BYTES = 1_000_000
+RECENT_WINDOW_S = 86400           # Files touched in the last 24h weigh 1.5x
+INDEX_VERSION = 1
+
+
+@dataclass
+class _FileEntry:
+    """Pattern weights found in one file, keyed by its (size, mtime)."""
+    size: int
+    mtime_ns: int
+    positive: float = 0.0
+    negative: float = 0.0
+    critical: float = 0.0
+    scored: bool = False          # False for oversized / unreadable files (score 0)
+
+
 class QueenRepositoryScanner:
     """
     The Queen's "Reading Glasses". Scans the file system for knowledge.
+
+    Every file's pattern weights are kept in a per-file index keyed by
+    (path, size, mtime_ns) and persisted to state/queen_repo_index.json, so
+    a refresh only stats the tree and re-reads files that changed. With
+    start_background() the refresh runs on a polling thread and
+    get_wisdom_factor() / scan_repository() never touch the disk.
     """
     
-    def __init__(self, repo_path: str = "/workspaces/aureon-trading"):
+    def __init__(self, repo_path: str = "/workspaces/aureon-trading", index_path: Optional[str] = None):
         self.repo_path = Path(repo_path)
+        self.index_path = Path(index_path) if index_path else self.repo_path / "state" / "queen_repo_index.json"
         self.wisdom_factor = 0.5  # Base wisdom
         self.last_scan_time = 0
         self.scan_interval = 60  # Scan every 60 seconds
         self.files_scanned = 0
         self.active_knowledge = {}
+        self.last_refresh: Dict[str, Any] = {}
+        
+        self._index: Dict[str, _FileEntry] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
         
         # Bus Integration
         self.thought_bus = ThoughtBus() if THOUGHT_BUS_AVAILABLE else None
@@ -75,119 +109,227 @@ class QueenRepositoryScanner:
                 'EMERGENCY': -0.1
             }
         }
+        self._load_index()
         
     def scan_repository(self) -> float:
         """
         Active active active scanning!
         Walks the repository, reads text/code files, and computes a 'Wisdom Factor'.
         
+        With the background thread running this only returns the cached
+        factor; otherwise it runs an incremental refresh once per interval.
+        
         Returns:
             float: A 0.0 to 1.0 score representing the "knowledge state" of the repo.
             High score = Healthy, intelligent, profit-aligned code base.
             Low score = Error-prone, warning-filled state.
         """
-        current_time = time.time()
-        
-        # Don't scan too often (it's heavy IO)
-        if current_time - self.last_scan_time < self.scan_interval:
+        if self.background_running:
             return self.wisdom_factor
-            
-        logger.info("👑👁️ Queen is scanning the repository for new knowledge...")
         
-        total_score = 0.5  # Start neutral
-        file_count = 0
+        # Don't scan too often (it's still a full stat of the tree)
+        if time.time() - self.last_scan_time < self.scan_interval:
+            return self.wisdom_factor
         
+        self.refresh()
+        return self.wisdom_factor
+    
+    def get_wisdom_factor(self) -> float:
+        """Cached wisdom factor; never touches the disk (decision path)."""
+        return self.wisdom_factor
+    
+    def refresh(self) -> Dict[str, Any]:
+        """Stat the tree, re-score only new/changed files, recompute wisdom."""
+        start = time.perf_counter()
+        logger.info("👑👁️ Queen is scanning the repository for new knowledge...")
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'files': 0}
         try:
-            # Walk the repository
-            for root, dirs, files in os.walk(self.repo_path):
-                # Skip hidden dirs and venvs
-                if '.git' in root or '__pycache__' in root or 'venv' in root:
-                    continue
-                    
-                for file in files:
-                    # Focus on knowledge-rich files
-                    if file.endswith(('.md', '.py', '.json', '.txt')):
-                        file_path = Path(root) / file
-                        file_score = self._analyze_file(file_path)
-                        total_score += file_score
-                        file_count += 1
-                        
-            # Normalize score
-            # A healthy repo with lots of code might push score high, so we use a sigmoid-like squash
-            # or just clamp it.
-            
-            # Base logic: More knowledge files = higher potential wisdom
-            # But errors drag it down.
-            
-            # Clamp to 0-1
-            self.wisdom_factor = max(0.1, min(1.0, total_score))
-            self.files_scanned = file_count
-            self.last_scan_time = current_time
+            with self._lock:
+                seen = self._stat_tree()
+                for rel in set(self._index) - set(seen):
+                    del self._index[rel]
+                    stats['removed'] += 1
+                for rel, (size, mtime_ns) in seen.items():
+                    entry = self._index.get(rel)
+                    if entry is not None and entry.size == size and entry.mtime_ns == mtime_ns:
+                        continue
+                    stats['changed' if entry is not None else 'added'] += 1
+                    self._index[rel] = self._score_file(self.repo_path / rel, size, mtime_ns)
+                
+                current_time = time.time()
+                # Clamp to 0-1
+                self.wisdom_factor = max(0.1, min(1.0, self._aggregate(current_time)))
+                self.files_scanned = len(self._index)
+                self.last_scan_time = current_time
+                stats['files'] = self.files_scanned
+                if stats['added'] or stats['changed'] or stats['removed']:
+                    self._save_index()
             
-            logger.info(f"👑👁️ Repository Scan Complete. Scanned {file_count} files. Wisdom Factor: {self.wisdom_factor:.4f}")
+            stats['seconds'] = time.perf_counter() - start
+            self.last_refresh = stats
+            logger.info(f"👑👁️ Repository Scan Complete. {self.files_scanned} files "
+                         f"(+{stats['added']} ~{stats['changed']} -{stats['removed']}). "
+                         f"Wisdom Factor: {self.wisdom_factor:.4f}")
             
             if self.thought_bus:
                 self.thought_bus.publish(Thought(
                     source="QUEEN_REPO_SCANNER",
                     topic="WISDOM_UPDATE",
-                    payload={"wisdom_factor": self.wisdom_factor, "files_scanned": file_count}
+                    payload={"wisdom_factor": self.wisdom_factor, "files_scanned": self.files_scanned}
                 ))
             
         except Exception as e:
             logger.error(f"❌ Error during repository scan: {e}")
-            
-        return self.wisdom_factor
+        
+        return stats
     
-    def _analyze_file(self, file_path: Path) -> float:
-        """Read a single file and extract its 'sentiment' / knowledge value."""
-        score = 0.0
+    # ------------------------------------------------------------------
+    # Background polling
+    # ------------------------------------------------------------------
+    @property
+    def background_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start_background(self, poll_interval: Optional[float] = None) -> bool:
+        """Refresh on a daemon thread every poll_interval (default scan_interval)."""
+        if self.background_running:
+            return False
+        interval = self.scan_interval if poll_interval is None else poll_interval
+        self._stop.clear()
+        
+        def _loop():
+            while not self._stop.is_set():
+                self.refresh()
+                self._stop.wait(interval)
+        
+        self._thread = threading.Thread(target=_loop, name="QueenRepoScanner", daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop_background(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+    
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    def _stat_tree(self) -> Dict[str, Tuple[int, int]]:
+        """(size, mtime_ns) of every knowledge file; stats only, no reads."""
+        found: Dict[str, Tuple[int, int]] = {}
+        root = str(self.repo_path)
+        skip_index = os.path.abspath(self.index_path)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            # Skip hidden dirs and venvs (whole subtree shares the prefix)
+            if any(token in current for token in SKIP_PATH_TOKENS):
+                continue
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                        continue
+                except OSError:
+                    pass
+                if not entry.name.endswith(KNOWLEDGE_SUFFIXES) or entry.path == skip_index:
+                    continue
+                rel = os.path.relpath(entry.path, root)
+                try:
+                    st = entry.stat()
+                    found[rel] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    found[rel] = (-1, -1)       # Broken link: counted, scores 0
+        return found
+    
+    def _score_file(self, file_path: Path, size: int, mtime_ns: int) -> _FileEntry:
+        """Read a single file and extract its 'sentiment' / knowledge weights."""
+        entry = _FileEntry(size=size, mtime_ns=mtime_ns)
+        # Skip very large files
+        if size < 0 or size > MAX_FILE_BYTES:
+            return entry
         try:
-            # Skip very large files
-            if file_path.stat().st_size > 1_000_000:
-                return 0.0
-                
             with open(file_path, 'r', errors='ignore') as f:
-                content = f.read()
-                
-                # Check novelty (recently modified files have more weight)
-                is_recent = (time.time() - file_path.stat().st_mtime) < 86400  # 24 hours
-                recency_multiplier = 1.5 if is_recent else 1.0
-                
-                # Scan for patterns
-                content_upper = content.upper()
-                
-                for word, val in self.knowledge_patterns['positive'].items():
-                    if word in content_upper:
-                        score += (val * recency_multiplier) / 100  # Divide by 100 to keep scale sanity
-                        
-                for word, val in self.knowledge_patterns['negative'].items():
-                    if word in content_upper:
-                        score += (val * recency_multiplier) / 100
-                        
-                for word, val in self.knowledge_patterns['critical'].items():
-                    if word in content_upper:
-                        score += (val * recency_multiplier) / 50 # Critical hitting harder
-                        
-                # Documentation bonus
-                if file_path.suffix == '.md':
-                    score += 0.05 # Docs are pure knowledge
-                    
-                # Python code bonus (executable knowledge)
-                if file_path.suffix == '.py':
-                    score += 0.02
-                    
+                content_upper = f.read().upper()
         except Exception:
-            pass # Ignore read errors
-            
-        return score
+            return entry  # Ignore read errors
+        
+        patterns = self.knowledge_patterns
+        entry.positive = sum(val for word, val in patterns['positive'].items() if word in content_upper)
+        entry.negative = sum(val for word, val in patterns['negative'].items() if word in content_upper)
+        entry.critical = sum(val for word, val in patterns['critical'].items() if word in content_upper)
+        entry.scored = True
+        return entry
+    
+    def _aggregate(self, now: float) -> float:
+        """Neutral 0.5 plus every file's score at time `now`."""
+        total = 0.5
+        recent_cutoff_ns = (now - RECENT_WINDOW_S) * 1e9
+        for rel, entry in self._index.items():
+            if not entry.scored:
+                continue
+            # Check novelty (recently modified files have more weight)
+            recency_multiplier = 1.5 if entry.mtime_ns > recent_cutoff_ns else 1.0
+            score = (entry.positive * recency_multiplier) / 100  # Divide by 100 to keep scale sanity
+            score += (entry.negative * recency_multiplier) / 100
+            score += (entry.critical * recency_multiplier) / 50  # Critical hitting harder
+            if rel.endswith('.md'):
+                score += 0.05  # Docs are pure knowledge
+            elif rel.endswith('.py'):
+                score += 0.02  # Python code bonus (executable knowledge)
+            total += score
+        return total
+    
+    def _patterns_signature(self) -> str:
+        return json.dumps(self.knowledge_patterns, sort_keys=True)
+    
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION or data.get('patterns') != self._patterns_signature():
+                return
+            self._index = {rel: _FileEntry(*row) for rel, row in data.get('files', {}).items()}
+            self.files_scanned = len(self._index)
+            self.wisdom_factor = max(0.1, min(1.0, self._aggregate(time.time())))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Repository index unreadable, rebuilding: {e}")
+            self._index = {}
+    
+    def _save_index(self):
+        data = {
+            'version': INDEX_VERSION,
+            'patterns': self._patterns_signature(),
+            'repo_path': str(self.repo_path),
+            'files': {rel: [e.size, e.mtime_ns, e.positive, e.negative, e.critical, e.scored]
+                      for rel, e in self._index.items()},
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.index_path)
+        except Exception as e:
+            logger.debug(f"Repository index not saved: {e}")
 
 # Singleton instance for easy access
 _scanner_instance = None
 
-def get_repo_scanner() -> QueenRepositoryScanner:
+def get_repo_scanner(background: bool = True) -> QueenRepositoryScanner:
     global _scanner_instance
     if _scanner_instance is None:
         _scanner_instance = QueenRepositoryScanner()
+    if background and not _scanner_instance.background_running:
+        _scanner_instance.start_background()
     return _scanner_instance
 
 if __name__ == "__main__":
@@ -195,3 +337,4 @@ if __name__ == "__main__":
     scanner = QueenRepositoryScanner()
     wisdom = scanner.scan_repository()
     print(f"Repo Wisdom Score: {wisdom}")
+    print(f"Index refresh: {scanner.last_refresh}")
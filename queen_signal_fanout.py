@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Queen Signal Fan-out
+--------------------
+Deadline-bounded, concurrent child queries for QueenHiveMind decisions.
+
+gather_neural_inputs and get_collective_signal used to ask Clownfish, the
+repository scanner, Mycelium, Enigma and the harmonic field one after
+another, so a decision took the sum of every child's latency and one slow
+child stalled every trade. SignalFanout starts every child at once on a
+small pool of daemon workers and waits only until the decision budget:
+
+    fanout = SignalFanout('queen')
+    got = fanout.gather({'mycelium': mycelium.get_network_coherence,
+                         'repo_wisdom': scanner.get_wisdom_factor},
+                        budget_s=0.25, label='neural_inputs')
+    if got['mycelium'].weight > 0:
+        coherence = got['mycelium'].value
+
+A child that misses the deadline (or raises) gets its last-known value
+substituted with a staleness weight of 0.5 ** (age / half_life): 1.0 for a
+fresh answer, decaying towards 0 as the substituted value ages, and 0 when
+the child has never answered. Callers scale that child's contribution by
+the weight, so a stale child fades out instead of voting at full strength.
+
+A late answer is not thrown away - it refreshes the last-known value for
+the next decision. A child whose previous call is still running is not
+started again ('busy'), so a hung child ties up at most one worker and its
+instance never runs two queries at once.
+
+A call key may carry a scope after '@' - 'clownfish@BTC/USD' - so a
+substituted value is never another symbol's. The part before '@' is the
+child kind: the busy guard, counters, latencies and metric labels are per
+kind (bounded), and last-known values per full key are kept in an LRU of
+LAST_KNOWN_MAX entries.
+
+Per-child call counts by status and latencies are exported through the
+metrics module; stats() gives p50/p99 per child and per gather label.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import time
+import queue
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from metrics import MetricCounter, MetricGauge
+
+SIGNAL_BUDGET_S = float(os.getenv('AUREON_QUEEN_SIGNAL_BUDGET_MS', '250')) / 1000.0
+SIGNAL_HALF_LIFE_S = float(os.getenv('AUREON_QUEEN_SIGNAL_HALF_LIFE', '60'))
+FANOUT_WORKERS = int(os.getenv('AUREON_QUEEN_FANOUT_WORKERS', '8'))
+FANOUT_CONCURRENT = os.getenv('AUREON_QUEEN_FANOUT', '1') != '0'
+LATENCY_WINDOW = 512                # Samples kept per child / label for percentiles
+LAST_KNOWN_MAX = int(os.getenv('AUREON_QUEEN_FANOUT_LAST_KNOWN', '1024'))   # Scoped last values kept
+
+fanout_child_calls = MetricCounter(
+    'queen_fanout_child_calls_total',
+    'Queen fan-out child queries by outcome',
+    labelnames=('fanout', 'child', 'status'),
+)
+fanout_child_latency = MetricGauge(
+    'queen_fanout_child_latency_seconds',
+    'Latency of the most recent completed child query',
+    labelnames=('fanout', 'child'),
+)
+fanout_gather_latency = MetricGauge(
+    'queen_fanout_gather_latency_seconds',
+    'Wall time of the most recent fan-out round',
+    labelnames=('fanout', 'label'),
+)
+
+
+@dataclass
+class ChildSignal:
+    """One child's answer for one decision."""
+    name: str
+    status: str                 # 'ok', 'timeout', 'error' or 'busy'
+    value: Any                  # Fresh value, else last-known, else the default
+    weight: float               # 1.0 fresh, decays with age of a substituted value, 0 if none
+    age: float                  # Seconds since `value` was produced
+    latency: float              # Seconds this decision waited for the child
+    error: str = ''
+
+    @property
+    def fresh(self) -> bool:
+        return self.status == 'ok'
+
+
+def child_kind(key: str) -> str:
+    """'clownfish@BTC/USD' -> 'clownfish'; unscoped keys are their own kind."""
+    return key.partition('@')[0]
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class SignalFanout:
+    """Runs child queries concurrently under a per-decision latency budget."""
+
+    def __init__(self, name: str = 'queen', max_workers: int = FANOUT_WORKERS,
+                 half_life_s: float = SIGNAL_HALF_LIFE_S, concurrent: bool = FANOUT_CONCURRENT,
+                 last_known_max: int = LAST_KNOWN_MAX):
+        self.name = name
+        self.last_known_max = max(1, last_known_max)
+        self.max_workers = max(1, max_workers)
+        self.half_life_s = half_life_s
+        self.concurrent = concurrent
+        self._lock = threading.Lock()
+        self._tasks: "queue.SimpleQueue[Tuple[str, Callable[[], Any], queue.Queue]]" = queue.SimpleQueue()
+        self._workers = 0
+        self._idle = 0
+        self._inflight: set = set()                          # Child kinds with a query running
+        self._last: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()   # key -> (value, produced_at), LRU
+        self._counts: Dict[str, Dict[str, int]] = {}         # Per kind
+        self._child_latency: Dict[str, deque] = {}           # Per kind
+        self._label_latency: Dict[str, deque] = {}
+
+    # ──────────────────────────────────────────────────────────────
+    # Worker pool
+    # ──────────────────────────────────────────────────────────────
+
+    def _submit(self, child: str, fn: Callable[[], Any], done: queue.Queue):
+        with self._lock:
+            spawn = self._idle == 0 and self._workers < self.max_workers
+            if spawn:
+                self._workers += 1
+                worker_id = self._workers
+        self._tasks.put((child, fn, done))
+        if spawn:
+            threading.Thread(target=self._work, name=f"{self.name}-fanout-{worker_id}", daemon=True).start()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            child, fn, done = self._tasks.get()
+            with self._lock:
+                self._idle -= 1
+            done.put((child,) + self._call(child, fn))
+            with self._lock:
+                self._inflight.discard(child_kind(child))
+
+    def _call(self, child: str, fn: Callable[[], Any]) -> Tuple[bool, Any, float, str]:
+        start = time.perf_counter()
+        try:
+            value = fn()
+            ok, error = True, ''
+        except Exception as e:
+            value, ok, error = None, False, str(e) or type(e).__name__
+        latency = time.perf_counter() - start
+        kind = child_kind(child)
+        with self._lock:
+            if ok:
+                self._last[child] = (value, time.time())
+                self._last.move_to_end(child)
+                while len(self._last) > self.last_known_max:
+                    self._last.popitem(last=False)
+            self._child_latency.setdefault(kind, deque(maxlen=LATENCY_WINDOW)).append(latency)
+        fanout_child_latency.set(latency, fanout=self.name, child=kind)
+        return ok, value, latency, error
+
+    def _claim(self, child: str) -> bool:
+        """Mark the child's kind busy; False if a query of that kind is still running."""
+        kind = child_kind(child)
+        with self._lock:
+            if kind in self._inflight:
+                return False
+            self._inflight.add(kind)
+            return True
+
+    # ──────────────────────────────────────────────────────────────
+    # Public API
+    # ──────────────────────────────────────────────────────────────
+
+    def gather(self, calls: Mapping[str, Callable[[], Any]], budget_s: Optional[float] = None,
+               defaults: Optional[Mapping[str, Any]] = None, label: str = 'gather') -> Dict[str, ChildSignal]:
+        """
+        Query every child in `calls` and return {child: ChildSignal}, in the
+        order given, within budget_s (SIGNAL_BUDGET_S by default).
+
+        defaults supplies the value for a child that has never answered.
+        With concurrent=False the children run inline and the budget is not
+        enforced (a running query cannot be interrupted). Either way a child
+        kind already running - from this round or another thread - is 'busy'.
+        """
+        budget = SIGNAL_BUDGET_S if budget_s is None else budget_s
+        defaults = defaults or {}
+        start = time.perf_counter()
+        answers: Dict[str, Tuple[bool, Any, float, str]] = {}
+        busy = set()
+
+        if not self.concurrent:
+            for child, fn in calls.items():
+                if not self._claim(child):
+                    busy.add(child)
+                    continue
+                try:
+                    answers[child] = self._call(child, fn)
+                finally:
+                    with self._lock:
+                        self._inflight.discard(child_kind(child))
+        else:
+            done: queue.Queue = queue.Queue()
+            started = 0
+            for child, fn in calls.items():
+                if not self._claim(child):
+                    busy.add(child)
+                    continue
+                self._submit(child, fn, done)
+                started += 1
+            deadline = start + budget
+            while len(answers) < started:
+                wait = deadline - time.perf_counter()
+                if wait <= 0:
+                    break
+                try:
+                    child, *answer = done.get(timeout=wait)
+                except queue.Empty:
+                    break
+                answers[child] = tuple(answer)
+
+        waited = time.perf_counter() - start
+        now = time.time()
+        results: Dict[str, ChildSignal] = {}
+        for child in calls:
+            if child in answers and answers[child][0]:
+                _, value, latency, _ = answers[child]
+                results[child] = ChildSignal(child, 'ok', value, 1.0, 0.0, latency)
+                continue
+            if child in answers:
+                status, latency, error = 'error', answers[child][2], answers[child][3]
+            elif child in busy:
+                status, latency, error = 'busy', 0.0, 'previous query still running'
+            else:
+                status, latency, error = 'timeout', waited, f"no answer within {budget * 1000:.0f}ms"
+            results[child] = self._substitute(child, status, latency, error, defaults.get(child), now)
+
+        with self._lock:
+            for child, result in results.items():
+                counts = self._counts.setdefault(child_kind(child), {})
+                counts[result.status] = counts.get(result.status, 0) + 1
+        for child, result in results.items():
+            fanout_child_calls.inc(fanout=self.name, child=child_kind(child), status=result.status)
+        self.observe(label, waited)
+        return results
+
+    def _substitute(self, child: str, status: str, latency: float, error: str,
+                    default: Any, now: float) -> ChildSignal:
+        with self._lock:
+            last = self._last.get(child)
+            if last is not None:
+                self._last.move_to_end(child)
+        if last is None:
+            return ChildSignal(child, status, default, 0.0, float('inf'), latency, error)
+        value, produced_at = last
+        age = max(0.0, now - produced_at)
+        weight = 0.5 ** (age / self.half_life_s) if self.half_life_s > 0 else 0.0
+        return ChildSignal(child, status, value, weight, age, latency, error)
+
+    def observe(self, label: str, seconds: float):
+        """Record a round / decision wall time under `label`."""
+        with self._lock:
+            self._label_latency.setdefault(label, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+        fanout_gather_latency.set(seconds, fanout=self.name, label=label)
+
+    def last_known(self, child: str) -> Optional[Tuple[Any, float]]:
+        """(value, unix time produced) of the child's last answer, if any."""
+        with self._lock:
+            return self._last.get(child)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-kind outcome counts and latency percentiles, per-label round times."""
+        with self._lock:
+            children = {
+                child: {
+                    'calls': sum(self._counts.get(child, {}).values()),
+                    **{s: self._counts.get(child, {}).get(s, 0) for s in ('ok', 'timeout', 'error', 'busy')},
+                    'p50_ms': _percentile(self._child_latency.get(child, ()), 0.50) * 1000,
+                    'p99_ms': _percentile(self._child_latency.get(child, ()), 0.99) * 1000,
+                }
+                for child in set(self._counts) | set(self._child_latency)
+            }
+            rounds = {
+                label: {
+                    'count': len(samples),
+                    'p50_ms': _percentile(samples, 0.50) * 1000,
+                    'p99_ms': _percentile(samples, 0.99) * 1000,
+                    'max_ms': max(samples) * 1000 if samples else 0.0,
+                }
+                for label, samples in self._label_latency.items()
+            }
+            return {'workers': self._workers, 'inflight': sorted(self._inflight),
+                    'last_known': len(self._last), 'children': children, 'rounds': rounds}
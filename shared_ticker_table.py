@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════════════╗
+║                                                                                      ║
+║     🧮 SHARED TICKER TABLE - MEMORY-MAPPED FIXED-RECORD PRICE STORE 🧮              ║
+║     ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━                    ║
+║                                                                                      ║
+║     PROBLEM: Every consumer re-parses MBs of JSON cache files once a second         ║
+║                                                                                      ║
+║     SOLUTION: Feeders patch fixed-size rows in a memory-mapped file in place,       ║
+║               readers unpack a single row straight out of the mapping (O(1))        ║
+║                                                                                      ║
+║     LAYOUT (little-endian):                                                         ║
+║       header  : magic(8) version(u32) capacity(u32) row_size(u32) count(u32)        ║
+║       rows[i] : seq(u64) symbol(16s) pair(16s) source(16s)                          ║
+║                 price bid ask change_24h volume_24h timestamp (6 x f64)             ║
+║                                                                                      ║
+║     Each row is guarded by a seqlock: writers bump `seq` to odd, patch the          ║
+║     payload, then bump it back to even. Readers retry if `seq` was odd or           ║
+║     changed while they were unpacking, so they never see a torn ticker.             ║
+║                                                                                      ║
+║     One row per base asset, shared by all feeders: a write is skipped if the        ║
+║     row holds newer data, or data from a preferred source (Binance WS >             ║
+║     unified > Kraken REST, as the JSON merge did) that is still fresh.              ║
+║                                                                                      ║
+║     OUTPUT: ws_cache/ticker_table.bin - mapped by every process                     ║
+║                                                                                      ║
+╚══════════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import mmap
+import struct
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - only needed for as_array()
+    np = None
+
+# Windows UTF-8 Fix
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+# Cross-platform file locking (writers only - readers are lock-free)
+if sys.platform == 'win32':
+    import msvcrt
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    def _unlock_file(f):
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        except Exception:
+            pass
+else:
+    import fcntl
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CACHE_DIR = os.getenv('MARKET_CACHE_DIR', 'ws_cache')
+TICKER_TABLE_PATH = os.getenv('TICKER_TABLE_PATH', os.path.join(CACHE_DIR, 'ticker_table.bin'))
+TICKER_TABLE_CAPACITY = int(os.getenv('TICKER_TABLE_CAPACITY', '4096'))
+
+TABLE_MAGIC = b'AURTICK1'
+TABLE_VERSION = 1
+
+HEADER_STRUCT = struct.Struct('<8sIIII')          # magic, version, capacity, row_size, count
+HEADER_SIZE = 64                                  # padded so rows start cache-line aligned
+COUNT_OFFSET = 20                                 # offset of `count` inside the header
+
+SEQ_STRUCT = struct.Struct('<Q')
+ROW_STRUCT = struct.Struct('<Q16s16s16s6d')       # seq, symbol, pair, source, 6 doubles
+PAYLOAD_STRUCT = struct.Struct('<16s16s16s6d')    # row minus the seqlock word
+ROW_SIZE = ROW_STRUCT.size                        # 104 bytes
+NAME_SIZE = 16
+
+_MAX_READ_RETRIES = 64
+
+# Feeders share one row per base asset. Lower rank wins while its data is
+# younger than SOURCE_HOLD_S (old JSON merge order: Binance WS > unified > Kraken)
+SOURCE_PRIORITY = {
+    'binance_ws': 0,
+    'unified': 1,
+    'unified_market_cache': 1,
+    'kraken_rest': 2,
+    'kraken_state_fallback': 3,
+}
+SOURCE_HOLD_S = float(os.getenv('TICKER_TABLE_SOURCE_HOLD_S', '10'))
+
+
+def _encode(text: str) -> bytes:
+    return (text or '').encode('ascii', 'replace')[:NAME_SIZE]
+
+
+def _decode(raw: bytes) -> str:
+    return raw.split(b'\x00', 1)[0].decode('ascii', 'replace')
+
+
+def _source_rank(source: str) -> int:
+    return SOURCE_PRIORITY.get(source, len(SOURCE_PRIORITY))
+
+
+class SharedTickerTable:
+    """
+    Memory-mapped ticker table shared between feeder and reader processes.
+
+    Usage:
+        from shared_ticker_table import get_ticker_table
+
+        table = get_ticker_table()
+        table.put('BTC', 95000.0, 94999.5, 95000.5, 1.2, 3.4e9, time.time(),
+                  source='binance_ws', pair='BTCUSDT')
+        row = table.get('BTC')   # -> (price, bid, ask, change_24h, volume_24h, timestamp, source, pair)
+
+    Rows are append-only: a symbol keeps its row for the lifetime of the file,
+    so readers cache `symbol -> row` and only rescan rows added since their
+    last look at the header `count`.
+
+    Every feeder writes the same row for a symbol, so writes follow the
+    source priority: older data never replaces newer, and a lower-priority
+    source only takes over once the preferred one is `source_hold_s` stale.
+    """
+
+    def __init__(self, path: str = TICKER_TABLE_PATH, capacity: int = TICKER_TABLE_CAPACITY,
+                 source_hold_s: float = SOURCE_HOLD_S):
+        self.path = path
+        self.source_hold_s = source_hold_s
+        self._write_lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._indexed_count = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'a+b')
+        _lock_file(self._file)
+        try:
+            self._file.seek(0, os.SEEK_END)
+            size = self._file.tell()
+            if size >= HEADER_SIZE:
+                self._file.seek(0)
+                magic, version, cap, row_size, _ = HEADER_STRUCT.unpack(self._file.read(HEADER_STRUCT.size))
+                if magic != TABLE_MAGIC or version != TABLE_VERSION or row_size != ROW_SIZE:
+                    raise ValueError(f"incompatible ticker table at {path}")
+                capacity = cap
+            else:
+                self._file.truncate(0)
+                self._file.write(HEADER_STRUCT.pack(TABLE_MAGIC, TABLE_VERSION, capacity, ROW_SIZE, 0))
+                self._file.write(b'\x00' * (HEADER_SIZE - HEADER_STRUCT.size + capacity * ROW_SIZE))
+                self._file.flush()
+        finally:
+            _unlock_file(self._file)
+
+        self.capacity = capacity
+        self._mm = mmap.mmap(self._file.fileno(), HEADER_SIZE + capacity * ROW_SIZE)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Index
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _count(self) -> int:
+        return struct.unpack_from('<I', self._mm, COUNT_OFFSET)[0]
+
+    def _refresh_index(self) -> None:
+        """Pick up rows appended by other processes since the last refresh."""
+        count = min(self._count(), self.capacity)
+        mm = self._mm
+        for row in range(self._indexed_count, count):
+            offset = HEADER_SIZE + row * ROW_SIZE + SEQ_STRUCT.size
+            symbol = _decode(mm[offset:offset + NAME_SIZE])
+            if symbol:
+                self._index[symbol] = row
+        self._indexed_count = count
+
+    def _row_for(self, symbol: str) -> Optional[int]:
+        row = self._index.get(symbol)
+        if row is None and self._count() != self._indexed_count:
+            self._refresh_index()
+            row = self._index.get(symbol)
+        return row
+
+    def _claim_row(self, symbol: str) -> Optional[int]:
+        """Append a row for `symbol` (caller holds the file lock)."""
+        self._refresh_index()
+        row = self._index.get(symbol)
+        if row is not None:
+            return row
+        count = self._count()
+        if count >= self.capacity:
+            logger.warning(f"Ticker table full ({self.capacity} rows) - dropping {symbol}")
+            return None
+        offset = HEADER_SIZE + count * ROW_SIZE
+        self._mm[offset + SEQ_STRUCT.size:offset + SEQ_STRUCT.size + NAME_SIZE] = _encode(symbol).ljust(NAME_SIZE, b'\x00')
+        struct.pack_into('<I', self._mm, COUNT_OFFSET, count + 1)
+        self._index[symbol] = count
+        self._indexed_count = count + 1
+        return count
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Writers
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _write_row(self, row: int, symbol: str, price: float, bid: float, ask: float,
+                   change_24h: float, volume_24h: float, timestamp: float,
+                   source: str, pair: str) -> None:
+        mm = self._mm
+        offset = HEADER_SIZE + row * ROW_SIZE
+        seq = SEQ_STRUCT.unpack_from(mm, offset)[0]
+        if seq & 1:
+            seq += 1  # recover from a writer that died mid-update
+        SEQ_STRUCT.pack_into(mm, offset, seq + 1)
+        PAYLOAD_STRUCT.pack_into(
+            mm, offset + SEQ_STRUCT.size,
+            _encode(symbol), _encode(pair), _encode(source),
+            price, bid, ask, change_24h, volume_24h, timestamp,
+        )
+        SEQ_STRUCT.pack_into(mm, offset, seq + 2)
+
+    def _may_replace(self, row: int, source: str, timestamp: float) -> bool:
+        """Source priority check against the row's current contents (caller holds the file lock)."""
+        current = self._read_row(row)
+        if current is None:
+            return True
+        held_source, held_ts = _decode(current[2]), current[8]
+        if timestamp < held_ts:
+            return False
+        if _source_rank(source) > _source_rank(held_source) and timestamp - held_ts <= self.source_hold_s:
+            return False
+        return True
+
+    def put(self, symbol: str, price: float, bid: float, ask: float,
+            change_24h: float, volume_24h: float, timestamp: float,
+            source: str = '', pair: str = '') -> bool:
+        """Update one ticker in place. False if the table is full or the row is held (source priority)."""
+        return self.put_many([(symbol, price, bid, ask, change_24h, volume_24h, timestamp, source, pair)]) == 1
+
+    def put_many(self, rows: Iterable[Tuple]) -> int:
+        """
+        Update many tickers under a single lock acquisition.
+
+        Each item is (symbol, price, bid, ask, change_24h, volume_24h, timestamp, source, pair).
+        Returns the number of rows written; rows held by newer or preferred
+        data are skipped.
+        """
+        written = 0
+        with self._write_lock:
+            _lock_file(self._file)
+            try:
+                for symbol, price, bid, ask, change, volume, ts, source, pair in rows:
+                    symbol = (symbol or '').upper()
+                    if not symbol:
+                        continue
+                    row = self._row_for(symbol)
+                    if row is None:
+                        row = self._claim_row(symbol)
+                        if row is None:
+                            continue
+                    elif not self._may_replace(row, source, float(ts)):
+                        continue
+                    self._write_row(row, symbol, float(price), float(bid), float(ask),
+                                    float(change), float(volume), float(ts), source, pair)
+                    written += 1
+            finally:
+                _unlock_file(self._file)
+        return written
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Readers (lock-free)
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _read_row(self, row: int) -> Optional[Tuple]:
+        mm = self._mm
+        offset = HEADER_SIZE + row * ROW_SIZE
+        for _ in range(_MAX_READ_RETRIES):
+            seq_before = SEQ_STRUCT.unpack_from(mm, offset)[0]
+            if seq_before & 1:
+                continue
+            values = PAYLOAD_STRUCT.unpack_from(mm, offset + SEQ_STRUCT.size)
+            if SEQ_STRUCT.unpack_from(mm, offset)[0] == seq_before:
+                if seq_before == 0:
+                    return None  # claimed but never written
+                return values
+        return None
+
+    def get(self, symbol: str) -> Optional[Tuple[float, float, float, float, float, float, str, str]]:
+        """
+        Return (price, bid, ask, change_24h, volume_24h, timestamp, source, pair) or None.
+        """
+        row = self._row_for(symbol.upper())
+        if row is None:
+            return None
+        values = self._read_row(row)
+        if values is None:
+            return None
+        _, pair, source, price, bid, ask, change, volume, ts = values
+        return price, bid, ask, change, volume, ts, _decode(source), _decode(pair)
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        row = self._row_for(symbol.upper())
+        if row is None:
+            return None
+        values = self._read_row(row)
+        return values[3] if values else None
+
+    def symbols(self) -> List[str]:
+        self._refresh_index()
+        return list(self._index)
+
+    def snapshot(self) -> Dict[str, Tuple[float, float, float, float, float, float, str, str]]:
+        """Consistent per-row copy of every populated ticker."""
+        self._refresh_index()
+        out = {}
+        for symbol, row in self._index.items():
+            values = self._read_row(row)
+            if values is None:
+                continue
+            _, pair, source, price, bid, ask, change, volume, ts = values
+            out[symbol] = (price, bid, ask, change, volume, ts, _decode(source), _decode(pair))
+        return out
+
+    def as_array(self):
+        """
+        Zero-copy numpy view over the populated rows (structured dtype).
+
+        Columns are live - values can change underneath the caller, so use
+        `snapshot()` when per-row consistency matters.
+        """
+        if np is None:
+            raise RuntimeError("numpy not installed")
+        dtype = np.dtype([
+            ('seq', '<u8'), ('symbol', 'S16'), ('pair', 'S16'), ('source', 'S16'),
+            ('price', '<f8'), ('bid', '<f8'), ('ask', '<f8'),
+            ('change_24h', '<f8'), ('volume_24h', '<f8'), ('timestamp', '<f8'),
+        ])
+        count = min(self._count(), self.capacity)
+        return np.frombuffer(self._mm, dtype=dtype, count=count, offset=HEADER_SIZE)
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+def publish_ticker_cache(prices: Dict[str, float], ticker_cache: Dict[str, Dict],
+                         source: str, timestamp: float) -> int:
+    """
+    Write a feeder's `prices`/`ticker_cache` payload into the shared table.
+
+    One row per base asset in `prices` (the feeder already picked the preferred
+    quote); bid/ask fall back to the last price when the feed has no book.
+    Returns the number of rows written, 0 if the table is unavailable.
+    """
+    table = get_ticker_table()
+    if table is None:
+        return 0
+    rows = []
+    seen = set()
+    for key, t in ticker_cache.items():
+        if ':' in key or not isinstance(t, dict):
+            continue  # exchange-prefixed duplicate of the same entry
+        base = t.get('base')
+        if not base or base in seen or prices.get(base) != t.get('price'):
+            continue
+        seen.add(base)
+        price = float(t.get('price') or 0)
+        rows.append((
+            base, price,
+            float(t.get('bid') or price), float(t.get('ask') or price),
+            float(t.get('change24h') or 0), float(t.get('volume') or 0),
+            float(t.get('timestamp') or timestamp),
+            t.get('source') or source, t.get('pair') or key,
+        ))
+    return table.put_many(rows)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SINGLETON ACCESS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_table_instance: Optional[SharedTickerTable] = None
+_table_unavailable = False
+_table_lock = threading.Lock()
+
+
+def get_ticker_table() -> Optional[SharedTickerTable]:
+    """Get the process-wide ticker table, or None if it cannot be mapped."""
+    global _table_instance, _table_unavailable
+    if _table_instance is None and not _table_unavailable:
+        with _table_lock:
+            if _table_instance is None and not _table_unavailable:
+                try:
+                    _table_instance = SharedTickerTable()
+                except Exception as e:
+                    _table_unavailable = True
+                    logger.debug(f"Ticker table unavailable: {e}")
+    return _table_instance
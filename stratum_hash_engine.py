@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+Stratum Hash Engine
+-------------------
+Midstate header templates and a multi-process nonce scanner for the
+Aureon Stratum miner.
+
+MiningJob.build_header used to rebuild the coinbase, double-hash it and
+fold every merkle branch for every nonce, and the miner ran one hashlib
+loop per thread, so extra threads mostly queued on the GIL. Here:
+
+    template = HeaderTemplate.build(job, extranonce2)   # merkle root once
+    template.hash(nonce)                                # patches 4 nonce bytes
+
+HeaderTemplate also keeps the SHA-256 state after the header's first
+64-byte block (the midstate), so each nonce hashes only the last 16 bytes
+plus the outer SHA-256.
+
+HashEngine fans nonce ranges out to worker processes. The current job
+(76-byte header prefix + target) lives in shared memory with a generation
+counter; cancel() bumps the generation and workers drop the rest of their
+range within `check_every` nonces, which is how clean_jobs notifies are
+honoured. Every hash a worker actually computes is counted by a HashMeter,
+so measured H/s stays separate from the miner's resonance-scaled counters.
+
+FakeStratumServer is a local Stratum v1 pool (subscribe / authorize /
+notify / submit with share validation) for tests and for the offline
+throughput benchmark:
+
+    python stratum_hash_engine.py --processes 4 --seconds 10
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import json
+import time
+import queue
+import socket
+import struct
+import hashlib
+import logging
+import argparse
+import threading
+import multiprocessing as mp
+from collections import deque
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = int(os.getenv('MINING_HASH_CHUNK', '16384'))   # Nonces per work item
+HASH_CHECK_EVERY = 2048            # Nonces between cancellation checks
+HASH_METER_WINDOW_S = 10.0         # Sliding window for measured H/s
+MAX_NONCE = 0xFFFFFFFF
+DIFF1_TARGET = 0x00000000FFFF0000000000000000000000000000000000000000000000000000
+
+_NONCE = struct.Struct('<I')
+_HEADER_PREFIX_LEN = 76
+_JOB_BUFFER_LEN = _HEADER_PREFIX_LEN + 32
+
+
+def double_sha256(data: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+
+def merkle_root(coinbase: bytes, branches: Sequence[bytes]) -> bytes:
+    root = double_sha256(coinbase)
+    for branch in branches:
+        root = double_sha256(root + branch)
+    return root
+
+
+def target_from_difficulty(difficulty: float) -> int:
+    if difficulty <= 0:
+        difficulty = 1
+    return int(DIFF1_TARGET / difficulty)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HEADER TEMPLATE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class HeaderTemplate:
+    """80-byte header for one (job, extranonce2) with only the nonce left open."""
+
+    __slots__ = ('prefix', '_mid', '_tail')
+
+    def __init__(self, prefix: bytes):
+        if len(prefix) != _HEADER_PREFIX_LEN:
+            raise ValueError(f"header prefix must be {_HEADER_PREFIX_LEN} bytes, got {len(prefix)}")
+        self.prefix = bytes(prefix)
+        self._mid = hashlib.sha256(self.prefix[:64])    # state after the first block
+        self._tail = self.prefix[64:]
+
+    @classmethod
+    def build(cls, job: Any, extranonce2: bytes) -> 'HeaderTemplate':
+        """Template from anything shaped like aureon_miner.MiningJob."""
+        coinbase = job.coinbase1 + job.extranonce1 + extranonce2 + job.coinbase2
+        root = merkle_root(coinbase, job.merkle_branches)
+        return cls(job.version + job.prev_hash + root + job.ntime + job.nbits)
+
+    def header(self, nonce: int) -> bytes:
+        return self.prefix + _NONCE.pack(nonce)
+
+    def hash(self, nonce: int) -> bytes:
+        """Double SHA-256 of the header (internal byte order, as hashlib returns it)."""
+        h = self._mid.copy()
+        h.update(self._tail + _NONCE.pack(nonce))
+        return hashlib.sha256(h.digest()).digest()
+
+    def scan(self, start: int, end: int, target: int,
+             is_cancelled: Optional[Callable[[], bool]] = None,
+             check_every: int = HASH_CHECK_EVERY) -> 'ScanResult':
+        """Hash nonces [start, end); collect (nonce, hash) below target."""
+        mid_copy = self._mid.copy
+        tail = self._tail
+        pack = _NONCE.pack
+        sha256 = hashlib.sha256
+        target_be = target.to_bytes(32, 'big')
+        top = target_be[0]
+        shares: List[Tuple[int, bytes]] = []
+        digest = b''
+        nonce = start
+        cancelled = False
+        while nonce < end:
+            stop = min(end, nonce + check_every)
+            for n in range(nonce, stop):
+                h = mid_copy()
+                h.update(tail + pack(n))
+                digest = sha256(h.digest()).digest()
+                # Most significant byte is last in internal order - cheap reject first
+                if digest[31] <= top and digest[::-1] < target_be:
+                    shares.append((n, digest))
+            nonce = stop
+            if is_cancelled is not None and nonce < end and is_cancelled():
+                cancelled = True
+                break
+        return ScanResult(start, nonce, nonce - start, shares, digest, cancelled)
+
+
+@dataclass
+class ScanResult:
+    """Outcome of scanning one nonce range."""
+    start: int
+    end: int                    # first nonce NOT scanned
+    hashes: int
+    shares: List[Tuple[int, bytes]] = field(default_factory=list)
+    last_hash: bytes = b''
+    cancelled: bool = False
+    seconds: float = 0.0
+    generation: int = 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MEASURED HASHRATE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class HashMeter:
+    """Counts hashes actually computed; rate over a sliding window."""
+
+    def __init__(self, window_s: float = HASH_METER_WINDOW_S, clock: Callable[[], float] = time.monotonic):
+        self.window_s = window_s
+        self._clock = clock
+        self.started = clock()
+        self.total = 0
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    def add(self, hashes: int):
+        now = self._clock()
+        with self._lock:
+            self.total += hashes
+            self._samples.append((now, hashes))
+            cutoff = now - self.window_s
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+
+    def rate(self) -> float:
+        """H/s over the window (or since start, if younger than the window)."""
+        now = self._clock()
+        with self._lock:
+            cutoff = now - self.window_s
+            recent = sum(n for t, n in self._samples if t >= cutoff)
+        span = min(self.window_s, now - self.started)
+        return recent / span if span > 0 else 0.0
+
+    def average(self) -> float:
+        elapsed = self._clock() - self.started
+        return self.total / elapsed if elapsed > 0 else 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MULTI-PROCESS ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _read_job(job_buffer, generation) -> Tuple[int, bytes, int]:
+    with job_buffer.get_lock():
+        data = bytes(job_buffer.get_obj())
+        gen = generation.value
+    return gen, data[:_HEADER_PREFIX_LEN], int.from_bytes(data[_HEADER_PREFIX_LEN:], 'big')
+
+
+def _worker_main(job_buffer, generation, tasks, results, check_every: int):
+    """Worker process: pull (generation, start, end), scan, report."""
+    template: Optional[HeaderTemplate] = None
+    target = 0
+    template_gen = -1
+    is_cancelled = None
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        gen, start, end = item
+        if gen != template_gen:
+            current, prefix, target = _read_job(job_buffer, generation)
+            if current != gen:
+                results.put(ScanResult(start, start, 0, cancelled=True, generation=gen))
+                continue
+            template = HeaderTemplate(prefix)
+            template_gen = gen
+            is_cancelled = (lambda g=gen: generation.value != g)
+        if generation.value != gen:
+            results.put(ScanResult(start, start, 0, cancelled=True, generation=gen))
+            continue
+        t0 = time.perf_counter()
+        result = template.scan(start, end, target, is_cancelled, check_every)
+        result.seconds = time.perf_counter() - t0
+        result.generation = gen
+        results.put(result)
+
+
+@dataclass
+class MineSummary:
+    """Totals for one HashEngine.mine() call."""
+    hashes: int
+    shares: List[Tuple[int, bytes]]
+    seconds: float
+    cancelled: bool
+    last_nonce: int = 0
+    last_hash: bytes = b''
+
+    @property
+    def hashrate(self) -> float:
+        return self.hashes / self.seconds if self.seconds > 0 else 0.0
+
+
+class HashEngine:
+    """
+    Process pool scanning nonce ranges of the current job.
+
+    mine() blocks until the range is done or cancel() is called (from any
+    thread - e.g. a Stratum on_job callback for clean_jobs).
+    """
+
+    def __init__(self, processes: Optional[int] = None, chunk_size: int = HASH_CHUNK_SIZE,
+                 check_every: int = HASH_CHECK_EVERY, start_method: Optional[str] = None):
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.check_every = max(1, check_every)
+        self._ctx = mp.get_context(start_method or os.getenv('MINING_MP_START') or None)
+        self._job_buffer = self._ctx.Array('B', _JOB_BUFFER_LEN)
+        self._generation = self._ctx.RawValue('Q', 0)
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._workers: List[Any] = []
+        self._job_key: Optional[Tuple[bytes, int]] = None
+        self._mine_lock = threading.Lock()
+        self.meter = HashMeter()
+        self.cancellations = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def generation(self) -> int:
+        return self._generation.value
+
+    def start(self) -> 'HashEngine':
+        if self._workers:
+            return self
+        for i in range(self.processes):
+            proc = self._ctx.Process(
+                target=_worker_main,
+                args=(self._job_buffer, self._generation, self._tasks, self._results, self.check_every),
+                name=f'hash-worker-{i}',
+                daemon=True,
+            )
+            proc.start()
+            self._workers.append(proc)
+        return self
+
+    def stop(self):
+        self.cancel()
+        for _ in self._workers:
+            self._tasks.put(None)
+        for proc in self._workers:
+            proc.join(timeout=2)
+            if proc.is_alive():
+                proc.terminate()
+        self._workers.clear()
+
+    def __enter__(self) -> 'HashEngine':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def set_job(self, template: HeaderTemplate, target: int) -> int:
+        """Publish a new job to the workers; returns its generation."""
+        key = (template.prefix, target)
+        with self._job_buffer.get_lock():
+            if key != self._job_key:
+                self._job_buffer.get_obj()[:] = template.prefix + target.to_bytes(32, 'big')
+                self._generation.value += 1
+                self._job_key = key
+            return self._generation.value
+
+    def cancel(self):
+        """Abandon the current job: queued and in-flight ranges stop early."""
+        with self._job_buffer.get_lock():
+            self._generation.value += 1
+            self._job_key = None
+        self.cancellations += 1
+
+    def mine(self, template: HeaderTemplate, target: int, nonce_start: int, nonce_end: int,
+             timeout: Optional[float] = None) -> MineSummary:
+        """Scan [nonce_start, nonce_end) across the pool."""
+        if not self._workers:
+            self.start()
+        with self._mine_lock:
+            t0 = time.perf_counter()
+            gen = self.set_job(template, target)
+            chunks = 0
+            for start in range(nonce_start, min(nonce_end, MAX_NONCE + 1), self.chunk_size):
+                self._tasks.put((gen, start, min(start + self.chunk_size, nonce_end)))
+                chunks += 1
+
+            hashes = 0
+            shares: List[Tuple[int, bytes]] = []
+            last_nonce, last_hash = nonce_start, b''
+            deadline = None if timeout is None else t0 + timeout
+            while chunks:
+                wait = 1.0 if deadline is None else max(0.0, deadline - time.perf_counter())
+                try:
+                    result = self._results.get(timeout=wait)
+                except queue.Empty:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        self.cancel()
+                        deadline = None     # drain what the workers hand back
+                    continue
+                if result.generation != gen:
+                    continue        # straggler from an earlier, cancelled call
+                chunks -= 1
+                hashes += result.hashes
+                if result.hashes:
+                    self.meter.add(result.hashes)
+                    last_nonce, last_hash = result.end - 1, result.last_hash
+                shares.extend(result.shares)
+
+            cancelled = self._generation.value != gen
+            shares.sort()
+            return MineSummary(hashes, [] if cancelled else shares, time.perf_counter() - t0,
+                               cancelled, last_nonce, last_hash)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FAKE STRATUM POOL (tests / offline benchmark)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class FakeStratumServer:
+    """
+    Minimal local Stratum v1 pool.
+
+    Hands out one job at a time, validates every mining.submit by
+    rebuilding the header from scratch, and records accepted/rejected
+    shares. notify(clean=True) pushes a fresh job to all clients.
+    """
+
+    def __init__(self, difficulty: float = 1e-4, extranonce1: bytes = b'\xa1\xb2\xc3\xd4',
+                 extranonce2_size: int = 4, host: str = '127.0.0.1', port: int = 0):
+        self.difficulty = difficulty
+        self.extranonce1 = extranonce1
+        self.extranonce2_size = extranonce2_size
+        self.accepted: List[Dict[str, Any]] = []
+        self.rejected: List[Dict[str, Any]] = []
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_seq = 0
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(8)
+        self.host, self.port = self._sock.getsockname()[:2]
+        self.new_job(clean=True)
+
+    def new_job(self, clean: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            self._job_seq += 1
+            seed = struct.pack('<I', self._job_seq)
+            job = {
+                'job_id': f'job{self._job_seq}',
+                'prev_hash': hashlib.sha256(b'prev' + seed).digest(),
+                'coinbase1': b'\x01\x00\x00\x00' + hashlib.sha256(b'cb1' + seed).digest()[:20],
+                'coinbase2': hashlib.sha256(b'cb2' + seed).digest()[:24],
+                'merkle_branches': [hashlib.sha256(b'mb%d' % i + seed).digest() for i in range(3)],
+                'version': b'\x20\x00\x00\x00',
+                'nbits': b'\x17\x03\xa3\x0c',
+                'ntime': struct.pack('>I', 1_700_000_000 + self._job_seq),
+                'clean': clean,
+            }
+            self.jobs[job['job_id']] = job
+            self.current_job = job
+            return job
+
+    def _notify_params(self, job: Dict[str, Any]) -> list:
+        return [job['job_id'], job['prev_hash'].hex(), job['coinbase1'].hex(), job['coinbase2'].hex(),
+                [b.hex() for b in job['merkle_branches']], job['version'].hex(), job['nbits'].hex(),
+                job['ntime'].hex(), job['clean']]
+
+    def start(self) -> 'FakeStratumServer':
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True, name='fake-stratum').start()
+        return self
+
+    def stop(self):
+        self._running = False
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for conn in clients:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+
+    def __enter__(self) -> 'FakeStratumServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def notify(self, clean: bool = True):
+        """Push a new job to every connected client."""
+        job = self.new_job(clean)
+        with self._lock:
+            clients = list(self._clients)
+        for conn in clients:
+            self._send(conn, {'id': None, 'method': 'mining.notify', 'params': self._notify_params(job)})
+
+    def _send(self, conn: socket.socket, msg: dict):
+        try:
+            conn.sendall((json.dumps(msg) + '\n').encode())
+        except OSError:
+            pass
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            with self._lock:
+                self._clients.append(conn)
+            threading.Thread(target=self._client_loop, args=(conn,), daemon=True).start()
+
+    def _client_loop(self, conn: socket.socket):
+        buffer = ''
+        while self._running:
+            try:
+                data = conn.recv(4096)
+            except OSError:
+                break
+            if not data:
+                break
+            buffer += data.decode('utf-8', errors='ignore')
+            while '\n' in buffer:
+                line, buffer = buffer.split('\n', 1)
+                if line.strip():
+                    self._handle(conn, json.loads(line))
+
+    def _handle(self, conn: socket.socket, msg: dict):
+        method, params, msg_id = msg.get('method'), msg.get('params', []), msg.get('id')
+        if method == 'mining.subscribe':
+            self._send(conn, {'id': msg_id, 'error': None,
+                              'result': [[['mining.notify', 'fake']], self.extranonce1.hex(), self.extranonce2_size]})
+        elif method == 'mining.authorize':
+            self._send(conn, {'id': msg_id, 'error': None, 'result': True})
+            self._send(conn, {'id': None, 'method': 'mining.set_difficulty', 'params': [self.difficulty]})
+            self._send(conn, {'id': None, 'method': 'mining.notify',
+                              'params': self._notify_params(self.current_job)})
+        elif method == 'mining.submit':
+            ok, reason = self.check_share(*params[1:5])
+            record = {'job_id': params[1], 'extranonce2': params[2], 'nonce': params[4], 'reason': reason}
+            (self.accepted if ok else self.rejected).append(record)
+            self._send(conn, {'id': msg_id, 'result': ok, 'error': None if ok else [23, reason, None]})
+        else:
+            self._send(conn, {'id': msg_id, 'result': None, 'error': [20, 'unknown method', None]})
+
+    def check_share(self, job_id: str, extranonce2_hex: str, ntime_hex: str, nonce_hex: str) -> Tuple[bool, str]:
+        """Rebuild the header from the job and verify the hash meets the target."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False, 'job not found'
+        if job is not self.current_job and self.current_job['clean']:
+            return False, 'stale job'
+        coinbase = job['coinbase1'] + self.extranonce1 + bytes.fromhex(extranonce2_hex) + job['coinbase2']
+        header = (job['version'] + job['prev_hash'] + merkle_root(coinbase, job['merkle_branches'])
+                  + bytes.fromhex(ntime_hex) + job['nbits'] + struct.pack('<I', int(nonce_hex, 16)))
+        hash_int = int.from_bytes(double_sha256(header)[::-1], 'big')
+        if hash_int >= target_from_difficulty(self.difficulty):
+            return False, 'low difficulty share'
+        return True, ''
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════
+
+def benchmark(processes_list: Sequence[int] = (1,), seconds: float = 5.0,
+              difficulty: float = 1e-4) -> List[Dict[str, Any]]:
+    """
+    Measure true H/s per process count against a FakeStratumServer job.
+
+    Also times the old per-nonce header rebuild for comparison. Returns one
+    dict per row: {'mode', 'processes', 'hashes', 'seconds', 'hps', 'hps_per_core', 'shares'}.
+    """
+    server = FakeStratumServer(difficulty=difficulty)
+    job = server.current_job
+    job_ns = SimpleNamespace(**job, extranonce1=server.extranonce1)
+    extranonce2 = b'\x00' * server.extranonce2_size
+    target = target_from_difficulty(difficulty)
+    template = HeaderTemplate.build(job_ns, extranonce2)
+    rows = []
+
+    # Baseline: rebuild coinbase + merkle root for every nonce
+    coinbase = job['coinbase1'] + server.extranonce1 + extranonce2 + job['coinbase2']
+    t0, n = time.perf_counter(), 0
+    while time.perf_counter() - t0 < min(seconds, 2.0):
+        for nonce in range(n, n + 1000):
+            header = (job['version'] + job['prev_hash'] + merkle_root(coinbase, job['merkle_branches'])
+                      + job['ntime'] + job['nbits'] + struct.pack('<I', nonce))
+            double_sha256(header)
+        n += 1000
+    elapsed = time.perf_counter() - t0
+    rows.append({'mode': 'rebuild-per-nonce', 'processes': 1, 'hashes': n, 'seconds': elapsed,
+                 'hps': n / elapsed, 'hps_per_core': n / elapsed, 'shares': 0})
+
+    for processes in processes_list:
+        with HashEngine(processes=processes) as engine:
+            engine.mine(template, target, 0, engine.chunk_size * processes)   # warm-up
+            t0, hashes, shares, nonce = time.perf_counter(), 0, 0, 0
+            while time.perf_counter() - t0 < seconds:
+                span = engine.chunk_size * processes * 4
+                summary = engine.mine(template, target, nonce, nonce + span)
+                hashes += summary.hashes
+                shares += len(summary.shares)
+                nonce += span
+            elapsed = time.perf_counter() - t0
+        rows.append({'mode': 'template+pool', 'processes': processes, 'hashes': hashes, 'seconds': elapsed,
+                     'hps': hashes / elapsed, 'hps_per_core': hashes / elapsed / processes, 'shares': shares})
+    server.stop()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline Stratum hashing benchmark')
+    parser.add_argument('--processes', type=int, nargs='*', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--difficulty', type=float, default=1e-4)
+    args = parser.parse_args()
+    print(f"{'mode':<20} {'procs':>5} {'hashes':>12} {'H/s':>12} {'H/s/core':>12} {'shares':>7}")
+    for row in benchmark(args.processes, args.seconds, args.difficulty):
+        print(f"{row['mode']:<20} {row['processes']:>5} {row['hashes']:>12,} {row['hps']:>12,.0f} "
+              f"{row['hps_per_core']:>12,.0f} {row['shares']:>7}")
+
+
+if __name__ == '__main__':
+    main()
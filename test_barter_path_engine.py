@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the BarterNavigator path engine
+
+Tests cover:
+- find_path returns the best simple route (checked against brute force)
+- Hop limits are respected
+- Per-source caching and per-edge invalidation
+- Arbitrage cycles are detected
+- find_all_paths returns distinct routes sorted by rate
+
+Run: python3 test_barter_path_engine.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import random
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aureon_barter_navigator import BarterNavigator
+
+
+def _brute_force_best(nav, source, destination, max_hops):
+    """Exhaustive DFS over simple paths - reference answer."""
+    best = [0.0, None]
+
+    def dfs(asset, rate, hops, visited):
+        if asset == destination and hops:
+            if rate > best[0]:
+                best[0], best[1] = rate, list(hops)
+            return
+        if len(hops) >= max_hops:
+            return
+        for edge in nav.graph.get(asset, []):
+            if edge.to_asset in visited:
+                continue
+            hops.append(edge)
+            visited.add(edge.to_asset)
+            dfs(edge.to_asset, rate * edge.effective_rate, hops, visited)
+            visited.discard(edge.to_asset)
+            hops.pop()
+
+    dfs(source, 1.0, [], {source})
+    return best
+
+
+def _pair(nav, base, quote, price, exchange='kraken'):
+    nav._add_edge(base, quote, f"{base}{quote}", exchange, price, 0, 0.001)
+    nav._add_edge(quote, base, f"{base}{quote}", exchange, 1.0 / price, 0, 0.001)
+
+
+class TestBarterPathEngine(unittest.TestCase):
+    """Test suite for the CSR path engine behind BarterNavigator."""
+
+    def setUp(self):
+        self.nav = BarterNavigator()
+        _pair(self.nav, 'BTC', 'USD', 95000.0)
+        _pair(self.nav, 'ETH', 'USD', 3000.0)
+        _pair(self.nav, 'ETH', 'BTC', 3000.0 / 95000.0, exchange='binance')
+        _pair(self.nav, 'CHZ', 'USD', 0.05)
+        _pair(self.nav, 'SOL', 'ETH', 150.0 / 3000.0, exchange='binance')
+
+    def test_find_path_matches_brute_force(self):
+        rng = random.Random(7)
+        nav = BarterNavigator()
+        assets = [f"A{i}" for i in range(12)]
+        prices = {a: rng.uniform(0.5, 50.0) for a in assets}
+        for _ in range(30):
+            a, b = rng.sample(assets, 2)
+            fee_tier = rng.choice(['kraken', 'binance', 'coinbase'])
+            # Keep mispricing inside the fee so the graph has no arbitrage cycles
+            noise = rng.uniform(0.9995, 1.0005)
+            _pair(nav, a, b, prices[a] / prices[b] * noise, exchange=fee_tier)
+        for _ in range(40):
+            s, d = rng.sample(assets, 2)
+            for hops in (2, 3, 4):
+                expected_rate, expected_hops = _brute_force_best(nav, s, d, hops)
+                path = nav.find_path(s, d, max_hops=hops)
+                if expected_hops is None:
+                    self.assertIsNone(path)
+                    continue
+                self.assertIsNotNone(path)
+                self.assertLessEqual(path.num_hops, hops)
+                self.assertAlmostEqual(path.total_rate, expected_rate, places=9)
+
+    def test_multi_hop_route(self):
+        path = self.nav.find_path('CHZ', 'SOL')
+        self.assertIsNotNone(path)
+        self.assertEqual([h.to_asset for h in path.hops], ['USD', 'ETH', 'SOL'])
+        self.assertIsNone(self.nav.find_path('CHZ', 'SOL', max_hops=2))
+
+    def test_source_tree_is_cached(self):
+        self.nav.find_path('CHZ', 'BTC')
+        searches = self.nav.engine.searches
+        self.nav.find_path('CHZ', 'ETH')
+        self.nav.find_path('CHZ', 'SOL')
+        self.assertEqual(self.nav.engine.searches, searches)
+
+    def test_unrelated_rate_change_keeps_cache(self):
+        self.nav.find_path('CHZ', 'USD', max_hops=1)
+        self.assertEqual(self.nav.engine.cached_sources(), 1)
+        # SOL->ETH is unreachable within one hop of CHZ - cache survives
+        self.nav.update_rate('SOL', 'ETH', 0.06)
+        self.assertEqual(self.nav.engine.cached_sources(), 1)
+        # CHZ->USD is on the cached route - cache is dropped
+        self.nav.update_rate('CHZ', 'USD', 0.06)
+        self.assertEqual(self.nav.engine.cached_sources(), 0)
+        path = self.nav.find_path('CHZ', 'USD', max_hops=1)
+        self.assertAlmostEqual(path.hops[0].rate, 0.06)
+
+    def test_cheaper_edge_reroutes(self):
+        before = self.nav.find_path('BTC', 'ETH')
+        # Make the USD->ETH leg far better than the direct BTC/ETH pair
+        self.nav.update_rate('USD', 'ETH', 1.0 / 2000.0)
+        after = self.nav.find_path('BTC', 'ETH')
+        self.assertGreater(after.total_rate, before.total_rate)
+        self.assertEqual([h.to_asset for h in after.hops], ['USD', 'ETH'])
+
+    def test_find_arbitrage(self):
+        self.assertEqual(self.nav.find_arbitrage('USD', min_profit_pct=0.1), [])
+        # Mis-priced ETH/BTC pair creates a USD->BTC->ETH->USD cycle
+        self.nav.update_rate('BTC', 'ETH', 95000.0 / 3000.0 * 1.05)
+        cycles = self.nav.find_arbitrage('USD', min_profit_pct=0.1)
+        self.assertTrue(cycles)
+        best = cycles[0]
+        self.assertEqual(best.hops[0].from_asset, 'USD')
+        self.assertEqual(best.hops[-1].to_asset, 'USD')
+        self.assertGreater(best.total_rate, 1.001)
+
+    def test_find_all_paths_sorted_and_distinct(self):
+        paths = self.nav.find_all_paths('BTC', 'ETH', max_hops=3, max_paths=5)
+        self.assertGreaterEqual(len(paths), 2)
+        rates = [p.total_rate for p in paths]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        routes = [tuple(id(h) for h in p.hops) for p in paths]
+        self.assertEqual(len(routes), len(set(routes)))
+
+
+if __name__ == '__main__':
+    unittest.main()
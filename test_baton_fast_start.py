@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the baton link fast-start mode and import profiler
+
+Tests cover:
+- AUREON_BATON_MODE=fast links modules without importing the Queen
+- bootstrap_runtime() runs the deferred wiring once and is idempotent
+- -X importtime output parses into per-module self/cumulative ms
+- profile_imports() reports a real child import
+
+Run: python3 test_baton_fast_start.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import subprocess
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aureon_baton_link as baton
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       1500 |     numpy.core
+import time:       800 |       2300 |   numpy
+import time:      4000 |       6420 | momentum_index
+"""
+
+
+def _run_child(code: str, mode: str) -> str:
+    env = dict(os.environ, AUREON_BATON_MODE=mode)
+    proc = subprocess.run([sys.executable, "-c", code], env=env, cwd=REPO,
+                          capture_output=True, text=True, timeout=300)
+    if proc.returncode != 0:
+        raise AssertionError(proc.stderr[-2000:])
+    return proc.stdout.strip().splitlines()[-1]
+
+
+class TestFastStart(unittest.TestCase):
+    """Fast mode in a clean interpreter."""
+
+    def test_fast_link_skips_queen(self):
+        out = _run_child(
+            "import sys, aureon_baton_link as b\n"
+            "import momentum_index\n"
+            "print(b.is_fast_start(), 'momentum_index' in b.linked_modules(),"
+            " 'aureon_queen_hive_mind' in sys.modules)",
+            mode="fast",
+        )
+        self.assertEqual(out, "True True False")
+
+    def test_bootstrap_is_idempotent(self):
+        saved = (baton._BOOTSTRAPPED, baton._AUTO_CONTROL_DONE, baton._FAST_START)
+        try:
+            baton._BOOTSTRAPPED = False
+            baton._AUTO_CONTROL_DONE = True      # Queen already woken by this process
+            baton.set_fast_start(True)
+            first = baton.bootstrap_runtime("test", queen=True, sonar=False, heartbeat=False)
+            self.assertFalse(first["queen"])
+            self.assertGreaterEqual(first["modules"], 1)
+            second = baton.bootstrap_runtime("test")
+            self.assertEqual(second, {"queen": False, "sonar": False, "heartbeat": False,
+                                      "modules": len(baton.linked_modules())})
+        finally:
+            baton._BOOTSTRAPPED, baton._AUTO_CONTROL_DONE, baton._FAST_START = saved
+
+
+class TestImportProfiler(unittest.TestCase):
+    """-X importtime parsing and reporting."""
+
+    def test_parse_importtime(self):
+        rows = baton.parse_importtime(SAMPLE)
+        self.assertEqual([r["module"] for r in rows], ["_io", "numpy.core", "numpy", "momentum_index"])
+        self.assertEqual([r["depth"] for r in rows], [1, 2, 1, 0])
+        self.assertEqual(rows[-1]["self_ms"], 4.0)
+        self.assertEqual(rows[-1]["cumulative_ms"], 6.42)
+
+    def test_profile_child_import(self):
+        report = baton.profile_imports("momentum_index", mode="fast", timeout=300)
+        self.assertEqual(report["returncode"], 0)
+        self.assertEqual(report["rows"][0]["module"], "momentum_index")
+        self.assertNotIn("aureon_queen_hive_mind", {r["module"] for r in report["rows"]})
+        text = baton.format_import_profile(report, top=5)
+        self.assertIn("baton mode=fast", text)
+        self.assertEqual(len(text.splitlines()), 3 + 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
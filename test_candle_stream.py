@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared streaming candle service
+
+Tests cover:
+- Running 1m/5m/15m/1h OHLCV matches a batch aggregation of the same ticks
+- Ring windows are zero-copy, read-only and keep the newest candles
+- on_close subscriptions filter by timeframe/key; flush() closes idle buckets
+- UnifiedWSFeed ticks (24h volume deltas) and Binance trades feed the stream
+- HarmonicGrowthEngine forms the same hourly candles as its old tick buffer
+- NexusPredictor and the ecosystem ATRCalculator follow closed candles
+  (backfill + on_close) and compute the same values as hand-fed candles;
+  a symbol streamed by two venues feeds the ATR from one venue only
+
+Run: python3 test_candle_stream.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import random
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from candle_stream import CLOSE, HIGH, START, VOLUME, CandleStream, stream_key
+
+
+def _ticks(seed=1, n=3000, start=1_700_000_000.0):
+    rng = random.Random(seed)
+    ts, price = start, 100.0
+    out = []
+    for _ in range(n):
+        ts += rng.choice([0.5, 3.0, 11.0, 47.0])
+        price *= 1 + rng.gauss(0, 0.002)
+        out.append((ts, price, rng.random()))
+    return out
+
+
+def _batch(ticks, seconds):
+    """Reference OHLCV: group ticks by bucket in arrival order."""
+    buckets = {}
+    for ts, price, vol in ticks:
+        start = ts - ts % seconds
+        bar = buckets.get(start)
+        if bar is None:
+            buckets[start] = [start, price, price, price, price, vol]
+        else:
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += vol
+    return [buckets[k] for k in sorted(buckets)]
+
+
+class TestCandleStream(unittest.TestCase):
+    """Streaming aggregation against a batch reference."""
+
+    def test_matches_batch_for_every_timeframe(self):
+        ticks = _ticks()
+        stream = CandleStream(history=1000)
+        for ts, price, vol in ticks:
+            stream.ingest('BTC/USD', price, vol, ts)
+        for tf, seconds in (('1m', 60), ('5m', 300), ('15m', 900), ('1h', 3600)):
+            expected = _batch(ticks, seconds)
+            closed, live = expected[:-1], expected[-1]
+            np.testing.assert_allclose(stream.window('BTC/USD', tf), np.array(closed), rtol=1e-12)
+            self.assertEqual(list(stream.current('BTC/USD', tf)[:5]), live[:5])
+
+    def test_ring_window_is_zero_copy_view(self):
+        stream = CandleStream(timeframes=('1m',), history=8)
+        for minute in range(30):
+            stream.ingest('ETH/USD', 100.0 + minute, 1.0, minute * 60.0)
+        window = stream.window('ETH/USD', '1m')
+        self.assertEqual(window[:, START].tolist(), [m * 60.0 for m in range(21, 29)])
+        self.assertFalse(window.flags.writeable)
+        self.assertFalse(window.flags.owndata)
+        self.assertEqual(stream.closes('ETH/USD', '1m', 3).tolist(), [126.0, 127.0, 128.0])
+        self.assertEqual(stream.count('ETH/USD', '1m'), 8)
+
+    def test_subscribers_and_flush(self):
+        stream = CandleStream(timeframes=('1m', '5m'))
+        seen = []
+        stream.on_close(lambda key, tf, c: seen.append((key, tf, c.start)), timeframe='5m')
+        token = stream.on_close(lambda key, tf, c: seen.append(('any', tf, c.start)), key='SOL/USD')
+        stream.ingest('SOL/USD', 10.0, 1.0, 10.0)
+        stream.ingest('SOL/USD', 11.0, 1.0, 70.0)
+        stream.ingest('SOL/USD', 12.0, 1.0, 310.0)
+        self.assertEqual(seen, [('any', '1m', 0.0), ('any', '1m', 60.0), ('SOL/USD', '5m', 0.0), ('any', '5m', 0.0)])
+        stream.off(token)
+        seen.clear()
+        closed = stream.flush(now=600.0)
+        self.assertEqual([(k, tf) for k, tf, _ in closed], [('SOL/USD', '1m'), ('SOL/USD', '5m')])
+        self.assertEqual(seen, [('SOL/USD', '5m', 300.0)])
+        self.assertIsNone(stream.current('SOL/USD', '1m'))
+
+    def test_feed_hooks(self):
+        stream = CandleStream(timeframes=('1m',))
+        for ts, v24 in ((0.0, 1000.0), (30.0, 1004.0), (50.0, 990.0), (61.0, 995.0)):
+            tick = SimpleNamespace(symbol='BTC/USDT', exchange='binance', last=100.0 + ts,
+                                   volume_24h=v24, timestamp=ts)
+            stream.ingest_tick(tick)
+        row = stream.window(stream_key('BTC/USDT', 'binance'), '1m')[0]
+        self.assertEqual(row[VOLUME], 4.0)       # 1000 -> 1004, the rolling drop is ignored
+        self.assertEqual(row[HIGH], 150.0)
+
+        trade = SimpleNamespace(symbol='ETHUSDT', price=3000.0, quantity=0.5,
+                                timestamp=datetime.fromtimestamp(120.0))
+        stream.ingest_trade(trade)
+        current = stream.current('binance:ETH/USDT', '1m')
+        self.assertEqual((current.close, current.volume), (3000.0, 0.5))
+
+
+class TestHarmonicGrowthEngine(unittest.TestCase):
+    """Hourly candles from the growth engine, old buffer vs stream."""
+
+    def _legacy_candles(self, ticks):
+        buffer, last, out = {}, {}, []
+        for symbol, ts, price, vol in ticks:
+            buffer.setdefault(symbol, []).append((ts, price, vol))
+            hour_start = (ts // 3600) * 3600
+            if hour_start > last.get(symbol, 0):
+                prev = hour_start - 3600
+                hour = [(t, p, v) for t, p, v in buffer[symbol] if prev <= t < hour_start]
+                if not hour:
+                    continue
+                prices = [p for _, p, _ in hour]
+                out.append((symbol, {'timestamp': hour_start, 'open': prices[0], 'high': max(prices),
+                                     'low': min(prices), 'close': prices[-1],
+                                     'volume': sum(v for _, _, v in hour)}))
+                buffer[symbol] = [(t, p, v) for t, p, v in buffer[symbol] if t >= hour_start]
+                last[symbol] = hour_start
+        return out
+
+    def test_same_candles_as_tick_buffer(self):
+        from aureon_harmonic_seed import GlobalHarmonicState, HarmonicGrowthEngine
+        rng = random.Random(5)
+        ticks, ts = [], 1_700_000_000.0
+        for _ in range(4000):
+            ts += rng.choice([5.0, 60.0, 300.0, 900.0]) if rng.random() > 0.002 else 3 * 3600.0
+            ticks.append((rng.choice(['BTC', 'ETH']), ts, 100 * (1 + rng.random()), rng.random()))
+
+        engine = HarmonicGrowthEngine(GlobalHarmonicState())
+        formed = []
+        engine._update_wave_state = lambda symbol, candle: formed.append((symbol, candle))
+        for symbol, t, price, vol in ticks:
+            engine.ingest_tick(symbol, price, vol, t)
+
+        expected = self._legacy_candles(ticks)
+        self.assertGreater(len(expected), 50)
+        self.assertEqual(len(formed), len(expected))
+        for (sym_a, a), (sym_b, b) in zip(formed, expected):
+            self.assertEqual(sym_a, sym_b)
+            for field in ('timestamp', 'open', 'high', 'low', 'close'):
+                self.assertEqual(a[field], b[field])
+            self.assertAlmostEqual(a['volume'], b['volume'], places=9)
+        self.assertFalse(hasattr(engine, 'tick_buffer'))
+
+
+class TestStreamConsumers(unittest.TestCase):
+    """Predictors fed from the stream instead of their own inputs."""
+
+    def _stream(self, split):
+        stream = CandleStream(timeframes=('1m', '15m'), history=64)
+        ticks = _ticks(seed=3, n=4000)
+        for ts, price, vol in ticks[:split]:
+            stream.ingest('binance:BTC/USDT', price, vol, ts)
+        return stream, ticks[split:]
+
+    def test_nexus_predictor(self):
+        from nexus_predictor import NexusPredictor
+        stream, rest = self._stream(1500)
+        attached, by_hand = NexusPredictor(), NexusPredictor()
+        attached.attach(stream, 'binance:BTC/USDT', '1m')
+        for ts, price, vol in rest:
+            stream.ingest('binance:BTC/USDT', price, vol, ts)
+        for candle in stream.candles('binance:BTC/USDT', '1m', 50):
+            by_hand.update(candle)
+        self.assertEqual([c['close'] for c in attached.candle_history],
+                         [c['close'] for c in by_hand.candle_history])
+        for field in ('momentum_6', 'momentum_12', 'price_position', 'streak'):
+            self.assertEqual(attached.candle_history[-1][field], by_hand.candle_history[-1][field])
+        self.assertEqual(attached.predict()['probability'], by_hand.predict()['probability'])
+
+    def test_ecosystem_atr(self):
+        from aureon_unified_ecosystem import ATRCalculator
+        stream, rest = self._stream(2000)
+        atr, by_hand = ATRCalculator(period=14), ATRCalculator(period=14)
+        atr.attach(stream, '15m')
+        for ts, price, vol in rest:
+            stream.ingest('binance:BTC/USDT', price, vol, ts)
+        for candle in stream.candles('binance:BTC/USDT', '15m', 28):
+            by_hand.update('BTCUSDT', candle['high'], candle['low'], candle['close'])
+        self.assertEqual(list(atr.price_history), ['BTCUSDT'])
+        self.assertEqual(len(atr.price_history['BTCUSDT']), 28)
+        self.assertGreater(atr.calculate_atr('BTCUSDT'), 0)
+        self.assertAlmostEqual(atr.calculate_atr('BTCUSDT'), by_hand.calculate_atr('BTCUSDT'), places=12)
+        self.assertTrue(atr.get_dynamic_tp_sl('BTCUSDT')['is_dynamic'])
+
+    def test_ecosystem_atr_one_venue_per_symbol(self):
+        from aureon_unified_ecosystem import ATRCalculator
+        stream = CandleStream(timeframes=('15m',), history=64)
+        ticks = _ticks(seed=5, n=4000)
+
+        def feed(part):
+            for ts, price, vol in part:
+                stream.ingest('kraken:BTC/USD', price, vol, ts)
+                stream.ingest('coinbase:BTC/USD', price * 1.02, vol, ts)   # Same symbol, other price level
+        feed(ticks[:2000])
+        first, pinned, single = ATRCalculator(period=14), ATRCalculator(period=14), ATRCalculator(period=14)
+        first.attach(stream, '15m')
+        pinned.attach(stream, '15m', exchange='coinbase')
+        feed(ticks[2000:])
+        for key, calc in (('kraken:BTC/USD', first), ('coinbase:BTC/USD', pinned)):
+            single.price_history.clear()
+            for candle in stream.candles(key, '15m', 28):
+                single.update('BTCUSD', candle['high'], candle['low'], candle['close'])
+            self.assertEqual(calc.stream_keys, {'BTCUSD': key})
+            self.assertEqual([c['close'] for c in calc.price_history['BTCUSD']],
+                             [c['close'] for c in single.price_history['BTCUSD']])
+            self.assertAlmostEqual(calc.calculate_atr('BTCUSD'), single.calculate_atr('BTCUSD'), places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
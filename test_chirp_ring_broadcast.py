@@ -0,0 +1,163 @@
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+#!/usr/bin/env python3
+"""
+Unit tests for the broadcast ChirpRingBuffer
+
+Tests cover:
+- Every reader (own cursor) sees every chirp; nobody steals from anyone
+- A full ring overwrites the oldest chirp and lapped readers count the loss
+- Seqlock stamps: a slot mid-write or reused for a later sequence is never returned
+- read_many into a preallocated bytearray / numpy buffer, with max_count
+- Attaching to an existing bus instead of replacing it; ChirpBus emit + reader
+- Multi-process stress: no torn chirps, received + lost == written
+- Several writer processes at once: no lost sequence claims, no torn or
+  reordered chirps per writer
+
+Run: python3 test_chirp_ring_broadcast.py
+"""
+
+import sys
+import os
+import struct
+import unittest
+
+import numpy as np
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aureon_chirp_bus import (CHIRP_SIZE, HEADER_SIZE, SEQ_STRUCT, SLOT_SIZE, ChirpBus,
+                              ChirpDirection, ChirpPacket, ChirpRingBuffer, ChirpType)
+
+SEQ = struct.Struct("<Q")
+
+
+def _chirp(i):
+    return SEQ.pack(i)
+
+
+class TestBroadcastRing(unittest.TestCase):
+    """Single-process ring behaviour."""
+
+    def setUp(self):
+        self.name = f"test_chirp_{os.getpid()}_{self._testMethodName[-12:]}"
+        self.ring = ChirpRingBuffer(name=self.name, slots=8, create=True)
+        self.assertTrue(self.ring._initialized)
+
+    def tearDown(self):
+        self.ring.close()
+        self.ring.unlink()
+
+    def test_every_reader_sees_every_chirp(self):
+        other = ChirpRingBuffer(name=self.name)              # Second handle on the same segment
+        readers = [self.ring.reader(), self.ring.reader(), other.reader()]
+        for i in range(5):
+            self.assertTrue(self.ring.write(_chirp(i)))
+        for reader in readers:
+            self.assertEqual([SEQ.unpack(reader.read())[0] for _ in range(5)], list(range(5)))
+            self.assertIsNone(reader.read())
+        # The handles' own default readers are independent too
+        self.assertEqual(SEQ.unpack(self.ring.read())[0], 0)
+        self.assertEqual(SEQ.unpack(other.read())[0], 0)
+        self.assertFalse(self.ring.write(b"short"))
+        other.close()
+
+    def test_overwrite_and_overrun(self):
+        reader = self.ring.reader()
+        for i in range(20):
+            self.assertTrue(self.ring.write(_chirp(i)))     # Never refuses when full
+        self.assertEqual(self.ring.write_seq(), 20)
+        self.assertEqual(reader.pending(), 20)
+        got = []
+        while (chirp := reader.read()) is not None:
+            got.append(SEQ.unpack(chirp)[0])
+        self.assertEqual(got, list(range(12, 20)))
+        self.assertEqual((reader.lost, reader.overruns, reader.received), (12, 1, 8))
+
+        late = self.ring.reader(from_start=True)
+        self.assertEqual(late.seq, 12)
+
+    def test_seqlock_rejects_reused_slot(self):
+        reader = self.ring.reader()
+        for i in range(3):
+            self.ring.write(_chirp(i))
+        # Writer started reusing slot 0 for seq 8 (odd stamp) but has not published it
+        SEQ_STRUCT.pack_into(self.ring.buf, HEADER_SIZE, 2 * 8 + 1)
+        self.assertEqual(SEQ.unpack(reader.read())[0], 1)
+        self.assertEqual((reader.lost, reader.overruns), (1, 1))
+
+        out = bytearray(4 * CHIRP_SIZE)
+        batch = self.ring.reader(from_start=True)
+        SEQ_STRUCT.pack_into(self.ring.buf, HEADER_SIZE + SLOT_SIZE, 2 * 9 + 1)
+        n = batch.read_many(out)                              # seqs 0 and 1 both reused
+        self.assertEqual((n, SEQ.unpack(out[:CHIRP_SIZE])[0]), (1, 2))
+        self.assertEqual((batch.lost, batch.overruns), (2, 2))
+
+    def test_read_many(self):
+        reader = self.ring.reader()
+        for i in range(6):
+            self.ring.write(_chirp(i))
+        out = bytearray(4 * CHIRP_SIZE)
+        self.assertEqual(reader.read_many(out), 4)
+        self.assertEqual(list(np.frombuffer(out, dtype="<u8")), [0, 1, 2, 3])
+        self.assertEqual(reader.read_many(out, max_count=1), 1)
+        self.assertEqual(SEQ.unpack(out[:CHIRP_SIZE])[0], 4)
+
+        # Wraps around the end of the ring and laps: numpy buffer this time
+        for i in range(6, 17):
+            self.ring.write(_chirp(i))
+        arr = np.zeros(16 * CHIRP_SIZE, dtype=np.uint8)
+        n = reader.read_many(arr)
+        self.assertEqual(list(arr.view("<u8")[:n]), list(range(9, 17)))
+        self.assertEqual((reader.seq, reader.lost, reader.received), (17, 4, 13))
+        self.assertEqual(reader.read_many(arr), 0)
+
+    def test_attach_keeps_existing_bus(self):
+        reader = self.ring.reader()
+        second = ChirpRingBuffer(name=self.name, slots=64, create=True)
+        self.assertFalse(second._owner)
+        self.assertEqual(second.slots, 8)                     # Layout comes from the segment
+        second.write(_chirp(42))
+        self.assertEqual(SEQ.unpack(reader.read())[0], 42)
+        second.close()
+
+
+class TestChirpBus(unittest.TestCase):
+
+    def test_emit_and_listen(self):
+        name = f"test_chirp_bus_{os.getpid()}"
+        bus = ChirpBus(name=name, create=True)
+        try:
+            listeners = [bus.reader(), ChirpBus(name=name).reader()]
+            self.assertTrue(bus.emit_message("BUY BTC", symbol="BTC/USD", coherence=0.8))
+            for listener in listeners:
+                packet = ChirpPacket.from_bytes(listener.read())
+                self.assertEqual((packet.message_type, packet.direction), (ChirpType.OPPORTUNITY, ChirpDirection.DOWN))
+        finally:
+            bus.ring.close()
+            bus.ring.unlink()
+
+
+class TestMultiProcessStress(unittest.TestCase):
+
+    def test_stress(self):
+        from chirp_bus_bench import run_stress
+        for single, slots in ((False, 4096), (False, 32), (True, 64)):
+            result = run_stress(count=30000, readers=3, slots=slots, batch=64, single=single)
+            for report in result['readers']:
+                self.assertEqual(report['torn'], 0)
+                self.assertEqual(report['received'] + report['lost'], 30000)
+                self.assertGreater(report['received'], 0)
+
+    def test_multi_writer_stress(self):
+        from chirp_bus_bench import run_stress
+        for single in (False, True):
+            result = run_stress(count=10000, readers=2, slots=1024, batch=64, single=single, writers=3)
+            self.assertEqual(result['write_seq'], 30000)
+            for report in result['readers']:
+                self.assertEqual(report['torn'], 0)
+                self.assertEqual(report['received'] + report['lost'], 30000)
+
+
+if __name__ == '__main__':
+    unittest.main()
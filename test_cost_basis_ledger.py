@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CostBasisTracker ledger backends
+
+Tests cover:
+- SQLite and JSON backends give identical positions and FIFO lots for the
+  same trade sequence, before and after a reload
+- A sell only touches the lots it consumes; batch() makes one commit
+- Legacy cost_basis_history.json is imported once into an empty ledger,
+  mirrored back, and merged by last-modified (never deleting) when another
+  tool rewrites it
+- Opening a tracker writes nothing: no mirror rewrite, no ledger commit
+- Two processes recording different symbols no longer overwrite each other
+- Two processes trading the same symbol: each read-modify-write happens
+  inside the ledger transaction, so no trade is lost
+- _find_position quote swap / base / prefix matching through the index
+
+Run: python3 test_cost_basis_ledger.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import io
+import json
+import time
+import random
+import tempfile
+import unittest
+import contextlib
+import subprocess
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cost_basis_ledger import JsonLedger, SqliteLedger, canonical_pair
+from cost_basis_tracker import CostBasisTracker
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+_WRITER = """
+import sys
+sys.path.insert(0, {repo!r})
+from cost_basis_tracker import CostBasisTracker
+tracker = CostBasisTracker('cost_basis_history.json')
+for i in range(40):
+    tracker.record_trade({symbol!r}, 'buy', 1.0, 10.0 + i, 'kraken', order_id=str(i))
+    if i % 4 == 3:
+        tracker.record_trade({symbol!r}, 'sell', 1.5, 30.0, 'kraken')
+"""
+
+
+def _lots(tracker, key):
+    return [(lot.price, round(lot.quantity, 12), lot.order_id) for lot in tracker.trade_lots.get(key, [])]
+
+
+class _TrackerCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)          # tracked_positions.json is read from the cwd
+        self.out = io.StringIO()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _tracker(self, ledger=None, filepath='cost_basis_history.json'):
+        with contextlib.redirect_stdout(self.out):
+            return CostBasisTracker(filepath, ledger=ledger)
+
+    def _sqlite(self, **kwargs):
+        return SqliteLedger('cost_basis_history.db', json_mirror='cost_basis_history.json', **kwargs)
+
+
+class TestBackendsAgree(_TrackerCase):
+    """FIFO accounting is the same on both backends."""
+
+    def _trade(self, tracker, rng):
+        with contextlib.redirect_stdout(self.out):
+            for i in range(120):
+                symbol = rng.choice(['BTC/USD', 'ETHUSDC', 'SOL/USD'])
+                side = 'buy' if rng.random() < 0.6 else 'sell'
+                tracker.record_trade(symbol, side, round(rng.uniform(0.1, 2.0), 4),
+                                     round(rng.uniform(50, 150), 2), 'kraken', order_id=f"o{i}")
+            tracker.set_entry_price('DOGE/USDT', 0.1, 500, exchange='binance', order_id='m1')
+            tracker.update_position('SOL/USD', 0.5, 0, 'kraken', is_buy=False)
+
+    def test_json_and_sqlite_match(self):
+        json_tracker = self._tracker(JsonLedger('legacy.json'), filepath='legacy.json')
+        sqlite_tracker = self._tracker(self._sqlite())
+        self._trade(json_tracker, random.Random(9))
+        self._trade(sqlite_tracker, random.Random(9))
+
+        json_again = self._tracker(JsonLedger('legacy.json'), filepath='legacy.json')
+        sqlite_again = self._tracker(self._sqlite())
+        self.assertEqual(set(json_tracker.positions), set(sqlite_tracker.positions))
+        for key, pos in json_tracker.positions.items():
+            for tracker in (sqlite_tracker, json_again, sqlite_again):
+                other = tracker.positions[key]
+                self.assertEqual(set(other), set(pos), key)
+                for field in ('total_quantity', 'total_cost', 'avg_entry_price', 'trade_count'):
+                    self.assertAlmostEqual(other[field], pos[field], places=9, msg=(key, field))
+                self.assertEqual(_lots(tracker, key), _lots(json_tracker, key), key)
+
+    def test_sell_touches_only_consumed_lots(self):
+        ledger = self._sqlite()
+        tracker = self._tracker(ledger)
+        with contextlib.redirect_stdout(self.out):
+            for i in range(50):
+                tracker.record_trade('BTC/USD', 'buy', 1.0, 100.0 + i, 'kraken', order_id=str(i))
+            ids_before = [r[0] for r in ledger._conn.execute("SELECT id FROM lots ORDER BY id")]
+            changes = ledger._conn.total_changes
+            result = tracker.record_trade('BTC/USD', 'sell', 2.5, 200.0, 'kraken')
+        # 2 lots deleted, 1 updated, 1 position row, 1 meta row
+        self.assertEqual(ledger._conn.total_changes - changes, 5)
+        ids_after = [r[0] for r in ledger._conn.execute("SELECT id FROM lots ORDER BY id")]
+        self.assertEqual(ids_after, ids_before[2:])
+        self.assertAlmostEqual(result['cost_basis_of_sale'], 100 + 101 + 0.5 * 102)
+        self.assertEqual(ledger.lots('kraken:BTC/USD')[0]['quantity'], 0.5)
+
+        commits = ledger.commits
+        with contextlib.redirect_stdout(self.out):
+            tracker.record_order_execution(exchange='kraken', symbol='BTC/USD', side='BUY', order_id='x',
+                                           fills=[{'qty': 1}], avg_fill_price=99.0, fees=0.1, executed_qty=1.0)
+        self.assertEqual(ledger.commits, commits + 1)
+
+
+class TestJsonImportAndMirror(_TrackerCase):
+    """Migration from, and compatibility with, cost_basis_history.json."""
+
+    def test_import_mirror_and_reimport(self):
+        legacy = {
+            'positions': {
+                'kraken:ADA': {'symbol': 'ADA', 'exchange': 'kraken', 'avg_entry_price': 0.35,
+                               'total_quantity': 28.0, 'total_cost': 9.8, 'total_fees': 0.0, 'trade_count': 2,
+                               'first_trade': 1000, 'last_trade': 2000, 'order_ids': ['a'], 'last_order_id': 'a'},
+                'EULUSD': {'avg_entry_price': 2.2, 'total_quantity': 3.6, 'total_cost': 7.92},
+            },
+            'trade_lots': {'kraken:ADA': [{'price': 0.3, 'quantity': 10.0, 'timestamp': 1.0, 'fee': 0.0, 'order_id': None},
+                                          {'price': 0.38, 'quantity': 18.0, 'timestamp': 2.0, 'fee': 0.0, 'order_id': 'a'}]},
+            'last_sync': 123.0,
+        }
+        with open('cost_basis_history.json', 'w') as f:
+            json.dump(legacy, f, indent=2)
+
+        tracker = self._tracker(self._sqlite(mirror_interval=0))
+        self.assertEqual(tracker.positions, legacy['positions'])
+        self.assertEqual(_lots(tracker, 'kraken:ADA'), [(0.3, 10.0, None), (0.38, 18.0, 'a')])
+        self.assertEqual(tracker.last_sync, 123.0)
+
+        with contextlib.redirect_stdout(self.out):
+            tracker.record_trade('ADA', 'sell', 12.0, 0.5, 'kraken')
+        with open('cost_basis_history.json') as f:
+            mirror = json.load(f)
+        self.assertEqual(mirror['trade_lots']['kraken:ADA'][0]['quantity'], 16.0)
+        self.assertAlmostEqual(mirror['positions']['kraken:ADA']['total_quantity'], 16.0)
+
+        # Reopening with an unchanged mirror does not re-import
+        ledger = self._sqlite()
+        self.assertNotIn('imported', self.out.getvalue().split('Loaded')[-1])
+        ledger.close()
+
+        # A position recorded after the last mirror write exists only in the ledger
+        with contextlib.redirect_stdout(self.out):
+            tracker.record_trade('SOL/USD', 'buy', 1.0, 20.0, 'kraken')
+        tracker.ledger.close()
+
+        # Another tool rewrites the JSON -> merged on next open: positions it
+        # changed win, positions it lacks are kept
+        time.sleep(0.01)
+        legacy['positions'].pop('EULUSD')
+        legacy['positions']['kraken:ADA']['avg_entry_price'] = 0.4
+        with open('cost_basis_history.json', 'w') as f:
+            json.dump(legacy, f)
+        again = self._tracker(self._sqlite())
+        self.assertEqual(set(again.positions), {'kraken:ADA', 'EULUSD', 'kraken:SOL/USD'})
+        self.assertEqual(again.positions['kraken:ADA']['avg_entry_price'], 0.4)
+        self.assertEqual(_lots(again, 'kraken:SOL/USD'), [(20.0, 1.0, None)])
+
+        # The ledger changed SOL after that rewrite: a stale file does not undo it
+        with contextlib.redirect_stdout(self.out):
+            again.record_trade('SOL/USD', 'buy', 1.0, 22.0, 'kraken')
+        again.ledger.close()
+        with open('cost_basis_history.json') as f:
+            stale = json.load(f)
+        stale['positions']['kraken:SOL/USD']['total_quantity'] = 99.0
+        ledger = self._sqlite()
+        os.utime('cost_basis_history.json', ns=(0, 1))        # Written "before" the ledger change
+        ledger.close()
+        final = self._tracker(self._sqlite())
+        self.assertEqual(final.positions['kraken:SOL/USD']['total_quantity'], 2.0)
+
+    def test_open_writes_nothing(self):
+        legacy = {'positions': {'EULUSD': {'avg_entry_price': 2.2, 'total_quantity': 3.6}},
+                  'trade_lots': {}, 'last_sync': 1.0}
+        with open('cost_basis_history.json', 'w') as f:
+            json.dump(legacy, f)
+        with open('tracked_positions.json', 'w') as f:
+            json.dump({'BTC/USD': {'exchange': 'kraken', 'entry_price': 100.0, 'entry_qty': 0.1}}, f)
+        with contextlib.redirect_stdout(self.out):
+            self._tracker(self._sqlite(mirror_interval=0)).ledger.close()   # First open imports
+        before = os.stat('cost_basis_history.json').st_mtime_ns
+
+        tracker = self._tracker(self._sqlite(mirror_interval=0))
+        self.assertIn('BTCUSD', tracker.positions)                # Integrated in memory only
+        self.assertEqual(tracker.ledger.commits, 0)
+        tracker.ledger.close()
+        self.assertEqual(os.stat('cost_basis_history.json').st_mtime_ns, before)
+        self.assertNotIn('BTCUSD', SqliteLedger('cost_basis_history.db').load()[0])
+
+
+class TestConcurrentWriters(_TrackerCase):
+    """Separate processes sharing one ledger."""
+
+    def test_two_processes_keep_both_positions(self):
+        env = dict(os.environ, AUREON_BATON_MODE='fast')
+        procs = [subprocess.Popen([sys.executable, '-c', _WRITER.format(repo=REPO, symbol=symbol)],
+                                  env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                 for symbol in ('BTC/USD', 'ETH/USD')]
+        for proc in procs:
+            _, err = proc.communicate(timeout=120)
+            self.assertEqual(proc.returncode, 0, err.decode()[-2000:])
+
+        tracker = self._tracker(self._sqlite())
+        for key in ('kraken:BTC/USD', 'kraken:ETH/USD'):
+            self.assertAlmostEqual(tracker.positions[key]['total_quantity'], 40 - 10 * 1.5, places=9)
+            self.assertAlmostEqual(sum(q for _, q, _ in _lots(tracker, key)), 25.0, places=9)
+            self.assertEqual(tracker.positions[key]['trade_count'], 50)
+
+    def test_two_processes_same_symbol(self):
+        env = dict(os.environ, AUREON_BATON_MODE='fast')
+        procs = [subprocess.Popen([sys.executable, '-c', _WRITER.format(repo=REPO, symbol='BTC/USD')],
+                                  env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                 for _ in range(2)]
+        for proc in procs:
+            _, err = proc.communicate(timeout=120)
+            self.assertEqual(proc.returncode, 0, err.decode()[-2000:])
+
+        tracker = self._tracker(self._sqlite())
+        pos = tracker.positions['kraken:BTC/USD']
+        self.assertEqual(pos['trade_count'], 100)
+        self.assertAlmostEqual(pos['total_quantity'], 2 * (40 - 10 * 1.5), places=9)
+        self.assertAlmostEqual(sum(q for _, q, _ in _lots(tracker, 'kraken:BTC/USD')), 50.0, places=9)
+
+    def test_refresh_sees_other_writer(self):
+        first = self._tracker(self._sqlite())
+        second = self._tracker(self._sqlite())
+        with contextlib.redirect_stdout(self.out):
+            first.record_trade('SOL/USD', 'buy', 2.0, 20.0, 'kraken')
+            self.assertEqual(second.get_entry_price('SOL/USD', 'kraken'), 20.0)
+            second.record_trade('BTC/USD', 'buy', 1.0, 100.0, 'kraken')
+            first.record_trade('SOL/USD', 'buy', 2.0, 22.0, 'kraken')
+        third = self._tracker(self._sqlite())
+        self.assertEqual(set(third.positions), {'kraken:SOL/USD', 'kraken:BTC/USD'})
+        self.assertAlmostEqual(third.positions['kraken:SOL/USD']['avg_entry_price'], 21.0)
+
+
+class TestIndexedLookup(_TrackerCase):
+    """_find_position strategies served by the canonical index."""
+
+    def test_strategies(self):
+        tracker = self._tracker(self._sqlite())
+        with contextlib.redirect_stdout(self.out):
+            tracker.record_trade('SHELL/USDT', 'buy', 10, 1.0, 'binance')
+            tracker.record_trade('ADAUSDC', 'buy', 10, 0.5, 'kraken')
+            tracker.record_trade('SOLO/USD', 'buy', 10, 0.2, 'kraken')
+        self.assertEqual(canonical_pair('binance:SHELLUSDT'), ('binance', 'SHELL', 'USDT'))
+        self.assertEqual(canonical_pair('kraken:X', {'symbol': 'SOL/USD'}), ('kraken', 'SOL', 'USD'))
+
+        self.assertEqual(tracker._find_position('SHELL/USDT', 'binance')[1], 'binance:SHELL/USDT')
+        self.assertEqual(tracker._find_position('SHELLUSDC', 'binance')[1], 'binance:SHELL/USDT')
+        self.assertEqual(tracker._find_position('ADA/USD', 'kraken')[1], 'kraken:ADAUSDC')
+        self.assertEqual(tracker._find_position('ADA')[1], 'kraken:ADAUSDC')
+        self.assertEqual(tracker._find_position('SOL')[1], 'kraken:SOLO/USD')      # prefix reach kept
+        self.assertEqual(tracker._find_position('XRPUSD'), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
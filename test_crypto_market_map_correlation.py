@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CryptoMarketMap correlation engine
+
+Tests cover:
+- Returns are aligned by timestamp, not truncated to the shortest series
+- Masked correlation matrix matches np.corrcoef pair by pair
+- Lagged cross-correlation finds a leader one bar ahead
+- Rolling live window matches a from-scratch recompute after eviction
+- Live window is bounded: max_symbols / universe, and symbols that stop
+  appearing are evicted (matrices shrink, the rest stays exact)
+- submit_live_prices runs the update on a worker thread and coalesces
+- get_labyrinth_targets / find_optimal_path read live correlations
+
+Run: python3 test_crypto_market_map_correlation.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from crypto_market_map import (
+    CryptoMarketMap,
+    RollingCorrelationWindow,
+    aligned_returns_matrix,
+    lagged_correlation,
+    masked_correlation,
+)
+
+
+@dataclass
+class _Candle:
+    timestamp: datetime
+    open: float
+    close: float
+
+
+def _candles(changes, start=0):
+    t0 = datetime(2025, 1, 1)
+    return [_Candle(t0 + timedelta(hours=start + i), 100.0, 100.0 * (1 + c / 100.0))
+            for i, c in enumerate(changes)]
+
+
+def _quiet_map() -> CryptoMarketMap:
+    tmp = tempfile.mkdtemp()
+    return CryptoMarketMap(cache_dir=tmp)
+
+
+class TestCorrelationMatrix(unittest.TestCase):
+    """Batch matrix routines."""
+
+    def test_alignment_by_timestamp(self):
+        series = {'A': ([10.0, 20.0, 30.0], [1.0, 2.0, 3.0]),
+                  'B': ([20.0, 30.0, 40.0], [5.0, 6.0, 7.0])}
+        symbols, times, R, M = aligned_returns_matrix(series)
+        np.testing.assert_array_equal(times, [10.0, 20.0, 30.0, 40.0])
+        np.testing.assert_array_equal(M, [[1, 1, 1, 0], [0, 1, 1, 1]])
+        self.assertEqual(R[1, 1], 5.0)
+
+    def test_matches_pairwise_corrcoef(self):
+        rng = np.random.default_rng(4)
+        R = rng.normal(0.1, 1.0, (6, 200))
+        R[1] += 0.8 * R[0]
+        M = rng.random((6, 200)) > 0.2
+        corr, n = masked_correlation(R, M, min_periods=11)
+        for i in range(6):
+            for j in range(6):
+                both = M[i] & M[j]
+                self.assertEqual(n[i, j], both.sum())
+                expected = np.corrcoef(R[i, both], R[j, both])[0, 1]
+                self.assertAlmostEqual(corr[i, j], expected, places=10)
+
+    def test_constant_and_short_series_undefined(self):
+        R = np.vstack([np.zeros(30), np.arange(30.0), np.arange(30.0) ** 2])
+        M = np.ones_like(R, dtype=bool)
+        M[2, 5:] = False
+        corr, _ = masked_correlation(R, M, min_periods=11)
+        self.assertTrue(np.isnan(corr[0, 1]))
+        self.assertTrue(np.isnan(corr[1, 2]))
+
+    def test_lagged_leader(self):
+        rng = np.random.default_rng(9)
+        lead = rng.normal(size=300)
+        follow = np.concatenate([[0.0], lead[:-1]]) + 0.1 * rng.normal(size=300)
+        R = np.vstack([lead, follow])
+        M = np.ones_like(R, dtype=bool)
+        corr, _ = lagged_correlation(R, M, [0], lag=1, min_periods=51)
+        self.assertGreater(corr[0, 1], 0.9)
+        self.assertLess(abs(corr[0, 0]), 0.3)
+
+
+class TestCandleLoading(unittest.TestCase):
+    """Candle-driven correlation and lead/lag detection."""
+
+    def test_correlations_and_lead_lag(self):
+        rng = np.random.default_rng(1)
+        btc = rng.normal(0, 1.0, 400)
+        data = {
+            'BTC-USD': _candles(btc),
+            # Starts 50 bars later - must be aligned on time, not position
+            'ETH-USD': _candles(btc[50:] * 1.2 + 0.1 * rng.normal(size=350), start=50),
+            'SOL-USD': _candles(np.concatenate([[0.0], btc[:-1]]) + 0.2 * rng.normal(size=400)),
+            'DOGE-USD': _candles(-btc + 0.1 * rng.normal(size=400)),
+        }
+        market_map = _quiet_map()
+        market_map._build_correlations_from_candles(data)
+        market_map._detect_lead_lag(data)
+
+        self.assertGreater(market_map.correlation_matrix['BTC']['ETH'], 0.95)
+        self.assertLess(market_map.correlation_matrix['BTC']['DOGE'], -0.95)
+        self.assertIn('ETH', market_map.assets['BTC'].correlates_with)
+        self.assertIn('DOGE', market_map.assets['BTC'].inverse_to)
+        self.assertGreater(market_map.lead_lag_matrix['BTC']['SOL'], 0.9)
+        self.assertIn('SOL', market_map.assets['BTC'].leads)
+        self.assertNotIn('BTC', market_map.lead_lag_matrix['ETH'])
+
+
+class TestRollingWindow(unittest.TestCase):
+    """Incremental live window."""
+
+    def test_matches_recompute(self):
+        rng = np.random.default_rng(2)
+        window = RollingCorrelationWindow(window=40, min_periods=10)
+        prices = {'BTC': 100.0, 'ETH': 50.0}
+        history = []
+        for step in range(130):
+            shock = rng.normal(0, 0.01)
+            prices['BTC'] *= 1 + shock
+            prices['ETH'] *= 1 + 0.7 * shock + rng.normal(0, 0.005)
+            if step == 30:
+                prices['SOL'] = 20.0   # symbol joins mid-stream
+            if 'SOL' in prices:
+                prices['SOL'] *= 1 + rng.normal(0, 0.01)
+            snapshot = dict(prices)
+            window.update(snapshot, ts=float(step))
+            history.append(snapshot)
+
+        # Rebuild the same window from scratch
+        symbols = window.symbols
+        rows = []
+        for prev, cur in zip(history[-41:-1], history[-40:]):
+            rows.append([(cur[s] / prev[s] - 1) * 100 if s in prev and s in cur else np.nan
+                         for s in symbols])
+        R = np.array(rows).T
+        M = np.isfinite(R)
+        expected, _ = masked_correlation(np.nan_to_num(R), M, min_periods=10)
+        np.testing.assert_allclose(window.correlation_matrix(), expected, atol=1e-9)
+        lag_expected, _ = masked_correlation(np.nan_to_num(R[:, :-1]), M[:, :-1],
+                                             np.nan_to_num(R[:, 1:]), M[:, 1:], min_periods=10)
+        np.testing.assert_allclose(window.lead_lag_matrix(), lag_expected, atol=1e-9)
+        self.assertEqual(len(window), 40)
+
+    def test_min_interval_skips_fast_ticks(self):
+        window = RollingCorrelationWindow(window=10, min_interval=5.0)
+        self.assertTrue(window.update({'BTC': 1.0}, ts=0.0))
+        self.assertFalse(window.update({'BTC': 2.0}, ts=1.0))
+        self.assertTrue(window.update({'BTC': 2.0}, ts=6.0))
+
+    def test_bounded_universe_and_eviction(self):
+        rng = np.random.default_rng(4)
+        window = RollingCorrelationWindow(window=30, min_periods=5, max_symbols=3, max_missed=3)
+        prices = {s: 10.0 + i for i, s in enumerate(['BTC', 'ETH', 'SOL', 'DOGE'])}
+        history = []
+        for step in range(40):
+            if step == 10:
+                window.set_universe(['BTC', 'ETH', 'DOGE'])
+            snap = {s: p * (1 + rng.normal(0, 0.01)) for s, p in prices.items() if s != 'ETH' or step < 20}
+            window.update(snap, ts=float(step))
+            history.append(snap)
+            if step == 9:
+                self.assertEqual(window.symbols, ['BTC', 'ETH', 'SOL'])      # DOGE over the cap
+
+        # SOL left the universe at once, ETH after 3 missed snapshots
+        self.assertEqual(window.symbols, ['BTC', 'DOGE'])
+        self.assertEqual(window._co.n.shape, (2, 2))
+        self.assertEqual(window.get_stats()['evicted'], 2)
+        self.assertIsNone(window.get('BTC', 'ETH'))
+
+        # Same result as recomputing the last 30 rows; DOGE's first row (step 10) has no return
+        rows = [[(cur[s] / prev[s] - 1) * 100 if step > 10 or s == 'BTC' else np.nan for s in ('BTC', 'DOGE')]
+                for step, prev, cur in zip(range(10, 40), history[9:-1], history[10:])]
+        R = np.array(rows).T
+        expected, _ = masked_correlation(np.nan_to_num(R), np.isfinite(R), min_periods=5)
+        np.testing.assert_allclose(window.correlation_matrix(), expected, atol=1e-9)
+
+    def test_submit_runs_off_loop(self):
+        import asyncio
+        import threading
+        market_map = _quiet_map()
+        threads = []
+        real = market_map.live_correlations.update
+        market_map.live_correlations.update = lambda p, ts=None: threads.append(threading.get_ident()) or real(p, ts)
+
+        async def run():
+            prices = {'BTC': 100.0}
+            self.assertTrue(market_map.submit_live_prices(prices))
+            self.assertFalse(market_map.submit_live_prices(prices))       # Previous one still running
+            prices['BTC'] = 101.0                                        # Caller mutates its dict in place
+            await market_map._live_task
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+        self.assertEqual(market_map.live_correlations._last_price, {'BTC': 100.0})
+
+    def test_labyrinth_reads_live_matrix(self):
+        market_map = _quiet_map()
+        market_map.live_correlations = RollingCorrelationWindow(window=50, min_periods=10)
+        market_map.correlation_matrix['BTC']['ETH'] = -0.9   # stale cached value
+        rng = np.random.default_rng(3)
+        prices = {'BTC': 100.0, 'ETH': 50.0}
+        for step in range(40):
+            shock = rng.normal(0, 0.01)
+            prices['BTC'] *= 1 + shock
+            prices['ETH'] *= 1 + shock + rng.normal(0, 0.001)
+            market_map.load_from_live_tickers({f"kraken:{k}USD": {'price': v} for k, v in prices.items()})
+
+        self.assertGreater(market_map.get_correlation('BTC', 'ETH'), 0.95)
+        ranked = market_map.get_labyrinth_targets('BTC', ['ETH'])
+        self.assertTrue(any(r.startswith('MOMENTUM') for r in ranked[0]['reasons']))
+        paths = market_map.find_optimal_path('BTC', 'SOL')
+        hops = [p for p in paths if p.pattern_match == 'CORRELATION_HOP']
+        self.assertEqual(hops[0].steps, [('BTC', 'ETH'), ('ETH', 'SOL')])
+        direct = market_map.find_optimal_path('BTC', 'ETH')
+        direct = [p for p in direct if p.pattern_match == 'DIRECT'][0]
+        self.assertGreater(direct.total_correlation_score, 0.95)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -243,6 +243,71 @@ class TestDynamicCostEstimator(unittest.TestCase):
         self.assertAlmostEqual(estimate.estimated_total_pct, expected, places=3)
 
 
+class TestMonteCarloCostEngine(unittest.TestCase):
+    """Seeded, cached Monte Carlo draws and the batch candidate scorer."""
+    
+    def setUp(self):
+        self.estimator = DynamicCostEstimator(seed=42)
+        for i in range(10):
+            self.estimator.add_sample('ETH/USD', 'buy', 100.0, 0.12 + 0.01 * i, 0.05, 0.01)
+    
+    def test_seeded_draws_are_reproducible(self):
+        other = DynamicCostEstimator(seed=42)
+        for i in range(10):
+            other.add_sample('ETH/USD', 'buy', 100.0, 0.12 + 0.01 * i, 0.05, 0.01)
+        self.assertEqual(self.estimator.sample_total_cost_draws('ETH/USD', 'buy', 100.0, n_samples=200),
+                         other.sample_total_cost_draws('ETH/USD', 'buy', 100.0, n_samples=200))
+    
+    def test_draws_cached_until_new_sample(self):
+        first = self.estimator.sample_total_cost_draws('ETH/USD', 'buy', 100.0)
+        second = self.estimator.sample_total_cost_draws('ETH/USD', 'buy', 100.0)
+        self.assertEqual(first, second)
+        self.assertEqual(self.estimator.get_stats()['mc_cache_hits'], 1)
+        self.estimator.add_sample('ETH/USD', 'buy', 100.0, 0.30, 0.20, 0.50)
+        third = self.estimator.sample_total_cost_draws('ETH/USD', 'buy', 100.0)
+        self.assertNotEqual(first, third)
+        self.assertEqual(len(third), 1000)
+    
+    def test_batch_scores_match_per_candidate(self):
+        self.estimator.add_sample('BTC/USD', 'buy', 100.0, 0.10, 0.05, 0.01)
+        candidates = [
+            ('ETH/USD', 100.0, 0.10), ('ETH/USD', 100.0, 0.25), ('ETH/USD', 50.0, 0.50),
+            ('BTC/USD', 200.0, 0.40), ('SOL/USD', 100.0, 0.00), ('SOL/USD', 0.0, 1.0),
+        ]
+        symbols, notionals, gross = zip(*candidates)
+        scores = self.estimator.score_candidates(symbols, notionals, gross)
+        for i, (symbol, notional, g) in enumerate(candidates):
+            draws = self.estimator.sample_total_cost_draws(symbol, 'buy', notional)
+            nets = sorted(g - d / 100.0 * notional for d in draws)
+            expected = sum(1 for v in nets if v > 0) / len(nets)
+            self.assertAlmostEqual(float(scores['p_win'][i]), expected, places=2)
+            # net p50 = gross - median cost
+            self.assertAlmostEqual(float(scores['net_p50'][i]), g - draws[len(draws) // 2] / 100.0 * notional, places=9)
+            self.assertLessEqual(float(scores['net_p5'][i]), float(scores['net_p95'][i]))
+        self.assertEqual(float(scores['p_win'][4]), 0.0)
+        self.assertEqual(float(scores['p_win'][5]), 1.0)
+    
+    def test_distribution_percentiles_ordered(self):
+        dist = self.estimator.sample_total_cost_distribution('ETH/USD', 'buy', 100.0)
+        self.assertLessEqual(dist['p5'], dist['p50'])
+        self.assertLessEqual(dist['p50'], dist['p90'])
+        self.assertLessEqual(dist['p90'], dist['p95'])
+        self.assertEqual(len(dist['samples']), 10)
+    
+    def test_batch_of_2000_candidates_is_fast(self):
+        symbols = [f'SYM{i % 50}/USD' for i in range(2000)]
+        for i in range(50):
+            self.estimator.add_sample(f'SYM{i}/USD', 'buy', 100.0, 0.15, 0.05, 0.02)
+        notionals = [100.0] * 2000
+        gross = [0.001 * i for i in range(2000)]
+        self.estimator.score_candidates(symbols, notionals, gross)  # warm draw cache
+        start = time.perf_counter()
+        scores = self.estimator.score_candidates(symbols, notionals, gross)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(scores['p_win']), 2000)
+        self.assertLess(elapsed, 0.5)
+
+
 def run_tests():
     """Run all tests with verbose output."""
     unittest.main(argv=[''], verbosity=2, exit=False)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared exchange PairIndex
+
+Tests cover:
+- Direct (sell) and inverse (buy) single-trade lookups
+- Base/quote filtering matches a linear scan
+- Neighbour sets and convertible-asset map
+- Index is reused until the exchange-info token changes
+- Kraken asset codes (X/Z prefixes, Z-fiat) normalise to plain symbols
+- A failed Alpaca asset refresh is not retried on every lookup
+
+Run: python3 test_exchange_pair_index.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import random
+import unittest
+from unittest import mock
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exchange_pair_index import PairIndex, ensure_pair_index
+
+
+PAIRS = [
+    {"pair": "BTCUSDT", "base": "BTC", "quote": "USDT", "minNotional": 5.0},
+    {"pair": "ETHUSDT", "base": "ETH", "quote": "USDT", "minNotional": 5.0},
+    {"pair": "ETHBTC", "base": "ETH", "quote": "BTC", "minNotional": 0.0001},
+    {"pair": "SOLETH", "base": "SOL", "quote": "ETH", "minNotional": 0.001},
+    {"pair": "DELISTED", "base": "", "quote": ""},
+]
+
+
+class TestPairIndex(unittest.TestCase):
+    """Test suite for PairIndex."""
+
+    def setUp(self):
+        self.index = PairIndex(PAIRS, token=1)
+
+    def test_direct_and_inverse(self):
+        entry, side = self.index.direct("ETH", "BTC")
+        self.assertEqual((entry["pair"], side), ("ETHBTC", "sell"))
+        entry, side = self.index.direct("BTC", "ETH")
+        self.assertEqual((entry["pair"], side), ("ETHBTC", "buy"))
+        self.assertEqual(entry["minNotional"], 0.0001)
+        self.assertIsNone(self.index.direct("SOL", "BTC"))
+
+    def test_filters_match_linear_scan(self):
+        rng = random.Random(3)
+        assets = [f"A{i}" for i in range(15)]
+        entries = []
+        for i in range(120):
+            b, q = rng.sample(assets, 2)
+            entries.append({"pair": f"P{i}", "base": b, "quote": q})
+        index = PairIndex(entries)
+        for base in [None] + assets[:5]:
+            for quote in [None] + assets[5:10]:
+                expected = [e for e in entries
+                            if (not base or e["base"] == base) and (not quote or e["quote"] == quote)]
+                self.assertEqual(index.pairs(base=base, quote=quote), expected)
+
+    def test_neighbors_and_convertible(self):
+        self.assertEqual(self.index.neighbors("eth"), {"USDT", "BTC", "SOL"})
+        conv = self.index.convertible()
+        self.assertEqual(conv["BTC"], ["ETH", "USDT"])
+        self.assertEqual(conv["SOL"], ["ETH"])
+        self.assertNotIn("", conv)
+        # Returned lists are copies
+        conv["BTC"].append("XXX")
+        self.assertEqual(self.index.convertible()["BTC"], ["ETH", "USDT"])
+
+    def test_unpaired_symbol_still_listed(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertIn("DELISTED", self.index.by_pair)
+
+    def test_rebuilt_only_on_new_token(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return PAIRS
+
+        first = ensure_pair_index(None, 100.0, build)
+        self.assertIs(ensure_pair_index(first, 100.0, build), first)
+        second = ensure_pair_index(first, 200.0, build)
+        self.assertIsNot(second, first)
+        self.assertEqual(len(calls), 2)
+
+
+class TestExchangeClients(unittest.TestCase):
+    """Client-side pair index plumbing."""
+
+    def test_kraken_asset_normalisation(self):
+        from kraken_client import _normalize_kraken_asset
+        cases = {'XXBT': 'BTC', 'XBT': 'BTC', 'XETH': 'ETH', 'XXDG': 'DG', 'SOL': 'SOL', 'USDC': 'USDC',
+                 'ZUSD': 'USD', 'ZEUR': 'EUR', 'ZGBP': 'GBP', 'ZJPY': 'JPY', 'ZCAD': 'CAD', 'ZEC': 'ZEC',
+                 'ZRX': 'ZRX', 'zgbp': 'GBP'}
+        self.assertEqual({k: _normalize_kraken_asset(k) for k in cases}, cases)
+
+    def test_alpaca_pair_index_failure_backoff(self):
+        from alpaca_client import AlpacaClient
+        client = AlpacaClient.__new__(AlpacaClient)
+        client._pairs_ttl, client._pairs_retry_s = 300.0, 30.0
+        client._pair_index, client._pairs_time, client._pairs_retry_at = None, 0.0, 0.0
+        client._normalize_pair_symbol = lambda s: s
+        calls = []
+
+        def get_assets(**kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("down")
+            return [{'symbol': 'BTC/USD', 'tradable': True}]
+
+        client.get_assets = get_assets
+        now = [1000.0]
+        with mock.patch('alpaca_client.time.time', lambda: now[0]):
+            for _ in range(5):
+                self.assertEqual(len(client._get_pair_index()), 0)
+            self.assertEqual(len(calls), 1)
+            now[0] += 31.0
+            self.assertEqual(client._get_pair_index().direct('BTC', 'USD')[1], 'sell')
+            self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the preloading fork server
+
+Tests cover:
+- production/supervisord.conf parses into 44 services in priority order,
+  with bash -c wrappers unwrapped and /aureon paths remapped
+- Forked services see the preloaded modules and write their own logs
+- supervisord semantics: BACKOFF -> FATAL on early exits, restart on
+  unexpected exit, no restart on an expected one, SIGKILL after stopwaitsecs
+- Memory report splits shared and private pages per service
+
+Run: python3 test_fork_server.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import json
+import shutil
+import tempfile
+import textwrap
+import subprocess
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aureon_fork_server import DEFAULT_CONFIG, load_supervisor_config
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPTS = {
+    "steady.py": """
+        import sys, time
+        print("preloaded", "xml.dom.minidom" in sys.modules, flush=True)
+        time.sleep(600)
+    """,
+    "flaky.py": "raise SystemExit(1)",
+    "crash_later.py": "import time; time.sleep(0.4); raise SystemExit(3)",
+    "done.py": "import time; time.sleep(0.4)",
+    "stubborn.py": """
+        import signal, time
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        print("ignoring TERM", flush=True)
+        time.sleep(600)
+    """,
+}
+
+CONFIG = """
+[program:steady]
+command=/bin/bash -c "cd {app} && exec python steady.py"
+stdout_logfile={logs}/steady.out.log
+redirect_stderr=true
+startsecs=0.2
+priority=1
+
+[program:flaky]
+command=python {app}/flaky.py
+startsecs=1
+startretries=1
+stdout_logfile={logs}/flaky.out.log
+priority=2
+
+[program:crash-later]
+command=python {app}/crash_later.py
+startsecs=0.1
+autorestart=unexpected
+stdout_logfile={logs}/crash.out.log
+priority=3
+
+[program:done]
+command=python {app}/done.py
+startsecs=0.1
+autorestart=unexpected
+stdout_logfile={logs}/done.out.log
+priority=4
+
+[program:stubborn]
+command=python {app}/stubborn.py
+startsecs=0.1
+stopwaitsecs=0.5
+stdout_logfile={logs}/stubborn.out.log
+priority=5
+"""
+
+# Runs in a clean interpreter: forking from the test process (which has
+# woken the Queen and its threads) would not reflect production.
+DRIVER = """
+import json, sys, time
+from aureon_fork_server import ForkServer, format_memory_report, load_supervisor_config
+out = {}
+server = ForkServer(load_supervisor_config(sys.argv[1], remap={"/aureon/app": sys.argv[2]}),
+                    preload=["xml.dom.minidom"], tick_s=0.05)
+out["preload"] = server.preload()
+server.start_all()
+end = time.monotonic() + 4.0
+while time.monotonic() < end:
+    server.poll()
+    time.sleep(0.05)
+out["running"] = server.status()
+out["memory"] = server.memory_report()
+out["memory_text"] = format_memory_report(out["memory"])
+start = time.monotonic()
+server.shutdown(timeout_s=10)
+out["shutdown_s"] = time.monotonic() - start
+out["stopped"] = server.status()
+print("RESULT " + json.dumps(out))
+"""
+
+
+class TestSupervisorConfig(unittest.TestCase):
+    """Parsing the production supervisord config."""
+
+    def test_production_config(self):
+        specs = load_supervisor_config(DEFAULT_CONFIG, remap={"/aureon/app": "/srv/app", "/aureon/logs": "/srv/logs"},
+                                       env={"PORT": "9000"})
+        self.assertEqual(len(specs), 44)
+        self.assertEqual([s.priority for s in specs], sorted(s.priority for s in specs))
+        health = specs[0]
+        self.assertEqual(health.name, "health-check-server")
+        self.assertEqual(health.command, ["python", "aureon_health_check_server.py"])
+        self.assertEqual(health.directory, "/srv/app")
+        self.assertEqual(health.environment["PORT"], "9000")
+        self.assertTrue(health.redirect_stderr and health.killasgroup)
+        labyrinth = next(s for s in specs if s.name == "micro-profit-labyrinth")
+        self.assertEqual(labyrinth.command, ["python", "/srv/app/micro_profit_labyrinth.py"])
+        self.assertEqual(labyrinth.stdout_logfile, "/srv/logs/micro-profit-labyrinth.out.log")
+        self.assertEqual((labyrinth.startsecs, labyrinth.autorestart), (29.0, "true"))
+        self.assertTrue(all(s.forkable for s in specs))
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "fork server needs fork() and /proc")
+class TestForkServer(unittest.TestCase):
+    """Supervision end to end in a child interpreter."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp(prefix="aureon_fork_")
+        app = os.path.join(cls.tmp, "app")
+        cls.logs = os.path.join(cls.tmp, "logs")
+        os.makedirs(app)
+        for name, body in SCRIPTS.items():
+            with open(os.path.join(app, name), "w") as fh:
+                fh.write(textwrap.dedent(body))
+        conf = os.path.join(cls.tmp, "supervisord.conf")
+        with open(conf, "w") as fh:
+            fh.write(CONFIG.format(app="/aureon/app", logs=cls.logs))
+        env = dict(os.environ, AUREON_BATON_MODE="fast", PYTHONPATH=REPO)
+        proc = subprocess.run([sys.executable, "-c", DRIVER, conf, app], cwd=REPO, env=env,
+                              capture_output=True, text=True, timeout=300)
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("RESULT ")]
+        if not lines:
+            raise AssertionError(proc.stdout[-2000:] + proc.stderr[-2000:])
+        cls.result = json.loads(lines[-1][len("RESULT "):])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def test_states(self):
+        running = self.result["running"]
+        self.assertEqual(running["steady"]["state"], "RUNNING")
+        self.assertEqual(running["steady"]["spawns"], 1)
+        self.assertEqual(running["flaky"]["state"], "FATAL")
+        self.assertEqual(running["flaky"]["spawns"], 2)          # first try + startretries
+        self.assertGreaterEqual(running["crash-later"]["spawns"], 3)
+        self.assertEqual(running["crash-later"]["last_exit"], 3)
+        self.assertEqual(running["done"]["state"], "EXITED")
+        self.assertEqual(running["done"]["spawns"], 1)
+        self.assertEqual(running["stubborn"]["state"], "RUNNING")
+
+    def test_shutdown_escalates(self):
+        stopped = self.result["stopped"]
+        self.assertTrue(all(s["pid"] is None for s in stopped.values()))
+        self.assertEqual(stopped["stubborn"]["state"], "STOPPED")
+        self.assertEqual(stopped["stubborn"]["last_exit"], -9)
+        self.assertLess(self.result["shutdown_s"], 5.0)
+
+    def test_preload_and_logs(self):
+        self.assertEqual(self.result["preload"]["loaded"], ["xml.dom.minidom"])
+        with open(os.path.join(self.logs, "steady.out.log")) as fh:
+            self.assertIn("preloaded True", fh.read())
+
+    def test_memory_report(self):
+        memory = self.result["memory"]
+        self.assertIn("(fork server)", memory["services"])
+        steady = memory["services"]["steady"]
+        self.assertGreater(steady["shared_kb"], 0)
+        self.assertLessEqual(steady["pss_kb"], steady["rss_kb"])
+        self.assertEqual(memory["totals"]["processes"], len(memory["services"]))
+        self.assertIn("TOTAL", self.result["memory_text"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+#!/usr/bin/env python3
+"""
+Unit tests for the GlobalRateBudget priority admission scheduler
+
+Tests cover:
+- Admission order is priority first, then arrival
+- Deadline-aware rejection: up front when the estimate misses, and in the
+  queue when a backoff pushes a ticket past its deadline
+- Legacy behaviour kept: quiet period after EXECUTION / POSITIONS admissions,
+  429 backoff for the failing priority and below (doubling per streak)
+- Fake-clock simulation: EXECUTION p99 wait stays bounded under a QUOTES flood,
+  with bursts borrowing idle lower-priority tokens
+- A throttled QUOTES waiter does not block an EXECUTION caller (threads and asyncio)
+
+Run: python3 test_global_rate_budget.py
+"""
+
+import sys
+import os
+import time
+import random
+import asyncio
+import threading
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_rate_budget import GlobalRateBudget, RequestPriority, ADMITTED, REJECTED, WAITING
+
+E, P, Q = RequestPriority.EXECUTION, RequestPriority.POSITIONS, RequestPriority.QUOTES
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _budget(**kw):
+    clock = FakeClock()
+    return GlobalRateBudget(5.0, 10.0, clock=clock, **kw), clock
+
+
+def _exhaust(budget, priority, is_trading=False):
+    bucket = budget._buckets[(priority, 'trading' if is_trading else 'data')]
+    bucket.tokens = 0.0
+
+
+class TestAdmissionOrder(unittest.TestCase):
+    """Queue ordering and deadlines on a fake clock."""
+
+    def test_priority_then_arrival(self):
+        budget, clock = _budget()
+        for p in (P, Q):
+            _exhaust(budget, p)
+        q1 = budget.submit(Q, timeout=10)
+        q2 = budget.submit(Q, timeout=10)
+        p1 = budget.submit(P, timeout=10)
+        self.assertEqual((q1.state, q2.state, p1.state), (WAITING, WAITING, WAITING))
+        self.assertEqual(budget.get_stats()['queued'], {'EXECUTION': 0, 'POSITIONS': 1, 'QUOTES': 2})
+
+        # Both buckets reach one token at the same instant; POSITIONS goes first
+        while WAITING in (q1.state, q2.state, p1.state):
+            clock.now = budget.next_wakeup()
+            budget.poll()
+        self.assertLess(p1.decided_at, q1.decided_at)
+        self.assertLess(q1.decided_at, q2.decided_at)
+        # POSITIONS admission quiets QUOTES for 0.2s
+        self.assertGreaterEqual(q1.decided_at, p1.decided_at + 0.2)
+
+    def test_deadline_rejection(self):
+        budget, clock = _budget()
+        _exhaust(budget, Q)
+        ok = budget.submit(Q, timeout=1.0)                   # ~0.67s at 1.5/s
+        late = budget.submit(Q, timeout=1.0)                 # second token needs ~1.33s
+        self.assertEqual(ok.state, WAITING)
+        self.assertEqual((late.state, late.reason, late.wait), (REJECTED, 'deadline', 0.0))
+
+        # A 429 pushes QUOTES past the queued ticket's deadline
+        budget.on_429_error(P)
+        clock.now = budget.next_wakeup()
+        budget.poll()
+        self.assertEqual((ok.state, ok.reason), (REJECTED, 'deadline'))
+        self.assertAlmostEqual(ok.wait, 1.0)
+        self.assertEqual(budget.get_stats()['requests_rejected'][Q], 2)
+
+    def test_borrowing(self):
+        budget, clock = _budget()
+        _exhaust(budget, E)
+        self.assertEqual(budget.submit(E).state, ADMITTED)   # from POSITIONS' bucket
+        self.assertLess(budget._buckets[(P, 'data')].tokens, 3.0)
+
+        # Lower priorities never borrow upward
+        budget, clock = _budget()
+        _exhaust(budget, Q)
+        self.assertEqual(budget.submit(Q, timeout=5).state, WAITING)
+        self.assertEqual(budget._buckets[(E, 'data')].tokens, 5.0)
+
+        budget, clock = _budget(borrow=False)
+        _exhaust(budget, E)
+        self.assertEqual(budget.submit(E, timeout=5).state, WAITING)
+
+
+class TestLegacyBackoff(unittest.TestCase):
+    """Behaviour callers of wait_for_slot already rely on."""
+
+    def test_quiet_period_after_execution(self):
+        budget, clock = _budget()
+        self.assertEqual(budget.submit(E, is_trading=True).state, ADMITTED)
+        t = budget.submit(Q)
+        self.assertEqual((t.state, t.reason), (REJECTED, 'backoff'))
+        self.assertEqual(budget.submit(P).reason, 'backoff')
+        clock.now = 0.5
+        self.assertEqual(budget.submit(Q).state, ADMITTED)
+        self.assertTrue(budget.wait_for_slot(P))
+
+    def test_429_streak(self):
+        budget, clock = _budget()
+        budget.on_429_error(P)
+        backoffs = budget.get_stats()['active_backoffs']
+        self.assertEqual((backoffs['EXECUTION'], backoffs['POSITIONS'], backoffs['QUOTES']), (0, 2.0, 1.0))
+        self.assertEqual(budget.submit(E).state, ADMITTED)
+        budget.on_429_error(P)
+        self.assertEqual(budget.get_stats()['active_backoffs']['POSITIONS'], 4.0)
+
+        clock.now = 200.0                                     # streak resets after a quiet minute
+        budget.on_429_error(E)
+        self.assertEqual(budget.get_stats()['active_backoffs']['EXECUTION'], 2.0)
+
+
+class TestQuoteFloodSimulation(unittest.TestCase):
+    """Discrete-event run on a fake clock: no sleeping, fully deterministic."""
+
+    def test_execution_p99_bounded(self):
+        budget, clock = _budget()
+        rng = random.Random(11)
+        horizon = 120.0
+        arrivals = []                                         # (time, priority, is_trading, timeout)
+        t = 0.0
+        while t < horizon:
+            arrivals.append((t, Q, False, 0.5))               # 50 quotes/s, 10x the whole budget
+            t += 0.02
+        t = 0.0
+        while t < horizon:
+            arrivals.append((t, P, False, 2.0))
+            t += 0.5
+        t = 0.0
+        while t < horizon:
+            arrivals.append((t, E, rng.random() < 0.5, 2.0))
+            t += rng.uniform(0.5, 2.5)
+        arrivals += [(60.0, E, False, 2.0)] * 8               # A basket of orders at once
+        arrivals.sort(key=lambda a: a[0])
+
+        tickets = {E: [], P: [], Q: []}
+        i = 0
+        while i < len(arrivals) or budget.get_stats()['queued'] != {'EXECUTION': 0, 'POSITIONS': 0, 'QUOTES': 0}:
+            wake = budget.next_wakeup()
+            candidates = [x for x in (wake, arrivals[i][0] if i < len(arrivals) else None) if x is not None]
+            clock.now = max(clock.now, min(candidates))
+            while i < len(arrivals) and arrivals[i][0] <= clock.now:
+                _, priority, trading, timeout = arrivals[i]
+                tickets[priority].append(budget.submit(priority, is_trading=trading, timeout=timeout))
+                i += 1
+            budget.poll()
+
+        executions = tickets[E]
+        self.assertTrue(all(t.state == ADMITTED for t in executions))
+        waits = sorted(t.wait for t in executions)
+        p99 = waits[min(len(waits) - 1, int(0.99 * len(waits)))]
+        # Lone orders go straight through; only the basket outruns its own
+        # bucket plus borrowed tokens and waits for refills at 2/s
+        self.assertEqual(waits[len(waits) // 2], 0.0)
+        self.assertLess(p99, 1.0)
+
+        # Quotes still get their share instead of being starved outright,
+        # and never waited past their deadline
+        admitted_q = [t for t in tickets[Q] if t.state == ADMITTED]
+        self.assertGreater(len(admitted_q), 0.5 * horizon)
+        self.assertTrue(all(t.wait <= 0.5 + 1e-9 for t in tickets[Q]))
+        self.assertTrue(all(t.state != WAITING for ts in tickets.values() for t in ts))
+        stats = budget.get_stats()
+        self.assertEqual(stats['requests_processed'][E], len(executions))
+        self.assertLess(stats['wait_ms']['EXECUTION']['p99'], 1000)
+
+
+class TestBlockingCallers(unittest.TestCase):
+    """Real clock: waiters park without holding the budget lock."""
+
+    def _throttled_quotes(self):
+        budget = GlobalRateBudget(3.0, 2.0)                   # QUOTES: 0.9/s, burst 1
+        self.assertTrue(budget.wait_for_slot(Q))              # drains the QUOTES bucket
+        return budget
+
+    def test_thread_waiter_does_not_block_execution(self):
+        budget = self._throttled_quotes()
+        result = {}
+        waiter = threading.Thread(target=lambda: result.setdefault('q', budget.wait_for_slot(Q, timeout=3.0)),
+                                  daemon=True)
+        waiter.start()
+        deadline = time.monotonic() + 1.0
+        while budget.get_stats()['queued']['QUOTES'] != 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(budget.get_stats()['queued']['QUOTES'], 1)
+
+        start = time.monotonic()
+        self.assertTrue(budget.wait_for_slot(E, is_trading=True))
+        self.assertLess(time.monotonic() - start, 0.1)
+        waiter.join(5)
+        self.assertTrue(result['q'])
+
+    def test_async_waiter_and_cancel(self):
+        budget = self._throttled_quotes()
+
+        async def run():
+            waiter = asyncio.ensure_future(budget.wait_for_slot_async(Q, timeout=3.0))
+            await asyncio.sleep(0.02)
+            start = time.monotonic()
+            self.assertTrue(await budget.wait_for_slot_async(E, is_trading=True))
+            self.assertLess(time.monotonic() - start, 0.1)
+            self.assertTrue(await waiter)
+
+            cancelled = asyncio.ensure_future(budget.wait_for_slot_async(Q, timeout=3.0))
+            await asyncio.sleep(0.02)
+            cancelled.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await cancelled
+
+        asyncio.run(run())
+        self.assertEqual(budget.get_stats()['queued']['QUOTES'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched harmonic seed maths and binary seed cache
+
+Tests cover:
+- Batched wave states match the per-symbol Hilbert / FFT / coherence methods
+- The batched coherence matrix matches the pairwise loop, including mixed
+  history lengths, flat series and too-short series (no RuntimeWarning)
+- The .npz seed round-trips a GlobalHarmonicState; stale seeds are ignored
+- open_seed memory-maps members on first access
+- A fresh legacy pickle seed is loaded once and rewritten as .npz
+- HarmonicGrowthEngine recomputes phase without scipy
+
+Run: python3 test_harmonic_seed_batch.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import json
+import time
+import pickle
+import tempfile
+import unittest
+import warnings
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import harmonic_batch
+from aureon_harmonic_seed import (
+    GlobalHarmonicState,
+    HarmonicGrowthEngine,
+    HarmonicSeedLoader,
+    SymbolWaveState,
+)
+
+
+def _candles(rng, n):
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return [{'close': float(p), 'volume': float(v)} for p, v in zip(prices, rng.random(n))]
+
+
+class TestBatchWaveMaths(unittest.TestCase):
+    """Batched results against the original per-symbol methods."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.loader = HarmonicSeedLoader(cache_dir=self.tmp.name)
+        self.rng = np.random.default_rng(11)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_wave_states_match_per_symbol(self):
+        symbol_candles = {f"S{i}@kraken": _candles(self.rng, n)
+                          for i, n in enumerate([168, 168, 167, 15, 40, 9, 168])}
+        states = self.loader.build_wave_states(symbol_candles)
+        self.assertNotIn('S5@kraken', states)           # < 10 candles
+        for symbol, state in states.items():
+            prices = np.array([c['close'] for c in symbol_candles[symbol]])
+            phase, _ = self.loader._hilbert_transform(prices)
+            self.assertAlmostEqual(state.phase, phase[-1], places=9)
+            np.testing.assert_allclose(state.phase_history, phase[-168:], atol=1e-9)
+            self.assertEqual(state.frequency, self.loader._dominant_frequency(prices))
+            self.assertAlmostEqual(state.amplitude, np.std(prices) / (np.mean(prices) + 1e-8), places=12)
+            if len(prices) > 20:
+                half = len(prices) // 2
+                expected = self.loader._calculate_coherence(prices[:half], prices[half:])
+            else:
+                expected = 0.5
+            self.assertAlmostEqual(state.coherence, expected, places=9)
+            self.assertEqual(state.price_history, prices.tolist())
+
+        single = self.loader.build_wave_state('S0@kraken', symbol_candles['S0@kraken'])
+        self.assertAlmostEqual(single.phase, states['S0@kraken'].phase, places=12)
+
+    def test_coherence_matrix_matches_pairwise(self):
+        histories = [np.array([c['close'] for c in _candles(self.rng, n)])
+                     for n in [168, 168, 120, 168, 30, 5, 168]]
+        histories.append(np.full(168, 42.0))             # flat series
+        states = {f"S{i}": SymbolWaveState(symbol=f"S{i}", last_volume=100.0 - i, price_history=h.tolist())
+                  for i, h in enumerate(histories)}
+        batched = self.loader.build_coherence_matrix(states, top_n=len(states))
+
+        symbols = list(states)
+        self.assertEqual(list(batched), symbols)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            for i, s1 in enumerate(symbols):
+                self.assertEqual(list(batched[s1]), symbols[i + 1:])
+                for s2 in symbols[i + 1:]:
+                    expected = self.loader._calculate_coherence(histories[i], histories[symbols.index(s2)])
+                    self.assertAlmostEqual(batched[s1][s2], expected, places=9, msg=(s1, s2))
+        self.assertEqual(batched['S0']['S7'], 0.0)
+
+        top = self.loader.build_coherence_matrix(states, top_n=3)
+        self.assertEqual(list(top), ['S0', 'S1', 'S2'])
+
+
+class TestBinarySeed(unittest.TestCase):
+    """Versioned .npz seed cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.loader = HarmonicSeedLoader(cache_dir=self.tmp.name)
+        rng = np.random.default_rng(5)
+        states = self.loader.build_wave_states({f"S{i}@binance": _candles(rng, 168) for i in range(12)})
+        states['SHORT@kraken'] = SymbolWaveState(symbol='SHORT@kraken', last_volume=0.1,
+                                                 price_history=[1.0, 2.0], volume_history=[3.0],
+                                                 phase_history=[])
+        self.state = GlobalHarmonicState(symbols=states, global_phase=0.3, global_coherence=0.6,
+                                         dominant_frequency=2.5, schumann_alignment=0.2,
+                                         market_regime='bullish', last_update=123.0, candle_count=168)
+        self.state.coherence_matrix = self.loader.build_coherence_matrix(states, top_n=5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _assert_same(self, got, expected):
+        self.assertEqual(got.to_dict(), expected.to_dict())
+
+    def test_round_trip(self):
+        self.loader.state = self.state
+        self.assertTrue(self.loader.save_seed())
+        with harmonic_batch.open_seed(self.loader.seed_file) as npz:
+            self.assertEqual(int(npz['format_version']), harmonic_batch.SEED_FORMAT_VERSION)
+            self.assertEqual(list(npz._arrays), ['format_version'])      # Nothing else read yet
+            self.assertEqual(npz['price_history'].shape, (13, 168))
+            self.assertIsInstance(npz['price_history'], np.memmap)
+            self.assertIsInstance(npz['coherence_matrix'], np.memmap)
+            self.assertFalse(npz['coherence_matrix'].flags.writeable)
+            self.assertEqual(npz['symbols'].tolist()[0], 'S0@binance')
+
+        fresh = HarmonicSeedLoader(cache_dir=self.tmp.name)
+        self._assert_same(fresh.load_seed(), self.state)
+
+        self.assertIsNone(fresh.load_cached_seed(max_age=0))
+        meta = json.loads(fresh.seed_meta_file.read_text())
+        meta['version'] = 0
+        with harmonic_batch.open_seed(fresh.seed_file) as npz:
+            arrays = {name: np.array(npz[name]) for name in npz}     # Copies: the file is rewritten in place
+        arrays['format_version'] = np.array(0)
+        with open(fresh.seed_file, 'wb') as f:
+            np.savez(f, **arrays)
+        self.assertIsNone(fresh.load_cached_seed())
+
+    def test_legacy_pickle_upgraded(self):
+        written = time.time() - 3600
+        with open(self.loader.legacy_seed_file, 'wb') as f:
+            pickle.dump(self.state, f)
+        self.loader.seed_meta_file.write_text(json.dumps({'timestamp': written, 'symbols': 13, 'candles': 168}))
+
+        self._assert_same(self.loader.load_cached_seed(), self.state)
+        meta = json.loads(self.loader.seed_meta_file.read_text())
+        self.assertEqual((meta['format'], meta['timestamp']), ('npz', written))
+        os.remove(self.loader.legacy_seed_file)
+        self._assert_same(self.loader.load_cached_seed(), self.state)
+
+
+class TestGrowthPhase(unittest.TestCase):
+    """Live phase recalculation uses the batched Hilbert transform."""
+
+    def test_phase_recalculated_every_six_candles(self):
+        rng = np.random.default_rng(2)
+        prices = [c['close'] for c in _candles(rng, 24)]
+        engine = HarmonicGrowthEngine(GlobalHarmonicState())
+        for i, price in enumerate(prices):
+            engine._update_wave_state('BTC/USD', {'close': price, 'volume': 1.0, 'timestamp': i})
+        expected, _ = HarmonicSeedLoader._hilbert_transform(None, np.array(prices))
+        state = engine.get_symbol_state('BTC/USD')
+        self.assertAlmostEqual(state.phase, expected[-1], places=9)
+        self.assertAlmostEqual(state.phase_history[-1], expected[-1], places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the HFTHarmonicEngine hot path
+
+Tests cover:
+- Per-symbol tick rings wrap correctly and keep symbols apart
+- Harmonic tone uses only the ticked symbol's recent window
+- TTL cache expires by deadline and evicts oldest entries first
+- Per-stage latency histograms are filled by the tick pipeline
+
+Run: python3 test_hft_hot_path.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import asyncio
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aureon_hft_harmonic_mycelium import (
+    CachedDecision,
+    HFTHarmonicEngine,
+    HFTTick,
+    HotPathCache,
+    LatencyHistogram,
+    SymbolTickRing,
+)
+
+
+def _decision(symbol: str, cached_at: float, ttl_ms: int = 100) -> CachedDecision:
+    return CachedDecision(symbol=symbol, harmonic_pattern=(528.0, 'falcon', 'gamma'), action='BUY',
+                          confidence=0.9, position_size_usd=5.0, cached_at=cached_at, ttl_ms=ttl_ms)
+
+
+class _FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSymbolTickRing(unittest.TestCase):
+    """Ring buffer windowing."""
+
+    def test_window_across_wrap(self):
+        ring = SymbolTickRing(capacity=8)
+        for i in range(13):
+            ring.append(float(i), 100.0 + i, 1.0 + i)
+        self.assertEqual(len(ring), 8)
+        count, first_ts, first_price, last_ts, last_price, volume = ring.window(6)
+        self.assertEqual((count, first_ts, last_ts), (6, 7.0, 12.0))
+        self.assertEqual((first_price, last_price), (107.0, 112.0))
+        self.assertEqual(volume, sum(1.0 + i for i in range(7, 13)))
+        self.assertEqual(ring.tail(3)[:, 0].tolist(), [10.0, 11.0, 12.0])
+        self.assertEqual(ring.window(50)[0], 8)
+
+
+class TestHotPathCache(unittest.TestCase):
+    """Heap-backed TTL cache."""
+
+    def test_expiry_by_deadline(self):
+        clock = _FakeClock()
+        cache = HotPathCache(clock=clock)
+        cache.put(('BTC',), _decision('BTC', clock.now, ttl_ms=100))
+        cache.put(('ETH',), _decision('ETH', clock.now, ttl_ms=500))
+        self.assertIsNotNone(cache.get(('BTC',)))
+        clock.now += 0.2
+        self.assertIsNone(cache.get(('BTC',)))
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(('ETH',)))
+        self.assertEqual(cache.expire(clock.now + 1.0), 1)
+        self.assertEqual(cache.expired, 2)
+
+    def test_overwrite_and_evict_oldest(self):
+        clock = _FakeClock()
+        cache = HotPathCache(max_entries=10, evict_batch=3, clock=clock)
+        for i in range(10):
+            cache.put((i,), _decision(str(i), clock.now + i * 0.001))
+        # Refreshing key 0 makes it the newest entry
+        cache.put((0,), _decision('0', clock.now + 0.05))
+        cache.put((10,), _decision('10', clock.now + 0.06))
+        self.assertEqual(len(cache), 8)
+        self.assertEqual(cache.evicted, 3)
+        for gone in (1, 2, 3):
+            self.assertNotIn((gone,), cache)
+        self.assertIn((0,), cache)
+
+    def test_superseded_entries_compacted(self):
+        clock = _FakeClock()
+        cache = HotPathCache(clock=clock)
+        for i in range(1000):
+            cache.put(('BTC',), _decision('BTC', clock.now))
+        self.assertEqual(len(cache), 1)
+        self.assertLess(len(cache._heap), 100)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Bucketed percentiles and budget share."""
+
+    def test_percentiles_and_budget(self):
+        hist = LatencyHistogram()
+        for ms in [0.02] * 90 + [3.0] * 9 + [40.0]:
+            hist.record(ms)
+        self.assertEqual(hist.percentile(50), 0.025)
+        self.assertEqual(hist.percentile(99), 5.0)
+        self.assertEqual(hist.percentile(100), 40.0)
+        self.assertAlmostEqual(hist.within(10.0), 0.99)
+        self.assertEqual(hist.to_dict()['buckets']['<=50'], 1)
+
+
+class TestEnginePipeline(unittest.TestCase):
+    """End-to-end tick processing."""
+
+    def test_tone_is_per_symbol_and_stages_recorded(self):
+        async def run():
+            engine = HFTHarmonicEngine()
+            engine.enabled = True
+            for i in range(20):
+                engine.ingest_tick({'timestamp': 100.0 + i, 'symbol': 'BTC/USD',
+                                    'price': 100.0 + i, 'volume': 1.0})
+                engine.ingest_tick({'timestamp': 100.0 + i, 'symbol': 'ETH/USD',
+                                    'price': 50.0 - i, 'volume': 1.0})
+            up = await engine._encode_harmonic_tone(HFTTick(119.0, 'BTC/USD', 119.0, 1.0, 'buy', 'x'))
+            down = await engine._encode_harmonic_tone(HFTTick(119.0, 'ETH/USD', 31.0, 1.0, 'sell', 'x'))
+            self.assertEqual(up.auris_node, 'falcon')
+            self.assertEqual(down.auris_node, 'tiger')
+
+            engine.mode = "EXECUTING"
+            engine.ingest_tick({'timestamp': 121.0, 'symbol': 'BTC/USD', 'price': 121.0, 'volume': 1.0})
+            engine.ingest_tick({'timestamp': 122.0, 'symbol': 'BTC/USD', 'price': 122.0, 'volume': 1.0})
+            await asyncio.sleep(0.05)
+            return engine
+
+        engine = asyncio.run(run())
+        stats = engine.get_performance_stats()
+        hist = stats['latency_histograms']
+        for stage in ('ingest', 'tone', 'decision', 'tick_to_decision'):
+            self.assertEqual(hist[stage]['count'], 2, stage)
+        self.assertEqual(stats['cache_performance']['hits'], 1)
+        self.assertEqual(stats['cache_performance']['misses'], 1)
+        self.assertGreater(stats['latency_budget']['tick_to_decision_within'], 0.0)
+        self.assertEqual(engine.get_status()['tracked_symbols'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent multi-exchange market scan
+
+Tests cover:
+- Venues run concurrently and results keep scanner order
+- A venue past its deadline is reported as timeout, others still count
+- Scanner errors are isolated to their venue
+- A venue still scanning past its deadline is reported busy, not rescanned
+- OrcaKillCycle.scan_entire_market dedupes kill-chain hunts by
+  (exchange, symbol) and records per-venue timings
+
+Run: python3 test_market_scan_fanout.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import io
+import time
+import threading
+import unittest
+import contextlib
+from types import SimpleNamespace
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_scan_fanout import in_flight_venues, scan_venues, summarize_venue_scan
+
+
+def _slow(items, delay):
+    def scan():
+        time.sleep(delay)
+        return items
+    return scan
+
+
+class TestScanVenues(unittest.TestCase):
+    """scan_venues fan-out."""
+
+    def test_concurrent_wall_time_and_order(self):
+        scanners = [('alpaca', _slow([1], 0.3)), ('kraken', _slow([2, 3], 0.1)), ('binance', _slow([4], 0.2))]
+        start = time.perf_counter()
+        results = scan_venues(scanners, concurrent=True, deadline_s=5.0)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual([r.venue for r in results], ['alpaca', 'kraken', 'binance'])
+        self.assertEqual([r.items for r in results], [[1], [2, 3], [4]])
+        self.assertTrue(all(r.status == 'ok' for r in results))
+
+    def test_deadline_gives_partial_results(self):
+        scanners = [('kraken', _slow([1], 0.05)), ('capital', _slow([2], 2.0))]
+        start = time.perf_counter()
+        results = scan_venues(scanners, deadline_s={'kraken': 1.0, 'capital': 0.2})
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(results[0].items, [1])
+        self.assertEqual(results[1].status, 'timeout')
+        self.assertEqual(results[1].items, [])
+        summary = summarize_venue_scan(results, 0.2)
+        self.assertTrue(summary['partial'])
+        self.assertEqual(summary['venues']['capital']['status'], 'timeout')
+
+    def test_errors_are_isolated(self):
+        def boom():
+            raise RuntimeError("venue down")
+        for concurrent in (True, False):
+            results = scan_venues([('alpaca', boom), ('kraken', _slow([7], 0.0))], concurrent=concurrent)
+            self.assertEqual(results[0].status, 'error')
+            self.assertIn("venue down", results[0].error)
+            self.assertEqual(results[1].items, [7])
+
+    def test_hung_venue_scanned_once(self):
+        gate, calls = threading.Event(), []
+
+        def hung():
+            calls.append(1)
+            gate.wait(5)
+            return [1]
+        scanners = [('hung', hung), ('kraken', _slow([2], 0.0))]
+        try:
+            first = scan_venues(scanners, deadline_s=0.1)
+            second = scan_venues(scanners, deadline_s=0.1)
+            self.assertEqual(len(calls), 1)
+            self.assertEqual([r.status for r in first], ['timeout', 'ok'])
+            self.assertEqual([r.status for r in second], ['busy', 'ok'])
+            self.assertEqual(second[1].items, [2])
+            self.assertIn('hung', in_flight_venues())
+            self.assertEqual(scan_venues([('hung', hung)], concurrent=False)[0].status, 'busy')
+        finally:
+            gate.set()
+        deadline = time.time() + 2
+        while 'hung' in in_flight_venues() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(scan_venues(scanners, deadline_s=1.0)[0].items, [1])
+        self.assertEqual(len(calls), 2)
+
+
+class TestOrcaScanEntireMarket(unittest.TestCase):
+    """scan_entire_market wiring on a stubbed OrcaKillCycle."""
+
+    def test_dedupe_and_summary(self):
+        import orca_complete_kill_cycle as orca
+        MarketOpportunity = orca.MarketOpportunity
+
+        def opp(symbol, exchange):
+            return MarketOpportunity(symbol=symbol, exchange=exchange, price=1.0, change_pct=5.0,
+                                     volume=1e6, momentum_score=10.0, fee_rate=0.001)
+
+        cycle = orca.OrcaKillCycle.__new__(orca.OrcaKillCycle)
+        cycle.clients = {'kraken': object(), 'binance': object()}
+        cycle.fee_rates = {}
+        cycle.snowball = None
+        cycle.momentum_ecosystem = None
+        cycle.micro_scanner = None
+        cycle._scan_kraken_market = lambda c, v: (time.sleep(0.2), [opp('ETHUSD', 'kraken')])[1]
+        cycle._scan_binance_market = lambda c, v: (time.sleep(0.2), [opp('ETHUSD', 'binance')])[1]
+        hunt = {'symbol': 'ETHUSD', 'price': 1.0, 'change_24h': 5.0, 'volume_24h': 1e6, 'score': 1.0}
+        cycle.unified_kill_chain = SimpleNamespace(win_killer=SimpleNamespace(
+            hunt_binance=lambda: [hunt, dict(hunt, symbol='SOLUSD'), dict(hunt, symbol='SOLUSD')],
+            hunt_kraken=lambda: [hunt, dict(hunt, symbol='SOLUSD')],
+        ))
+        cycle.get_quantum_score = lambda **kw: {'quantum_boost': 1.0, 'is_blessed': False, 'limbo_probability': 0.5}
+
+        nexus = orca.PROBABILITY_NEXUS_AVAILABLE
+        orca.PROBABILITY_NEXUS_AVAILABLE = False
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                found = cycle.scan_entire_market(venue_deadline_s=5.0)
+        finally:
+            orca.PROBABILITY_NEXUS_AVAILABLE = nexus
+
+        keys = sorted((o.exchange, o.symbol) for o in found)
+        self.assertEqual(keys, [('binance', 'ETHUSD'), ('binance', 'SOLUSD'),
+                                ('kraken', 'ETHUSD'), ('kraken', 'SOLUSD')])
+        summary = cycle.last_scan_summary
+        self.assertEqual(summary['mode'], 'concurrent')
+        self.assertEqual(summary['duplicates_skipped'], 3)
+        self.assertEqual(set(summary['venues']), {'kraken', 'binance'})
+        self.assertLess(summary['total_seconds'], summary['venue_seconds_sum'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the labyrinth momentum rings and top-k index
+
+Tests cover:
+- Batch snapshot updates match the old per-asset deque scan exactly
+- Ring wrap-around keeps the window start inside the ring
+- Index slices (rising_above / between / falling_below) match full filters
+- Labyrinth wave check, lion hunt and wolf hunt read the shared index
+- AnimalPackScanner hunters give the same signals from the index
+
+Run: python3 test_momentum_index.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import io
+import random
+import unittest
+import contextlib
+from collections import deque
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from momentum_index import MomentumIndex, MomentumRings
+
+
+class _DequeMomentum:
+    """The labyrinth's original per-asset deque algorithm."""
+
+    def __init__(self, window=60, maxlen=1000):
+        self.window = window
+        self.history = {}
+        self.momentum = {}
+        self.maxlen = maxlen
+
+    def update(self, asset, price, now):
+        history = self.history.setdefault(asset, deque(maxlen=self.maxlen))
+        history.append((now, price))
+        if len(history) < 2:
+            self.momentum[asset] = 0.0
+            return
+        cutoff = now - self.window
+        oldest_price = None
+        oldest_time = now
+        for t, p in history:
+            if t >= cutoff:
+                if oldest_price is None or t < oldest_time:
+                    oldest_price = p
+                    oldest_time = t
+        if oldest_price is None or oldest_price <= 0:
+            self.momentum[asset] = 0.0
+            return
+        time_diff = now - oldest_time
+        if time_diff < 5:
+            self.momentum[asset] = 0.0
+            return
+        price_change = (price - oldest_price) / oldest_price
+        minutes = time_diff / 60
+        self.momentum[asset] = price_change / minutes if minutes > 0 else 0.0
+
+
+class TestMomentumRings(unittest.TestCase):
+    """Vectorised rings against the reference scan."""
+
+    def test_snapshot_matches_reference(self):
+        rng = random.Random(7)
+        rings = MomentumRings(window_seconds=60, capacity=50)
+        ref = _DequeMomentum(window=60, maxlen=50)
+        prices = {f"A{i}": 10.0 + i for i in range(40)}
+        now = 1000.0
+        for step in range(300):
+            now += rng.choice([0.5, 2.0, 3.0, 7.0])
+            snapshot = {}
+            for asset in prices:
+                if rng.random() < 0.8:     # not every asset ticks every snapshot
+                    prices[asset] *= 1 + rng.gauss(0, 0.01)
+                    snapshot[asset] = prices[asset]
+            if step == 150:
+                snapshot['LATE'] = 3.0
+            got = rings.update_snapshot(snapshot, now)
+            for asset, price in snapshot.items():
+                ref.update(asset, price, now)
+                self.assertEqual(got[asset], ref.momentum[asset], (step, asset))
+        for asset, m in ref.momentum.items():
+            self.assertEqual(rings.get(asset), m)
+
+    def test_single_update_and_wrap(self):
+        rings = MomentumRings(window_seconds=1000, capacity=4)
+        for i in range(10):
+            rings.update('BTC', 100.0 + i, float(i * 10))
+        window = rings.window('BTC')
+        # Window is longer than the ring holds, so only the last 4 remain
+        self.assertEqual(window[:, 1].tolist(), [106.0, 107.0, 108.0, 109.0])
+        self.assertAlmostEqual(rings.get('BTC'), (109.0 - 106.0) / 106.0 / 0.5)
+
+    def test_short_span_is_zero(self):
+        rings = MomentumRings(window_seconds=60)
+        rings.update('ETH', 100.0, 0.0)
+        self.assertEqual(rings.update('ETH', 110.0, 4.0), 0.0)
+        self.assertGreater(rings.update('ETH', 110.0, 6.0), 0.0)
+
+
+class TestMomentumIndex(unittest.TestCase):
+    """Sorted slices against brute-force filters."""
+
+    def test_slices_match_filters(self):
+        rng = random.Random(3)
+        momentum = {f"C{i}": round(rng.uniform(-3, 3), 2) for i in range(500)}
+        momentum['ZERO'] = 0.0
+        index = MomentumIndex.from_mapping(momentum)
+        self.assertEqual(index.rising, sorted([(a, m) for a, m in momentum.items() if m > 0],
+                                              key=lambda x: x[1], reverse=True))
+        self.assertEqual(index.falling, sorted([(a, m) for a, m in momentum.items() if m < 0],
+                                               key=lambda x: x[1]))
+        self.assertEqual(set(index.rising_above(1.5)), {(a, m) for a, m in momentum.items() if m > 1.5})
+        self.assertEqual(set(index.rising_between(0.5, 1.0)),
+                         {(a, m) for a, m in momentum.items() if 0.5 < m < 1.0})
+        self.assertEqual(set(index.falling_below(-2.0)), {(a, m) for a, m in momentum.items() if m < -2.0})
+        self.assertEqual(set(index.falling_between(-1.0, -0.5)),
+                         {(a, m) for a, m in momentum.items() if -1.0 < m < -0.5})
+        top = index.top_rising(exclude={index.rising[0][0]}, limit=3, where=momentum)
+        self.assertEqual(top, index.rising[1:4])
+
+
+class TestLabyrinthHunters(unittest.TestCase):
+    """Labyrinth consumers on a stubbed MicroProfitLabyrinth."""
+
+    @classmethod
+    def setUpClass(cls):
+        import micro_profit_labyrinth as mpl
+        cls.mpl = mpl
+
+    def _labyrinth(self):
+        lab = self.mpl.MicroProfitLabyrinth.__new__(self.mpl.MicroProfitLabyrinth)
+        lab.momentum_window = 60
+        lab.momentum_rings = MomentumRings(window_seconds=60)
+        lab.asset_momentum = {}
+        lab.min_momentum_diff = 0.003
+        lab._ticker_volume_index = (None, -1, {})
+        lab.prices = {'USD': 1.0, 'BTC': 100.0, 'ETH': 50.0, 'SOL': 20.0, 'DOGE': 0.1}
+        lab.ticker_cache = {
+            'kraken:BTCUSD': {'base': 'BTC', 'volume': 10.0},
+            'kraken:ETHUSD': {'base': 'ETH', 'volume': 1e9},
+            'binance:ETHUSDT': {'base': 'ETH', 'volume': 1.0},
+        }
+        lab.balances = {'USD': 100.0, 'DOGE': 500.0}
+        lab.update_momentum_snapshot(lab.prices, now=0.0)
+        moved = {'USD': 1.0, 'BTC': 101.0, 'ETH': 50.5, 'SOL': 20.0, 'DOGE': 0.099}
+        lab.update_momentum_snapshot(moved, now=60.0)
+        lab.prices = moved
+        return lab
+
+    def test_wave_lion_and_wolf(self):
+        lab = self._labyrinth()
+        self.assertEqual([a for a, _ in lab.get_strongest_rising()], ['BTC', 'ETH'])
+        self.assertEqual(lab.get_weakest_falling(), [('DOGE', lab.asset_momentum['DOGE'])])
+
+        wave = lab.find_momentum_opportunity()
+        self.assertEqual(wave[:2], ('DOGE', 'BTC'))
+        self.assertAlmostEqual(wave[4], 0.01 + 0.01)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            hunts = lab.lion_hunt(min_wave_momentum=0.0001)
+            wolf = lab.wolf_hunt(verbose=False)
+        self.assertEqual([(src, tgt) for src, tgt, _, _ in hunts], [('USD', 'BTC'), ('USD', 'ETH')])
+        # ETH's first ticker carries far more volume, so it outscores BTC
+        self.assertEqual(wolf[0], 'ETH')
+
+    def test_pack_hunters_from_index(self):
+        momentum = {'A': 3.0, 'B': -2.5, 'C': 0.05, 'D': 0.3, 'E': -0.2, 'F': 0.35, 'G': 0.0}
+        data = {a: {'change': m / 100, 'price': 1.0} for a, m in momentum.items()}
+        scanner = self.mpl.AnimalPackScanner()
+        scanner.update_momentum_data(data, index=MomentumIndex.from_mapping(momentum))
+        results = scanner.scan_all()
+        assets = {animal: sorted(s.asset for s in sigs) for animal, sigs in results.items()}
+        self.assertEqual(assets['Tiger'], ['A', 'B'])
+        self.assertEqual(assets['Hummingbird'], ['D', 'E', 'F'])
+        self.assertEqual(assets['Deer'], ['C'])
+        self.assertEqual(assets['Wolf'], ['A', 'F'])
+        self.assertEqual(assets['Bee'], ['HIVE'])
+
+        # Same answer when the scanner builds its own index from the dict
+        scanner.update_momentum_data(data)
+        again = {animal: sorted(s.asset for s in sigs) for animal, sigs in scanner.scan_all().items()}
+        self.assertEqual(again, assets)
+
+
+if __name__ == '__main__':
+    unittest.main()
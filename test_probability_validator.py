@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ProbabilityValidator journal and compaction
+
+Tests cover:
+- Running stats match a full recount of every prediction (old _update_stats)
+- Record/validate append one journal line; a restart replays the journal
+- validate_pending only pops due predictions and retries ones without a price
+- Compaction folds the journal into a snapshot and rolls up old validated
+  predictions into per-symbol tallies without changing the stats
+- Legacy indent=2 state files load and are rewritten as a compact snapshot
+
+Run: python3 test_probability_validator.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import io
+import json
+import random
+import tempfile
+import unittest
+import contextlib
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import probability_validator as pv
+
+
+class _Clock(datetime):
+    """datetime whose now() is set by the test."""
+    current = datetime(2026, 3, 1, 12, 0, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def _reference_stats(predictions, now):
+    """The original full-recount _update_stats."""
+    validated = [p for p in predictions if p.validated]
+    correct = sum(1 for p in validated if p.direction_correct)
+    regimes = {}
+    for p in validated:
+        r = regimes.setdefault(p.market_regime, [0, 0])
+        r[0] += p.direction_correct
+        r[1] += 1
+    bands = {band: [0, 0] for band in pv.FEAR_GREED_BANDS}
+    for p in validated:
+        for band, (low, high) in pv.FEAR_GREED_BANDS.items():
+            if low <= p.fear_greed < high:
+                bands[band][0] += p.direction_correct
+                bands[band][1] += 1
+                break
+    recent = [p for p in validated if (now - datetime.fromisoformat(p.timestamp)).total_seconds() < 86400]
+    gains = sum(p.outcome_score for p in validated if p.outcome_score > 0)
+    losses = sum(abs(p.outcome_score) for p in validated if p.outcome_score < 0)
+    return {
+        'validated_predictions': len(validated),
+        'direction_correct': correct,
+        'direction_accuracy': correct / len(validated),
+        'avg_predicted_prob': sum(p.predicted_probability for p in validated) / len(validated),
+        'avg_actual_change': sum(abs(p.actual_change_pct) for p in validated) / len(validated),
+        'accuracy_by_regime': {k: c / t for k, (c, t) in regimes.items()},
+        'accuracy_by_fear_greed': {k: c / t if t else 0 for k, (c, t) in bands.items()},
+        'accuracy_last_24h': sum(p.direction_correct for p in recent) / len(recent),
+        'profit_factor': gains / losses if losses > 0 else gains if gains > 0 else 1.0,
+    }
+
+
+class TestPredictionJournal(unittest.TestCase):
+    """Journalled state against the full-rewrite behaviour."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp.name, 'validation.json')
+        self.journal_file = os.path.join(self.tmp.name, 'validation.journal.jsonl')
+        self.patches = [
+            mock.patch.object(pv, 'datetime', _Clock),
+            mock.patch.object(pv.time, 'time', lambda: _Clock.current.timestamp()),
+            mock.patch.object(pv, 'PREDICTION_LOG', os.path.join(self.tmp.name, 'predictions.jsonl')),
+        ]
+        for p in self.patches:
+            p.start()
+        _Clock.current = datetime(2026, 3, 1, 12, 0, 0)
+        self.rng = random.Random(4)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def _validator(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return pv.ProbabilityValidator(state_file=self.state_file, journal_file=self.journal_file, **kwargs)
+
+    def _record(self, validator, n):
+        ids = []
+        for _ in range(n):
+            _Clock.current += timedelta(seconds=self.rng.choice([1, 30, 600]))
+            ids.append(validator.record_prediction(
+                symbol=self.rng.choice(['BTCUSD', 'ETHUSD', 'SOLUSD']),
+                direction=self.rng.choice(['BULLISH', 'BEARISH', 'NEUTRAL']),
+                probability=self.rng.random(), confidence=self.rng.random(), action='BUY',
+                price=100.0, fear_greed=self.rng.randint(0, 100),
+                market_regime=self.rng.choice(['NORMAL', 'CRISIS'])))
+        return ids
+
+    def _journal_lines(self):
+        with open(self.journal_file) as f:
+            return f.read().splitlines()
+
+    def _assert_stats(self, validator):
+        expected = _reference_stats(validator.predictions.values(), _Clock.current)
+        got = validator.stats.to_dict()
+        for key, value in expected.items():
+            if isinstance(value, dict):
+                self.assertEqual(got[key].keys(), value.keys(), key)
+                for k in value:
+                    self.assertAlmostEqual(got[key][k], value[k], places=9, msg=(key, k))
+            else:
+                self.assertAlmostEqual(got[key], value, places=9, msg=key)
+
+    def test_journal_replay_and_running_stats(self):
+        validator = self._validator()
+        ids = self._record(validator, 60)
+        self.assertEqual(len(self._journal_lines()), 60)
+        self.assertFalse(os.path.exists(self.state_file))
+
+        for pid in ids[:40]:
+            validator.validate_prediction(pid, self.rng.uniform(95, 105))
+        self.assertEqual(len(self._journal_lines()), 100)
+        self._assert_stats(validator)
+        self.assertEqual(validator.stats.total_predictions, 60)
+        self.assertEqual(validator.pending_validations, ids[40:])
+
+        again = self._validator()
+        self.assertEqual({k: p.to_dict() for k, p in again.predictions.items()},
+                         {k: p.to_dict() for k, p in validator.predictions.items()})
+        self.assertEqual(again.pending_validations, ids[40:])
+        self.assertEqual(again.stats.to_dict(), validator.stats.to_dict())
+
+    def test_validate_pending_pops_due_only(self):
+        validator = self._validator()
+        first = self._record(validator, 3)
+        _Clock.current += timedelta(hours=1)
+        later = self._record(validator, 2)
+        _Clock.current = datetime.fromisoformat(validator.predictions[first[-1]].window_end)
+
+        prices = {'BTCUSD': None, 'ETHUSD': 101.0, 'SOLUSD': 99.0}
+        calls = []
+
+        def price(symbol):
+            calls.append(symbol)
+            return prices[symbol]
+
+        results = validator.validate_pending(price)
+        no_price = [pid for pid in first if validator.predictions[pid].symbol == 'BTCUSD']
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sorted(r['prediction_id'] for r in results), sorted(set(first) - set(no_price)))
+        self.assertEqual(validator.pending_validations, no_price + later)
+
+        prices['BTCUSD'] = 100.0
+        results = validator.validate_pending(price)
+        self.assertEqual([r['prediction_id'] for r in results], no_price)
+        self.assertEqual(validator.pending_validations, later)
+
+    def test_compaction_and_rollup(self):
+        validator = self._validator(compact_every=50, retention_seconds=86400)
+        ids = self._record(validator, 30)
+        for pid in ids:
+            validator.validate_prediction(pid, self.rng.uniform(95, 105))
+        # 60 events -> compacted once at 50, 10 events left in the journal
+        self.assertEqual(len(self._journal_lines()), 10)
+        before = validator.stats.to_dict()
+        symbol_stats = {s: validator.get_symbol_stats(s) for s in ('BTCUSD', 'ETHUSD', 'SOLUSD')}
+
+        _Clock.current += timedelta(days=2)
+        validator.compact()
+        self.assertEqual(self._journal_lines(), [])
+        self.assertEqual(validator.predictions, {})
+        self.assertEqual(validator.archived.overall.total, 30)
+        after = validator.stats.to_dict()
+        self.assertEqual({k: v for k, v in after.items() if k != 'accuracy_last_24h'},
+                         {k: v for k, v in before.items() if k != 'accuracy_last_24h'})
+
+        again = self._validator()
+        self.assertEqual(again.stats.total_predictions, 30)
+        self.assertEqual(again.stats.direction_correct, before['direction_correct'])
+        self.assertEqual({s: again.get_symbol_stats(s) for s in symbol_stats}, symbol_stats)
+        new_id = self._record(again, 1)[0]
+        self.assertEqual(again.stats.total_predictions, 31)
+        self.assertEqual(again.pending_validations, [new_id])
+
+    def test_legacy_state_file(self):
+        validator = self._validator()
+        ids = self._record(validator, 5)
+        validator.validate_prediction(ids[0], 110.0)
+        legacy = {
+            'predictions': {pid: p.to_dict() for pid, p in validator.predictions.items()},
+            'pending': ids[1:] + ids[1:2],          # old files carried duplicates
+            'stats': validator.stats.to_dict(),
+            'updated': _Clock.current.isoformat(),
+        }
+        os.remove(self.journal_file)
+        with open(self.state_file, 'w') as f:
+            json.dump(legacy, f, indent=2)
+
+        loaded = self._validator()
+        self.assertEqual(loaded.pending_validations, ids[1:])
+        self.assertEqual(loaded.stats.to_dict(), validator.stats.to_dict())
+        with open(self.state_file) as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['version'], pv.SNAPSHOT_VERSION)
+        self.assertEqual(len(snapshot['predictions']), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
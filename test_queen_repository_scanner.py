@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Queen's incremental repository index
+
+Tests cover:
+- Indexed wisdom matches the original full walk-and-read score
+- A refresh re-reads only added/changed files and drops deleted ones
+- The index persists across instances and resets when patterns change
+- The background thread picks up edits; the decision path does no IO
+
+Run: python3 test_queen_repository_scanner.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from queen_repository_scanner import QueenRepositoryScanner
+
+FILES = {
+    "README.md": "Queen strategy notes. PROFIT and LEARNING.",
+    "engine.py": "# handles ERROR and FAILURE paths\nWIN = True\n",
+    "state.json": '{"status": "CRASH recovered", "mode": "EMERGENCY"}',
+    "notes.txt": "nothing to see",
+    "image.png": "not knowledge",
+    "docs/guide.md": "EVOLUTION of the INTELLIGENCE. Deprecated: old BUG list.",
+    ".git/config.txt": "QUEEN QUEEN QUEEN",
+    "venv/lib/site.py": "PROFIT",
+    "pkg/__pycache__/x.txt": "PROFIT",
+}
+
+
+def _reference_total(scanner: QueenRepositoryScanner) -> float:
+    """The original scan_repository()/_analyze_file() sum, unclamped."""
+    total = 0.5
+    for root, dirs, files in os.walk(scanner.repo_path):
+        if '.git' in root or '__pycache__' in root or 'venv' in root:
+            continue
+        for file in files:
+            if not file.endswith(('.md', '.py', '.json', '.txt')):
+                continue
+            file_path = Path(root) / file
+            if file_path == scanner.index_path:
+                continue
+            score = 0.0
+            try:
+                if file_path.stat().st_size > 1_000_000:
+                    continue
+                content_upper = file_path.read_text(errors='ignore').upper()
+                mult = 1.5 if (time.time() - file_path.stat().st_mtime) < 86400 else 1.0
+                for kind, div in (('positive', 100), ('negative', 100), ('critical', 50)):
+                    for word, val in scanner.knowledge_patterns[kind].items():
+                        if word in content_upper:
+                            score += (val * mult) / div
+                if file_path.suffix == '.md':
+                    score += 0.05
+                if file_path.suffix == '.py':
+                    score += 0.02
+            except Exception:
+                pass
+            total += score
+    return total
+
+
+class TestRepositoryIndex(unittest.TestCase):
+    """Incremental index against the original full scan."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="queen_repo_")
+        for rel, body in FILES.items():
+            path = Path(self.tmp, rel)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body)
+        Path(self.tmp, "big.txt").write_text("PROFIT " * 200_000)
+        old = time.time() - 3 * 86400
+        os.utime(Path(self.tmp, "notes.txt"), (old, old))
+        os.utime(Path(self.tmp, "engine.py"), (old, old))
+        os.symlink(os.path.join(self.tmp, "missing.md"), os.path.join(self.tmp, "dangling.md"))
+        self.scanner = self._scanner()
+
+    def tearDown(self):
+        self.scanner.stop_background()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _scanner(self) -> QueenRepositoryScanner:
+        scanner = QueenRepositoryScanner(self.tmp)
+        scanner.thought_bus = None
+        return scanner
+
+    def test_matches_full_scan(self):
+        stats = self.scanner.refresh()
+        self.assertEqual(stats['added'], 7)       # 5 knowledge files + big.txt + dangling.md
+        self.assertAlmostEqual(self.scanner._aggregate(time.time()), _reference_total(self.scanner), places=12)
+        self.assertAlmostEqual(self.scanner.wisdom_factor, max(0.1, min(1.0, _reference_total(self.scanner))))
+        self.assertTrue(self.scanner.index_path.exists())
+
+    def test_only_changed_files_are_read(self):
+        self.scanner.refresh()
+        reads = []
+        original = self.scanner._score_file
+        self.scanner._score_file = lambda path, size, mtime: reads.append(path.name) or original(path, size, mtime)
+
+        self.assertEqual(self.scanner.refresh()['files'], 7)
+        self.assertEqual(reads, [])
+
+        Path(self.tmp, "notes.txt").write_text("LIQUIDATION warning")
+        Path(self.tmp, "docs/new.md").write_text("SUCCESS")
+        os.remove(Path(self.tmp, "README.md"))
+        stats = self.scanner.refresh()
+        self.assertEqual(sorted(reads), ["new.md", "notes.txt"])
+        self.assertEqual((stats['added'], stats['changed'], stats['removed']), (1, 1, 1))
+        self.assertAlmostEqual(self.scanner._aggregate(time.time()), _reference_total(self.scanner), places=12)
+
+    def test_index_persists(self):
+        self.scanner.refresh()
+        expected = self.scanner.wisdom_factor
+        reloaded = self._scanner()
+        self.assertEqual((reloaded.files_scanned, reloaded.wisdom_factor), (7, expected))
+        self.assertEqual(reloaded.refresh()['added'], 0)
+
+        reloaded.knowledge_patterns['positive']['NOTES'] = 0.5
+        reloaded._index = {}
+        reloaded._load_index()
+        self.assertEqual(reloaded._index, {})     # Different patterns -> rebuild
+
+    def test_background_refresh_and_cached_reads(self):
+        self.scanner.start_background(poll_interval=0.05)
+        deadline = time.time() + 5
+        while self.scanner.files_scanned == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        before = self.scanner.get_wisdom_factor()
+
+        Path(self.tmp, "alarm.txt").write_text("CRASH LIQUIDATION EMERGENCY")
+        deadline = time.time() + 5
+        while self.scanner.get_wisdom_factor() == before and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertLess(self.scanner.get_wisdom_factor(), before)
+
+        def _no_io():
+            raise AssertionError("decision path touched the disk")
+        self.scanner._stat_tree = _no_io
+        self.assertEqual(self.scanner.scan_repository(), self.scanner.get_wisdom_factor())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Queen's deadline-bounded signal fan-out
+
+Tests cover:
+- Children run side by side: a round takes the slowest child, not the sum
+- A child that misses the budget gets its last value with a staleness weight
+  (0 when it never answered); its late answer refreshes that value
+- A child still running from the last round is not started again ('busy')
+- Errors fall back like timeouts; per-child counters and percentiles
+- Scoped keys ('kind@symbol'): one busy guard, counter and metric label per
+  kind, last-known values per symbol in a bounded LRU; inline mode too
+- get_collective_signal / gather_neural_inputs stay within budget with a
+  hung child and weight stale children down
+- autonomous_trade_decision bounds the dream consultation
+
+Run: python3 test_queen_signal_fanout.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queen_signal_fanout as qsf
+from queen_signal_fanout import SignalFanout
+
+
+def _sleeper(seconds, value):
+    def call():
+        time.sleep(seconds)
+        return value
+    return call
+
+
+class TestSignalFanout(unittest.TestCase):
+    """SignalFanout on its own."""
+
+    def setUp(self):
+        self.fanout = SignalFanout('test', max_workers=4, half_life_s=60.0)
+
+    def test_concurrent_round_and_stale_substitution(self):
+        start = time.perf_counter()
+        got = self.fanout.gather({'a': _sleeper(0.1, 1.0), 'b': _sleeper(0.1, 2.0), 'c': _sleeper(0.1, 3.0)},
+                                 budget_s=1.0)
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.assertEqual([(r.status, r.value, r.weight) for r in got.values()],
+                         [('ok', 1.0, 1.0), ('ok', 2.0, 1.0), ('ok', 3.0, 1.0)])
+
+        slow = threading.Event()
+        start = time.perf_counter()
+        got = self.fanout.gather({'a': lambda: 10.0, 'b': lambda: slow.wait(2) and 20.0, 'new': lambda: slow.wait(2)},
+                                 budget_s=0.05, defaults={'new': 'neutral'})
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertEqual((got['a'].status, got['a'].value), ('ok', 10.0))
+        self.assertEqual((got['b'].status, got['b'].value), ('timeout', 2.0))
+        self.assertGreater(got['b'].weight, 0.99)
+        self.assertEqual((got['new'].value, got['new'].weight), ('neutral', 0.0))
+
+        # While 'b' is still running it is not started again
+        got = self.fanout.gather({'b': lambda: 99.0}, budget_s=0.05)
+        self.assertEqual((got['b'].status, got['b'].value), ('busy', 2.0))
+
+        # Its late answer becomes the last-known value
+        slow.set()
+        deadline = time.time() + 2
+        while self.fanout.stats()['inflight'] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.fanout.last_known('b')[0], 20.0)
+
+    def test_staleness_weight_and_errors(self):
+        self.fanout.gather({'x': lambda: 5.0}, budget_s=1.0)
+        with mock.patch.object(qsf.time, 'time', lambda: self.fanout.last_known('x')[1] + 120.0):
+            got = self.fanout.gather({'x': lambda: 1 / 0}, budget_s=1.0)
+        self.assertEqual((got['x'].status, got['x'].value), ('error', 5.0))
+        self.assertAlmostEqual(got['x'].weight, 0.25, places=6)      # two half-lives
+        self.assertIn('division', got['x'].error)
+
+        got = self.fanout.gather({'never': lambda: 1 / 0}, budget_s=1.0, defaults={'never': 0.5})
+        self.assertEqual((got['never'].value, got['never'].weight), (0.5, 0.0))
+
+        stats = self.fanout.stats()
+        self.assertEqual({k: stats['children']['x'][k] for k in ('calls', 'ok', 'error', 'timeout')},
+                         {'calls': 2, 'ok': 1, 'error': 1, 'timeout': 0})
+        self.assertEqual(stats['rounds']['gather']['count'], 3)
+        self.assertEqual(qsf.fanout_child_calls.get(fanout='test', child='x', status='error'), 1.0)
+
+    def test_sequential_mode(self):
+        fanout = SignalFanout('seq', concurrent=False)
+        got = fanout.gather({'a': _sleeper(0.06, 1), 'b': _sleeper(0.06, 2)}, budget_s=0.01)
+        self.assertEqual([r.status for r in got.values()], ['ok', 'ok'])
+
+    def test_scoped_keys_share_kind(self):
+        fanout = SignalFanout('scoped', max_workers=4, half_life_s=60.0, last_known_max=3)
+        fanout.gather({'clownfish@BTC': lambda: 1.0}, budget_s=1.0)
+        fanout.gather({'clownfish@ETH': lambda: 2.0}, budget_s=1.0)
+        self.assertEqual(fanout.last_known('clownfish@BTC')[0], 1.0)    # Never another symbol's
+
+        # One instance, one query at a time: ETH waits while BTC's call still runs
+        hang = threading.Event()
+        fanout.gather({'clownfish@BTC': lambda: hang.wait(2) and 3.0}, budget_s=0.05)
+        got = fanout.gather({'clownfish@ETH': lambda: 99.0}, budget_s=0.05)
+        self.assertEqual((got['clownfish@ETH'].status, got['clownfish@ETH'].value), ('busy', 2.0))
+        hang.set()
+        deadline = time.time() + 2
+        while fanout.stats()['inflight'] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(fanout.last_known('clownfish@BTC')[0], 3.0)
+
+        # Counters and metric labels are per kind; scoped values are an LRU
+        for i in range(10):
+            fanout.gather({f'dream@S{i}': lambda i=i: i}, budget_s=1.0)
+        stats = fanout.stats()
+        self.assertEqual(sorted(stats['children']), ['clownfish', 'dream'])
+        self.assertEqual(stats['children']['dream']['ok'], 10)
+        self.assertEqual(stats['last_known'], 3)
+        self.assertEqual(fanout.last_known('dream@S9')[0], 9)
+        self.assertIsNone(fanout.last_known('clownfish@BTC'))
+        self.assertEqual(qsf.fanout_child_calls.get(fanout='scoped', child='dream', status='ok'), 10.0)
+        self.assertEqual(qsf.fanout_child_calls.get(fanout='scoped', child='dream@S9', status='ok'), 0.0)
+
+    def test_sequential_mode_busy_guard(self):
+        fanout = SignalFanout('seq-busy', concurrent=False)
+        inner = {}
+
+        def outer():
+            inner.update(fanout.gather({'node@ETH': lambda: 2.0}, budget_s=1.0))
+            return 1.0
+        got = fanout.gather({'node@BTC': outer}, budget_s=1.0)
+        self.assertEqual(got['node@BTC'].status, 'ok')
+        self.assertEqual(inner['node@ETH'].status, 'busy')
+        self.assertEqual(fanout.stats()['inflight'], [])
+
+
+class TestQueenFanout(unittest.TestCase):
+    """QueenHiveMind decision paths on top of the fan-out."""
+
+    @classmethod
+    def setUpClass(cls):
+        import aureon_queen_hive_mind as hive
+        cls.hive = hive
+
+    def _queen(self):
+        queen = self.hive.QueenHiveMind.__new__(self.hive.QueenHiveMind)
+        queen.children = {}
+        queen.harmonic_field = None
+        queen.clownfish = None
+        queen.signal_fanout = SignalFanout('queen-test', half_life_s=60.0)
+        return queen
+
+    def _child(self, name, kind, instance):
+        return self.hive.HiveChild(name=name, system_type=kind, instance=instance)
+
+    def test_collective_signal_with_hung_child(self):
+        queen = self._queen()
+        hang = threading.Event()
+        fast = mock.Mock(get_conviction=lambda: 0.8, get_mood=lambda: 'BULLISH')
+        slow = mock.Mock(get_conviction=lambda: hang.wait(5) and 0.4, get_mood=lambda: 'BULLISH')
+        queen.children = {'fast': self._child('fast', 'ENIGMA', fast),
+                          'slow': self._child('slow', 'ENIGMA', slow)}
+
+        with mock.patch.object(qsf, 'SIGNAL_BUDGET_S', 0.05):
+            start = time.perf_counter()
+            result = queen.get_collective_signal()
+            self.assertLess(time.perf_counter() - start, 0.3)
+            self.assertAlmostEqual(result['collective_signal'], 0.8)
+            self.assertEqual(result['sources'], 1)
+            self.assertEqual(result['stale_sources'], ['child:slow'])
+
+            hang.set()
+            time.sleep(0.05)
+            hang.clear()
+            result = queen.get_collective_signal()       # 'slow' hangs again -> last value, weight ~1
+        self.assertEqual(result['sources'], 2)
+        self.assertAlmostEqual(result['collective_signal'], 0.6, places=3)
+        hang.set()
+        self.assertEqual(queen.get_fanout_stats()['children']['child:slow']['timeout'], 2)
+
+    def test_neural_inputs_weight_stale_children(self):
+        if not self.hive.NeuralInput:
+            self.skipTest("NeuralInput not available")
+        queen = self._queen()
+        calls = {'repo_wisdom': lambda: 1.0, 'mycelium': lambda: 1.0}
+        with mock.patch.object(queen, '_neural_input_calls', lambda market_state=None: dict(calls)):
+            fresh = queen.gather_neural_inputs(wisdom_score=0.5)
+            self.assertAlmostEqual(fresh.wisdom_score, 0.65)
+            self.assertAlmostEqual(fresh.mycelium_signal, 1.0)
+
+            calls['repo_wisdom'] = lambda: 1 / 0
+            calls['mycelium'] = lambda: 1 / 0
+            last = queen.signal_fanout.last_known('repo_wisdom')[1]
+            with mock.patch.object(qsf.time, 'time', lambda: last + 60.0):
+                stale = queen.gather_neural_inputs(wisdom_score=0.5)
+            self.assertAlmostEqual(stale.wisdom_score, 0.5 * 0.85 + 1.0 * 0.15, places=5)
+            self.assertAlmostEqual(stale.mycelium_signal, 0.5, places=5)
+
+        fresh_queen = self._queen()
+        with mock.patch.object(fresh_queen, '_neural_input_calls', lambda market_state=None: dict(calls)):
+            none = fresh_queen.gather_neural_inputs(wisdom_score=0.5)
+        self.assertAlmostEqual(none.wisdom_score, 0.5)
+        self.assertEqual(none.mycelium_signal, 0.0)
+
+    def test_autonomous_decision_bounded(self):
+        queen = self._queen()
+        queen.has_full_control = True
+        queen.controlled_systems = {}
+        queen.total_profit = 0.0
+        queen.gaia_connection = {'total_alignment': 1.0}
+        hang = threading.Event()
+        with mock.patch.object(queen, 'dream_of_winning', lambda opp=None: hang.wait(5) or {'will_win': True}), \
+                mock.patch.object(queen, '_generate_decision_message', lambda d, o: d), \
+                mock.patch.object(qsf, 'SIGNAL_BUDGET_S', 0.05):
+            start = time.perf_counter()
+            result = queen.autonomous_trade_decision({'symbol': 'BTC/USD', 'confidence': 0.9, 'expected_profit': 0.01})
+        self.assertLess(time.perf_counter() - start, 0.3)
+        hang.set()
+        self.assertEqual(result['decision'], 'EXECUTE')
+        self.assertIsNone(result['intelligence']['dream_guidance'])
+        self.assertEqual(result['intelligence']['dream_weight'], 0.0)
+        self.assertIn('autonomous_trade_decision', queen.get_fanout_stats()['rounds'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Unit tests for SharedTickerTable
+
+Tests cover:
+- Put/get round trip and in-place updates
+- Row reuse per symbol and capacity limit
+- Visibility of rows written by another process
+- Seqlock recovery from a writer that died mid-update
+- publish_ticker_cache picking the preferred quote per base
+- Source priority: Kraken REST cannot overwrite a fresh Binance WS row,
+  older data never replaces newer
+
+Run: python3 test_shared_ticker_table.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import time
+import tempfile
+import unittest
+import multiprocessing
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_ticker_table
+from shared_ticker_table import SharedTickerTable, HEADER_SIZE, SEQ_STRUCT
+
+
+def _child_writer(path: str) -> None:
+    table = SharedTickerTable(path=path, capacity=16)
+    table.put('SOL', 150.0, 149.9, 150.1, 2.0, 1e6, time.time(), source='kraken_rest', pair='SOLUSD')
+    table.close()
+
+
+class TestSharedTickerTable(unittest.TestCase):
+    """Test suite for SharedTickerTable."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'ticker_table.bin')
+        self.table = SharedTickerTable(path=self.path, capacity=16)
+
+    def tearDown(self):
+        self.table.close()
+        self.tmpdir.cleanup()
+
+    def test_put_get_round_trip(self):
+        ts = time.time()
+        self.assertTrue(self.table.put('btc', 95000.0, 94999.5, 95000.5, 1.5, 3.2e9, ts,
+                                       source='binance_ws', pair='BTCUSDT'))
+        price, bid, ask, change, volume, stamp, source, pair = self.table.get('BTC')
+        self.assertEqual(price, 95000.0)
+        self.assertEqual(bid, 94999.5)
+        self.assertEqual(ask, 95000.5)
+        self.assertEqual(change, 1.5)
+        self.assertEqual(volume, 3.2e9)
+        self.assertEqual(stamp, ts)
+        self.assertEqual(source, 'binance_ws')
+        self.assertEqual(pair, 'BTCUSDT')
+        self.assertIsNone(self.table.get('ETH'))
+
+    def test_update_reuses_row(self):
+        self.table.put('ETH', 3000.0, 3000.0, 3000.0, 0.0, 0.0, time.time())
+        self.table.put('ETH', 3100.0, 3100.0, 3100.0, 0.0, 0.0, time.time())
+        self.assertEqual(self.table.get_price('ETH'), 3100.0)
+        self.assertEqual(self.table.symbols(), ['ETH'])
+
+    def test_capacity_limit(self):
+        rows = [(f'S{i}', 1.0, 1.0, 1.0, 0.0, 0.0, time.time(), 'test', '') for i in range(20)]
+        self.assertEqual(self.table.put_many(rows), 16)
+        self.assertIsNone(self.table.get('S19'))
+
+    def test_reader_sees_other_process_rows(self):
+        reader = SharedTickerTable(path=self.path, capacity=16)
+        try:
+            self.assertIsNone(reader.get('SOL'))
+            proc = multiprocessing.get_context('spawn').Process(target=_child_writer, args=(self.path,))
+            proc.start()
+            proc.join(30)
+            self.assertEqual(proc.exitcode, 0)
+            self.assertEqual(reader.get_price('SOL'), 150.0)
+            self.assertIn('SOL', reader.snapshot())
+        finally:
+            reader.close()
+
+    def test_recovers_from_torn_write(self):
+        self.table.put('XRP', 0.5, 0.5, 0.5, 0.0, 0.0, time.time())
+        # Simulate a writer that died after bumping seq to odd
+        seq = SEQ_STRUCT.unpack_from(self.table._mm, HEADER_SIZE)[0]
+        SEQ_STRUCT.pack_into(self.table._mm, HEADER_SIZE, seq + 1)
+        self.assertIsNone(self.table.get('XRP'))
+        self.table.put('XRP', 0.6, 0.6, 0.6, 0.0, 0.0, time.time())
+        self.assertEqual(self.table.get_price('XRP'), 0.6)
+
+    def test_source_priority(self):
+        now = time.time()
+        self.assertTrue(self.table.put('BTC', 95000.0, 95000.0, 95000.0, 0.0, 0.0, now, source='binance_ws'))
+        self.assertFalse(self.table.put('BTC', 94000.0, 94000.0, 94000.0, 0.0, 0.0, now + 1, source='kraken_rest'))
+        self.assertFalse(self.table.put('BTC', 96000.0, 96000.0, 96000.0, 0.0, 0.0, now - 1, source='binance_ws'))
+        self.assertEqual(self.table.get('BTC')[6], 'binance_ws')
+
+        # Binance went quiet: Kraken takes over, and Binance wins it back
+        stale = now + self.table.source_hold_s + 1
+        self.assertTrue(self.table.put('BTC', 94000.0, 94000.0, 94000.0, 0.0, 0.0, stale, source='kraken_rest'))
+        self.assertEqual(self.table.get('BTC')[6], 'kraken_rest')
+        self.assertTrue(self.table.put('BTC', 95500.0, 95500.0, 95500.0, 0.0, 0.0, stale + 1, source='binance_ws'))
+        self.assertEqual(self.table.get_price('BTC'), 95500.0)
+
+        rows = [('BTC', 1.0, 1.0, 1.0, 0.0, 0.0, stale + 2, 'kraken_rest', ''),
+                ('ETH', 3000.0, 3000.0, 3000.0, 0.0, 0.0, stale + 2, 'kraken_rest', '')]
+        self.assertEqual(self.table.put_many(rows), 1)
+
+    def test_publish_ticker_cache(self):
+        prices = {'BTC': 95000.0}
+        entry_usdt = {'price': 95000.0, 'change24h': 1.0, 'volume': 10.0, 'base': 'BTC', 'quote': 'USDT'}
+        entry_usdc = {'price': 94990.0, 'change24h': 1.0, 'volume': 5.0, 'base': 'BTC', 'quote': 'USDC'}
+        ticker_cache = {
+            'BTCUSDC': entry_usdc, 'binance:BTCUSDC': entry_usdc,
+            'BTCUSDT': entry_usdt, 'binance:BTCUSDT': entry_usdt,
+        }
+        original = shared_ticker_table._table_instance
+        shared_ticker_table._table_instance = self.table
+        try:
+            written = shared_ticker_table.publish_ticker_cache(prices, ticker_cache, 'binance_ws', time.time())
+        finally:
+            shared_ticker_table._table_instance = original
+        self.assertEqual(written, 1)
+        row = self.table.get('BTC')
+        self.assertEqual(row[0], 95000.0)
+        self.assertEqual(row[6], 'binance_ws')
+        self.assertEqual(row[7], 'BTCUSDT')
+
+
+if __name__ == '__main__':
+    unittest.main()
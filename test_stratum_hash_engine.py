@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Stratum hashing engine
+
+Tests cover:
+- Header template + midstate hashing match a full per-nonce header rebuild
+- Range scan finds exactly the shares a brute-force loop finds
+- Process pool returns the same shares and counts every hash once
+- cancel() stops in-flight ranges early (clean_jobs)
+- MiningSession mines against the local fake Stratum pool in both thread
+  and process mode; the pool accepts every share and measured H/s is kept
+  apart from the resonance-scaled counter
+- A pool that answers before sendall() returns still reaches the callback
+
+Run: python3 test_stratum_hash_engine.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import json
+import time
+import struct
+import hashlib
+import threading
+import unittest
+from types import SimpleNamespace
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stratum_hash_engine import (
+    FakeStratumServer,
+    HashEngine,
+    HashMeter,
+    HeaderTemplate,
+    target_from_difficulty,
+)
+
+EASY_TARGET = 1 << 248      # ~1 share per 256 hashes
+
+
+def _job(server: FakeStratumServer) -> SimpleNamespace:
+    return SimpleNamespace(**server.current_job, extranonce1=server.extranonce1)
+
+
+def _rebuilt_hash(job, extranonce2: bytes, nonce: int) -> bytes:
+    """The miner's original build_header + double SHA-256."""
+    coinbase = job.coinbase1 + job.extranonce1 + extranonce2 + job.coinbase2
+    root = hashlib.sha256(hashlib.sha256(coinbase).digest()).digest()
+    for branch in job.merkle_branches:
+        root = hashlib.sha256(hashlib.sha256(root + branch).digest()).digest()
+    header = job.version + job.prev_hash + root + job.ntime + job.nbits + struct.pack('<I', nonce)
+    return hashlib.sha256(hashlib.sha256(header).digest()).digest()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHeaderTemplate(unittest.TestCase):
+    """Template hashing against a per-nonce rebuild."""
+
+    def setUp(self):
+        self.server = FakeStratumServer()
+        self.job = _job(self.server)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_hash_matches_rebuild(self):
+        template = HeaderTemplate.build(self.job, b'\x01\x02\x03\x04')
+        for nonce in (0, 1, 0xDEADBEEF, 0xFFFFFFFF, 123456):
+            self.assertEqual(template.hash(nonce), _rebuilt_hash(self.job, b'\x01\x02\x03\x04', nonce))
+            self.assertEqual(len(template.header(nonce)), 80)
+
+    def test_scan_matches_brute_force(self):
+        template = HeaderTemplate.build(self.job, b'\x00' * 4)
+        expected = [n for n in range(5000)
+                    if int.from_bytes(_rebuilt_hash(self.job, b'\x00' * 4, n)[::-1], 'big') < EASY_TARGET]
+        result = template.scan(0, 5000, EASY_TARGET, check_every=512)
+        self.assertEqual([n for n, _ in result.shares], expected)
+        self.assertEqual((result.hashes, result.end, result.cancelled), (5000, 5000, False))
+
+
+class TestHashEngine(unittest.TestCase):
+    """Process pool fan-out and cancellation."""
+
+    def setUp(self):
+        self.server = FakeStratumServer()
+        self.template = HeaderTemplate.build(_job(self.server), b'\x00' * 4)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_pool_matches_single_scan(self):
+        expected = self.template.scan(1000, 21000, EASY_TARGET).shares
+        with HashEngine(processes=2, chunk_size=3000) as engine:
+            summary = engine.mine(self.template, EASY_TARGET, 1000, 21000)
+            self.assertEqual(summary.hashes, 20000)
+            self.assertEqual(summary.shares, expected)
+            self.assertFalse(summary.cancelled)
+            self.assertEqual(engine.meter.total, 20000)
+
+    def test_cancel_stops_in_flight_ranges(self):
+        with HashEngine(processes=2, chunk_size=1 << 20, check_every=256) as engine:
+            threading.Timer(0.3, engine.cancel).start()
+            start = time.perf_counter()
+            summary = engine.mine(self.template, EASY_TARGET, 0, 1 << 24)
+            self.assertLess(time.perf_counter() - start, 5.0)
+            self.assertTrue(summary.cancelled)
+            self.assertEqual(summary.shares, [])
+            self.assertLess(summary.hashes, 1 << 24)
+            # Next job runs normally after a cancel
+            self.assertEqual(engine.mine(self.template, EASY_TARGET, 0, 1000).hashes, 1000)
+
+    def test_meter_window(self):
+        clock = _Clock()
+        meter = HashMeter(window_s=10.0, clock=clock)
+        clock.now = 5.0
+        meter.add(500)
+        self.assertEqual(meter.rate(), 100.0)
+        clock.now = 20.0
+        meter.add(1000)
+        self.assertEqual(meter.rate(), 100.0)
+        self.assertEqual(meter.total, 1500)
+
+
+class TestMiningSessionAgainstFakePool(unittest.TestCase):
+    """End-to-end Stratum mining on localhost."""
+
+    @classmethod
+    def setUpClass(cls):
+        import aureon_miner
+        cls.miner = aureon_miner
+
+    def _optimizer(self):
+        return SimpleNamespace(
+            should_mine=lambda: True,
+            get_batch_size=lambda: 20000,
+            get_nonce_bias=lambda: 0,
+            get_quantum_nonce=lambda base: base,
+            ping_hash=lambda thread_id, nonce, h: 2.0,      # max resonance: doubles the display counter
+            pong_result=lambda thread_id, found, difficulty=0.0: 1.0,
+            on_share_found=lambda h, nonce, diff: None,
+        )
+
+    def _mine(self, threads: int, processes: int):
+        with FakeStratumServer(difficulty=1e-6) as server:
+            session = self.miner.MiningSession('127.0.0.1', server.port, 'worker', 'x',
+                                               self._optimizer(), 'fake-pool')
+            self.assertTrue(session.start(threads, processes=processes))
+            try:
+                deadline = time.time() + 60
+                while len(server.accepted) < 2 and time.time() < deadline:
+                    time.sleep(0.1)
+                if processes:
+                    cancels = session._engine.cancellations
+                    server.notify(clean=True)
+                    deadline = time.time() + 5
+                    while session._engine.cancellations == cancels and time.time() < deadline:
+                        time.sleep(0.05)
+                    self.assertGreater(session._engine.cancellations, cancels)
+            finally:
+                session.stop()
+            self.assertGreaterEqual(len(server.accepted), 2)
+            self.assertEqual([r for r in server.rejected if r['reason'] != 'stale job'], [])
+            self.assertGreater(session.stats.measured_hashes, 0)
+            self.assertGreater(session.stats.hashes, session.stats.measured_hashes)
+            return session
+
+    def test_thread_mode(self):
+        self._mine(threads=1, processes=0)
+
+    def test_process_mode(self):
+        session = self._mine(threads=1, processes=2)
+        self.assertIsNone(session._engine)
+
+    def test_instant_response_not_lost(self):
+        client = self.miner.StratumClient('127.0.0.1', 0, 'worker')
+
+        class InstantPool:
+            def sendall(sock, data):
+                msg = json.loads(data)
+                result = [[], '0000abcd', 4] if msg['method'] == 'mining.subscribe' else True
+                client._handle_message({'id': msg['id'], 'result': result, 'error': None})
+
+        client.socket = InstantPool()
+        start = time.perf_counter()
+        self.assertTrue(client._subscribe())
+        self.assertTrue(client._authorize())
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual((client.extranonce1, client.pending_responses), (bytes.fromhex('0000abcd'), {}))
+
+    def test_build_header_uses_template(self):
+        with FakeStratumServer() as server:
+            raw = server.current_job
+            job = self.miner.MiningJob(
+                job_id=raw['job_id'], prev_hash=raw['prev_hash'], coinbase1=raw['coinbase1'],
+                coinbase2=raw['coinbase2'], merkle_branches=raw['merkle_branches'], version=raw['version'],
+                nbits=raw['nbits'], ntime=raw['ntime'], clean_jobs=True,
+                target=target_from_difficulty(1.0), extranonce1=server.extranonce1, extranonce2_size=4)
+        header = job.build_header(b'\x00\x00\x00\x07', 42)
+        self.assertIs(job.header_template(b'\x00\x00\x00\x07'), job.header_template(b'\x00\x00\x00\x07'))
+        self.assertEqual(hashlib.sha256(hashlib.sha256(header).digest()).digest(),
+                         _rebuilt_hash(_job(server), b'\x00\x00\x00\x07', 42))
+
+
+if __name__ == '__main__':
+    unittest.main()
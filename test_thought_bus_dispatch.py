@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ThoughtBus topic-trie dispatch and group-commit persistence
+
+Tests cover:
+- Exact, prefix and global subscriptions (same semantics as before)
+- Handler order follows subscription order
+- Match cache invalidation on subscribe
+- Group/buffered/sync durability modes all persist every thought; sync
+  is the default, group commit is opt-in
+- Writer metrics (queue depth, batches, fsyncs)
+
+Run: python3 test_thought_bus_dispatch.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aureon_thought_bus import (
+    Thought,
+    ThoughtBus,
+    _TopicTrie,
+    DURABILITY_SYNC,
+    DURABILITY_GROUP,
+    DURABILITY_BUFFERED,
+)
+
+
+class TestTopicTrie(unittest.TestCase):
+    """Trie matching mirrors the old linear prefix checks."""
+
+    def test_match_semantics(self):
+        trie = _TopicTrie()
+        for order, key in enumerate(("*", "miner.*", "miner.signal", "min*", "market.snapshot")):
+            trie.add(key, order)
+
+        def keys(topic):
+            return [key for _, key in sorted(trie.match(topic))]
+        self.assertEqual(keys("miner.signal"), ["*", "miner.*", "miner.signal", "min*"])
+        self.assertEqual(keys("miner."), ["*", "miner.*", "min*"])
+        self.assertEqual(keys("market.snapshot"), ["*", "market.snapshot"])
+        self.assertEqual(keys("market.snap"), ["*"])
+
+
+class TestThoughtBusDispatch(unittest.TestCase):
+    """Dispatch order and caching."""
+
+    def test_handler_order_and_cache_invalidation(self):
+        bus = ThoughtBus(persist_path=None)
+        calls = []
+        bus.subscribe("miner.signal", lambda t: calls.append("exact"))
+        bus.subscribe("min*", lambda t: calls.append("short_prefix"))
+        bus.subscribe("miner.*", lambda t: calls.append("prefix"))
+
+        bus.publish(Thought(source="test", topic="miner.signal"))
+        self.assertEqual(calls, ["exact", "short_prefix", "prefix"])
+
+        calls.clear()
+        bus.publish(Thought(source="test", topic="miner.signal"))
+        self.assertEqual(calls, ["exact", "short_prefix", "prefix"])
+        self.assertGreaterEqual(bus.get_metrics()["match_cache_hits"], 1)
+
+        bus.subscribe("miner.signal", lambda t: calls.append("late"))
+        calls.clear()
+        bus.publish(Thought(source="test", topic="miner.signal"))
+        self.assertEqual(calls, ["exact", "late", "short_prefix", "prefix"])
+
+    def test_handler_error_becomes_system_error(self):
+        bus = ThoughtBus(persist_path=None)
+        bus.subscribe("boom", lambda t: 1 / 0)
+        bus.publish(Thought(source="test", topic="boom"))
+        topics = [t["topic"] for t in bus.get_recent(10)]
+        self.assertIn("system.error", topics)
+
+
+class TestThoughtBusPersistence(unittest.TestCase):
+    """Every durability mode writes every thought exactly once."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _publish_and_read(self, durability):
+        path = os.path.join(self.tmpdir.name, f"{durability}.jsonl")
+        bus = ThoughtBus(persist_path=path, durability=durability, flush_interval=0.01)
+        for i in range(250):
+            bus.publish(Thought(source="test", topic="load.test", payload={"i": i}))
+        self.assertTrue(bus.flush(timeout=10))
+        metrics = bus.get_metrics()
+        bus.close()
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return rows, metrics
+
+    def test_group_commit_batches(self):
+        rows, metrics = self._publish_and_read(DURABILITY_GROUP)
+        self.assertEqual([r["payload"]["i"] for r in rows], list(range(250)))
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["written"], 250)
+        self.assertLess(metrics["fsyncs"], 250)
+        self.assertEqual(metrics["fsyncs"], metrics["batches"])
+
+    def test_buffered_never_fsyncs(self):
+        rows, metrics = self._publish_and_read(DURABILITY_BUFFERED)
+        self.assertEqual(len(rows), 250)
+        self.assertEqual(metrics["fsyncs"], 0)
+
+    def test_sync_mode_writes_inline(self):
+        rows, metrics = self._publish_and_read(DURABILITY_SYNC)
+        self.assertEqual(len(rows), 250)
+        self.assertEqual(metrics["durability"], DURABILITY_SYNC)
+
+    def test_sync_is_default(self):
+        path = os.path.join(self.tmpdir.name, "default.jsonl")
+        bus = ThoughtBus(persist_path=path)
+        self.assertEqual(bus.get_metrics()["durability"], DURABILITY_SYNC)
+        bus.publish(Thought(source="test", topic="load.test"))
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)            # On disk when publish() returns
+        bus.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
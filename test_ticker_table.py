@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental ticker table and concurrent fetch_prices
+
+Tests cover:
+- Venue snapshots merge with the old precedence rules (Kraken overwrites,
+  Binance only fills gaps, Alpaca positions overwrite, stablecoins last)
+- Commits report changed / removed prices and tickers and keep dict identity
+- A failed venue keeps its previous snapshot and is reported stale, with
+  the bases it still prices; past max_age its rows leave the table
+- fetch_prices runs venues side by side, keeps a timed-out venue's cached
+  data and picks up its late result on the next turn
+- Stale venues' prices are not fed to momentum / market map as new samples
+- The barter navigator only re-derives edges touching moved prices
+
+Run: python3 test_ticker_table.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import io
+import time
+import asyncio
+import threading
+import unittest
+import contextlib
+from unittest import mock
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ticker_table import TickerTable, VenueSnapshot
+from momentum_index import MomentumRings
+
+ORDER = ('ws_cache', 'kraken', 'binance', 'alpaca')
+
+
+def _snap(venue, prices=(), tickers=()):
+    snap = VenueSnapshot(venue)
+    for base, price, overwrite in prices:
+        snap.set_price(base, price, overwrite)
+    for entry, keys in tickers:
+        snap.add_ticker(entry, *keys)
+    return snap
+
+
+class TestTickerTable(unittest.TestCase):
+    """Merging and diffing venue snapshots."""
+
+    def test_precedence_and_diff(self):
+        table = TickerTable(fixed_prices={'USD': 1.0, 'USDT': 1.0})
+        btc_k = {'price': 100.0, 'exchange': 'kraken'}
+        table.set_snapshot('kraken', _snap('kraken', [('BTC', 100.0, True)], [(btc_k, ('kraken:XBTUSD', 'XBTUSD'))]))
+        table.set_snapshot('binance', _snap('binance', [('BTC', 99.0, False), ('BNB', 5.0, False), ('USDT', 1.01, False)],
+                                            [({'price': 99.0}, ('binance:BTCUSDT', 'BTCUSDT'))]))
+        table.set_snapshot('alpaca', _snap('alpaca', [('BTC', 101.0, True), ('BNB', 6.0, False)]))
+        prices, tickers = table.prices, table.tickers
+        diff = table.commit(ORDER)
+
+        self.assertEqual(table.prices, {'BTC': 101.0, 'BNB': 5.0, 'USDT': 1.01, 'USD': 1.0})
+        self.assertIs(table.tickers['kraken:XBTUSD'], table.tickers['XBTUSD'])
+        self.assertEqual(diff.prices, {'BTC', 'BNB', 'USDT', 'USD'})
+        self.assertEqual(diff.tickers, {'kraken:XBTUSD', 'XBTUSD', 'binance:BTCUSDT', 'BTCUSDT'})
+        self.assertEqual(diff.fresh_venues, ['kraken', 'binance', 'alpaca'])
+        version = table.version
+
+        # Next turn: Kraken moves, Binance drops a pair, Alpaca fails (keeps last snapshot)
+        table.set_snapshot('kraken', _snap('kraken', [('BTC', 102.0, True)],
+                                           [({'price': 102.0, 'exchange': 'kraken'}, ('kraken:XBTUSD', 'XBTUSD'))]))
+        table.set_snapshot('binance', _snap('binance', [('BTC', 99.0, False)]))
+        diff = table.commit(ORDER)
+        self.assertIs(table.prices, prices)
+        self.assertIs(table.tickers, tickers)
+        self.assertEqual(table.prices, {'BTC': 101.0, 'BNB': 6.0, 'USD': 1.0, 'USDT': 1.0})
+        self.assertEqual(diff.prices, {'BNB', 'USDT'})
+        self.assertEqual(diff.removed_prices, set())
+        self.assertEqual(diff.tickers, {'kraken:XBTUSD', 'XBTUSD'})
+        self.assertEqual(diff.removed_tickers, {'binance:BTCUSDT', 'BTCUSDT'})
+        self.assertEqual(diff.stale_venues, ['alpaca'])
+        self.assertEqual(table.version, version + 1)
+
+        diff = table.commit(ORDER)
+        self.assertFalse(diff)
+        self.assertEqual(table.version, version + 1)
+
+        table.drop_venue('alpaca')
+        diff = table.commit(ORDER)
+        self.assertEqual((diff.prices, diff.removed_prices), ({'BTC'}, {'BNB'}))   # BNB only came from Alpaca now
+        self.assertEqual(table.prices['BTC'], 102.0)
+
+    def test_stale_prices_and_max_age(self):
+        now = [0.0]
+        table = TickerTable(fixed_prices={'USD': 1.0}, max_age=30.0, clock=lambda: now[0])
+        table.set_snapshot('kraken', _snap('kraken', [('BTC', 100.0, True)], [({'price': 100.0}, ('XBTUSD',))]))
+        table.set_snapshot('binance', _snap('binance', [('BTC', 99.0, False), ('BNB', 5.0, False)]))
+        self.assertEqual(table.commit(ORDER).stale_prices, set())
+
+        now[0] = 20.0                                         # Binance fails from here on
+        table.set_snapshot('kraken', _snap('kraken', [('BTC', 101.0, True)], [({'price': 101.0}, ('XBTUSD',))]))
+        diff = table.commit(ORDER)
+        self.assertEqual((diff.stale_venues, diff.stale_prices), (['binance'], {'BNB'}))
+        self.assertEqual(table.age('binance'), 20.0)
+
+        now[0] = 31.0
+        table.set_snapshot('kraken', _snap('kraken', [('BTC', 101.0, True)], [({'price': 101.0}, ('XBTUSD',))]))
+        diff = table.commit(ORDER)
+        self.assertEqual((diff.expired_venues, diff.stale_venues, diff.stale_prices), (['binance'], [], set()))
+        self.assertEqual(diff.removed_prices, {'BNB'})
+        self.assertIsNone(table.snapshot('binance'))
+        self.assertEqual(table.prices, {'BTC': 101.0, 'USD': 1.0})
+
+
+class _Kraken:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.price = 100.0
+        self.release = None
+
+    def get_24h_tickers(self):
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        return [{'symbol': 'XBTUSD', 'lastPrice': str(self.price), 'priceChangePercent': '1', 'quoteVolume': '10'},
+                {'symbol': 'ETHUSD', 'lastPrice': '50', 'priceChangePercent': '0', 'quoteVolume': '5'}]
+
+
+class _Binance:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def ticker_24hr_all(self):
+        time.sleep(self.delay)
+        return [{'symbol': 'BTCUSDT', 'lastPrice': '99', 'priceChangePercent': '0', 'volume': '1'},
+                {'symbol': 'BNBUSDT', 'lastPrice': '5', 'priceChangePercent': '0', 'volume': '1'}]
+
+
+class TestFetchPrices(unittest.TestCase):
+    """MicroProfitLabyrinth.fetch_prices on stub venue clients."""
+
+    @classmethod
+    def setUpClass(cls):
+        import micro_profit_labyrinth as mpl
+        cls.mpl = mpl
+
+    def setUp(self):
+        self.patches = [mock.patch.object(self.mpl, 'HFT_ENGINE_AVAILABLE', False),
+                        mock.patch.object(self.mpl, 'HFT_ORDER_ROUTER_AVAILABLE', False),
+                        mock.patch.dict(os.environ, {'WS_PRICE_CACHE_PATH': ''})]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def _labyrinth(self, kraken, binance):
+        lab = self.mpl.MicroProfitLabyrinth.__new__(self.mpl.MicroProfitLabyrinth)
+        lab.kraken, lab.binance, lab.alpaca = kraken, binance, None
+        lab.binance_uk_mode = False
+        lab.binance_pairs = {'XBTUSD', 'BNBUSDT'}
+        lab.alpaca_pairs = {}
+        lab.ticker_table = self.mpl.TickerTable(fixed_prices=self.mpl.STABLECOIN_PRICES)
+        lab.ticker_changes = self.mpl.TickerDiff()
+        lab._price_fetches = {}
+        lab.prices, lab.ticker_cache = {}, {}
+        lab.barter_navigator = lab.market_map = lab.penny_turbo = None
+        lab.queen = lab.orca = lab.thought_bus = None
+        lab.momentum_rings = MomentumRings(window_seconds=60)
+        lab.asset_momentum = {}
+        lab.balances = {}
+        return lab
+
+    def _fetch(self, lab):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            prices = asyncio.run(lab.fetch_prices())
+        return prices, out.getvalue()
+
+    def test_concurrent_merge(self):
+        lab = self._labyrinth(_Kraken(delay=0.3), _Binance(delay=0.3))
+        start = time.perf_counter()
+        prices, _ = self._fetch(lab)
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.assertEqual(prices['BTC'], 100.0)             # Kraken wins over Binance
+        self.assertEqual(prices['BNB'], 5.0)
+        self.assertEqual(prices['USDT'], 1.0)
+        self.assertEqual(lab.ticker_cache['BTCUSDT']['exchange'], 'binance')
+        self.assertIs(lab.ticker_cache['kraken:XBTUSD'], lab.ticker_cache['XBTUSD'])
+        self.assertEqual(lab.binance_pairs, {'BNBUSDT'})    # Kraken symbols are not Binance pairs
+        self.assertIn('BTC', lab.ticker_changes.prices)
+
+        lab.kraken.delay = lab.binance.delay = 0.0
+        self._fetch(lab)
+        self.assertFalse(lab.ticker_changes)
+        lab.kraken.price = 101.0
+        self._fetch(lab)
+        self.assertEqual(lab.ticker_changes.prices, {'BTC'})
+        self.assertEqual(lab.ticker_changes.tickers, {'kraken:XBTUSD', 'XBTUSD'})
+
+    def test_timeout_keeps_cache_and_uses_late_result(self):
+        lab = self._labyrinth(_Kraken(), _Binance())
+        self._fetch(lab)
+        lab.kraken.release = threading.Event()
+        lab.kraken.price = 105.0
+        with mock.patch.dict(self.mpl.PRICE_FETCH_TIMEOUT_S, {'kraken': 0.1}):
+            start = time.perf_counter()
+            prices, out = self._fetch(lab)
+            self.assertLess(time.perf_counter() - start, 0.5)
+            self.assertIn('keeping 2 cached', out)
+            self.assertEqual(prices['BTC'], 100.0)
+            self.assertEqual(lab.ticker_changes.stale_venues, ['kraken'])
+
+            # Still running: no second Kraken fetch is started
+            first = lab._price_fetches['kraken']
+            self._fetch(lab)
+            self.assertIs(lab._price_fetches['kraken'], first)
+
+            lab.kraken.release.set()
+            first.result(timeout=5)
+            lab.kraken.release = None
+            lab.kraken.price = 110.0
+            prices, _ = self._fetch(lab)
+        self.assertEqual(prices['BTC'], 110.0)
+        self.assertNotIn('kraken', lab._price_fetches)
+
+    def test_failed_venue_keeps_previous_snapshot(self):
+        lab = self._labyrinth(_Kraken(), _Binance())
+        self._fetch(lab)
+        lab.binance.ticker_24hr_all = mock.Mock(side_effect=RuntimeError('418'))
+        with self.assertLogs(self.mpl.logger, 'ERROR'):
+            prices, _ = self._fetch(lab)
+        self.assertEqual(prices['BNB'], 5.0)
+        self.assertEqual(lab.ticker_changes.stale_venues, ['binance'])
+
+    def test_stale_prices_not_fed_as_samples(self):
+        lab = self._labyrinth(_Kraken(), _Binance())
+        lab.market_map = mock.Mock()
+        lab.market_map.live_correlations.max_symbols = 10
+        self._fetch(lab)
+        self.assertIn('BNB', lab.market_map.submit_live_prices.call_args[0][0])
+        lab.binance.ticker_24hr_all = mock.Mock(side_effect=RuntimeError('418'))
+        with mock.patch.object(lab, 'update_momentum_snapshot', wraps=lab.update_momentum_snapshot) as momentum, \
+                self.assertLogs(self.mpl.logger, 'ERROR'):
+            prices, _ = self._fetch(lab)
+        self.assertEqual(prices['BNB'], 5.0)                 # Still quoted...
+        self.assertNotIn('BNB', momentum.call_args[0][0])    # ...but not a new sample
+        self.assertIn('BTC', momentum.call_args[0][0])
+        self.assertNotIn('BNB', lab.market_map.submit_live_prices.call_args[0][0])
+
+
+class TestBarterChangedAssets(unittest.TestCase):
+    """update_rates_from_prices with a changed-asset set."""
+
+    def test_only_touching_edges(self):
+        from aureon_barter_navigator import BarterNavigator
+        with contextlib.redirect_stdout(io.StringIO()):
+            nav = BarterNavigator()
+        nav._add_edge('BTC', 'ETH', 'ETHBTC', 'kraken', 20.0, 0, 0.001)
+        nav._add_edge('SOL', 'USD', 'SOLUSD', 'kraken', 10.0, 0, 0.001)
+        self.assertEqual(nav.update_rates_from_prices({'BTC': 100.0, 'ETH': 4.0, 'SOL': 12.0}), 2)
+
+        moved = {'BTC': 100.0, 'ETH': 5.0, 'SOL': 13.0}
+        self.assertEqual(nav.update_rates_from_prices(moved, assets=set()), 0)
+        self.assertEqual(nav.update_rates_from_prices(moved, assets={'ETH'}), 1)
+        self.assertAlmostEqual(nav.graph['BTC'][-1].rate, 20.0)
+        self.assertAlmostEqual(nav.graph['SOL'][-1].rate, 12.0)      # untouched until SOL is listed
+        self.assertEqual(nav.update_rates_from_prices(moved), 1)
+
+if __name__ == '__main__':
+    unittest.main()
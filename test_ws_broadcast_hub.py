@@ -0,0 +1,253 @@
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+#!/usr/bin/env python3
+"""
+Unit tests for the websocket BroadcastHub (command center fan-out)
+
+Tests cover:
+- Each message is serialised once, whatever the number of clients
+- A stuck client neither blocks publish() nor delays other clients
+- Unsent snapshots (balances, stats) are conflated in place; events are not
+- Clients are dropped on queue overflow, or lag (queued or mid-send) past the budget
+- Local aiohttp server with hundreds of clients: every client gets every
+  message in order, fan-out latency measured; non-reading clients get
+  dropped while the rest keep up
+
+Run: python3 test_ws_broadcast_hub.py
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import unittest
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ws_broadcast_hub import BroadcastHub, broadcast_dropped
+
+try:
+    import aiohttp
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class FakeWS:
+    """send_str records; optionally waits on a gate or sleeps per message."""
+
+    def __init__(self, gate=None, delay=0.0):
+        self.gate = gate
+        self.delay = delay
+        self.received = []
+        self.closed_with = None
+
+    async def send_str(self, data):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(json.loads(data))
+
+    async def close(self, code=None, message=b''):
+        self.closed_with = code
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestBroadcastHub(unittest.TestCase):
+    """Queueing, conflation and drop policy against fake sockets."""
+
+    def test_serialise_once_and_isolation(self):
+        async def run():
+            calls = []
+            hub = BroadcastHub('t_once', dumps=lambda m: calls.append(m) or json.dumps(m))
+            stuck = FakeWS(gate=asyncio.Event())
+            fast = [FakeWS() for _ in range(50)]
+            for ws in [stuck] + fast:
+                hub.add(ws)
+            start = time.perf_counter()
+            for i in range(20):
+                self.assertEqual(hub.publish({'type': 'trade', 'i': i}), 51)
+            self.assertLess(time.perf_counter() - start, 0.1)
+            self.assertEqual(len(calls), 20)
+            await asyncio.sleep(0.05)
+            for ws in fast:
+                self.assertEqual([m['i'] for m in ws.received], list(range(20)))
+            self.assertEqual(stuck.received, [])
+            self.assertEqual(hub.stats()['queued'], 19)          # First one is in the stuck send
+            await hub.close()
+        _run(run())
+
+    def test_snapshot_conflation(self):
+        async def run():
+            hub = BroadcastHub('t_conflate')
+            gate = asyncio.Event()
+            ws = FakeWS(gate=gate)
+            hub.add(ws)
+            hub.send(ws, {'type': 'state'})
+            await asyncio.sleep(0)                                # Writer takes 'state', blocks
+            for msg in ({'type': 'balances', 'v': 1}, {'type': 'trade', 'id': 'a'},
+                        {'type': 'balances', 'v': 2}, {'type': 'stats', 'v': 1},
+                        {'type': 'trade', 'id': 'b'}, {'type': 'balances', 'v': 3},
+                        {'type': 'stats', 'v': 2}):
+                hub.publish(msg)
+            gate.set()
+            self.assertTrue(await hub.drain(1))
+            await asyncio.sleep(0.01)
+            self.assertEqual([(m['type'], m.get('v', m.get('id'))) for m in ws.received],
+                             [('state', None), ('balances', 3), ('trade', 'a'), ('stats', 2), ('trade', 'b')])
+            self.assertEqual(hub.stats()['conflated'], 3)
+            # A snapshot sent already is not replaced: the next one queues again
+            hub.publish({'type': 'balances', 'v': 4})
+            await hub.drain(1)
+            await asyncio.sleep(0.01)
+            self.assertEqual(ws.received[-1], {'type': 'balances', 'v': 4})
+            await hub.close()
+        _run(run())
+
+    def test_drop_policy(self):
+        async def run():
+            hub = BroadcastHub('t_drop', max_queue=8, lag_budget_s=0.2)
+            overflow, stalled, slow, ok = FakeWS(gate=asyncio.Event()), FakeWS(gate=asyncio.Event()), \
+                FakeWS(delay=0.05), FakeWS()
+            hub.add(overflow)
+            hub.add(ok)
+            for i in range(10):                                   # 1 in the stuck send + 8 queued + 1
+                hub.publish({'type': 'trade', 'i': i})
+                await asyncio.sleep(0.001)
+            self.assertNotIn(overflow, hub.clients)
+            self.assertEqual(hub.dropped, {'overflow': 1})
+
+            # Each send is quick, but a burst takes longer than the lag budget to clear
+            hub.add(slow)
+            for i in range(8):
+                hub.publish({'type': 'trade', 'i': 10 + i})
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.25)
+            hub.publish({'type': 'trade', 'i': 20})
+            self.assertNotIn(slow, hub.clients)
+            self.assertEqual(hub.dropped.get('lag'), 1)
+
+            # A send that never completes counts as lag too
+            hub.add(stalled)
+            hub.publish({'type': 'trade', 'i': 30})
+            await asyncio.sleep(0.25)
+            hub.publish({'type': 'trade', 'i': 31})
+            self.assertEqual(hub.dropped, {'overflow': 1, 'lag': 2})
+            await asyncio.sleep(0.01)
+            self.assertEqual((overflow.closed_with, slow.closed_with, stalled.closed_with), (1013, 1013, 1013))
+            self.assertEqual(list(hub.clients), [ok])
+            self.assertEqual(broadcast_dropped.get(hub='t_drop', reason='overflow'), 1.0)
+            self.assertEqual([m['i'] for m in ok.received], list(range(18)) + [20, 30, 31])
+            await hub.close()
+        _run(run())
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+class TestAiohttpFanout(unittest.TestCase):
+    """Real websockets on localhost."""
+
+    async def _server(self, hub):
+        async def handler(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            hub.add(ws)
+            hub.send(ws, {'type': 'state'})
+            try:
+                async for _ in ws:
+                    pass
+            finally:
+                hub.remove(ws)
+            return ws
+
+        app = web.Application()
+        app.router.add_get('/ws', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}/ws"
+
+    async def _fast_client(self, session, url, last, received):
+        ws = await session.ws_connect(url, max_msg_size=0)
+        first = await ws.receive_json()
+        assert first['type'] == 'state'
+        received.append([])
+        mine = received[-1]
+
+        async def read():
+            async for msg in ws:
+                data = json.loads(msg.data)
+                mine.append((data['i'], time.perf_counter()))
+                if data['i'] == last:
+                    break
+            await ws.close()
+        return read()
+
+    def test_hundreds_of_clients(self):
+        clients, messages = 300, 50
+
+        async def run():
+            hub = BroadcastHub('t_fanout')
+            runner, url = await self._server(hub)
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+                received = []
+                readers = await asyncio.gather(*(self._fast_client(session, url, messages - 1, received)
+                                                 for _ in range(clients)))
+                tasks = [asyncio.ensure_future(r) for r in readers]
+                self.assertEqual(len(hub.clients), clients)
+
+                published = []
+                for i in range(messages):
+                    published.append(time.perf_counter())
+                    hub.publish({'type': 'trade', 'i': i, 'pad': 'x' * 200})
+                    await asyncio.sleep(0.005)
+                await asyncio.wait_for(asyncio.gather(*tasks), 60)
+            await runner.cleanup()
+
+            fanout = []
+            for i in range(messages):
+                fanout.append(max(r[i][1] for r in received) - published[i])
+            for r in received:
+                self.assertEqual([i for i, _ in r], list(range(messages)))
+            fanout.sort()
+            p50, p99 = fanout[len(fanout) // 2], fanout[min(len(fanout) - 1, int(0.99 * len(fanout)))]
+            print(f"\n  fan-out to {clients} clients: p50={p50 * 1000:.1f}ms p99={p99 * 1000:.1f}ms "
+                  f"(send p99 {hub.stats()['send_latency_p99_ms']:.1f}ms)")
+            self.assertLess(p99, 5.0)
+            self.assertEqual(hub.dropped, {})
+
+        _run(run())
+
+    def test_non_reading_clients_dropped(self):
+        async def run():
+            hub = BroadcastHub('t_slow', max_queue=16, lag_budget_s=0.5)
+            runner, url = await self._server(hub)
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+                stuck = [await session.ws_connect(url, max_msg_size=0) for _ in range(2)]   # never read
+                received = []
+                readers = [await self._fast_client(session, url, 59, received) for _ in range(10)]
+                tasks = [asyncio.ensure_future(r) for r in readers]
+                payload = 'x' * (256 * 1024)
+                for i in range(60):
+                    hub.publish({'type': 'trade', 'i': i, 'pad': payload})
+                    await asyncio.sleep(0.02)
+                await asyncio.wait_for(asyncio.gather(*tasks), 60)
+                for r in received:
+                    self.assertEqual([i for i, _ in r], list(range(60)))
+                self.assertEqual(sum(hub.dropped.values()), 2)
+                for ws in stuck:
+                    await ws.close()
+            await runner.cleanup()
+
+        _run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
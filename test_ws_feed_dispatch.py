@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Unit tests for UnifiedWSFeed tick dispatch and the frame replay harness
+
+Tests cover:
+- 'all' consumers get every tick in order; a full queue drops the oldest
+- 'latest' consumers conflate per exchange/symbol and keep key order
+- A slow consumer neither blocks _emit nor delays other consumers
+- Consumer errors are counted and do not stop the drain thread
+- Frame parsers for Binance, Kraken, Coinbase and Capital.com
+- Recorded frames replay through the feed end to end with no network
+
+Run: python3 test_ws_feed_dispatch.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unified_ws_feed as uwf
+from tick_dispatch import TickDispatcher, consumer_ticks
+from unified_ws_feed import NormalizedTick, tick_key
+
+
+def _tick(symbol='BTC/USD', last=100.0, exchange='binance'):
+    return NormalizedTick(symbol=symbol, exchange=exchange, bid=last - 1, ask=last + 1, last=last)
+
+
+class TestTickDispatcher(unittest.TestCase):
+    """TickDispatcher queue modes and counters."""
+
+    def setUp(self):
+        self.dispatcher = TickDispatcher('test')
+
+    def tearDown(self):
+        self.dispatcher.close()
+
+    def test_full_fidelity_and_drop_oldest(self):
+        seen = []
+        gate, first = threading.Event(), threading.Event()
+        self.dispatcher.add_consumer('all', lambda t: (first.set(), gate.wait(2), seen.append(t.last)),
+                                     mode='all', maxsize=3)
+        self.dispatcher.dispatch(_tick(last=0.0))
+        first.wait(2)
+        for i in range(1, 6):
+            self.dispatcher.dispatch(_tick(last=float(i)))
+        gate.set()
+        self.assertTrue(self.dispatcher.drain(2))
+        # First tick was already taken by the thread; of the rest only the newest 3 fit
+        self.assertEqual(seen, [0.0, 3.0, 4.0, 5.0])
+        stats = self.dispatcher.stats()['all']
+        self.assertEqual((stats['delivered'], stats['dropped'], stats['depth']), (4, 2, 0))
+        self.assertEqual(consumer_ticks.get(dispatcher='test', consumer='all', outcome='dropped'), 2.0)
+
+    def test_latest_conflates_per_key(self):
+        seen = []
+        gate = threading.Event()
+        first = threading.Event()
+        def handler(t):
+            first.set()
+            gate.wait(2)
+            seen.append((t.symbol, t.last))
+        self.dispatcher.add_consumer('latest', handler, mode='latest', key=tick_key)
+        self.dispatcher.dispatch(_tick('BTC/USD', 1.0))
+        first.wait(2)
+        for i in range(2, 6):
+            self.dispatcher.dispatch(_tick('BTC/USD', float(i)))
+            self.dispatcher.dispatch(_tick('ETH/USD', float(i * 10)))
+        gate.set()
+        self.assertTrue(self.dispatcher.drain(2))
+        self.assertEqual(seen, [('BTC/USD', 1.0), ('BTC/USD', 5.0), ('ETH/USD', 50.0)])
+        stats = self.dispatcher.stats()['latest']
+        self.assertEqual((stats['delivered'], stats['conflated'], stats['dropped']), (3, 6, 0))
+        self.assertGreater(stats['lag_max_ms'], 0.0)
+
+    def test_slow_consumer_isolated_and_errors_counted(self):
+        fast, hang = [], threading.Event()
+        self.dispatcher.add_consumer('slow', lambda t: hang.wait(5), mode='all')
+        self.dispatcher.add_consumer('fast', fast.append, mode='all')
+        self.dispatcher.add_consumer('broken', lambda t: 1 / 0, mode='all')
+        start = time.perf_counter()
+        for i in range(500):
+            self.dispatcher.dispatch(_tick(last=float(i)))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(self.dispatcher.consumer('fast').drain(2))
+        self.assertTrue(self.dispatcher.consumer('broken').drain(2))
+        self.assertEqual(len(fast), 500)
+        self.assertFalse(self.dispatcher.drain(0.05))          # 'slow' still stuck
+        hang.set()
+        self.assertTrue(self.dispatcher.drain(5))
+        self.assertEqual(self.dispatcher.stats()['broken']['errors'], 500)
+
+    def test_inline_mode(self):
+        seen = []
+        inline = TickDispatcher('inline', threaded=False)
+        inline.add_consumer('cb', seen.append, mode='latest', key=tick_key)
+        inline.dispatch(_tick(last=1.0))
+        inline.dispatch(_tick(last=2.0))
+        self.assertEqual([t.last for t in seen], [1.0, 2.0])
+        self.assertTrue(inline.drain(0))
+
+
+class TestFrameParsers(unittest.TestCase):
+    """Raw exchange frames -> NormalizedTick."""
+
+    def test_parsers(self):
+        t = uwf.parse_binance_frame(json.dumps({'stream': 'btcusdt@ticker', 'data': {
+            's': 'BTCUSDT', 'b': '99', 'a': '101', 'c': '100', 'v': '5', 'P': '1.5'}}))
+        self.assertEqual((t.symbol, t.exchange, t.bid, t.ask, t.last, t.volume_24h, t.change_24h),
+                         ('BTC/USDT', 'binance', 99.0, 101.0, 100.0, 5.0, 1.5))
+
+        t = uwf.parse_kraken_frame(json.dumps([1, {'b': ['99', 1, '1'], 'a': ['101', 1, '1'], 'c': ['100', '1'],
+                                                   'v': ['1', '7']}, 'ticker', 'XBT/USD']))
+        self.assertEqual((t.symbol, t.last, t.volume_24h), ('BTC/USD', 100.0, 7.0))
+        self.assertIsNone(uwf.parse_kraken_frame(json.dumps({'event': 'heartbeat'})))
+
+        t = uwf.parse_coinbase_frame(json.dumps({'type': 'ticker', 'product_id': 'ETH-USD', 'best_bid': '9',
+                                                 'best_ask': '11', 'price': '10', 'volume_24h': '3'}))
+        self.assertEqual((t.symbol, t.bid, t.ask, t.last), ('ETH/USD', 9.0, 11.0, 10.0))
+        self.assertIsNone(uwf.parse_coinbase_frame(json.dumps({'type': 'subscriptions'})))
+
+        t = uwf.parse_capital_frame(json.dumps({'type': 'price', 'epic': 'GOLDUSD', 'bid': 1, 'offer': 3, 'mid': 2}))
+        self.assertEqual((t.symbol, t.exchange, t.last), ('GOLD/USD', 'capital', 2.0))
+
+        with self.assertRaises(ValueError):
+            uwf.parse_binance_frame('not json')
+
+
+class TestReplay(unittest.TestCase):
+    """ws_feed_replay against a feed with no exchange connections."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)          # ThoughtBus persists to the cwd
+        self.patches = [mock.patch.object(uwf, 'HFT_ENGINE_AVAILABLE', False),
+                        mock.patch.object(uwf, 'HARMONIC_LIQUID_ALUMINIUM_AVAILABLE', False),
+                        mock.patch.object(uwf, 'CANDLE_STREAM_AVAILABLE', False)]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _close_bus(self, feed):
+        # Write persisted ticks while still inside the temp dir
+        if feed.thought_bus is not None and hasattr(feed.thought_bus, 'close'):
+            feed.thought_bus.close()
+
+    def test_record_and_replay(self):
+        import ws_feed_replay
+        frames = ws_feed_replay.synthetic_frames(600, exchanges=('binance', 'kraken', 'coinbase', 'capital'))
+        path = os.path.join(self.tmp.name, 'frames.jsonl')
+        with mock.patch.object(uwf, 'WS_FEED_RECORD_PATH', path):
+            recorder = uwf.UnifiedWSFeed()
+        for exchange, msg in frames + [('kraken', json.dumps({'event': 'heartbeat'}))]:
+            recorder._record(exchange, msg)
+        recorder._recorder.close()
+        recorder.dispatcher.close()
+        self._close_bus(recorder)
+
+        loaded = ws_feed_replay.load_frames(path)
+        self.assertEqual(loaded[:600], frames)
+
+        feed = uwf.UnifiedWSFeed()
+        everything, latest = [], []
+        feed.on_tick(everything.append)
+        feed.on_tick(latest.append, mode='latest', name='latest_cb')
+        result = ws_feed_replay.replay(feed, loaded)
+        feed.dispatcher.close()
+        self._close_bus(feed)
+
+        self.assertEqual((result['frames'], result['ticks'], result['skipped'], result['parse_errors']),
+                         (601, 600, 1, 0))
+        self.assertTrue(result['drained'])
+        self.assertEqual(len(everything), 600)
+        self.assertEqual(result['consumers']['callback_1']['delivered'], 600)
+        consumers = result['consumers']
+        if feed.thought_bus is not None:
+            self.assertEqual(consumers['thought_bus']['delivered'] + consumers['thought_bus']['conflated'], 600)
+        self.assertEqual(consumers['latest_cb']['delivered'] + consumers['latest_cb']['conflated'], 600)
+        # Every exchange/symbol's final tick reaches the conflated consumer
+        final = {tick_key(t): t.last for t in everything}
+        self.assertEqual({tick_key(t): t.last for t in latest if final[tick_key(t)] == t.last}, final)
+        self.assertGreater(result['read_ticks_per_s'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the UnifiedWSFeed per-exchange book and consolidated NBBO
+
+Tests cover:
+- Ticks for the same symbol from different venues no longer overwrite
+  each other (Kraken XBT/USD joins BTC/USD)
+- Best bid / best ask / tightest venue follow every update, including a
+  venue's quote getting worse; reference-only CoinGecko ticks are ignored
+- get_best_tick and the NBBO agree with a brute-force scan of all ticks
+- max_age_s leaves stale venues out; REST-shaped get_ticker
+- SmartOrderRouter.get_best_quote reads fresh streamed quotes and only
+  calls REST for venues the feed has no fresh tick for
+
+Run: python3 test_ws_feed_nbbo.py
+"""
+
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+import sys
+import os
+import random
+import unittest
+from unittest import mock
+
+# Add parent dir to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unified_ws_feed as uwf
+from tick_dispatch import TickDispatcher
+from unified_ws_feed import NormalizedTick, normalize_symbol
+
+
+def _feed():
+    feed = uwf.UnifiedWSFeed.__new__(uwf.UnifiedWSFeed)
+    feed.ticks, feed.books, feed.nbbo = {}, {}, {}
+    feed.candles = None
+    feed.dispatcher = TickDispatcher('nbbo-test', threaded=False)
+    return feed
+
+
+def _tick(exchange, bid, ask, symbol='BTC/USD', last=None, ts=1000.0):
+    return NormalizedTick(symbol=symbol, exchange=exchange, bid=bid, ask=ask,
+                          last=last if last is not None else (bid + ask) / 2, timestamp=ts)
+
+
+class TestNBBO(unittest.TestCase):
+    """Per-venue book and consolidated quote maintenance."""
+
+    def test_venues_kept_and_best_tracked(self):
+        self.assertEqual(normalize_symbol('XBT/USD', 'kraken'), 'BTC/USD')
+        self.assertEqual(normalize_symbol('XXBTZUSD', 'kraken'), 'BTC/USD')
+        self.assertEqual(normalize_symbol('XDGUSD', 'kraken'), 'DOGE/USD')
+
+        feed = _feed()
+        feed._emit(_tick('binance', 99.0, 101.0))
+        feed._emit(_tick('kraken', 100.0, 100.6, symbol=normalize_symbol('XBT/USD', 'kraken')))
+        feed._emit(_tick('coinbase', 99.5, 100.4))
+        feed._emit(_tick('coingecko', 120.0, 80.0))
+        self.assertEqual(set(feed.books['BTC/USD']), {'binance', 'kraken', 'coinbase', 'coingecko'})
+
+        q = feed.get_nbbo('BTC')
+        self.assertEqual((q.best_bid, q.best_bid_exchange, q.best_ask, q.best_ask_exchange),
+                         (100.0, 'kraken', 100.4, 'coinbase'))
+        self.assertEqual(q.tightest_exchange, 'kraken')
+        self.assertEqual(q.venues, 4)
+        self.assertFalse(q.crossed)
+        self.assertIs(feed.get_best_tick('BTC/USD'), feed.books['BTC/USD']['kraken'])
+
+        # Kraken's quote gets worse: the best moves to the next venue
+        feed._emit(_tick('kraken', 98.0, 103.0))
+        q = feed.get_nbbo('BTC/USD')
+        self.assertEqual((q.best_bid_exchange, q.best_ask_exchange, q.tightest_exchange),
+                         ('coinbase', 'coinbase', 'coinbase'))
+
+        feed._emit(_tick('binance', 100.6, 100.9))
+        self.assertTrue(feed.get_nbbo('BTC/USD').crossed)        # binance bid > coinbase ask
+
+    def test_matches_brute_force(self):
+        feed = _feed()
+        rng = random.Random(3)
+        latest = {}
+        for i in range(3000):
+            symbol = rng.choice(['BTC/USD', 'ETH/USD', 'SOL/USD'])
+            exchange = rng.choice(['binance', 'kraken', 'coinbase', 'capital'])
+            bid = rng.uniform(90, 110)
+            tick = _tick(exchange, bid, bid * (1 + rng.uniform(0, 0.01)), symbol=symbol, ts=float(i))
+            feed._emit(tick)
+            latest[(symbol, exchange)] = tick
+            if i % 97:
+                continue
+            for sym in ('BTC/USD', 'ETH/USD', 'SOL/USD'):
+                ticks = [t for (s, _), t in latest.items() if s == sym]
+                if not ticks:
+                    continue
+                q = feed.get_nbbo(sym)
+                self.assertEqual(q.best_bid, max(t.bid for t in ticks))
+                self.assertEqual(q.best_ask, min(t.ask for t in ticks))
+                self.assertEqual(feed.get_best_tick(sym).spread, min(t.spread for t in ticks))
+                self.assertEqual(q.last, max(ticks, key=lambda t: t.timestamp).last)
+
+    def test_max_age_and_rest_shape(self):
+        feed = _feed()
+        with mock.patch.object(uwf.time, 'time', return_value=1000.0):
+            feed._emit(_tick('binance', 99.0, 100.0, ts=900.0, symbol='ETH/USDT'))
+            feed._emit(_tick('binance', 99.0, 100.0, ts=900.0))
+            feed._emit(_tick('kraken', 98.0, 101.0, ts=999.0))
+            q = feed.get_nbbo('BTC/USD', max_age_s=10)
+            self.assertEqual((q.best_bid_exchange, q.venues), ('kraken', 1))
+            self.assertEqual(feed.get_nbbo('BTC/USD').best_bid_exchange, 'binance')
+            self.assertEqual(set(feed.get_quotes('BTC/USD', max_age_s=10)), {'kraken'})
+            self.assertEqual(set(feed.nbbo_snapshot(max_age_s=10)), {'BTC/USD'})
+            self.assertIsNone(feed.get_ticker('binance', 'BTCUSD', max_age_s=10))
+
+            ticker = feed.get_ticker('kraken', 'XBTUSD', max_age_s=10)
+            self.assertEqual((ticker['bid'], ticker['ask'], ticker['price'], ticker['source']),
+                             (98.0, 101.0, 99.5, 'ws'))
+            self.assertEqual(feed.get_ticker('binance', 'ETHUSDT')['bid'], 99.0)
+
+
+class TestSmartOrderRouterQuotes(unittest.TestCase):
+    """SmartOrderRouter.get_best_quote on top of the streamed book."""
+
+    @classmethod
+    def setUpClass(cls):
+        import aureon_unified_ecosystem as eco
+        cls.eco = eco
+
+    def test_streamed_quotes_skip_rest(self):
+        feed = _feed()
+        feed._emit(_tick('binance', 99.0, 100.0, symbol='BTC/USDT'))
+        feed._emit(_tick('kraken', 99.5, 100.2, symbol='BTC/USD'))
+        for t in feed.books['BTC/USDT'].values():
+            t.timestamp = uwf.time.time()
+        for t in feed.books['BTC/USD'].values():
+            t.timestamp = uwf.time.time()
+
+        client = mock.Mock()
+        client.normalize_symbol = lambda ex, sym: {'binance': 'BTCUSDT', 'kraken': 'XBTUSD'}.get(ex, 'BTC/USD')
+        client.get_ticker = mock.Mock(return_value={'price': 100.5, 'bid': 100.4, 'ask': 100.6})
+        router = self.eco.SmartOrderRouter(client, quote_feed=feed, quote_max_age_s=30)
+
+        best = router.get_best_quote('BTC/USD', 'BUY')
+        self.assertEqual(sorted(c.args[0] for c in client.get_ticker.call_args_list), ['alpaca', 'capital'])
+        self.assertEqual(best['exchange'], 'binance')          # 100.0 * 1.001 beats 100.2 * 1.0026
+        self.assertEqual({q['exchange'] for q in best['alternatives']}, {'kraken', 'alpaca', 'capital'})
+
+        # Stale stream -> REST for every venue
+        client.get_ticker.reset_mock()
+        router.quote_max_age_s = 0.0
+        for t in list(feed.books['BTC/USDT'].values()) + list(feed.books['BTC/USD'].values()):
+            t.timestamp -= 60
+        router.get_best_quote('BTC/USD', 'SELL')
+        self.assertEqual(client.get_ticker.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Tick Dispatch
+-------------
+Bounded per-consumer fan-out for UnifiedWSFeed ticks.
+
+UnifiedWSFeed._emit used to run every consumer (HFT injection, the harmonic
+field, user callbacks, the ThoughtBus JSONL append) inline in the websocket
+coroutine, so one slow consumer stalled socket reads for every exchange.
+TickDispatcher hands each tick to a queue per consumer and returns; each
+consumer is drained by its own daemon thread:
+
+    dispatcher = TickDispatcher('ws_feed')
+    dispatcher.add_consumer('hft', engine.inject_tick, mode='all')
+    dispatcher.add_consumer('thought_bus', publish, mode='latest',
+                            key=lambda t: f"{t.exchange}:{t.symbol}")
+    dispatcher.dispatch(tick)            # O(consumers), never blocks
+
+Two queue modes:
+- 'all'     full fidelity, FIFO, bounded; when full the oldest queued tick
+            is dropped (counted as 'dropped') so a stuck consumer sees fresh
+            data when it recovers.
+- 'latest'  conflated: one pending tick per key, a newer tick for the same
+            key replaces the pending one (counted as 'conflated'); keys are
+            delivered in the order they first became pending.
+
+Per-consumer delivered / dropped / conflated / error counts, queue depth and
+lag (time from dispatch to handler start) are exported via the metrics
+module and returned by stats(). With threaded=False (WS_FEED_DISPATCH=0)
+handlers run inline, as before.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from metrics import MetricCounter, MetricGauge
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_THREADED = os.getenv('WS_FEED_DISPATCH', '1') != '0'
+CONSUMER_QUEUE_SIZE = int(os.getenv('WS_FEED_CONSUMER_QUEUE', '10000'))
+LAG_WINDOW = 1024                   # Lag samples kept per consumer for percentiles
+
+consumer_ticks = MetricCounter(
+    'ws_feed_consumer_ticks_total',
+    'Ticks handled per WS feed consumer by outcome',
+    labelnames=('dispatcher', 'consumer', 'outcome'),
+)
+consumer_depth = MetricGauge(
+    'ws_feed_consumer_queue_depth',
+    'Ticks waiting in a WS feed consumer queue',
+    labelnames=('dispatcher', 'consumer'),
+)
+consumer_lag = MetricGauge(
+    'ws_feed_consumer_lag_seconds',
+    'Dispatch-to-handler lag of the most recent tick',
+    labelnames=('dispatcher', 'consumer'),
+)
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class TickConsumer:
+    """One consumer's bounded queue and drain thread."""
+
+    MODES = ('all', 'latest')
+
+    def __init__(self, name: str, handler: Callable[[Any], None], mode: str = 'all',
+                 maxsize: int = CONSUMER_QUEUE_SIZE, key: Optional[Callable[[Any], Hashable]] = None,
+                 dispatcher: str = 'ws_feed', threaded: bool = True):
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, got {mode!r}")
+        self.name = name
+        self.handler = handler
+        self.mode = mode
+        self.maxsize = max(1, maxsize)
+        self.key = key or (lambda item: item)
+        self.dispatcher = dispatcher
+        self.threaded = threaded
+        self._cond = threading.Condition()
+        self._fifo: deque = deque()                          # (item, enqueued_at)
+        self._latest: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._busy = False
+        self._closed = False
+        self.counts = {'offered': 0, 'delivered': 0, 'dropped': 0, 'conflated': 0, 'errors': 0}
+        self.max_depth = 0
+        self._lags: deque = deque(maxlen=LAG_WINDOW)
+        self._thread: Optional[threading.Thread] = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name=f"{dispatcher}-{name}", daemon=True)
+            self._thread.start()
+
+    # ──────────────────────────────────────────────────────────────
+    # Producer side
+    # ──────────────────────────────────────────────────────────────
+
+    def offer(self, item: Any):
+        """Queue an item without blocking (inline mode: handle it now)."""
+        now = time.perf_counter()
+        if not self.threaded:
+            self.counts['offered'] += 1
+            self._deliver(item, now)
+            return
+        dropped = conflated = 0
+        with self._cond:
+            if self._closed:
+                return
+            self.counts['offered'] += 1
+            if self.mode == 'all':
+                if len(self._fifo) >= self.maxsize:
+                    self._fifo.popleft()
+                    dropped = 1
+                self._fifo.append((item, now))
+                depth = len(self._fifo)
+            else:
+                k = self.key(item)
+                if k in self._latest:
+                    # Keep the original enqueue time: lag is how long the key has been pending
+                    self._latest[k] = (item, self._latest[k][1])
+                    conflated = 1
+                else:
+                    if len(self._latest) >= self.maxsize:
+                        self._latest.popitem(last=False)
+                        dropped = 1
+                    self._latest[k] = (item, now)
+                depth = len(self._latest)
+            self.counts['dropped'] += dropped
+            self.counts['conflated'] += conflated
+            self.max_depth = max(self.max_depth, depth)
+            self._cond.notify()
+        if dropped:
+            consumer_ticks.inc(dispatcher=self.dispatcher, consumer=self.name, outcome='dropped')
+        if conflated:
+            consumer_ticks.inc(dispatcher=self.dispatcher, consumer=self.name, outcome='conflated')
+
+    # ──────────────────────────────────────────────────────────────
+    # Consumer side
+    # ──────────────────────────────────────────────────────────────
+
+    def _depth(self) -> int:
+        return len(self._fifo) if self.mode == 'all' else len(self._latest)
+
+    def _take(self):
+        if self.mode == 'all':
+            return self._fifo.popleft()
+        return self._latest.popitem(last=False)[1]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._depth():
+                    self._busy = False
+                    self._cond.notify_all()
+                    self._cond.wait()
+                if self._closed and not self._depth():
+                    self._busy = False
+                    self._cond.notify_all()
+                    return
+                item, enqueued_at = self._take()
+                self._busy = True
+                depth = self._depth()
+            consumer_depth.set(depth, dispatcher=self.dispatcher, consumer=self.name)
+            self._deliver(item, enqueued_at)
+
+    def _deliver(self, item: Any, enqueued_at: float):
+        lag = time.perf_counter() - enqueued_at
+        try:
+            self.handler(item)
+            outcome = 'delivered'
+        except Exception as e:
+            outcome = 'errors'
+            logger.warning(f"Tick consumer '{self.name}' error: {e}")
+        with self._cond:
+            self.counts[outcome] += 1
+            self._lags.append(lag)
+        consumer_ticks.inc(dispatcher=self.dispatcher, consumer=self.name,
+                           outcome='delivered' if outcome == 'delivered' else 'error')
+        consumer_lag.set(lag, dispatcher=self.dispatcher, consumer=self.name)
+
+    # ──────────────────────────────────────────────────────────────
+    # Control
+    # ──────────────────────────────────────────────────────────────
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been handled."""
+        if not self.threaded:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._depth() or self._busy:
+                wait = None if deadline is None else deadline - time.monotonic()
+                if wait is not None and wait <= 0:
+                    return False
+                self._cond.wait(wait)
+        return True
+
+    def close(self, timeout: Optional[float] = 1.0):
+        """Stop the drain thread after it handles what is already queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            lags = list(self._lags)
+            return {
+                'mode': self.mode,
+                **self.counts,
+                'depth': self._depth(),
+                'max_depth': self.max_depth,
+                'lag_p50_ms': _percentile(lags, 0.50) * 1000,
+                'lag_p99_ms': _percentile(lags, 0.99) * 1000,
+                'lag_max_ms': max(lags) * 1000 if lags else 0.0,
+            }
+
+
+class TickDispatcher:
+    """Fans ticks out to named consumers without running them on the caller."""
+
+    def __init__(self, name: str = 'ws_feed', threaded: bool = DISPATCH_THREADED):
+        self.name = name
+        self.threaded = threaded
+        self._lock = threading.Lock()
+        self._consumers: Dict[str, TickConsumer] = {}
+        self._snapshot: List[TickConsumer] = []       # Read lock-free by dispatch()
+        self.dispatched = 0
+
+    def add_consumer(self, name: str, handler: Callable[[Any], None], mode: str = 'all',
+                     maxsize: int = CONSUMER_QUEUE_SIZE,
+                     key: Optional[Callable[[Any], Hashable]] = None) -> TickConsumer:
+        """Register `handler` under `name` (replacing any consumer of that name)."""
+        consumer = TickConsumer(name, handler, mode=mode, maxsize=maxsize, key=key,
+                                dispatcher=self.name, threaded=self.threaded)
+        with self._lock:
+            old = self._consumers.pop(name, None)
+            self._consumers[name] = consumer
+            self._snapshot = list(self._consumers.values())
+        if old is not None:
+            old.close(timeout=0)
+        return consumer
+
+    def remove_consumer(self, name: str):
+        with self._lock:
+            consumer = self._consumers.pop(name, None)
+            self._snapshot = list(self._consumers.values())
+        if consumer is not None:
+            consumer.close(timeout=0)
+
+    def consumer(self, name: str) -> Optional[TickConsumer]:
+        return self._consumers.get(name)
+
+    def dispatch(self, item: Any):
+        """Offer `item` to every consumer."""
+        self.dispatched += 1
+        for consumer in self._snapshot:
+            consumer.offer(item)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for every consumer to catch up; False if the timeout hit first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for consumer in list(self._snapshot):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not consumer.drain(remaining):
+                return False
+        return True
+
+    def close(self, timeout: Optional[float] = 1.0):
+        with self._lock:
+            consumers = list(self._consumers.values())
+            self._consumers.clear()
+            self._snapshot = []
+        for consumer in consumers:
+            consumer.close(timeout)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-consumer counters, queue depth and lag percentiles."""
+        return {c.name: c.stats() for c in list(self._snapshot)}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Ticker Table
+------------
+Incremental price / ticker table for MicroProfitLabyrinth.fetch_prices.
+
+fetch_prices used to rebuild `prices` (base -> USD price) and
+`ticker_cache` (prefixed and raw symbol -> ticker dict) from nothing every
+turn, so downstream code could not tell what moved. Each venue fetch now
+produces a VenueSnapshot of ordered writes; the table keeps the last
+snapshot per venue, merges them in venue order with the same precedence
+rules as before, and applies only the difference to its live dicts:
+
+    table.set_snapshot('kraken', snap)            # fresh this turn
+    diff = table.commit(['ws_cache', 'kraken', 'binance', 'alpaca'])
+    diff.prices          # bases whose price is new or moved
+    diff.tickers         # ticker keys that are new or changed
+    diff.removed_*       # keys gone since the previous turn
+
+A venue that failed or timed out keeps its previous snapshot (it is listed
+in diff.stale_venues) instead of dropping out of the table for a turn, but
+only for max_age seconds: an older snapshot is dropped at commit (listed in
+diff.expired_venues) and its rows leave the table. diff.stale_prices names
+the bases whose price still comes from a stale snapshot, so consumers that
+treat each commit as a new sample (momentum, correlation) can skip them.
+`prices` and `tickers` are the same dict objects from turn to turn;
+`version` increments whenever a commit changes anything, for caches that
+used to key on dict identity.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+MAX_SNAPSHOT_AGE_S = float(os.getenv('TICKER_MAX_SNAPSHOT_AGE_S', '120'))
+
+
+@dataclass
+class VenueSnapshot:
+    """One venue's writes for one turn, in the order the venue produced them."""
+    venue: str
+    # (base, price, overwrite) - overwrite=False only fills a missing base
+    prices: List[Tuple[str, float, bool]] = field(default_factory=list)
+    # (keys, entry) - every key in `keys` points at the same entry dict
+    tickers: List[Tuple[Tuple[str, ...], Dict[str, Any]]] = field(default_factory=list)
+    # Loader state changes (pair routing maps) to run on the caller's thread
+    deferred: List[Callable[[], None]] = field(default_factory=list)
+    count: int = 0
+
+    def set_price(self, base: str, price: float, overwrite: bool = True):
+        self.prices.append((base, price, overwrite))
+
+    def add_ticker(self, entry: Dict[str, Any], *keys: str):
+        self.tickers.append((keys, entry))
+
+
+@dataclass
+class TickerDiff:
+    """What one commit changed."""
+    prices: Set[str] = field(default_factory=set)
+    removed_prices: Set[str] = field(default_factory=set)
+    tickers: Set[str] = field(default_factory=set)
+    removed_tickers: Set[str] = field(default_factory=set)
+    fresh_venues: List[str] = field(default_factory=list)
+    stale_venues: List[str] = field(default_factory=list)
+    expired_venues: List[str] = field(default_factory=list)
+    stale_prices: Set[str] = field(default_factory=set)      # Bases priced by a stale venue
+
+    def __bool__(self) -> bool:
+        return bool(self.prices or self.removed_prices or self.tickers or self.removed_tickers)
+
+
+class TickerTable:
+    """Live prices / ticker_cache maintained by per-turn diffs."""
+
+    def __init__(self, fixed_prices: Optional[Dict[str, float]] = None,
+                 max_age: float = MAX_SNAPSHOT_AGE_S, clock: Callable[[], float] = time.monotonic):
+        self.prices: Dict[str, float] = {}
+        self.tickers: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self.fixed_prices = dict(fixed_prices or {})     # Filled last, only if missing
+        self.max_age = max_age
+        self.clock = clock
+        self._snapshots: Dict[str, VenueSnapshot] = {}
+        self._taken_at: Dict[str, float] = {}
+        self._fresh: List[str] = []
+
+    def set_snapshot(self, venue: str, snapshot: VenueSnapshot):
+        """Replace a venue's snapshot with this turn's data."""
+        self._snapshots[venue] = snapshot
+        self._taken_at[venue] = self.clock()
+        self._fresh.append(venue)
+
+    def age(self, venue: str) -> Optional[float]:
+        """Seconds since the venue's snapshot was set (None if it has none)."""
+        taken = self._taken_at.get(venue)
+        return None if taken is None else self.clock() - taken
+
+    def snapshot(self, venue: str) -> Optional[VenueSnapshot]:
+        return self._snapshots.get(venue)
+
+    def drop_venue(self, venue: str):
+        """Forget a venue entirely (e.g. its client was disconnected)."""
+        self._snapshots.pop(venue, None)
+        self._taken_at.pop(venue, None)
+
+    def _merged(self, order: Sequence[str]
+                ) -> Tuple[Dict[str, float], Dict[str, Dict[str, Any]], Dict[str, str]]:
+        prices: Dict[str, float] = {}
+        tickers: Dict[str, Dict[str, Any]] = {}
+        sources: Dict[str, str] = {}                      # base -> venue whose price won
+        for venue in order:
+            snap = self._snapshots.get(venue)
+            if snap is None:
+                continue
+            for base, price, overwrite in snap.prices:
+                if overwrite or base not in prices:
+                    prices[base] = price
+                    sources[base] = venue
+            for keys, entry in snap.tickers:
+                for key in keys:
+                    tickers[key] = entry
+        for base, price in self.fixed_prices.items():
+            if base not in prices:
+                prices[base] = price
+        return prices, tickers, sources
+
+    def commit(self, order: Sequence[str]) -> TickerDiff:
+        """Merge venue snapshots in `order` and apply the difference in place."""
+        now = self.clock()
+        expired = [v for v in order if v in self._snapshots and v not in self._fresh
+                   and now - self._taken_at.get(v, now) > self.max_age]
+        for venue in expired:
+            self.drop_venue(venue)
+        prices, tickers, sources = self._merged(order)
+        stale = [v for v in order if v in self._snapshots and v not in self._fresh]
+        diff = TickerDiff(fresh_venues=[v for v in order if v in self._fresh], stale_venues=stale,
+                          expired_venues=expired)
+        if stale:
+            stale_set = set(stale)
+            diff.stale_prices = {base for base, venue in sources.items() if venue in stale_set}
+        self._fresh = []
+
+        for base, price in prices.items():
+            if self.prices.get(base) != price:
+                diff.prices.add(base)
+        diff.removed_prices = self.prices.keys() - prices.keys()
+        for key, entry in tickers.items():
+            if self.tickers.get(key) != entry:
+                diff.tickers.add(key)
+        diff.removed_tickers = self.tickers.keys() - tickers.keys()
+
+        for base in diff.removed_prices:
+            del self.prices[base]
+        for base in diff.prices:
+            self.prices[base] = prices[base]
+        for key in diff.removed_tickers:
+            del self.tickers[key]
+        for key in diff.tickers:
+            self.tickers[key] = tickers[key]
+        if diff:
+            self.version += 1
+        return diff
@@ -14,7 +14,8 @@
 ║       2. 🐙 Kraken REST Cache (15s refresh, fallback)                               ║
 ║       3. 🦙 Alpaca REST (only for balance/orders - authenticated)                   ║
 ║                                                                                      ║
-║     OUTPUT: ws_cache/unified_prices.json - ALL processes read from here             ║
+║     OUTPUT: ws_cache/ticker_table.bin - memory-mapped, read in place (O(1))         ║
+║             ws_cache/unified_prices.json - optional JSON export for legacy readers  ║
 ║                                                                                      ║
 ║     Gary Leckey | January 2026 | PRODUCTION READY                                   ║
 ╚══════════════════════════════════════════════════════════════════════════════════════╝
@@ -32,6 +33,13 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+try:
+    from shared_ticker_table import get_ticker_table
+    TICKER_TABLE_AVAILABLE = True
+except Exception:
+    get_ticker_table = None
+    TICKER_TABLE_AVAILABLE = False
+
 # Windows UTF-8 Fix
 if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -52,6 +60,10 @@ KRAKEN_CACHE_PATH = os.path.join(CACHE_DIR, 'kraken_prices.json')
 CACHE_TTL_SECONDS = float(os.getenv('MARKET_CACHE_TTL', '30'))  # 30s default
 WS_CACHE_TTL_SECONDS = float(os.getenv('WS_CACHE_TTL', '5'))  # 5s for WebSocket data
 
+# JSON files are an export for modules that still read them directly;
+# UnifiedMarketCache itself reads the shared ticker table when it is mapped.
+JSON_EXPORT_ENABLED = os.getenv('MARKET_CACHE_JSON_EXPORT', '1').lower() in ('1', 'true', 'yes', 'on')
+
 # Symbols to track (top crypto by volume)
 DEFAULT_SYMBOLS = [
     'BTC', 'ETH', 'SOL', 'XRP', 'DOGE', 'ADA', 'AVAX', 'LINK', 'DOT', 'MATIC',
@@ -89,7 +101,7 @@ class UnifiedMarketCache:
         # Get singleton
         cache = get_market_cache()
         
-        # Get price (reads from cache file, no API calls!)
+        # Get price (reads the shared ticker table, no API calls!)
         price = get_price('BTC')  # Returns float or None
         
         # Get full ticker
@@ -121,10 +133,34 @@ class UnifiedMarketCache:
         # Ensure cache directory exists
         os.makedirs(CACHE_DIR, exist_ok=True)
         
-        logger.info(f"🌐 UnifiedMarketCache initialized (cache dir: {CACHE_DIR})")
+        # Shared memory-mapped ticker table (None -> fall back to JSON files)
+        self._table = get_ticker_table() if TICKER_TABLE_AVAILABLE else None
+        
+        logger.info(f"🌐 UnifiedMarketCache initialized (cache dir: {CACHE_DIR}, "
+                    f"ticker table: {'mapped' if self._table else 'unavailable'})")
+    
+    def _ticker_from_table(self, symbol: str) -> Optional[CachedTicker]:
+        """Build a CachedTicker from one shared-table row (no file I/O)"""
+        row = self._table.get(symbol)
+        if row is None:
+            return None
+        price, bid, ask, change, volume, ts, source, pair = row
+        if price <= 0:
+            return None
+        return CachedTicker(
+            symbol=symbol,
+            price=price,
+            bid=bid,
+            ask=ask,
+            change_24h=change,
+            volume_24h=volume,
+            source=source,
+            timestamp=ts,
+            pair=pair
+        )
     
     def _read_cache_files(self) -> None:
-        """Read all cache files and merge into memory"""
+        """Read all cache files and merge into memory (fallback when the table misses)"""
         now = time.time()
         if now - self._last_file_read < self._file_read_interval:
             return  # Don't read too often
@@ -213,11 +249,16 @@ class UnifiedMarketCache:
         """
         Get ticker for symbol from cache.
         
-        NO API CALLS - reads from shared cache files only!
+        NO API CALLS - reads from the shared ticker table (or cache files)!
         """
         symbol = symbol.upper()
         
-        # Refresh from files
+        if self._table is not None:
+            ticker = self._ticker_from_table(symbol)
+            if ticker and ticker.is_fresh(max_age):
+                return ticker
+        
+        # Refresh from files (only reached on a table miss)
         self._read_cache_files()
         
         with self._cache_lock:
@@ -233,6 +274,15 @@ class UnifiedMarketCache:
     
     def get_all_tickers(self, max_age: float = CACHE_TTL_SECONDS) -> Dict[str, CachedTicker]:
         """Get all fresh tickers"""
+        if self._table is not None:
+            cutoff = time.time() - max_age
+            fresh = {
+                s: CachedTicker(s, price, bid, ask, change, volume, source, ts, pair)
+                for s, (price, bid, ask, change, volume, ts, source, pair) in self._table.snapshot().items()
+                if price > 0 and ts >= cutoff
+            }
+            if fresh:
+                return fresh
         self._read_cache_files()
         with self._cache_lock:
             return {s: t for s, t in self._tickers.items() if t.is_fresh(max_age)}
@@ -243,12 +293,20 @@ class UnifiedMarketCache:
         return {s: t.price for s, t in tickers.items()}
     
     def update_ticker(self, ticker: CachedTicker) -> None:
-        """Update a ticker in memory (used by feeders)"""
+        """Update a ticker in place (used by feeders)"""
         with self._cache_lock:
             self._tickers[ticker.symbol] = ticker
+        if self._table is not None:
+            self._table.put(
+                ticker.symbol, ticker.price, ticker.bid, ticker.ask,
+                ticker.change_24h, ticker.volume_24h, ticker.timestamp,
+                source=ticker.source, pair=ticker.pair
+            )
     
     def write_cache(self) -> None:
-        """Write current cache to unified file"""
+        """Export current cache to the unified JSON file (optional, for legacy readers)"""
+        if not JSON_EXPORT_ENABLED:
+            return
         with self._cache_lock:
             tickers = dict(self._tickers)
         
@@ -454,12 +512,17 @@ class BinanceWSFeeder:
             logger.debug(f"Ticker parse error: {e}")
     
     def write_cache_periodically(self, interval: float = 1.0):
-        """Write cache to file periodically"""
+        """Export cache to JSON files periodically (tickers already live in the shared table)"""
         while self.running:
+            if not JSON_EXPORT_ENABLED:
+                time.sleep(interval)
+                continue
             try:
                 self.cache.write_cache()
                 # Also write to Binance-specific path for compatibility
-                _write_binance_cache(self.cache.get_all_tickers())
+                with self.cache._cache_lock:
+                    tickers = {s: t for s, t in self.cache._tickers.items() if t.is_fresh()}
+                _write_binance_cache(tickers)
             except Exception as e:
                 logger.debug(f"Cache write error: {e}")
             time.sleep(interval)
@@ -512,8 +575,13 @@ def main():
     parser = argparse.ArgumentParser(description='Unified Market Cache - Binance WebSocket Feeder')
     parser.add_argument('--symbols', nargs='+', default=DEFAULT_SYMBOLS, help='Symbols to track')
     parser.add_argument('--write-interval', type=float, default=1.0, help='Cache write interval in seconds')
+    parser.add_argument('--no-json-export', action='store_true', help='Only update the shared ticker table')
     args = parser.parse_args()
     
+    if args.no_json_export:
+        global JSON_EXPORT_ENABLED
+        JSON_EXPORT_ENABLED = False
+    
     print("╔══════════════════════════════════════════════════════════════════════════════╗")
     print("║     🌐 UNIFIED MARKET CACHE - BINANCE WEBSOCKET FEEDER                       ║")
     print("║     ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━                        ║")
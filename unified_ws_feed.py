@@ -14,6 +14,8 @@ Production-grade WebSocket feed aggregator for multi-exchange data:
 
 🔗 OUTPUTS:
 ├─ Normalized ticker stream (symbol, bid, ask, last, exchange, ts)
+├─ Per-consumer tick queues, drained off the read loop (tick_dispatch.py)
+├─ Per-exchange book + consolidated NBBO per symbol (get_nbbo / nbbo_snapshot)
 ├─ ThoughtBus events for downstream consumers
 └─ GlobalFinancialFeed enrichment
 
@@ -69,6 +71,20 @@ except ImportError:
     HarmonicLiquidAluminiumField = None
     FieldSnapshot = None
 
+# Shared streaming candles (1m/5m/15m/1h) built from every tick
+try:
+    from candle_stream import get_candle_stream
+    CANDLE_STREAM_AVAILABLE = True
+except ImportError:
+    get_candle_stream = None
+    CANDLE_STREAM_AVAILABLE = False
+
+# Per-consumer tick queues drained off the websocket read loop
+from tick_dispatch import TickDispatcher
+
+# Optional raw frame capture for ws_feed_replay.py (JSONL: t, exchange, msg)
+WS_FEED_RECORD_PATH = os.getenv('WS_FEED_RECORD_PATH', '')
+
 # ═══════════════════════════════════════════════════════════════
 # WEBSOCKET ENDPOINTS
 # ═══════════════════════════════════════════════════════════════
@@ -82,6 +98,12 @@ WS_ENDPOINTS = {
 
 COINGECKO_API = 'https://api.coingecko.com/api/v3'
 
+# Kraken asset codes that differ from everyone else's
+KRAKEN_ASSET_ALIASES = {'XBT': 'BTC', 'XDG': 'DOGE'}
+
+# Reference-only sources: kept in the per-venue book, never best bid/ask
+NBBO_EXCLUDED_VENUES = {'coingecko'}
+
 # ═══════════════════════════════════════════════════════════════
 # DATA STRUCTURES
 # ═══════════════════════════════════════════════════════════════
@@ -129,6 +151,68 @@ class ExchangeStatus:
         return self.connected and (time.time() - self.last_message) < 60
 
 
+@dataclass
+class ConsolidatedQuote:
+    """Best bid / best ask / tightest venue for one symbol across exchanges (NBBO)."""
+    symbol: str
+    best_bid: float = 0.0
+    best_bid_exchange: str = ""
+    best_ask: float = 0.0
+    best_ask_exchange: str = ""
+    tightest_exchange: str = ""   # Venue with the tightest own spread
+    tightest_spread: float = 0.0
+    last: float = 0.0             # Most recent trade price on any venue
+    timestamp: float = 0.0        # Newest tick time
+    oldest: float = 0.0           # Oldest contributing tick time
+    venues: int = 0
+    
+    @property
+    def spread(self) -> float:
+        """Consolidated spread (best ask vs best bid), relative to the bid."""
+        if self.best_bid > 0 and self.best_ask > 0:
+            return (self.best_ask - self.best_bid) / self.best_bid
+        return 0.0
+    
+    @property
+    def mid(self) -> float:
+        if self.best_bid > 0 and self.best_ask > 0:
+            return (self.best_bid + self.best_ask) / 2
+        return self.last
+    
+    @property
+    def crossed(self) -> bool:
+        """Best bid above best ask - a cross-venue arbitrage signal."""
+        return self.best_bid > 0 and self.best_ask > 0 and self.best_bid > self.best_ask
+    
+    def to_dict(self) -> Dict:
+        d = asdict(self)
+        d.update(spread=self.spread, mid=self.mid, crossed=self.crossed)
+        return d
+
+
+def consolidate(symbol: str, venue_ticks: Dict[str, NormalizedTick],
+                min_timestamp: float = 0.0) -> Optional[ConsolidatedQuote]:
+    """Build the NBBO for one symbol from its per-exchange ticks (O(venues))."""
+    quote = ConsolidatedQuote(symbol=symbol)
+    for exchange, tick in venue_ticks.items():
+        if tick.timestamp < min_timestamp:
+            continue
+        if tick.timestamp >= quote.timestamp:
+            quote.timestamp = tick.timestamp
+            quote.last = tick.last
+        quote.oldest = tick.timestamp if not quote.venues else min(quote.oldest, tick.timestamp)
+        quote.venues += 1
+        if exchange in NBBO_EXCLUDED_VENUES:
+            continue
+        if tick.bid > 0 and tick.bid > quote.best_bid:
+            quote.best_bid, quote.best_bid_exchange = tick.bid, exchange
+        if tick.ask > 0 and (quote.best_ask <= 0 or tick.ask < quote.best_ask):
+            quote.best_ask, quote.best_ask_exchange = tick.ask, exchange
+        if tick.bid > 0 and tick.ask > 0 and (not quote.tightest_exchange or tick.spread < quote.tightest_spread):
+            quote.tightest_exchange, quote.tightest_spread = exchange, tick.spread
+    return quote if quote.venues else None
+
+
 # ═══════════════════════════════════════════════════════════════
 # SYMBOL NORMALIZATION
 # ═══════════════════════════════════════════════════════════════
@@ -150,11 +234,12 @@ def normalize_symbol(raw: str, exchange: str) -> str:
         raw = raw.replace('XXBT', 'BTC').replace('XETH', 'ETH').replace('ZUSD', 'USD')
         raw = raw.replace('ZEUR', 'EUR').replace('ZGBP', 'GBP').replace('ZJPY', 'JPY')
         if '/' in raw:
-            return raw
+            base, quote = raw.split('/', 1)
+            return f"{KRAKEN_ASSET_ALIASES.get(base, base)}/{quote}"
         for quote in ['USD', 'USDT', 'USDC', 'EUR', 'GBP', 'BTC', 'ETH']:
             if raw.endswith(quote) and len(raw) > len(quote):
                 base = raw[:-len(quote)]
-                return f"{base}/{quote}"
+                return f"{KRAKEN_ASSET_ALIASES.get(base, base)}/{quote}"
         return raw
     
     elif exchange == 'coinbase':
@@ -192,6 +277,102 @@ def denormalize_symbol(symbol: str, exchange: str) -> str:
     return symbol
 
 
+# ═══════════════════════════════════════════════════════════════
+# FRAME PARSERS (raw websocket message -> NormalizedTick)
+# ═══════════════════════════════════════════════════════════════
+# Pure functions so recorded frames can be replayed without a socket.
+# Return None for frames that carry no tick; raise on malformed ones.
+
+def parse_binance_frame(msg: str) -> Optional[NormalizedTick]:
+    """Binance 24hr ticker (single or combined stream)."""
+    data = json.loads(msg)
+    if 'stream' in data:
+        data = data.get('data', data)
+    
+    raw_symbol = data.get('s', '')
+    return NormalizedTick(
+        symbol=normalize_symbol(raw_symbol, 'binance'),
+        exchange='binance',
+        bid=float(data.get('b', 0)),
+        ask=float(data.get('a', 0)),
+        last=float(data.get('c', 0)),
+        volume_24h=float(data.get('v', 0)),
+        change_24h=float(data.get('P', 0)),
+        raw_symbol=raw_symbol,
+    )
+
+
+def parse_kraken_frame(msg: str) -> Optional[NormalizedTick]:
+    """Kraken ticker: [channelID, {...}, "ticker", "XBT/USD"]."""
+    data = json.loads(msg)
+    
+    # Skip system messages
+    if isinstance(data, dict):
+        return None
+    
+    if isinstance(data, list) and len(data) >= 4 and data[2] == "ticker":
+        ticker = data[1]
+        raw_symbol = data[3]
+        return NormalizedTick(
+            symbol=normalize_symbol(raw_symbol, 'kraken'),
+            exchange='kraken',
+            bid=float(ticker.get('b', [0])[0]),
+            ask=float(ticker.get('a', [0])[0]),
+            last=float(ticker.get('c', [0])[0]),
+            volume_24h=float(ticker.get('v', [0, 0])[1]),
+            raw_symbol=raw_symbol,
+        )
+    return None
+
+
+def parse_coinbase_frame(msg: str) -> Optional[NormalizedTick]:
+    """Coinbase Advanced Trade ticker message."""
+    data = json.loads(msg)
+    
+    if data.get('type') == 'ticker':
+        raw_symbol = data.get('product_id', '')
+        return NormalizedTick(
+            symbol=normalize_symbol(raw_symbol, 'coinbase'),
+            exchange='coinbase',
+            bid=float(data.get('best_bid', 0)),
+            ask=float(data.get('best_ask', 0)),
+            last=float(data.get('price', 0)),
+            volume_24h=float(data.get('volume_24h', 0)),
+            raw_symbol=raw_symbol,
+        )
+    return None
+
+
+def parse_capital_frame(msg: str) -> Optional[NormalizedTick]:
+    """Capital.com price update."""
+    data = json.loads(msg)
+    
+    if data.get("type") == "price":
+        raw_symbol = data.get("epic", "")
+        return NormalizedTick(
+            symbol=normalize_symbol(raw_symbol, 'capital'),
+            exchange='capital',
+            bid=float(data.get('bid', 0)),
+            ask=float(data.get('offer', 0)),
+            last=float(data.get('mid', 0)),
+            raw_symbol=raw_symbol,
+        )
+    return None
+
+
+FRAME_PARSERS: Dict[str, Callable[[str], Optional[NormalizedTick]]] = {
+    'binance': parse_binance_frame,
+    'kraken': parse_kraken_frame,
+    'coinbase': parse_coinbase_frame,
+    'capital': parse_capital_frame,
+}
+
+
+def tick_key(tick: NormalizedTick) -> str:
+    """Conflation key for latest-per-symbol consumers."""
+    return f"{tick.exchange}:{tick.symbol}"
+
+
 # ═══════════════════════════════════════════════════════════════
 # WEBSOCKET HANDLERS
 # ═══════════════════════════════════════════════════════════════
@@ -224,11 +405,23 @@ class UnifiedWSFeed:
         self.status: Dict[str, ExchangeStatus] = {
             ex: ExchangeStatus(exchange=ex) for ex in WS_ENDPOINTS
         }
-        self.ticks: Dict[str, NormalizedTick] = {}  # symbol -> latest tick
+        self.ticks: Dict[str, NormalizedTick] = {}  # symbol -> latest tick (any exchange)
+        self.books: Dict[str, Dict[str, NormalizedTick]] = {}  # symbol -> exchange -> latest tick
+        self.nbbo: Dict[str, ConsolidatedQuote] = {}  # symbol -> consolidated best quote
         self.callbacks: List[Callable[[NormalizedTick], None]] = []
         self._running = False
         self._tasks: List[asyncio.Task] = []
         
+        # 📬 Consumers run off the read loop, each on its own bounded queue
+        self.dispatcher = TickDispatcher('ws_feed')
+        self._recorder = None
+        if WS_FEED_RECORD_PATH:
+            try:
+                self._recorder = open(WS_FEED_RECORD_PATH, 'a', encoding='utf-8')
+                logger.info(f"📼 Recording raw WS frames to {WS_FEED_RECORD_PATH}")
+            except OSError as e:
+                logger.warning(f"📼 Frame recording disabled: {e}")
+        
         # ThoughtBus integration
         self.thought_bus = None
         try:
@@ -246,6 +439,9 @@ class UnifiedWSFeed:
             except Exception as e:
                 logger.warning(f"🦈🔪 HFT Engine initialization failed: {e}")
         
+        # 🕯️ Shared candle stream - consumers read candles instead of REST klines
+        self.candles = get_candle_stream() if CANDLE_STREAM_AVAILABLE else None
+        
         # 🌊 Harmonic Liquid Aluminium Field - live flowing waveform visualization
         self.harmonic_field = None
         if HARMONIC_LIQUID_ALUMINIUM_AVAILABLE and HarmonicLiquidAluminiumField:
@@ -256,58 +452,93 @@ class UnifiedWSFeed:
             except Exception as e:
                 logger.warning(f"🌊 Harmonic Field initialization failed: {e}")
         
+        self._wire_consumers()
+        
         logger.info("🌐⚡ UnifiedWSFeed initialized")
         for ex, enabled in self.enable.items():
             logger.info(f"   {ex}: {'✅' if enabled else '❌'}")
     
-    def on_tick(self, callback: Callable[[NormalizedTick], None]):
-        """Register a callback for new ticks."""
+    def _wire_consumers(self):
+        """Register the built-in tick consumers with the dispatcher."""
+        # 🦈🔪 HFT engine wants every tick for sub-10ms processing
+        if self.hft_engine and hasattr(self.hft_engine, 'inject_tick'):
+            self.dispatcher.add_consumer('hft', self.hft_engine.inject_tick, mode='all')
+        
+        # 🌊 Harmonic field and ThoughtBus only need the latest tick per symbol
+        if self.harmonic_field:
+            self.dispatcher.add_consumer('harmonic_field', self._flow_harmonic_field,
+                                         mode='latest', key=tick_key)
+        if self.thought_bus:
+            self.dispatcher.add_consumer('thought_bus', self._publish_thought,
+                                         mode='latest', key=tick_key)
+    
+    def on_tick(self, callback: Callable[[NormalizedTick], None], mode: str = 'all',
+                name: Optional[str] = None):
+        """
+        Register a callback for new ticks.
+        
+        The callback runs on its own consumer thread. mode='all' delivers
+        every tick (bounded queue, oldest dropped when full); mode='latest'
+        delivers only the newest pending tick per exchange/symbol.
+        """
         self.callbacks.append(callback)
+        name = name or f"callback_{len(self.callbacks)}"
+        self.dispatcher.add_consumer(name, callback, mode=mode, key=tick_key)
     
     def _emit(self, tick: NormalizedTick):
-        """Emit tick to all callbacks, ThoughtBus, HFT engine, and Harmonic Field."""
+        """Record the tick and hand it to every consumer queue (never blocks)."""
         self.ticks[tick.symbol] = tick
         
-        # 🦈🔪 Inject tick into HFT engine for sub-10ms processing
-        if self.hft_engine and hasattr(self.hft_engine, 'inject_tick'):
-            try:
-                self.hft_engine.inject_tick(tick)
-            except Exception as e:
-                logger.debug(f"🦈🔪 HFT tick injection error: {e}")
-        
-        # 🌊 Flow tick into Harmonic Liquid Aluminium Field
-        # Each tick becomes a dancing waveform on the frequency spectrum
-        if self.harmonic_field:
-            try:
-                # Feed the harmonic field with live data
-                # Volume influences the quantity/energy of the node
-                self.harmonic_field.add_or_update_node(
-                    exchange=tick.exchange,
-                    symbol=tick.symbol,
-                    current_price=tick.last,
-                    entry_price=tick.last,  # No position, use current as baseline
-                    quantity=tick.volume_24h / 1000 if tick.volume_24h > 0 else 1.0,  # Normalize volume
-                    asset_class='crypto'
-                )
-            except Exception as e:
-                logger.debug(f"🌊 Harmonic field tick error: {e}")
+        # 📊 Per-venue book + NBBO, rebuilt for this symbol only (O(venues))
+        book = self.books.get(tick.symbol)
+        if book is None:
+            book = self.books[tick.symbol] = {}
+        book[tick.exchange] = tick
+        self.nbbo[tick.symbol] = consolidate(tick.symbol, book)
         
-        for cb in self.callbacks:
+        # Candles are an in-memory aggregate that needs every tick; keep inline
+        if self.candles is not None:
             try:
-                cb(tick)
+                self.candles.ingest_tick(tick)
             except Exception as e:
-                logger.warning(f"Tick callback error: {e}")
-        
-        if self.thought_bus:
-            try:
-                from aureon_thought_bus import Thought
-                self.thought_bus.publish(Thought(
-                    source=f"ws_{tick.exchange}",
-                    topic="tick",
-                    payload=tick.to_dict()
-                ))
-            except Exception:
-                pass
+                logger.debug(f"🕯️ Candle stream ingest error: {e}")
+        
+        self.dispatcher.dispatch(tick)
+    
+    def _flow_harmonic_field(self, tick: NormalizedTick):
+        """🌊 Each tick becomes a dancing waveform on the frequency spectrum."""
+        # Volume influences the quantity/energy of the node
+        self.harmonic_field.add_or_update_node(
+            exchange=tick.exchange,
+            symbol=tick.symbol,
+            current_price=tick.last,
+            entry_price=tick.last,  # No position, use current as baseline
+            quantity=tick.volume_24h / 1000 if tick.volume_24h > 0 else 1.0,  # Normalize volume
+            asset_class='crypto'
+        )
+    
+    def _publish_thought(self, tick: NormalizedTick):
+        from aureon_thought_bus import Thought
+        self.thought_bus.publish(Thought(
+            source=f"ws_{tick.exchange}",
+            topic="tick",
+            payload=tick.to_dict()
+        ))
+    
+    def _record(self, exchange: str, msg: Any):
+        """Append a raw frame to the recording file (WS_FEED_RECORD_PATH)."""
+        if self._recorder is None:
+            return
+        try:
+            if isinstance(msg, bytes):
+                msg = msg.decode('utf-8', errors='replace')
+            self._recorder.write(json.dumps({'t': time.time(), 'exchange': exchange, 'msg': msg}) + '\n')
+        except Exception as e:
+            logger.debug(f"📼 Frame record error: {e}")
+    
+    def get_consumer_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-consumer delivered/dropped/conflated counts, queue depth and lag."""
+        return self.dispatcher.stats()
     
     # ─────────────────────────────────────────────────────────────
     # BINANCE HANDLER
@@ -338,22 +569,9 @@ class UnifiedWSFeed:
                         if not self._running:
                             break
                         
+                        self._record('binance', msg)
                         try:
-                            data = json.loads(msg)
-                            if 'stream' in data:
-                                data = data.get('data', data)
-                            
-                            raw_symbol = data.get('s', '')
-                            tick = NormalizedTick(
-                                symbol=normalize_symbol(raw_symbol, 'binance'),
-                                exchange='binance',
-                                bid=float(data.get('b', 0)),
-                                ask=float(data.get('a', 0)),
-                                last=float(data.get('c', 0)),
-                                volume_24h=float(data.get('v', 0)),
-                                change_24h=float(data.get('P', 0)),
-                                raw_symbol=raw_symbol,
-                            )
+                            tick = parse_binance_frame(msg)
                             status.last_message = time.time()
                             status.message_count += 1
                             self._emit(tick)
@@ -400,27 +618,10 @@ class UnifiedWSFeed:
                         if not self._running:
                             break
                         
+                        self._record('kraken', msg)
                         try:
-                            data = json.loads(msg)
-                            
-                            # Skip system messages
-                            if isinstance(data, dict):
-                                continue
-                            
-                            # Ticker format: [channelID, {...}, "ticker", "XBT/USD"]
-                            if isinstance(data, list) and len(data) >= 4 and data[2] == "ticker":
-                                ticker = data[1]
-                                raw_symbol = data[3]
-                                
-                                tick = NormalizedTick(
-                                    symbol=normalize_symbol(raw_symbol, 'kraken'),
-                                    exchange='kraken',
-                                    bid=float(ticker.get('b', [0])[0]),
-                                    ask=float(ticker.get('a', [0])[0]),
-                                    last=float(ticker.get('c', [0])[0]),
-                                    volume_24h=float(ticker.get('v', [0, 0])[1]),
-                                    raw_symbol=raw_symbol,
-                                )
+                            tick = parse_kraken_frame(msg)
+                            if tick is not None:
                                 status.last_message = time.time()
                                 status.message_count += 1
                                 self._emit(tick)
@@ -468,21 +669,10 @@ class UnifiedWSFeed:
                         if not self._running:
                             break
                         
+                        self._record('coinbase', msg)
                         try:
-                            data = json.loads(msg)
-                            
-                            if data.get('type') == 'ticker':
-                                raw_symbol = data.get('product_id', '')
-                                
-                                tick = NormalizedTick(
-                                    symbol=normalize_symbol(raw_symbol, 'coinbase'),
-                                    exchange='coinbase',
-                                    bid=float(data.get('best_bid', 0)),
-                                    ask=float(data.get('best_ask', 0)),
-                                    last=float(data.get('price', 0)),
-                                    volume_24h=float(data.get('volume_24h', 0)),
-                                    raw_symbol=raw_symbol,
-                                )
+                            tick = parse_coinbase_frame(msg)
+                            if tick is not None:
                                 status.last_message = time.time()
                                 status.message_count += 1
                                 self._emit(tick)
@@ -546,20 +736,10 @@ class UnifiedWSFeed:
                         if not self._running:
                             break
                         
+                        self._record('capital', msg)
                         try:
-                            data = json.loads(msg)
-                            
-                            if data.get("type") == "price":
-                                raw_symbol = data.get("epic", "")
-                                
-                                tick = NormalizedTick(
-                                    symbol=normalize_symbol(raw_symbol, 'capital'),
-                                    exchange='capital',
-                                    bid=float(data.get('bid', 0)),
-                                    ask=float(data.get('offer', 0)),
-                                    last=float(data.get('mid', 0)),
-                                    raw_symbol=raw_symbol,
-                                )
+                            tick = parse_capital_frame(msg)
+                            if tick is not None:
                                 status.last_message = time.time()
                                 status.message_count += 1
                                 self._emit(tick)
@@ -675,20 +855,91 @@ class UnifiedWSFeed:
         for status in self.status.values():
             status.connected = False
         
+        if self._recorder is not None:
+            self._recorder.flush()
+        
         logger.info("🌐 UnifiedWSFeed stopped")
     
-    def get_best_tick(self, symbol: str) -> Optional[NormalizedTick]:
-        """Get the best (tightest spread) tick for a symbol across exchanges."""
+    @staticmethod
+    def _lookup_symbol(symbol: str) -> str:
         symbol = symbol.upper()
         if '/' not in symbol:
             symbol = f"{symbol}/USD"
-        
-        candidates = [t for t in self.ticks.values() if t.symbol == symbol]
-        if not candidates:
+        return symbol
+    
+    def get_best_tick(self, symbol: str) -> Optional[NormalizedTick]:
+        """Get the best (tightest spread) tick for a symbol across exchanges."""
+        symbol = self._lookup_symbol(symbol)
+        quote = self.nbbo.get(symbol)
+        if quote is None:
             return None
-        
-        # Return tick with tightest spread
-        return min(candidates, key=lambda t: t.spread)
+        book = self.books.get(symbol, {})
+        if quote.tightest_exchange:
+            return book.get(quote.tightest_exchange)
+        # Only reference / one-sided ticks: fall back to the newest one
+        return max(book.values(), key=lambda t: t.timestamp, default=None)
+    
+    def get_tick(self, symbol: str, exchange: str,
+                 max_age_s: Optional[float] = None) -> Optional[NormalizedTick]:
+        """Latest tick for one symbol on one exchange (None if missing or older than max_age_s)."""
+        tick = self.books.get(self._lookup_symbol(symbol), {}).get(exchange)
+        if tick is None or (max_age_s is not None and time.time() - tick.timestamp > max_age_s):
+            return None
+        return tick
+    
+    def get_quotes(self, symbol: str, max_age_s: Optional[float] = None) -> Dict[str, NormalizedTick]:
+        """Per-exchange latest ticks for a symbol, optionally only those newer than max_age_s."""
+        book = dict(self.books.get(self._lookup_symbol(symbol), {}))
+        if max_age_s is None:
+            return book
+        cutoff = time.time() - max_age_s
+        return {ex: t for ex, t in book.items() if t.timestamp >= cutoff}
+    
+    def get_nbbo(self, symbol: str, max_age_s: Optional[float] = None) -> Optional[ConsolidatedQuote]:
+        """
+        Consolidated best bid / best ask for a symbol. With max_age_s, venues
+        whose last tick is older are left out (recomputed over that symbol's
+        venues only when one of them is stale).
+        """
+        symbol = self._lookup_symbol(symbol)
+        quote = self.nbbo.get(symbol)
+        if quote is None or max_age_s is None:
+            return quote
+        cutoff = time.time() - max_age_s
+        if quote.oldest >= cutoff:
+            return quote
+        return consolidate(symbol, dict(self.books.get(symbol, {})), min_timestamp=cutoff)
+    
+    def nbbo_snapshot(self, symbols: Optional[List[str]] = None,
+                      max_age_s: Optional[float] = None) -> Dict[str, ConsolidatedQuote]:
+        """Consolidated quotes for `symbols` (default: every symbol seen)."""
+        wanted = [self._lookup_symbol(s) for s in symbols] if symbols else list(self.nbbo)
+        snapshot = {}
+        for symbol in wanted:
+            quote = self.get_nbbo(symbol, max_age_s)
+            if quote is not None:
+                snapshot[symbol] = quote
+        return snapshot
+    
+    def get_ticker(self, exchange: str, raw_symbol: str,
+                   max_age_s: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        REST-shaped ticker ({'price', 'bid', 'ask', ...}) for an exchange
+        symbol from the live stream, or None if the feed has no fresh tick.
+        """
+        tick = self.get_tick(normalize_symbol(raw_symbol, exchange), exchange, max_age_s)
+        if tick is None or tick.last <= 0:
+            return None
+        return {
+            'symbol': raw_symbol,
+            'price': tick.last,
+            'bid': tick.bid if tick.bid > 0 else tick.last,
+            'ask': tick.ask if tick.ask > 0 else tick.last,
+            'volume': tick.volume_24h,
+            'change24h': tick.change_24h,
+            'timestamp': tick.timestamp,
+            'source': 'ws',
+        }
     
     def get_health(self) -> Dict[str, Any]:
         """Return health status of all exchange connections."""
@@ -718,6 +969,13 @@ def get_ws_feed() -> UnifiedWSFeed:
     return _ws_feed
 
 
+def get_running_ws_feed() -> Optional[UnifiedWSFeed]:
+    """The singleton feed if it has been started, else None (never creates one)."""
+    if _ws_feed is not None and _ws_feed._running:
+        return _ws_feed
+    return None
+
+
 async def start_production_feeds(symbols: Optional[List[str]] = None):
     """Start the unified WS feed for production use."""
     feed = get_ws_feed()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+WebSocket Broadcast Hub
+-----------------------
+Backpressure-aware fan-out of JSON messages to browser websockets.
+
+Awaiting `ws.send_json(message)` for each client in turn re-serialised the
+same dict per client and let one slow tab delay every other client (and the
+task doing the broadcast). BroadcastHub serialises each message once and
+only enqueues it; every client has a bounded queue drained by its own
+writer task:
+
+    hub = BroadcastHub('command_center')
+    hub.add(ws)                          # in the websocket handler
+    hub.send(ws, initial_state)          # this client only, queued first
+    hub.publish({'type': 'trade', ...})  # O(clients), never awaits a socket
+    hub.remove(ws)                       # handler exit
+
+Snapshot types (balances, stats, prices, portfolio, ...) are conflated: a
+newer snapshot replaces one the client has not been sent yet, keeping its
+place in the queue, so a lagging client skips straight to current state.
+A client whose oldest undelivered message (queued, or stuck in a send) is
+older than the lag budget, or whose queue overflows, is dropped (closed with
+1013 Try Again Later; the browser reconnects and gets a fresh state).
+
+Connected / lagging client counts, drops by reason, and published / sent /
+conflated message counts are exported via the metrics module; stats() adds
+enqueue-to-sent latency percentiles.
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from metrics import MetricCounter, MetricGauge
+
+logger = logging.getLogger(__name__)
+
+CLIENT_QUEUE_SIZE = int(os.getenv('WS_BROADCAST_QUEUE', '256'))
+LAG_BUDGET_S = float(os.getenv('WS_BROADCAST_LAG_BUDGET_S', '5.0'))
+LAGGING_S = float(os.getenv('WS_BROADCAST_LAGGING_S', '1.0'))
+SNAPSHOT_TYPES = frozenset({'balances', 'portfolio', 'prices', 'stats', 'systems_loaded', 'live_feed', 'trading'})
+LATENCY_WINDOW = 4096               # Send latency samples kept for percentiles
+CLOSE_TRY_AGAIN_LATER = 1013
+
+broadcast_clients = MetricGauge(
+    'ws_broadcast_clients',
+    'Websocket clients of a broadcast hub by state',
+    labelnames=('hub', 'state'),
+)
+broadcast_dropped = MetricCounter(
+    'ws_broadcast_dropped_total',
+    'Websocket clients dropped by a broadcast hub',
+    labelnames=('hub', 'reason'),
+)
+broadcast_messages = MetricCounter(
+    'ws_broadcast_messages_total',
+    'Broadcast hub messages by outcome',
+    labelnames=('hub', 'outcome'),
+)
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class BroadcastClient:
+    """One websocket's bounded queue and writer task."""
+
+    def __init__(self, hub: 'BroadcastHub', ws: Any):
+        self.hub = hub
+        self.ws = ws
+        self._queue: deque = deque()                  # [snapshot_key, data, enqueued_at]
+        self._snapshots: Dict[str, list] = {}         # Unsent snapshot entry per type
+        self._wake = asyncio.Event()
+        self.sent = 0
+        self.conflated = 0
+        self.max_depth = 0
+        self._sending_since: Optional[float] = None   # Enqueue time of the message in flight
+        self.closed = False
+        self.task = asyncio.ensure_future(self._run())
+
+    def offer(self, key: Optional[str], data: str, now: float) -> str:
+        """Queue serialised data: 'queued', 'conflated' or 'overflow'."""
+        if key is not None:
+            pending = self._snapshots.get(key)
+            if pending is not None:
+                pending[1] = data                     # Keep position and age
+                self.conflated += 1
+                return 'conflated'
+        if len(self._queue) >= self.hub.max_queue:
+            return 'overflow'
+        entry = [key, data, now]
+        self._queue.append(entry)
+        if key is not None:
+            self._snapshots[key] = entry
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._wake.set()
+        return 'queued'
+
+    def lag(self, now: float) -> float:
+        """Age of the oldest message not yet written to the socket."""
+        if self._sending_since is not None:
+            return now - self._sending_since
+        return now - self._queue[0][2] if self._queue else 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    async def _run(self):
+        try:
+            while True:
+                while not self._queue:
+                    self._wake.clear()
+                    await self._wake.wait()
+                key, _, enqueued_at = entry = self._queue.popleft()
+                if key is not None and self._snapshots.get(key) is entry:
+                    del self._snapshots[key]
+                self._sending_since = enqueued_at
+                await self.ws.send_str(entry[1])
+                self._sending_since = None
+                self.sent += 1
+                self.hub._sent(time.perf_counter() - enqueued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.hub._drop(self, 'error')
+
+
+class BroadcastHub:
+    """Serialise-once fan-out to per-client writer tasks."""
+
+    def __init__(self, name: str = 'ws', max_queue: int = CLIENT_QUEUE_SIZE,
+                 lag_budget_s: float = LAG_BUDGET_S, lagging_s: float = LAGGING_S,
+                 snapshot_types: Iterable[str] = SNAPSHOT_TYPES,
+                 dumps: Callable[[Any], str] = json.dumps):
+        self.name = name
+        self.max_queue = max(1, max_queue)
+        self.lag_budget_s = lag_budget_s
+        self.lagging_s = lagging_s
+        self.snapshot_types = frozenset(snapshot_types)
+        self.dumps = dumps
+        self.clients: Dict[Any, BroadcastClient] = {}
+        self.published = 0
+        self.conflated = 0
+        self.dropped: Dict[str, int] = {}
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    # ──────────────────────────────────────────────────────────────
+    # Clients
+    # ──────────────────────────────────────────────────────────────
+
+    def add(self, ws: Any) -> BroadcastClient:
+        """Register a prepared websocket (call from inside the event loop)."""
+        client = BroadcastClient(self, ws)
+        self.clients[ws] = client
+        self._export(0)
+        return client
+
+    def remove(self, ws: Any):
+        """Forget a websocket that disconnected on its own."""
+        client = self.clients.pop(ws, None)
+        if client is not None:
+            client.closed = True
+            client.task.cancel()
+            self._export(0)
+
+    def _drop(self, client: BroadcastClient, reason: str):
+        if self.clients.get(client.ws) is not client:
+            return
+        del self.clients[client.ws]
+        client.closed = True
+        if client.task is not asyncio.current_task():
+            client.task.cancel()
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+        broadcast_dropped.inc(hub=self.name, reason=reason)
+        logger.warning(f"Broadcast hub '{self.name}' dropped a client ({reason}, "
+                       f"{client.depth} queued, lag {client.lag(time.perf_counter()):.2f}s)")
+        asyncio.ensure_future(self._close(client.ws))
+
+    async def _close(self, ws: Any):
+        try:
+            await asyncio.wait_for(ws.close(code=CLOSE_TRY_AGAIN_LATER, message=b'lagging'), timeout=1.0)
+        except Exception:
+            pass
+
+    # ──────────────────────────────────────────────────────────────
+    # Fan-out
+    # ──────────────────────────────────────────────────────────────
+
+    def send(self, ws: Any, message: Dict[str, Any]) -> bool:
+        """Queue a message for one client only."""
+        client = self.clients.get(ws)
+        if client is None:
+            return False
+        if client.offer(None, self.dumps(message), time.perf_counter()) == 'overflow':
+            self._drop(client, 'overflow')
+            return False
+        return True
+
+    def publish(self, message: Dict[str, Any]) -> int:
+        """Serialise once and queue for every client; returns clients reached."""
+        if not self.clients:
+            return 0
+        try:
+            data = self.dumps(message)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Broadcast hub '{self.name}' could not serialise {message.get('type')!r}: {e}")
+            return 0
+        msg_type = message.get('type')
+        key = msg_type if msg_type in self.snapshot_types else None
+        now = time.perf_counter()
+        reached = conflated = lagging = 0
+        for client in list(self.clients.values()):
+            outcome = client.offer(key, data, now)
+            if outcome == 'overflow':
+                self._drop(client, 'overflow')
+                continue
+            lag = client.lag(now)
+            if lag > self.lag_budget_s:
+                self._drop(client, 'lag')
+                continue
+            reached += 1
+            conflated += outcome == 'conflated'
+            lagging += lag > self.lagging_s
+        self.published += 1
+        self.conflated += conflated
+        broadcast_messages.inc(hub=self.name, outcome='published')
+        if conflated:
+            broadcast_messages.inc(conflated, hub=self.name, outcome='conflated')
+        self._export(lagging)
+        return reached
+
+    def _sent(self, latency: float):
+        self._latencies.append(latency)
+        broadcast_messages.inc(hub=self.name, outcome='sent')
+
+    def _export(self, lagging: int):
+        broadcast_clients.set(len(self.clients), hub=self.name, state='connected')
+        broadcast_clients.set(lagging, hub=self.name, state='lagging')
+
+    # ──────────────────────────────────────────────────────────────
+    # Control
+    # ──────────────────────────────────────────────────────────────
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every client's queue is empty (tests / shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(c.depth for c in self.clients.values()):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.005)
+        return True
+
+    async def close(self):
+        """Stop every writer task (app cleanup)."""
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            client.closed = True
+            client.task.cancel()
+        await asyncio.gather(*(c.task for c in clients), return_exceptions=True)
+        self._export(0)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.perf_counter()
+        clients = list(self.clients.values())
+        latencies = list(self._latencies)
+        return {
+            'connected': len(clients),
+            'lagging': sum(1 for c in clients if c.lag(now) > self.lagging_s),
+            'dropped': dict(self.dropped),
+            'published': self.published,
+            'conflated': self.conflated,
+            'queued': sum(c.depth for c in clients),
+            'max_depth': max((c.max_depth for c in clients), default=0),
+            'send_latency_p50_ms': _percentile(latencies, 0.50) * 1000,
+            'send_latency_p99_ms': _percentile(latencies, 0.99) * 1000,
+        }
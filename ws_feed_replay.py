@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""WS feed replay harness
+
+Feeds recorded (or synthetic) raw websocket frames through the
+UnifiedWSFeed frame parsers and tick dispatcher with no network, and
+reports ticks/s for the read loop alone and end to end (until every
+consumer queue has drained), plus per-consumer lag / drop counters.
+
+Record frames from a live feed by setting WS_FEED_RECORD_PATH=frames.jsonl;
+each line is {"t": unix_time, "exchange": "binance", "msg": "<raw frame>"}.
+
+Usage:
+- `python ws_feed_replay.py frames.jsonl`
+- `python ws_feed_replay.py --synthetic 200000 --slow-consumer-ms 2`
+- `python ws_feed_replay.py --synthetic 50000 --inline`   (old inline emit)
+"""
+
+from __future__ import annotations
+from aureon_baton_link import link_system as _baton_link; _baton_link(__name__)
+
+import json
+import time
+import random
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from unified_ws_feed import FRAME_PARSERS, UnifiedWSFeed, denormalize_symbol
+from tick_dispatch import TickDispatcher
+
+Frame = Tuple[str, str]         # (exchange, raw message)
+
+DEFAULT_SYMBOLS = ["BTC/USD", "ETH/USD", "SOL/USD", "XRP/USD", "DOGE/USD",
+                   "ADA/USD", "AVAX/USD", "DOT/USD", "LINK/USD", "LTC/USD"]
+
+
+def load_frames(path: str) -> List[Frame]:
+    """Read frames written with WS_FEED_RECORD_PATH."""
+    frames: List[Frame] = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                frames.append((rec['exchange'], rec['msg']))
+            except (ValueError, KeyError):
+                continue
+    return frames
+
+
+def synthetic_frames(count: int, symbols: Sequence[str] = DEFAULT_SYMBOLS,
+                     exchanges: Sequence[str] = ('binance', 'kraken', 'coinbase'),
+                     seed: int = 7) -> List[Frame]:
+    """Random-walk ticker frames in each exchange's native wire format."""
+    rng = random.Random(seed)
+    prices = {s: rng.uniform(1, 50000) for s in symbols}
+    volumes = {s: rng.uniform(1e3, 1e6) for s in symbols}
+    frames: List[Frame] = []
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        exchange = exchanges[(i // len(symbols)) % len(exchanges)]
+        prices[symbol] *= 1 + rng.gauss(0, 0.0005)
+        volumes[symbol] += rng.uniform(0, 10)
+        last = prices[symbol]
+        bid, ask = last * 0.9998, last * 1.0002
+        if exchange == 'binance':
+            raw = symbol.replace('/', '') + ('T' if symbol.endswith('/USD') else '')     # BTCUSDT
+            msg = {'e': '24hrTicker', 's': raw,
+                   'b': f"{bid:.8f}", 'a': f"{ask:.8f}", 'c': f"{last:.8f}",
+                   'v': f"{volumes[symbol]:.4f}", 'P': f"{rng.uniform(-5, 5):.3f}"}
+        elif exchange == 'kraken':
+            msg = [340, {'b': [f"{bid:.8f}", 1, '1.0'], 'a': [f"{ask:.8f}", 1, '1.0'],
+                         'c': [f"{last:.8f}", '0.1'], 'v': ['10.0', f"{volumes[symbol]:.4f}"]},
+                   'ticker', symbol.replace('BTC', 'XBT')]
+        elif exchange == 'coinbase':
+            msg = {'type': 'ticker', 'product_id': denormalize_symbol(symbol, 'coinbase'),
+                   'best_bid': f"{bid:.8f}", 'best_ask': f"{ask:.8f}", 'price': f"{last:.8f}",
+                   'volume_24h': f"{volumes[symbol]:.4f}"}
+        else:
+            msg = {'type': 'price', 'epic': symbol.replace('/', ''),
+                   'bid': bid, 'offer': ask, 'mid': last}
+        frames.append((exchange, json.dumps(msg)))
+    return frames
+
+
+def replay(feed: UnifiedWSFeed, frames: Iterable[Frame],
+           drain_timeout: Optional[float] = 60.0) -> Dict[str, Any]:
+    """
+    Parse and emit every frame as the stream loops would, then wait for
+    the consumers. read_* numbers are what the socket loop sustains;
+    end_to_end_* include every consumer finishing its queue.
+    """
+    frames_seen = ticks = parse_errors = skipped = 0
+    start = time.perf_counter()
+    for exchange, msg in frames:
+        frames_seen += 1
+        parser = FRAME_PARSERS.get(exchange)
+        if parser is None:
+            skipped += 1
+            continue
+        try:
+            tick = parser(msg)
+        except Exception:
+            parse_errors += 1
+            continue
+        if tick is None:
+            skipped += 1
+            continue
+        feed._emit(tick)
+        ticks += 1
+    read_s = time.perf_counter() - start
+    drained = feed.dispatcher.drain(drain_timeout)
+    total_s = time.perf_counter() - start
+    return {
+        'frames': frames_seen,
+        'ticks': ticks,
+        'parse_errors': parse_errors,
+        'skipped': skipped,
+        'read_s': read_s,
+        'read_ticks_per_s': ticks / read_s if read_s > 0 else 0.0,
+        'end_to_end_s': total_s,
+        'end_to_end_ticks_per_s': ticks / total_s if total_s > 0 else 0.0,
+        'drained': drained,
+        'consumers': feed.get_consumer_stats(),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description='Replay WS frames through UnifiedWSFeed (no network)')
+    ap.add_argument('frames', nargs='?', help='JSONL file recorded with WS_FEED_RECORD_PATH')
+    ap.add_argument('--synthetic', type=int, default=0, help='Generate N synthetic frames instead')
+    ap.add_argument('--inline', action='store_true', help='Run consumers inline (pre-dispatch behaviour)')
+    ap.add_argument('--slow-consumer-ms', type=float, default=0.0,
+                    help='Add a full-fidelity callback that sleeps this long per tick')
+    args = ap.parse_args()
+
+    if args.frames:
+        frames = load_frames(args.frames)
+    elif args.synthetic:
+        frames = synthetic_frames(args.synthetic)
+    else:
+        ap.error('give a frames file or --synthetic N')
+
+    feed = UnifiedWSFeed()
+    if args.inline:
+        feed.dispatcher.close(timeout=0)
+        feed.dispatcher = TickDispatcher('ws_feed', threaded=False)
+        feed._wire_consumers()
+    if args.slow_consumer_ms > 0:
+        delay = args.slow_consumer_ms / 1000.0
+        feed.on_tick(lambda tick: time.sleep(delay), mode='all', name='slow_consumer')
+
+    result = replay(feed, frames)
+    print(f"frames={result['frames']} ticks={result['ticks']} parse_errors={result['parse_errors']} "
+          f"skipped={result['skipped']}")
+    print(f"read loop:  {result['read_s']:.3f}s  {result['read_ticks_per_s']:,.0f} ticks/s")
+    print(f"end to end: {result['end_to_end_s']:.3f}s  {result['end_to_end_ticks_per_s']:,.0f} ticks/s"
+          f"{'' if result['drained'] else '  (consumers still draining)'}")
+    for name, stats in result['consumers'].items():
+        print(f"  {name:16} {stats['mode']:6} delivered={stats['delivered']} dropped={stats['dropped']} "
+              f"conflated={stats['conflated']} errors={stats['errors']} max_depth={stats['max_depth']} "
+              f"lag p50={stats['lag_p50_ms']:.2f}ms p99={stats['lag_p99_ms']:.2f}ms")
+    feed.dispatcher.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
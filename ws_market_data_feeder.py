@@ -2,7 +2,8 @@
 """WS Market Data Feeder
 
 Purpose:
-- Use FREE exchange WebSocket streams (heavy-lifting) to keep an on-disk price+ticker cache fresh.
+- Use FREE exchange WebSocket streams (heavy-lifting) to keep the shared memory-mapped
+  ticker table (shared_ticker_table) and an optional on-disk JSON cache fresh.
 - Designed to be OPTIONAL and production-friendly.
 - Does NOT change trading logic; it only publishes data the trader can optionally consume.
 
@@ -61,6 +62,11 @@ try:
 except Exception:
     websockets = None
 
+try:
+    from shared_ticker_table import publish_ticker_cache
+except Exception:
+    publish_ticker_cache = None
+
 
 def _atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -143,6 +149,7 @@ async def run_binance_all_tickers(
     binance_uk_mode: bool,
     write_interval_s: float,
     quiet: bool,
+    json_export: bool = True,
 ) -> None:
     if not websockets:
         raise RuntimeError("websockets package not installed")
@@ -180,13 +187,17 @@ async def run_binance_all_tickers(
                         binance_uk_mode=binance_uk_mode,
                     )
 
-                    payload = {
-                        'generated_at': now,
-                        'source': 'binance_ws',
-                        'prices': prices,
-                        'ticker_cache': ticker_cache,
-                    }
-                    _atomic_write_json(out_path, payload)
+                    if publish_ticker_cache:
+                        publish_ticker_cache(prices, ticker_cache, 'binance_ws', now)
+
+                    if json_export:
+                        payload = {
+                            'generated_at': now,
+                            'source': 'binance_ws',
+                            'prices': prices,
+                            'ticker_cache': ticker_cache,
+                        }
+                        _atomic_write_json(out_path, payload)
                     last_write = now
 
                     if not quiet:
@@ -225,6 +236,12 @@ def main() -> int:
         default=float(os.getenv("WS_FEED_WRITE_INTERVAL_S", "1.0")),
         help="Minimum seconds between cache writes (default: 1.0)",
     )
+    parser.add_argument(
+        "--no-json-export",
+        action="store_true",
+        default=os.getenv("MARKET_CACHE_JSON_EXPORT", "1").lower() in ("0", "false", "no", "off"),
+        help="Only update the shared ticker table, skip the JSON file",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -245,6 +262,7 @@ def main() -> int:
                     binance_uk_mode=args.binance_uk_mode,
                     write_interval_s=max(0.1, args.write_interval_s),
                     quiet=args.quiet,
+                    json_export=not args.no_json_export,
                 )
             )
         if not tasks: